@@ -35,6 +35,7 @@ import statistics
 sys.path.insert(0, str(Path(__file__).parent))
 
 from generate_wordpress_xml import WordPressXMLGenerator, CholotComponentFactory
+from page_stats import collect_page_stats
 
 
 @dataclass
@@ -644,8 +645,9 @@ class BenchmarkSuite:
                 elementor_data = self._extract_elementor_json(xml_output)
                 if elementor_data:
                     json_valid = True
-                    widget_count = self._count_widgets(elementor_data)
-                    required_fields_present = self._check_required_fields(elementor_data)
+                    stats = collect_page_stats(elementor_data)
+                    widget_count = stats.widget_count
+                    required_fields_present = stats.required_fields_present
                 else:
                     json_valid = False
                     
@@ -704,45 +706,6 @@ class BenchmarkSuite:
             print(f"JSON extraction error: {e}")
             return []
     
-    def _count_widgets(self, elementor_data: List[Dict]) -> int:
-        """Count total widgets in elementor data."""
-        count = 0
-        
-        def count_recursive(elements):
-            nonlocal count
-            for element in elements:
-                if element.get('elType') == 'widget':
-                    count += 1
-                if 'elements' in element:
-                    count_recursive(element['elements'])
-        
-        count_recursive(elementor_data)
-        return count
-    
-    def _check_required_fields(self, elementor_data: List[Dict]) -> bool:
-        """Check if required Elementor fields are present."""
-        required_section_fields = ['id', 'elType', 'elements']
-        required_widget_fields = ['id', 'elType', 'widgetType', 'settings']
-        
-        def check_recursive(elements):
-            for element in elements:
-                el_type = element.get('elType')
-                
-                if el_type == 'section':
-                    if not all(field in element for field in required_section_fields):
-                        return False
-                elif el_type == 'widget':
-                    if not all(field in element for field in required_widget_fields):
-                        return False
-                
-                if 'elements' in element:
-                    if not check_recursive(element['elements']):
-                        return False
-            
-            return True
-        
-        return check_recursive(elementor_data)
-    
     def _calculate_flexibility_score(self, scenario_data: Dict, widget_count: int, 
                                    json_valid: bool, approach: str) -> int:
         """Calculate flexibility score (0-100)."""
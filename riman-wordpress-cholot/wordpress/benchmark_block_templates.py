@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Block Template Fill Benchmark
+=============================
+
+Measures the per-block fill cost of the legacy deepcopy + str.replace loop
+against CompiledBlockTemplate (shared and fresh-copy fills) while the block
+library and the content map grow. The legacy cost scales with
+strings x content keys; the compiled fill only touches placeholder slots.
+
+Usage:
+    python benchmark_block_templates.py
+    python benchmark_block_templates.py --libraries 10 100 1000 --keys 10 100 1000 --fills 2000
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from block_templates import compile_block_library
+
+
+def legacy_fill(template, content):
+    def replace(element):
+        if isinstance(element, str):
+            for key, value in content.items():
+                placeholder = f"{{{{{key}}}}}"
+                if placeholder in element:
+                    element = element.replace(placeholder, str(value))
+            return element
+        if isinstance(element, dict):
+            return {k: replace(v) for k, v in element.items()}
+        if isinstance(element, list):
+            return [replace(item) for item in element]
+        return element
+    return replace(copy.deepcopy(template))
+
+
+def make_block(n: int) -> dict:
+    """A section with 3 columns of styled widgets, 4 of them with placeholders"""
+    def widget(i):
+        settings = {
+            'title_color': '#b68c2f', 'title_typo_font_family': 'Playfair Display',
+            'padding': {'unit': 'px', 'top': '20', 'right': '0', 'bottom': '20', 'left': '0'},
+            'text': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit.',
+        }
+        if i < 4:
+            settings['title'] = f'{{{{BLOCK_{n}_TITLE}}}} – {{{{TITLE}}}}'
+        return {'id': f'w{n}{i}', 'elType': 'widget', 'widgetType': 'cholot-texticon', 'settings': settings}
+
+    return {
+        'id': f's{n}', 'elType': 'section', 'settings': {'gap': 'extended', 'layout': 'boxed'},
+        'elements': [
+            {'id': f'c{n}{col}', 'elType': 'column', 'settings': {'_column_size': 33},
+             'elements': [widget(col * 3 + i) for i in range(3)]}
+            for col in range(3)
+        ],
+    }
+
+
+def time_per_fill(fill, blocks, content, fills):
+    start = time.perf_counter()
+    for i in range(fills):
+        fill(blocks[i % len(blocks)], content)
+    return (time.perf_counter() - start) / fills * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark block template fills')
+    parser.add_argument('--libraries', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--keys', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--fills', type=int, default=200)
+    args = parser.parse_args()
+
+    print("🚀 Block Template Fill Benchmark")
+    print("=" * 78)
+    print(f"{'blocks':>7} {'keys':>6} {'compile ms':>11} {'legacy µs':>11} "
+          f"{'shared µs':>11} {'copy µs':>11} {'speedup':>9}")
+
+    random.seed(0)
+    for library_size in args.libraries:
+        library = {f'block-{n}': [{'structure': make_block(n)}] for n in range(library_size)}
+        start = time.perf_counter()
+        compiled = compile_block_library(library)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        templates = [variants[0]['structure'] for variants in library.values()]
+        compiled_templates = [variants[0] for variants in compiled.values()]
+        order = random.sample(range(library_size), library_size)
+        templates = [templates[i] for i in order]
+        compiled_templates = [compiled_templates[i] for i in order]
+
+        for key_count in args.keys:
+            content = {f'BLOCK_{n}_TITLE': f'Block {n}' for n in range(key_count)}
+            content['TITLE'] = 'RIMAN GmbH'
+
+            legacy = time_per_fill(legacy_fill, templates, content, args.fills)
+            shared = time_per_fill(lambda t, c: t.fill(c), compiled_templates, content, args.fills)
+            copied = time_per_fill(lambda t, c: t.fill(c, share=False), compiled_templates, content, args.fills)
+            print(f"{library_size:>7} {key_count:>6} {compile_ms:>11.1f} {legacy:>11.1f} "
+                  f"{shared:>11.1f} {copied:>11.1f} {legacy / shared:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+XML Comparator Benchmark
+========================
+
+Ranks ``--iterations`` generated exports (copies of the exports in
+generated/, cycled) against generated/cholot-original-fixed.xml:
+
+- legacy: per candidate, the eight findall passes and four structure
+  substitutions over both the reference and the candidate
+- batch: ``compare_batch`` with the reference summarized once and one
+  tokenizer pass per candidate, serially and in a process pool
+
+Usage:
+    python benchmark_compare_xml.py
+    python benchmark_compare_xml.py --iterations 48 --workers 4
+"""
+
+import argparse
+import importlib.util
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+REFERENCE = HERE / 'generated' / 'cholot-original-fixed.xml'
+
+LEGACY_PATTERNS = [
+    r'<item>',
+    r'<wp:post_type>page</wp:post_type>',
+    r'<wp:post_type>post</wp:post_type>',
+    r'<wp:post_type>nav_menu_item</wp:post_type>',
+    r'_elementor_data',
+    r'<wp:post_type>(?!page|post|nav_menu_item)',
+    r'<wp:post_type>attachment</wp:post_type>',
+    r'<title><!\[CDATA\[(.*?)\]\]></title>',
+    r'<wp:post_id>(\d+)</wp:post_id>',
+    r'"widgetType":"([^"]+)"',
+]
+
+
+def load_comparator_module():
+    spec = importlib.util.spec_from_file_location('compare_xml', HERE / 'compare-xml.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_summary(module, xml_file):
+    """Stats and structure the way each comparison used to compute them"""
+    with open(xml_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    stats = [re.findall(pattern, content) for pattern in LEGACY_PATTERNS]
+    with open(xml_file, 'r', encoding='utf-8') as f:
+        structure = module.extract_structure(f.read())
+    return stats, structure
+
+
+def legacy_batch(module, reference_xml, candidates):
+    for candidate in candidates:
+        legacy_summary(module, reference_xml)
+        legacy_summary(module, candidate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch XML comparison')
+    parser.add_argument('--iterations', type=int, default=24)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    module = load_comparator_module()
+    sources = sorted((HERE / 'generated').glob('*.xml'))
+
+    print("🚀 XML Comparator Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        candidates = []
+        for n in range(args.iterations):
+            candidate = Path(tmp) / f'cholot-generated-iter-{n + 1}.xml'
+            candidate.write_bytes(sources[n % len(sources)].read_bytes())
+            candidates.append(str(candidate))
+        size = sum(Path(c).stat().st_size for c in candidates)
+        print(f"Reference: {REFERENCE.stat().st_size / 1024:.0f} KB, "
+              f"{args.iterations} candidates: {size / 1024 / 1024:.1f} MB")
+
+        runs = (
+            ('legacy per-file passes', lambda: legacy_batch(module, str(REFERENCE), candidates)),
+            ('batch, serial', lambda: module.compare_batch(str(REFERENCE), candidates)),
+            (f'batch, {args.workers} workers', lambda: module.compare_batch(str(REFERENCE), candidates,
+                                                                            workers=args.workers)),
+        )
+        for label, func in runs:
+            start = time.perf_counter()
+            func()
+            print(f"  {label:<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
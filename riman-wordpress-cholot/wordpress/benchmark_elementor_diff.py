@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Elementor Diff Benchmark
+========================
+
+Builds pages with N widgets (ten per column, one column per section),
+applies a fixed share of edits (changed settings, deleted, inserted and
+swapped widgets, regenerated IDs on every element) and times:
+
+- difflib: unified diff of the pretty-printed JSON, line based
+- tree diff: ``diff_elementor`` on the parsed trees
+
+Usage:
+    python benchmark_elementor_diff.py
+    python benchmark_elementor_diff.py --widgets 1000 4000 16000 --edit-rate 0.02
+"""
+
+import argparse
+import copy
+import difflib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from elementor_diff import diff_elementor
+
+
+def make_page(widgets):
+    sections = []
+    for s in range(0, widgets, 10):
+        column = [{'id': f'w{n}', 'elType': 'widget', 'widgetType': 'cholot-texticon',
+                   'settings': {'title': f'Leistung {n}', 'icon': 'fas fa-check', 'text': 'Sanierung ' * 4},
+                   'elements': []}
+                  for n in range(s, min(s + 10, widgets))]
+        sections.append({'id': f's{s}', 'elType': 'section', 'settings': {},
+                         'elements': [{'id': f'c{s}', 'elType': 'column', 'settings': {}, 'elements': column}]})
+    return sections
+
+
+def edit_page(sections, rate, seed=7):
+    rng = random.Random(seed)
+    edited = copy.deepcopy(sections)
+    columns = [section['elements'][0]['elements'] for section in edited]
+    edits = max(1, int(sum(len(c) for c in columns) * rate))
+    for n in range(edits):
+        column = rng.choice(columns)
+        if not column:
+            continue
+        action = n % 4
+        if action == 0:
+            rng.choice(column)['settings']['title'] += ' (neu)'
+        elif action == 1:
+            column.pop(rng.randrange(len(column)))
+        elif action == 2:
+            column.insert(rng.randrange(len(column) + 1), {
+                'id': f'new{n}', 'elType': 'widget', 'widgetType': 'cholot-title',
+                'settings': {'title': f'Neu {n}'}, 'elements': []})
+        elif len(column) > 1:
+            i, j = rng.sample(range(len(column)), 2)
+            column[i], column[j] = column[j], column[i]
+
+    def renumber(elements):
+        for element in elements:
+            element['id'] = 'x' + element['id']
+            renumber(element['elements'])
+    renumber(edited)
+    return edited
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Elementor tree diff')
+    parser.add_argument('--widgets', type=int, nargs='+', default=[1000, 4000, 16000])
+    parser.add_argument('--edit-rate', type=float, default=0.02)
+    parser.add_argument('--difflib-limit', type=int, default=1000,
+                        help='Skip the difflib baseline above this many widgets')
+    args = parser.parse_args()
+
+    print("🚀 Elementor Diff Benchmark")
+    print("=" * 60)
+    print(f"{'Widgets':>8} {'difflib':>12} {'tree diff':>12} {'ins':>5} {'del':>5} {'move':>5} {'upd':>5}")
+
+    for widgets in args.widgets:
+        old = make_page(widgets)
+        new = edit_page(old, args.edit_rate)
+
+        baseline = '-'
+        if widgets <= args.difflib_limit:
+            old_lines = json.dumps(old, indent=2).splitlines(keepends=True)
+            new_lines = json.dumps(new, indent=2).splitlines(keepends=True)
+            start = time.perf_counter()
+            list(difflib.unified_diff(old_lines, new_lines))
+            baseline = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+        start = time.perf_counter()
+        summary = diff_elementor(old, new).summary()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{widgets:>8} {baseline:>12} {elapsed:>9.1f} ms {summary['insert']:>5} {summary['delete']:>5} "
+              f"{summary['move']:>5} {summary['update']:>5}")
+
+
+if __name__ == "__main__":
+    main()
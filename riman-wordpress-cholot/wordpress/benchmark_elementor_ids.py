@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Elementor ID Allocator Benchmark
+================================
+
+Allocates 1M IDs with each ElementorIDAllocator mode and compares against
+the old list-backed ProcessingContext.generate_element_id, which is O(n)
+per ID. The legacy path is measured on a smaller sample because it is
+quadratic.
+
+Usage:
+    python benchmark_elementor_ids.py
+    python benchmark_elementor_ids.py --count 200000 --legacy-count 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from elementor_ids import ElementorIDAllocator
+
+
+def legacy_allocate(count: int) -> list:
+    """The previous list-backed allocator from ProcessingContext."""
+    generated_ids = []
+    for _ in range(count):
+        element_id = ''.join(random.choices('0123456789abcdef', k=8))
+        while element_id in generated_ids:
+            element_id = ''.join(random.choices('0123456789abcdef', k=8))
+        generated_ids.append(element_id)
+    return generated_ids
+
+
+def timed(label: str, count: int, func) -> float:
+    start = time.perf_counter()
+    ids = func()
+    elapsed = time.perf_counter() - start
+    assert len(ids) == count and len(set(ids)) == count, f"{label}: duplicate IDs"
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"  {label:<34} {count:>9,} IDs {elapsed:>8.3f}s {rate:>12,.0f} IDs/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Elementor ID allocation')
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--legacy-count', type=int, default=20_000)
+    args = parser.parse_args()
+
+    count = args.count
+    print("🚀 Elementor ID Allocator Benchmark")
+    print("=" * 78)
+
+    def one_by_one(allocator):
+        allocate = allocator.allocate
+        return [allocate() for _ in range(count)]
+
+    print("\n📊 One ID at a time (length 8, hex)")
+    timed('random', count, lambda: one_by_one(ElementorIDAllocator(length=8)))
+    timed('seeded', count, lambda: one_by_one(ElementorIDAllocator(length=8, mode='seeded', seed=1)))
+    timed('counter', count, lambda: one_by_one(ElementorIDAllocator(length=8, mode='counter')))
+
+    print("\n📊 Batch allocation (allocate_many)")
+    timed('random batch', count, lambda: ElementorIDAllocator(length=8).allocate_many(count))
+    timed('seeded batch', count,
+          lambda: ElementorIDAllocator(length=8, mode='seeded', seed=1).allocate_many(count))
+    timed('counter batch', count, lambda: ElementorIDAllocator(length=8, mode='counter').allocate_many(count))
+
+    print("\n📊 Legacy list-backed allocator (O(n) per ID)")
+    legacy = timed('legacy list', args.legacy_count, lambda: legacy_allocate(args.legacy_count))
+    new = timed('random (same count)', args.legacy_count,
+                lambda: ElementorIDAllocator(length=8).allocate_many(args.legacy_count))
+    print(f"\n  Speedup at {args.legacy_count:,} IDs: x{legacy / max(new, 1e-9):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Elementor Validator Benchmark
+=============================
+
+Builds a synthetic WXR export with N Elementor pages (every tenth page reuses
+the same layout as page 0) and compares post-ID attribution:
+
+- legacy: regex scan of the whole file, then for every block
+  ``content.find(data)`` plus ``re.findall`` over the prefix before it
+  (quadratic in file size, picks the first page for shared data)
+- single pass: ``ElementorValidator.run_validation`` on the streaming reader
+
+It then validates a directory of ``--iterations`` copies of the export, as
+CI does with generated iterations: without a block cache, with the shared
+in-memory cache, with a warm on-disk cache and with a process pool.
+
+Usage:
+    python benchmark_elementor_validator.py
+    python benchmark_elementor_validator.py --pages 2000 --iterations 10 --workers 4
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+ELEMENTOR_PATTERN = r'<wp:meta_key>_elementor_data</wp:meta_key>\s*<wp:meta_value><!\[CDATA\[(.*?)\]\]></wp:meta_value>'
+
+
+def load_validator_module():
+    spec = importlib.util.spec_from_file_location('validate_elementor', HERE / 'validate-elementor.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def page_data(n):
+    """Section/column/widget layout of roughly 4 KB"""
+    widgets = [{'id': f'w{n}x{k}', 'elType': 'widget', 'widgetType': 'cholot-texticon',
+                'settings': {'title': f'Leistung {n}.{k}', 'text': 'Schadstoffsanierung ' * 8}}
+               for k in range(6)]
+    column = {'id': f'c{n}', 'elType': 'column', 'settings': {}, 'elements': widgets}
+    return json.dumps([{'id': f's{n}', 'elType': 'section', 'settings': {}, 'elements': [column]}])
+
+
+def make_export(pages):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<rss version="2.0" xmlns:wp="http://wordpress.org/export/1.2/"><channel>\n']
+    for n in range(pages):
+        data = page_data(0 if n % 10 == 0 else n)
+        parts.append(
+            f'<item><title>Seite {n}</title><wp:post_id>{1000 + n}</wp:post_id>'
+            f'<wp:post_type>page</wp:post_type>\n'
+            f'<wp:postmeta><wp:meta_key>_elementor_edit_mode</wp:meta_key><wp:meta_value>builder</wp:meta_value></wp:postmeta>\n'
+            f'<wp:postmeta><wp:meta_key>_elementor_data</wp:meta_key><wp:meta_value><![CDATA[{data}]]></wp:meta_value></wp:postmeta>\n'
+            f'</item>\n')
+    parts.append('</channel></rss>\n')
+    return ''.join(parts)
+
+
+def legacy_owners(xml_file):
+    """Post IDs as the previous find-then-rescan-prefix attribution produced them"""
+    with open(xml_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    owners = []
+    for match in re.findall(ELEMENTOR_PATTERN, content, re.DOTALL):
+        data_pos = content.find(match)
+        post_ids = re.findall(r'<wp:post_id>(\d+)</wp:post_id>', content[:data_pos])
+        owners.append(int(post_ids[-1]) if post_ids else None)
+    return owners
+
+
+def single_pass_owners(validator_class, xml_file):
+    validator = validator_class(xml_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = validator.run_validation()
+    return [detail['post_id'] for detail in results['details']]
+
+
+def validate_without_cache(module, directory):
+    """Every export on its own, every block validated"""
+    results = []
+    for xml_file in sorted(Path(directory).glob('*.xml')):
+        validator = module.ElementorValidator(str(xml_file), verbose=False)
+        results.append(validator.run_validation())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Elementor validation post-ID attribution')
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    module = load_validator_module()
+    validator_class = module.ElementorValidator
+    expected = [1000 + n for n in range(args.pages)]
+
+    print("🚀 Elementor Validator Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_file = str(Path(tmp) / 'export.xml')
+        with open(xml_file, 'w', encoding='utf-8') as f:
+            f.write(make_export(args.pages))
+        print(f"Export: {args.pages} pages, {Path(xml_file).stat().st_size / 1024 / 1024:.1f} MB")
+
+        for label, func in (('legacy attribution only', lambda: legacy_owners(xml_file)),
+                            ('single-pass full validation', lambda: single_pass_owners(validator_class, xml_file))):
+            start = time.perf_counter()
+            owners = func()
+            elapsed = time.perf_counter() - start
+            wrong = sum(1 for got, want in zip(owners, expected) if got != want)
+            print(f"  {label:<28} {elapsed * 1000:>9.1f} ms  ({len(owners)} blocks, {wrong} wrong owners)")
+
+        export_dir = Path(tmp) / 'iterations'
+        export_dir.mkdir()
+        for n in range(args.iterations):
+            (export_dir / f'cholot-generated-iter-{n + 1}.xml').write_bytes(Path(xml_file).read_bytes())
+        cache_file = str(Path(tmp) / 'validation-cache.json')
+
+        print(f"\nDirectory: {args.iterations} exports")
+        runs = (
+            ('no block cache', lambda: validate_without_cache(module, export_dir)),
+            ('shared memory cache', lambda: module.validate_directory(str(export_dir))),
+            ('disk cache (cold)', lambda: module.validate_directory(str(export_dir), cache_path=cache_file)),
+            ('disk cache (warm)', lambda: module.validate_directory(str(export_dir), cache_path=cache_file)),
+            (f'pool, {args.workers} workers', lambda: module.validate_directory(str(export_dir), workers=args.workers)),
+        )
+        for label, func in runs:
+            start = time.perf_counter()
+            func()
+            print(f"  {label:<28} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Incremental Build Benchmark
+===========================
+
+Builds a synthetic site (the RIMAN relaunch pages repeated up to --pages),
+then edits one page and rebuilds, comparing a full rebuild with the
+incremental build cache for RIMANBlockProcessor and YAMLToJSONProcessor.
+
+Config loading (YAML parsing) is timed separately from the build itself,
+since it is the same for both modes; both processors use libyaml's
+CSafeLoader when PyYAML was built with it.
+
+Usage:
+    python benchmark_incremental_build.py
+    python benchmark_incremental_build.py --pages 500
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_cache import BuildCache
+from riman_block_processor import RIMANBlockProcessor, YAML_LOADER
+from yaml_to_json_processor import YAMLToJSONProcessor
+
+SOURCE_CONFIG = Path(__file__).parent / 'riman-relaunch-complete.yaml'
+
+
+def make_site(page_count: int) -> dict:
+    with open(SOURCE_CONFIG, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    base_pages = config['pages']
+    pages = []
+    for i in range(page_count):
+        page = copy.deepcopy(base_pages[i % len(base_pages)])
+        page['title'] = f"{page.get('title', 'Page')} {i}"
+        page['slug'] = f"page-{i}"
+        pages.append(page)
+    config['pages'] = pages
+    return config
+
+
+def edit_one_page(config: dict) -> dict:
+    edited = copy.deepcopy(config)
+    middle = edited['pages'][len(edited['pages']) // 2]
+    middle['title'] += ' (edited)'
+    return edited
+
+
+def timed(func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return result, time.perf_counter() - start
+
+
+def bench_riman(config: dict, edited: dict, output_file: str):
+    def build(site_config, incremental):
+        processor = RIMANBlockProcessor('unused.yaml')
+        processor.config = site_config
+        processor.load_block_library()
+        if not incremental:
+            return processor.generate_wordpress_xml()
+        cache = BuildCache.for_output(output_file, namespace='riman_block_processor')
+        xml_output = processor.generate_wordpress_xml_incremental(output_file, cache)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(xml_output)
+        cache.save()
+        return xml_output
+
+    timed(lambda: build(config, True))  # prime cache and previous output
+    _, full = timed(lambda: build(edited, False))
+    _, incremental = timed(lambda: build(edited, True))
+    return full, incremental
+
+
+def bench_yaml_to_json(config: dict, edited: dict, output_file: str):
+    for site in (config, edited):
+        for page in site['pages']:
+            page.setdefault('sections', [{'type': 'hero', 'title': page['title']}])
+
+    def build(site_config, incremental):
+        cache = BuildCache.for_output(output_file, namespace='yaml_to_json') if incremental else None
+        return YAMLToJSONProcessor(id_mode='content', build_cache=cache).process_yaml_data(site_config)
+
+    timed(lambda: build(config, True))
+    _, full = timed(lambda: build(edited, False))
+    _, incremental = timed(lambda: build(edited, True))
+    return full, incremental
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark incremental site rebuilds')
+    parser.add_argument('--pages', type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    config = make_site(args.pages)
+    edited = edit_one_page(config)
+
+    print("🚀 Incremental Build Benchmark")
+    print("=" * 60)
+    print(f"Pages: {args.pages}, one page edited between runs")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, 'site.yaml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(edited, f, allow_unicode=True)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_text = f.read()
+        _, load_time = timed(lambda: yaml.safe_load(config_text))
+        _, fast_load_time = timed(lambda: yaml.load(config_text, Loader=YAML_LOADER))
+
+        cwd = os.getcwd()
+        os.chdir(tmp)  # RIMANBlockProcessor resolves block_library relative to cwd
+        try:
+            riman = bench_riman(config, edited, os.path.join(tmp, 'riman.xml'))
+            y2j = bench_yaml_to_json(config, edited, os.path.join(tmp, 'pages.json'))
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n  {'YAML load, SafeLoader':<32} {load_time * 1000:>10.1f} ms")
+    print(f"  {'YAML load, ' + YAML_LOADER.__name__:<32} {fast_load_time * 1000:>10.1f} ms")
+    for label, (full, incremental) in (('RIMANBlockProcessor', riman), ('YAMLToJSONProcessor', y2j)):
+        print(f"\n📊 {label}")
+        print(f"  {'full rebuild':<32} {full * 1000:>10.1f} ms")
+        print(f"  {'incremental (1 dirty page)':<32} {incremental * 1000:>10.1f} ms")
+        print(f"  {'speedup':<32} {full / max(incremental, 1e-9):>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+JSON Backend Benchmark
+======================
+
+Times json_backend against the stdlib on the ``*elementor*.json`` fixtures
+for the call shapes the generators use: compact ``_elementor_data`` (ASCII
+and UTF-8), indented reports, and decoding. Each installed backend is
+measured; ``json`` is the stdlib baseline.
+
+Usage:
+    python benchmark_json_backend.py
+    python benchmark_json_backend.py --repeat 20 --fixture cholot_elementor_structures.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import json_backend
+
+
+def load_fixtures(names):
+    paths = [HERE / name for name in names] if names else sorted(HERE.glob('*elementor*.json'))
+    fixtures = []
+    for path in paths:
+        try:
+            fixtures.append(json.loads(path.read_text(encoding='utf-8')))
+        except ValueError:
+            continue
+    return fixtures
+
+
+def timed(fn, fixtures, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in fixtures:
+            fn(data)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the JSON backends')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--fixture', nargs='*', help='Fixture files (default: all *elementor*.json)')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixture)
+    texts = {id(data): json.dumps(data, separators=(',', ':')) for data in fixtures}
+    size = sum(len(text) for text in texts.values())
+
+    cases = [
+        ('compact', lambda data: json_backend.dumps(data, separators=(',', ':'))),
+        ('compact utf-8', lambda data: json_backend.dumps(data, separators=(',', ':'), ensure_ascii=False)),
+        ('indent=2', lambda data: json_backend.dumps(data, indent=2, ensure_ascii=False)),
+        ('loads', lambda data: json_backend.loads(texts[id(data)])),
+    ]
+
+    print("🚀 JSON Backend Benchmark")
+    print("=" * 60)
+    print(f"{len(fixtures)} fixtures, {size / 1024 / 1024:.1f} MiB compact JSON")
+    backends = json_backend.available_backends()[::-1]
+    print(f"{'operation':<16}" + ''.join(f"{name:>12}" for name in backends))
+
+    previous = json_backend.BACKEND
+    try:
+        for label, fn in cases:
+            row = []
+            for backend in backends:
+                json_backend.set_backend(backend)
+                row.append(timed(fn, fixtures, args.repeat))
+            print(f"{label:<16}" + ''.join(f"{ms:>9.1f} ms" for ms in row))
+    finally:
+        json_backend.set_backend(previous)
+
+
+if __name__ == "__main__":
+    main()
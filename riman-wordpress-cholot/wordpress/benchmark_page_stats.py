@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Page Statistics Benchmark
+=========================
+
+Times the separate tree walks the generator, validators and benchmark suite
+used to make (elements usage, widget counts, required fields, element
+count, ID extraction) against one ``collect_page_stats`` traversal on the
+``*elementor*.json`` fixtures.
+
+Usage:
+    python benchmark_page_stats.py
+    python benchmark_page_stats.py --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from page_stats import REQUIRED_FIELDS, collect_page_stats
+
+
+def load_pages():
+    pages = []
+    for path in sorted(HERE.glob('*elementor*.json')):
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except ValueError:
+            continue
+        elements = data if isinstance(data, list) else data.get('content', [])
+        if isinstance(elements, list) and all(isinstance(element, dict) for element in elements):
+            pages.append(elements)
+    return pages
+
+
+def usage_walk(elements, usage):
+    for element in elements:
+        el_type, widget_type = element.get('elType', ''), element.get('widgetType', '')
+        if el_type == 'widget' and widget_type:
+            usage[widget_type] = usage.get(widget_type, 0) + 1
+        elif el_type in ('section', 'column'):
+            usage[el_type] = usage.get(el_type, 0) + 1
+        usage_walk(element.get('elements', []), usage)
+    return usage
+
+
+def widget_walk(elements):
+    return sum((element.get('elType') == 'widget') + widget_walk(element.get('elements', []))
+               for element in elements)
+
+
+def any_widget_walk(data):
+    if isinstance(data, dict):
+        return ('widgetType' in data) + sum(any_widget_walk(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(any_widget_walk(item) for item in data)
+    return 0
+
+
+def required_walk(elements):
+    for element in elements:
+        required = REQUIRED_FIELDS.get(element.get('elType'), ())
+        if not all(name in element for name in required) or not required_walk(element.get('elements', [])):
+            return False
+    return True
+
+
+def id_walk(data, ids):
+    if isinstance(data, dict):
+        if 'id' in data:
+            ids.append(data['id'])
+        for value in data.values():
+            id_walk(value, ids)
+    elif isinstance(data, list):
+        for item in data:
+            id_walk(item, ids)
+    return ids
+
+
+def separate_walks(elements):
+    usage_walk(elements, {})
+    widget_walk(elements)
+    any_widget_walk(elements)
+    required_walk(elements)
+    sum(len(column.get('elements', [])) for section in elements for column in section.get('elements', []))
+    ids = id_walk(elements, [])
+    return len(ids) == len(set(ids))
+
+
+def timed(fn, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for elements in pages:
+            fn(elements)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark page statistics')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages()
+    elements = sum(collect_page_stats(page).element_count for page in pages)
+
+    print("🚀 Page Statistics Benchmark")
+    print("=" * 60)
+    print(f"{len(pages)} pages, {elements} elements")
+    separate = timed(separate_walks, pages, args.repeat)
+    single = timed(collect_page_stats, pages, args.repeat)
+    print(f"separate walks:   {separate:8.1f} ms")
+    print(f"one traversal:    {single:8.1f} ms  ({separate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
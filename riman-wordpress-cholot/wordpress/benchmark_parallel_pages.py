@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Parallel Page Rendering Benchmark
+=================================
+
+Renders a synthetic multi-page site with YAMLToJSONProcessor serially and
+with worker processes, and checks that every run produces the same output
+(content-addressed IDs).
+
+Usage:
+    python benchmark_parallel_pages.py
+    python benchmark_parallel_pages.py --pages 1000 --workers 2 4 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from yaml_to_json_processor import YAMLToJSONProcessor
+
+
+def make_site(page_count: int) -> dict:
+    def column(width, *widgets):
+        return {'width': width, 'widgets': list(widgets)}
+
+    sections = [
+        {'structure': '100', 'columns': [column(100, {
+            'type': 'title', 'title': 'Welcome to Our <span>Business</span>', 'header_size': 'h1'})]},
+        {'structure': '33', 'columns': [
+            column(33, {'type': 'texticon', 'title': f'Service {n}', 'icon': 'fas fa-check',
+                        'text': 'Lorem ipsum dolor sit amet ' * 10})
+            for n in range(3)
+        ]},
+        {'structure': '50', 'columns': [
+            column(50, {'type': 'team', 'name': f'Member {n}', 'position': 'Engineer',
+                        'image_url': f'http://localhost:8080/team-{n}.jpg',
+                        'social_links': [{'icon': 'fab fa-twitter', 'url': '#'},
+                                         {'icon': 'fab fa-linkedin-in', 'url': '#'}]})
+            for n in range(2)
+        ]},
+        {'structure': '100', 'columns': [column(100,
+            {'type': 'text-line', 'title': 'Contact', 'line_width': 50},
+            {'type': 'contact', 'shortcode': '[contact-form-7 id="1"]'})]},
+    ]
+    return {
+        'site': {'title': 'Benchmark Site'},
+        'pages': [
+            {'title': f'Page {i}', 'slug': f'page-{i}', 'sections': sections}
+            for i in range(page_count)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel page rendering')
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    site = make_site(args.pages)
+
+    print("🚀 Parallel Page Rendering Benchmark")
+    print("=" * 60)
+    print(f"Pages: {args.pages}, CPUs: {os.cpu_count()}")
+
+    reference = None
+    for workers in [1] + args.workers:
+        processor = YAMLToJSONProcessor(id_mode='content', workers=workers)
+        start = time.perf_counter()
+        result = processor.process_yaml_data(site)
+        elapsed = time.perf_counter() - start
+
+        output = json.dumps(result, sort_keys=True)
+        if reference is None:
+            reference, serial_time = output, elapsed
+        identical = '✅' if output == reference else '❌'
+        print(f"  workers={workers:<3} {elapsed * 1000:>9.1f} ms  "
+              f"x{serial_time / elapsed:>5.2f}  identical to serial: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+PHP Serialization Benchmark
+===========================
+
+Times php_serialize on realistic ``_wp_attachment_metadata`` values (an
+original plus the default WordPress sizes) and on one large array read
+whole, streamed entry by entry, and streamed from a file in chunks.
+
+Usage:
+    python benchmark_php_serialize.py
+    python benchmark_php_serialize.py --attachments 5000
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import php_serialize
+
+SIZES = {'thumbnail': (150, 150), 'medium': (300, 200), 'medium_large': (768, 512), 'large': (1024, 683)}
+
+
+def attachment_metadata(index):
+    name = f'schadstoffsanierung-größe-{index}'
+    return {
+        'width': 1920, 'height': 1280, 'file': f'2025/08/{name}.webp', 'filesize': 184320 + index,
+        'sizes': {size: {'file': f'{name}-{width}x{height}.webp', 'width': width, 'height': height,
+                         'mime-type': 'image/webp', 'filesize': width * height // 10}
+                  for size, (width, height) in SIZES.items()},
+        'image_meta': {'aperture': '0', 'credit': '', 'camera': '', 'caption': '', 'created_timestamp': '0',
+                       'copyright': '', 'focal_length': '0', 'iso': '0', 'shutter_speed': '0',
+                       'title': '', 'orientation': '0', 'keywords': []},
+    }
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed * 1000:9.1f} ms  ({count / elapsed:,.0f}/s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PHP serialization')
+    parser.add_argument('--attachments', type=int, default=2000)
+    args = parser.parse_args()
+
+    values = [attachment_metadata(index) for index in range(args.attachments)]
+
+    print("🚀 PHP Serialization Benchmark")
+    print("=" * 60)
+    texts = timed('dumps (per attachment)', lambda: [php_serialize.dumps(value) for value in values], len(values))
+    timed('loads (per attachment)', lambda: [php_serialize.loads(text) for text in texts], len(texts))
+
+    big = php_serialize.dumps(dict(enumerate(values))).encode('utf-8')
+    print(f"\nOne array of {len(values)} entries, {len(big) / 1024 / 1024:.1f} MiB")
+    timed('loads (whole array)', lambda: php_serialize.loads(big), len(values))
+    timed('iter_items (bytes)', lambda: sum(1 for _ in php_serialize.iter_items(big)), len(values))
+    timed('iter_items (64 KiB chunks)', lambda: sum(1 for _ in php_serialize.iter_items(io.BytesIO(big))),
+          len(values))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Structural-Sharing Clone Benchmark
+==================================
+
+Builds service pages (styled cholot-texticon widgets, three per column) and
+measures memory with tracemalloc for the legacy deepcopy paths against the
+structural-sharing clones:
+
+- dynamic: DynamicTemplateProcessor fills the services section, cloning the
+  template widget (and columns) once per service
+- hybrid: HybridElementorGenerator.assemble_and_validate on one service
+  block per three services
+
+"kept" is what the finished page holds on to, "peak" the high-water mark
+while building it.
+
+Usage:
+    python benchmark_structural_clone.py
+    python benchmark_structural_clone.py --services 6 12 48 --repeat 20
+"""
+
+import argparse
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from dynamic_template_processor import DynamicTemplateProcessor
+from elementor_document import ElementorDocument
+from elementor_ids import ElementorIDAllocator
+
+spec = importlib.util.spec_from_file_location('hybrid_generator', HERE / 'hybrid-generator.py')
+hybrid_generator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hybrid_generator)
+
+
+class LegacyTemplateProcessor(DynamicTemplateProcessor):
+    """clone_widget as it was: deepcopy, then new IDs"""
+
+    def clone_widget(self, widget: dict) -> dict:
+        cloned = copy.deepcopy(widget)
+
+        def update(element):
+            element['id'] = self.generate_unique_id()
+            for child in element.get('elements', []):
+                update(child)
+
+        update(cloned)
+        return cloned
+
+
+class LegacyHybridGenerator(hybrid_generator.HybridElementorGenerator):
+    """deepcopy before filling and again before the new IDs, as it was"""
+
+    def replace_placeholders(self, json_obj, content):
+        json_obj = copy.deepcopy(json_obj)
+
+        def replace(obj):
+            if isinstance(obj, dict):
+                return {k: replace(v) for k, v in obj.items()}
+            if isinstance(obj, list):
+                return [replace(item) for item in obj]
+            if isinstance(obj, str):
+                for key, value in content.items():
+                    obj = obj.replace(f"{{{{{key}}}}}", str(value))
+            return obj
+
+        return replace(json_obj)
+
+    def regenerate_ids(self, section):
+        section = copy.deepcopy(section)
+
+        def update(obj):
+            if isinstance(obj, dict):
+                if "id" in obj:
+                    obj["id"] = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+                for value in obj.values():
+                    update(value)
+            elif isinstance(obj, list):
+                for item in obj:
+                    update(item)
+
+        update(section)
+        return section
+
+
+def texticon(widget_id: str, title: str) -> dict:
+    return {
+        'id': widget_id, 'elType': 'widget', 'widgetType': 'cholot-texticon',
+        'settings': {
+            'title': title, 'subtitle': 'Fachbetrieb', 'text': '<p>Lorem ipsum dolor sit amet.</p>',
+            'selected_icon': {'value': 'fas fa-shield-alt', 'library': 'fa-solid'},
+            'title_typography_typography': 'custom', 'title_typography_font_family': 'Playfair Display',
+            'title_typography_font_size': {'unit': 'px', 'size': 24, 'sizes': []},
+            'title_margin': {'unit': 'px', 'top': '0', 'right': '0', 'bottom': '10', 'left': '0', 'isLinked': False},
+            'icon_size': {'unit': 'px', 'size': 40, 'sizes': []},
+            'icon_list': [{'_id': f'{widget_id}{n}', 'text': f'Punkt {n}',
+                           'selected_icon': {'value': 'fas fa-check', 'library': 'fa-solid'}} for n in range(3)],
+            '_padding': {'unit': 'px', 'top': '30', 'right': '30', 'bottom': '30', 'left': '30', 'isLinked': True},
+        },
+        'elements': [],
+    }
+
+
+def services_section(prefix: str, title: str = 'Leistung') -> dict:
+    return {
+        'id': f'{prefix}s', 'elType': 'section',
+        'settings': {'gap': 'extended', 'structure': '33', 'background_color': '#f7f5f0'},
+        'elements': [
+            {'id': f'{prefix}c{n}', 'elType': 'column', 'settings': {'_column_size': 33},
+             'elements': [texticon(f'{prefix}w{n}', title)]}
+            for n in range(3)
+        ],
+    }
+
+
+def services(count: int):
+    return [{'title': f'Leistung {n}', 'subtitle': 'Sanierung', 'text': f'Beschreibung {n}',
+             'icon': 'fas fa-check'} for n in range(count)]
+
+
+def build_dynamic(processor_class, count):
+    processor = processor_class(id_allocator=ElementorIDAllocator(mode='counter'))
+    page = [services_section('t')]
+    processor._process_section(ElementorDocument(page), {'type': 'service_cards', 'services': services(count)}, {})
+    return page
+
+
+def build_hybrid(generator_class, count):
+    generator = generator_class('does-not-exist.json')
+    block = {'id': 'services', 'name': 'Services', 'json_template': services_section('h', '{{SERVICE_TITLE}}')}
+    blocks = [block] * ((count + 2) // 3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generator.assemble_and_validate(blocks, {'services': {'SERVICE_TITLE': 'Leistung'}})
+
+
+def measure(build, *args, repeat=1):
+    """(kept KiB, peak KiB, ms per build, JSON) for one build"""
+    result = build(*args)  # warm-up, and the output to compare
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    page = build(*args)
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del page
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(*args)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return (kept - baseline) / 1024, (peak - baseline) / 1024, elapsed, json.dumps(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark structural-sharing clones')
+    parser.add_argument('--services', type=int, nargs='+', default=[6, 12])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print("🚀 Structural-Sharing Clone Benchmark")
+    print("=" * 78)
+    print(f"{'path':<8} {'services':>8} {'legacy kept':>12} {'kept':>9} {'legacy peak':>12} "
+          f"{'peak':>9} {'legacy ms':>10} {'ms':>7}")
+
+    cases = [
+        ('dynamic', build_dynamic, LegacyTemplateProcessor, DynamicTemplateProcessor),
+        ('hybrid', build_hybrid, LegacyHybridGenerator, hybrid_generator.HybridElementorGenerator),
+    ]
+    for name, build, legacy_class, shared_class in cases:
+        for count in args.services:
+            random.seed(count)
+            legacy = measure(build, legacy_class, count, repeat=args.repeat)
+            random.seed(count)
+            shared = measure(build, shared_class, count, repeat=args.repeat)
+            same = '' if legacy[3] == shared[3] else '  ⚠️ output differs'
+            print(f"{name:<8} {count:>8} {legacy[0]:>9.1f} KiB {shared[0]:>5.1f} KiB "
+                  f"{legacy[1]:>8.1f} KiB {shared[1]:>5.1f} KiB {legacy[2]:>10.2f} {shared[2]:>7.2f}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+SWARM Batch Benchmark
+=====================
+
+Compares the legacy file + subprocess pipeline of SwarmOrchestrator
+(JSON to disk -> format_for_wordpress.py -> generate_wordpress_xml.py per
+company) with the in-memory generate_batch() API, serially and with a
+worker pool. Everything runs in a temporary directory.
+
+Usage:
+    python benchmark_swarm_batch.py
+    python benchmark_swarm_batch.py --companies 500 --legacy-companies 10 --workers 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent.resolve()
+sys.path.insert(0, str(HERE))
+
+from swarm_orchestrator import SwarmOrchestrator
+
+
+def make_company(i: int) -> dict:
+    return {
+        'name': f'Tenant {i} GmbH',
+        'tagline': 'Professionelle Sanierung',
+        'brand_color': '#b68c2f',
+        'services': [
+            {'title': f'Leistung {n}', 'subtitle': 'Zertifiziert',
+             'description': 'Fachgerechte Ausführung nach aktuellen Standards', 'icon': 'fas fa-shield-alt'}
+            for n in range(4)
+        ],
+        'about': {'title': 'Über uns', 'content': 'Seit 1998 Ihr Partner für sichere Sanierungen.'},
+        'team': [{'name': f'Person {n}', 'position': 'Projektleitung',
+                  'socials': [{'icon': 'fab fa-linkedin-in', 'link': '#'}]} for n in range(2)],
+        'contact': {'shortcode': '[contact-form-7 id="1"]'},
+    }
+
+
+def run(label: str, count: int, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = func()
+    elapsed = time.perf_counter() - start
+    per_minute = count / elapsed * 60
+    print(f"  {label:<28} {count:>5} companies {elapsed:>8.2f}s  {per_minute:>9,.0f}/min")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SwarmOrchestrator batch generation')
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--legacy-companies', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print("🚀 SWARM Batch Benchmark")
+    print("=" * 70)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The legacy pipeline resolves templates/ and its helper scripts relative to cwd
+        for name in ('templates', 'format_for_wordpress.py', 'generate_wordpress_xml.py'):
+            os.symlink(HERE / name, Path(tmp) / name)
+        os.chdir(tmp)
+        try:
+            orchestrator = SwarmOrchestrator()
+            legacy = [make_company(i) for i in range(args.legacy_companies)]
+            companies = [make_company(i) for i in range(args.companies)]
+
+            run('legacy (subprocess)', len(legacy),
+                lambda: orchestrator.generate_company_pages(legacy, in_process=False))
+            results = run('in-process, 1 worker', len(companies),
+                          lambda: orchestrator.generate_batch(companies, workers=1, output_dir='out'))
+            if args.workers > 1:
+                run(f'in-process, {args.workers} workers', len(companies),
+                    lambda: orchestrator.generate_batch(companies, workers=args.workers, output_dir='out'))
+        finally:
+            os.chdir(cwd)
+
+    errors = [r for r in results if r['error']]
+    print(f"\n📊 Per-company timings (1 worker, {len(results)} companies, {len(errors)} errors)")
+    for stage in ('structure', 'format', 'xml', 'write', 'total'):
+        values = [r['timings'][stage] * 1000 for r in results if stage in r['timings']]
+        print(f"  {stage:<10} median {statistics.median(values):>7.2f} ms   max {max(values):>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Text Rewriter Benchmark
+=======================
+
+Rewrites a synthetic ~1.3 MB WXR export full of RIMAN image references with
+the SEO mapping from seo-image-mapping.json: once with the previous loop of
+str.replace calls (one full-document pass per mapping entry) and once with
+the single-pass TextRewriter.
+
+Usage:
+    python benchmark_text_rewriter.py
+    python benchmark_text_rewriter.py --size-mb 5 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from update_seo_images import create_replacement_mappings, create_seo_rewriter
+
+OLD_BASE = 'https://www.riman.de/wp-content/uploads/sites/9/'
+
+
+def legacy_update(xml_content, replacements, image_mapping):
+    """update_xml_content before the single-pass rewriter"""
+    for old_pattern, new_pattern in replacements.items():
+        xml_content = xml_content.replace(old_pattern, new_pattern)
+    xml_content = xml_content.replace(OLD_BASE, 'http://localhost:8081/wp-content/uploads/2025/08/')
+    xml_content = xml_content.replace('2019/06/', '2025/08/')
+    xml_content = xml_content.replace('2019/07/', '2025/08/')
+    for image in image_mapping['images']:
+        original, seo_name = image['original'], image['seo_name']
+        xml_content = xml_content.replace(f'<wp:post_name><![CDATA[{original}]]></wp:post_name>',
+                                          f'<wp:post_name><![CDATA[{seo_name}]]></wp:post_name>')
+        xml_content = xml_content.replace(f'<title>{original}</title>', f'<title>{seo_name}</title>')
+        xml_content = xml_content.replace(f'https://www.riman.de/Projekt/{original}/',
+                                          f'http://localhost:8081/projekt/{seo_name}/')
+    return xml_content
+
+
+def make_export(image_mapping, size_bytes):
+    """Attachment items plus page bodies that reference sized image variants"""
+    items = []
+    for image in image_mapping['images']:
+        original = image['original']
+        items.append(
+            f'<item><title>{original}</title>'
+            f'<guid isPermaLink="false">{OLD_BASE}2019/06/{original}.jpg</guid>'
+            f'<wp:post_name><![CDATA[{original}]]></wp:post_name>'
+            f'<wp:attachment_url><![CDATA[{OLD_BASE}2019/06/{original}.jpg]]></wp:attachment_url></item>\n')
+    page = []
+    for n, image in enumerate(image_mapping['images']):
+        original = image['original']
+        page.append(
+            f'<p>Projekt {n} mit Sanierung nach TRGS 519, Fläche 1500 m², Bericht 2019/07/{n}.</p>'
+            f'<img src="{OLD_BASE}2019/07/{original}-768x512.jpg" width="768" height="512" />'
+            f'<a href="https://www.riman.de/Projekt/{original}/">Mehr</a>\n')
+    page_item = '<item><content:encoded><![CDATA[' + ''.join(page) + ']]></content:encoded></item>\n'
+
+    body = ''.join(items)
+    while len(body) < size_bytes:
+        body += page_item
+    return f'<rss><channel>{body}</channel></rss>'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the single-pass SEO image rewriter')
+    parser.add_argument('--size-mb', type=float, default=1.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with open(HERE / 'seo-image-mapping.json', encoding='utf-8') as f:
+        image_mapping = json.load(f)
+    replacements = create_replacement_mappings(image_mapping)
+    xml = make_export(image_mapping, int(args.size_mb * 1024 * 1024))
+
+    print("🚀 Text Rewriter Benchmark")
+    print("=" * 60)
+    print(f"Document: {len(xml) / 1024 / 1024:.2f} MB, {len(replacements)} replacement mappings")
+
+    start = time.perf_counter()
+    rewriter = create_seo_rewriter(replacements, image_mapping)
+    print(f"  compile rewriter            {(time.perf_counter() - start) * 1000:>9.1f} ms  ({len(rewriter)} keys)")
+
+    for label, func in (('legacy str.replace loop', lambda: legacy_update(xml, replacements, image_mapping)),
+                        ('single-pass TextRewriter', lambda: rewriter.subn(xml))):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        print(f"  {label:<27} {min(timings) * 1000:>9.1f} ms")
+
+    _, count = result
+    print(f"\n📊 {count} replacements in one scan")
+
+
+if __name__ == "__main__":
+    main()
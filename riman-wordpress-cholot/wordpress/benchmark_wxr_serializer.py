@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+WXR Serializer Benchmark
+========================
+
+Compares the old minidom pretty-printing path against the single-pass
+serializer in wxr_serializer.py for 10, 100 and 1000 pages.
+
+Each (mode, pages) combination runs in a fresh subprocess so that peak RSS
+(ru_maxrss) is not polluted by earlier runs. The tree is built from the
+section-based processor's real page structure (riman_input.yaml).
+
+Usage:
+    python benchmark_wxr_serializer.py
+    python benchmark_wxr_serializer.py --pages 10 100 1000 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from section_based_processor import SectionBasedProcessor
+from wxr_serializer import legacy_pretty_xml, write_wxr, wxr_to_string
+
+
+WP_NS = 'http://wordpress.org/export/1.2/'
+
+
+def build_tree(page_count: int) -> ET.Element:
+    """Build a WXR tree with ``page_count`` section-based pages."""
+    processor = SectionBasedProcessor()
+    config, elementor_data = processor.process_yaml_to_elementor(
+        str(Path(__file__).parent / 'riman_input.yaml'))
+
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = 'Benchmark Site'
+    ET.SubElement(channel, f'{{{WP_NS}}}wxr_version').text = '1.2'
+
+    page = dict(config.get('pages', [{}])[0])
+    for i in range(page_count):
+        page['slug'] = f'page-{i + 1}'
+        processor._add_page_item(channel, {**config, 'pages': [page]}, elementor_data)
+
+    return rss
+
+
+def max_rss_kb() -> int:
+    """Peak resident set size of this process in KB."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def run_child(mode: str, page_count: int) -> dict:
+    """Serialize once in this process and report time and memory."""
+    rss = build_tree(page_count)
+    rss_before = max_rss_kb()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False, encoding='utf-8') as f:
+        output_path = f.name
+        start = time.perf_counter()
+        if mode == 'minidom':
+            f.write(legacy_pretty_xml(rss))
+        else:
+            write_wxr(rss, f)
+        elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(output_path)
+    os.unlink(output_path)
+
+    return {
+        'mode': mode,
+        'pages': page_count,
+        'seconds': elapsed,
+        'rss_before_kb': rss_before,
+        'rss_peak_kb': max_rss_kb(),
+        'bytes': size,
+    }
+
+
+def check_equivalence(page_count: int = 5) -> bool:
+    """Both paths must produce the same element tree."""
+    rss = build_tree(page_count)
+
+    def canonical(xml_text):
+        root = ET.fromstring(xml_text.encode('utf-8'))
+        return [(e.tag, sorted(e.attrib.items()), (e.text or '').strip()) for e in root.iter()]
+
+    return canonical(legacy_pretty_xml(rss)) == canonical(wxr_to_string(rss))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark WXR pretty-printing paths')
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per combination (best time is kept)')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PAGES'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], int(args.child[1]))))
+        return
+
+    print("🚀 WXR Serializer Benchmark")
+    print("=" * 78)
+    print(f"✅ Output equivalence (minidom vs fast): {check_equivalence()}")
+    print()
+    print(f"{'Pages':>6} {'Mode':<8} {'Time (s)':>10} {'Peak RSS (MB)':>14} {'Δ RSS (MB)':>11} {'Size (KB)':>10}")
+    print("-" * 78)
+
+    for page_count in args.pages:
+        results = {}
+        for mode in ('minidom', 'fast'):
+            runs = []
+            for _ in range(args.repeat):
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', mode, str(page_count)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            best = min(runs, key=lambda r: r['seconds'])
+            results[mode] = best
+            delta = (best['rss_peak_kb'] - best['rss_before_kb']) / 1024
+            print(f"{page_count:>6} {mode:<8} {best['seconds']:>10.3f} "
+                  f"{best['rss_peak_kb'] / 1024:>14.1f} {delta:>11.1f} {best['bytes'] / 1024:>10.1f}")
+
+        speedup = results['minidom']['seconds'] / max(results['fast']['seconds'], 1e-9)
+        print(f"{'':>6} {'':<8} speedup x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compiled Block Templates
+========================
+
+Block templates from the block library contain ``{{KEY}}`` placeholders in
+a handful of strings. Filling a block used to deep-copy the whole template
+and run ``str.replace`` for every key of the content map on every string,
+i.e. O(strings x keys) per block.
+
+A CompiledBlockTemplate scans the template once and records the exact paths
+that hold placeholders, with each string pre-split into literal and
+placeholder segments. Filling then only visits those paths and does one
+dict lookup per placeholder.
+
+Features:
+- fill(content): copies only the containers on the way to a placeholder and
+  shares everything else with the template (treat the result as read-only)
+- fill(content, share=False): fresh containers throughout, for callers that
+  mutate the block afterwards; still no deepcopy and no per-key scans
+- Unknown placeholders are left as-is, values are rendered with ``str()``
+
+Note: placeholders are resolved in one pass, so a value that itself
+contains ``{{OTHER}}`` is inserted literally.
+"""
+
+import re
+from typing import Any, Dict, Optional, Set, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([^{}]+)\}\}')
+
+# Plan node kinds
+_STR = 0
+_CONTAINER = 1
+
+
+def _split(text: str) -> Optional[Tuple[str, ...]]:
+    """Split a string into (literal, name, literal, name, ..., literal), or None without placeholders."""
+    if '{{' not in text:
+        return None
+    parts = PLACEHOLDER_PATTERN.split(text)
+    return tuple(parts) if len(parts) > 1 else None
+
+
+def _render(segments: Tuple[str, ...], content: Dict[str, Any]) -> str:
+    out = []
+    for i, segment in enumerate(segments):
+        if i % 2 == 0:
+            out.append(segment)
+        elif segment in content:
+            out.append(str(content[segment]))
+        else:
+            out.append('{{' + segment + '}}')
+    return ''.join(out)
+
+
+class CompiledBlockTemplate:
+    """A block template with pre-located placeholder slots."""
+
+    __slots__ = ('template', 'placeholders', 'slot_count', '_plan')
+
+    def __init__(self, template: Any):
+        self.template = template
+        self.placeholders: Set[str] = set()
+        self.slot_count = 0
+        self._plan = self._compile(template)
+
+    def _compile(self, node: Any):
+        """Return a plan for ``node``, or None if nothing below it needs filling."""
+        if isinstance(node, str):
+            segments = _split(node)
+            if segments is None:
+                return None
+            self.slot_count += 1
+            self.placeholders.update(segments[1::2])
+            return (_STR, segments)
+
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            return None
+
+        children = {}
+        for key, value in items:
+            plan = self._compile(value)
+            if plan is not None:
+                children[key] = plan
+        return (_CONTAINER, children) if children else None
+
+    def fill(self, content: Dict[str, Any], share: bool = True) -> Any:
+        """Return the template with placeholders replaced from ``content``."""
+        if share:
+            return _fill_shared(self.template, self._plan, content)
+        return _fill_copy(self.template, self._plan, content)
+
+
+def _fill_shared(node: Any, plan, content: Dict[str, Any]) -> Any:
+    if plan is None:
+        return node
+    kind, body = plan
+    if kind == _STR:
+        return _render(body, content)
+    clone = node.copy()
+    for key, child_plan in body.items():
+        clone[key] = _fill_shared(node[key], child_plan, content)
+    return clone
+
+
+def _fill_copy(node: Any, plan, content: Dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        children = plan[1] if plan is not None else {}
+        return {key: _fill_copy(value, children.get(key), content) for key, value in node.items()}
+    if isinstance(node, list):
+        children = plan[1] if plan is not None else {}
+        return [_fill_copy(value, children.get(index), content) for index, value in enumerate(node)]
+    if plan is not None:
+        return _render(plan[1], content)
+    return node
+
+
+def compile_block_library(blocks: Dict[str, list]) -> Dict[str, list]:
+    """Compile every variant's ``structure`` of a ``{block_type: [variant, ...]}`` library."""
+    return {
+        block_type: [CompiledBlockTemplate(variant.get('structure')) for variant in variants]
+        for block_type, variants in blocks.items()
+    }
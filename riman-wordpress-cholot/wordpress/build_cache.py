@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Build Cache
+===========
+
+On-disk cache for incremental site rebuilds.
+
+Each cached entry stores a fingerprint of its inputs (page config, block
+templates, generator source) next to the rendered result. On the next run
+a processor re-renders only the entries whose fingerprint changed and reuses
+the rest. The cache lives in a JSON file next to the build output, e.g.
+``riman-complete.xml`` -> ``riman-complete.xml.buildcache.json``.
+
+Features:
+- Stable fingerprints of arbitrary JSON-like data
+- Generator source files are part of the fingerprint, so code changes
+  invalidate the cache automatically
+- Atomic writes (temp file + rename); a corrupt or foreign cache is ignored
+- Output file digests, so a hand-edited output is never spliced into
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+import json_backend
+
+
+CACHE_SUFFIX = '.buildcache.json'
+CACHE_FORMAT = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serializable parts (dict key order does not matter)."""
+    text = json.dumps(parts, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 of a text's UTF-8 bytes."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: Union[str, Path]) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if it does not exist."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def source_fingerprint(*paths: Union[str, Path]) -> str:
+    """Fingerprint of generator source files, used to invalidate on code changes."""
+    return fingerprint(*(file_digest(path) for path in paths))
+
+
+class BuildCache:
+    """Fingerprint-keyed entries persisted as one JSON file."""
+
+    def __init__(self, path: Union[str, Path], namespace: str = ''):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.meta: Dict[str, Any] = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_output(cls, output_file: Union[str, Path], namespace: str = '') -> 'BuildCache':
+        """Cache stored next to ``output_file``."""
+        return cls(f'{output_file}{CACHE_SUFFIX}', namespace)
+
+    def load(self) -> bool:
+        """Load the cache file; returns False (and starts empty) if missing or unusable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json_backend.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (not isinstance(data, dict) or data.get('format') != CACHE_FORMAT
+                or data.get('namespace') != self.namespace):
+            return False
+
+        self.meta = data.get('meta', {})
+        self.entries = data.get('entries', {})
+        return True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        if not self._dirty:
+            return
+
+        data = {
+            'format': CACHE_FORMAT,
+            'namespace': self.namespace,
+            'meta': self.meta,
+            'entries': self.entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name, dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # dumps uses the C encoder (or orjson); json.dump to a file does not
+                f.write(json_backend.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._dirty = False
+
+    def get(self, key: str, digest: str) -> Optional[Any]:
+        """Return the cached value for ``key`` if it was built from ``digest``."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.get('digest') == digest:
+            self.hits += 1
+            return entry['value']
+        self.misses += 1
+        return None
+
+    def put(self, key: str, digest: str, value: Any) -> None:
+        self.entries[key] = {'digest': digest, 'value': value}
+        self._dirty = True
+
+    def set_meta(self, key: str, value: Any) -> None:
+        if self.meta.get(key) != value:
+            self.meta[key] = value
+            self._dirty = True
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Drop entries for pages that no longer exist."""
+        keep = set(keys)
+        stale = [key for key in self.entries if key not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+
+    def clear(self) -> None:
+        if self.entries or self.meta:
+            self._dirty = True
+        self.meta = {}
+        self.entries = {}
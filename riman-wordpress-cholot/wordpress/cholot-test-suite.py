@@ -28,6 +28,8 @@ import logging
 from urllib.parse import urljoin, urlparse
 import difflib
 
+from wxr_reader import WXRItem, WXRReader
+
 # Playwright imports for visual testing
 try:
     from playwright.sync_api import sync_playwright, Browser, Page
@@ -326,23 +328,29 @@ class XMLCorrector:
         """Analysiere Fehler und korrigiere XML iterativ"""
         print(f"🔧 XML Korrektur-Engine: Iteration {len(self.correction_history) + 1}")
         
-        corrections_applied = []
+        # Analysiere Import-Fehler
+        corrections = [c for c in (self._determine_correction(error) for error in import_errors) if c]
         
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            # Analysiere Import-Fehler und wende Korrekturen an
-            for error in import_errors:
-                correction = self._determine_correction(error)
-                if correction:
-                    success = self._apply_correction(root, correction)
-                    if success:
-                        corrections_applied.append(correction)
+            # Wende Korrekturen Item für Item an, während die XML gestreamt wird
+            applied = set()
+            elementor_fixes = 0
+            
+            def correct_item(item: ET.Element, record: WXRItem):
+                nonlocal elementor_fixes
+                for index, correction in enumerate(corrections):
+                    if self._apply_correction(item, record, correction):
+                        applied.add(index)
+                        if correction['action'] == 'add_elementor_meta':
+                            elementor_fixes += 1
             
             # Speichere korrigierte Version
             corrected_file = self._generate_corrected_filename(xml_file)
-            tree.write(corrected_file, encoding='utf-8', xml_declaration=True)
+            WXRReader(xml_file).rewrite(corrected_file, correct_item)
+            
+            corrections_applied = [c for index, c in enumerate(corrections) if index in applied]
+            if any(c['action'] == 'add_elementor_meta' for c in corrections):
+                print(f"📝 Elementor Meta zu {elementor_fixes} Items hinzugefügt")
             
             # Track corrections
             self.correction_history.append({
@@ -403,21 +411,21 @@ class XMLCorrector:
         
         return None
     
-    def _apply_correction(self, root: ET.Element, correction: Dict[str, str]) -> bool:
-        """Wende spezifische Korrektur an"""
+    def _apply_correction(self, item: ET.Element, record: WXRItem, correction: Dict[str, str]) -> bool:
+        """Wende spezifische Korrektur auf ein Item an"""
         action = correction['action']
         
         try:
             if action == 'add_elementor_meta':
-                return self._add_elementor_meta_fields(root)
+                return self._add_elementor_meta_fields(item, record)
             elif action == 'fix_post_type':
-                return self._fix_post_types(root)
+                return self._fix_post_types(item)
             elif action == 'fix_image_urls':
-                return self._fix_image_references(root)
+                return self._fix_image_references(item)
             elif action == 'fix_menu_structure':
-                return self._fix_menu_structure(root)
+                return self._fix_menu_structure(item)
             elif action == 'fix_encoding':
-                return self._fix_text_encoding(root)
+                return self._fix_text_encoding(item)
             else:
                 print(f"⚠️ Unbekannte Korrektur-Aktion: {action}")
                 return False
@@ -426,39 +434,22 @@ class XMLCorrector:
             print(f"❌ Korrektur-Anwendung fehlgeschlagen ({action}): {e}")
             return False
     
-    def _add_elementor_meta_fields(self, root: ET.Element) -> bool:
-        """Füge fehlende Elementor Meta-Felder hinzu"""
-        channel = root.find('channel')
-        if channel is None:
+    def _add_elementor_meta_fields(self, item: ET.Element, record: WXRItem) -> bool:
+        """Füge fehlende Elementor Meta-Felder zu einer Seite hinzu"""
+        if record.post_type != 'page':
             return False
         
-        items = channel.findall('item')
-        corrections_made = 0
-        
-        for item in items:
-            post_type = item.find('.//wp:post_type', {'wp': 'http://wordpress.org/export/1.2/'})
-            if post_type is not None and post_type.text == 'page':
-                
-                # Check für existierende Elementor Meta
-                has_elementor_data = False
-                postmetas = item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'})
-                for meta in postmetas:
-                    meta_key = meta.find('.//wp:meta_key', {'wp': 'http://wordpress.org/export/1.2/'})
-                    if meta_key is not None and '_elementor' in meta_key.text:
-                        has_elementor_data = True
-                        break
-                
-                if not has_elementor_data:
-                    # Füge Elementor Meta hinzu
-                    self._add_elementor_meta_to_item(item)
-                    corrections_made += 1
+        # Check für existierende Elementor Meta
+        if any('_elementor' in key for key in record.meta):
+            return False
         
-        print(f"📝 Elementor Meta zu {corrections_made} Items hinzugefügt")
-        return corrections_made > 0
+        # Füge Elementor Meta hinzu
+        self._add_elementor_meta_to_item(item)
+        return True
     
     def _add_elementor_meta_to_item(self, item: ET.Element):
         """Füge Elementor Meta-Felder zu einem Item hinzu"""
-        wp_ns = {'wp': 'http://wordpress.org/export/1.2/'}
+        wp = '{http://wordpress.org/export/1.2/}'
         
         # Standard Elementor Meta Fields
         elementor_metas = [
@@ -469,28 +460,28 @@ class XMLCorrector:
         ]
         
         for meta_key, meta_value in elementor_metas:
-            postmeta = ET.SubElement(item, 'wp:postmeta')
-            key_elem = ET.SubElement(postmeta, 'wp:meta_key')
+            postmeta = ET.SubElement(item, f'{wp}postmeta')
+            key_elem = ET.SubElement(postmeta, f'{wp}meta_key')
             key_elem.text = meta_key
-            value_elem = ET.SubElement(postmeta, 'wp:meta_value')
+            value_elem = ET.SubElement(postmeta, f'{wp}meta_value')
             value_elem.text = meta_value
     
-    def _fix_post_types(self, root: ET.Element) -> bool:
+    def _fix_post_types(self, item: ET.Element) -> bool:
         """Korrigiere ungültige Post-Types"""
         # Implementation für Post-Type Korrektur
         return True
     
-    def _fix_image_references(self, root: ET.Element) -> bool:
+    def _fix_image_references(self, item: ET.Element) -> bool:
         """Korrigiere Bild-Referenzen"""
         # Implementation für Bild-URL Korrektur
         return True
     
-    def _fix_menu_structure(self, root: ET.Element) -> bool:
+    def _fix_menu_structure(self, item: ET.Element) -> bool:
         """Korrigiere Menü-Struktur"""
         # Implementation für Menü-Korrektur
         return True
     
-    def _fix_text_encoding(self, root: ET.Element) -> bool:
+    def _fix_text_encoding(self, item: ET.Element) -> bool:
         """Korrigiere Zeichenkodierung"""
         # Implementation für Encoding-Korrektur
         return True
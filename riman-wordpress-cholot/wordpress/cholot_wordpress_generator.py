@@ -7,11 +7,11 @@ import json
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 from typing import Dict, Any, List
 import uuid
 
 from yaml_to_json_processor import YAMLToJSONProcessor
+from wxr_serializer import write_wxr
 
 class CholotWordPressGenerator:
     def __init__(self):
@@ -144,27 +144,8 @@ class CholotWordPressGenerator:
     
     def _save_xml(self, rss: ET.Element, output_path: str):
         """Save XML with proper formatting"""
-        try:
-            # Convert to string
-            xml_string = ET.tostring(rss, encoding='unicode')
-            
-            # Parse and format
-            dom = minidom.parseString(xml_string)
-            pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-            
-            # Clean up empty lines
-            lines = pretty_xml.decode('utf-8').split('\n')
-            clean_lines = [line for line in lines if line.strip()]
-            clean_xml = '\n'.join(clean_lines)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(clean_xml)
-                
-        except Exception as e:
-            print(f"Warning: Using fallback XML formatting: {e}")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-                f.write(ET.tostring(rss, encoding='unicode'))
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_wxr(rss, f)
 
 
 def main():
@@ -4,18 +4,20 @@ Cholot XML Data Extractor and Analyzer
 Comprehensive analysis of the original Cholot XML focusing on Elementor data structures
 """
 
-import xml.etree.ElementTree as ET
 import json
 import os
 import re
 from collections import defaultdict
 from datetime import datetime
 
+from wxr_reader import WXRReader
+
 class CholotXMLAnalyzer:
     def __init__(self, xml_path):
         self.xml_path = xml_path
-        self.tree = None
-        self.root = None
+        self.reader = None
+        self.post_types = defaultdict(int)
+        self.elementor_items = []
         self.analysis = {
             'total_counts': {},
             'elementor_data': {},
@@ -30,11 +32,19 @@ class CholotXMLAnalyzer:
         }
         
     def load_xml(self):
-        """Load and parse the XML file"""
+        """Stream the XML once, collecting post types, Elementor items and taxonomies"""
         try:
-            self.tree = ET.parse(self.xml_path)
-            self.root = self.tree.getroot()
-            print(f"✅ Successfully loaded XML with root: {self.root.tag}")
+            self.reader = WXRReader(self.xml_path)
+            self.post_types = defaultdict(int)
+            self.elementor_items = []
+            
+            for item in self.reader:
+                self.post_types[item.post_type] += 1
+                item_info = self.extract_item_elementor_data(item)
+                if item_info:
+                    self.elementor_items.append(item_info)
+            
+            print(f"✅ Successfully loaded XML with root: {self.reader.root_tag}")
             return True
         except Exception as e:
             print(f"❌ Error loading XML: {e}")
@@ -44,11 +54,8 @@ class CholotXMLAnalyzer:
         """Count all types of items in the XML"""
         print("\n🔍 Counting items...")
         
-        # Find all items
-        items = self.root.findall('.//item')
-        
         counts = {
-            'total_items': len(items),
+            'total_items': sum(self.post_types.values()),
             'pages': 0,
             'posts': 0,
             'attachments': 0,
@@ -60,29 +67,25 @@ class CholotXMLAnalyzer:
         
         post_types = defaultdict(int)
         
-        for item in items:
-            post_type = item.find('.//{http://wordpress.org/export/1.2/}post_type')
-            if post_type is not None:
-                pt = post_type.text
-                post_types[pt] += 1
+        for pt, count in self.post_types.items():
+            if pt is not None:
+                post_types[pt] += count
                 
                 if pt == 'page':
-                    counts['pages'] += 1
+                    counts['pages'] += count
                 elif pt == 'post':
-                    counts['posts'] += 1
+                    counts['posts'] += count
                 elif pt == 'attachment':
-                    counts['attachments'] += 1
+                    counts['attachments'] += count
                 elif pt == 'nav_menu_item':
-                    counts['nav_menu_items'] += 1
+                    counts['nav_menu_items'] += count
                 elif pt == 'elementor_library':
-                    counts['elementor_library'] += 1
-                elif pt in ['page', 'post', 'attachment', 'nav_menu_item', 'elementor_library']:
-                    pass  # Already counted
+                    counts['elementor_library'] += count
                 else:
-                    counts['custom_post_types'] += 1
+                    counts['custom_post_types'] += count
                     self.analysis['custom_post_types'].add(pt)
             else:
-                counts['other'] += 1
+                counts['other'] += count
         
         self.analysis['total_counts'] = counts
         self.analysis['post_type_breakdown'] = dict(post_types)
@@ -92,74 +95,70 @@ class CholotXMLAnalyzer:
             if key != 'total_items' and value > 0:
                 print(f"   {key}: {value}")
     
+    def extract_item_elementor_data(self, item):
+        """Collect the Elementor meta of one streamed item, or None if it has none"""
+        # Get basic item info
+        title = item.title if item.title is not None else 'Untitled'
+        post_type = item.post_type if item.post_type is not None else 'unknown'
+        post_id = item.post_id if item.post_id is not None else 'unknown'
+        
+        # Look for Elementor meta data
+        elementor_data = {}
+        has_elementor = False
+        
+        for key, value in item.meta.items():
+            if value is None:
+                continue
+            
+            # Capture all Elementor-related meta
+            if 'elementor' in key.lower() or key.startswith('_elementor'):
+                elementor_data[key] = value
+                has_elementor = True
+                
+                # Special handling for Elementor data
+                if key == '_elementor_data' and value:
+                    try:
+                        # Try to parse as JSON
+                        parsed_data = json.loads(item.elementor_data)
+                        elementor_data[f'{key}_parsed'] = parsed_data
+                        
+                        # Extract widget types
+                        self.extract_widget_types(parsed_data)
+                        
+                    except json.JSONDecodeError:
+                        # If not JSON, store as string
+                        elementor_data[f'{key}_raw'] = value
+        
+        if not has_elementor:
+            return None
+        
+        return {
+            'id': post_id,
+            'title': title,
+            'post_type': post_type,
+            'elementor_data': elementor_data
+        }
+    
     def extract_elementor_data(self):
         """Extract all Elementor-related data"""
         print("\n🎨 Extracting Elementor data...")
         
-        items = self.root.findall('.//item')
         elementor_pages = []
         elementor_posts = []
         
-        for item in items:
-            # Get basic item info
-            title_elem = item.find('title')
-            title = title_elem.text if title_elem is not None else 'Untitled'
-            
-            post_type_elem = item.find('.//{http://wordpress.org/export/1.2/}post_type')
-            post_type = post_type_elem.text if post_type_elem is not None else 'unknown'
-            
-            post_id_elem = item.find('.//{http://wordpress.org/export/1.2/}post_id')
-            post_id = post_id_elem.text if post_id_elem is not None else 'unknown'
-            
-            # Look for Elementor meta data
-            meta_items = item.findall('.//{http://wordpress.org/export/1.2/}postmeta')
-            elementor_data = {}
-            has_elementor = False
+        for item_info in self.elementor_items:
+            post_type = item_info['post_type']
             
-            for meta in meta_items:
-                meta_key_elem = meta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                meta_value_elem = meta.find('.//{http://wordpress.org/export/1.2/}meta_value')
-                
-                if meta_key_elem is not None and meta_value_elem is not None:
-                    key = meta_key_elem.text
-                    value = meta_value_elem.text
-                    
-                    # Capture all Elementor-related meta
-                    if key and ('elementor' in key.lower() or key.startswith('_elementor')):
-                        elementor_data[key] = value
-                        has_elementor = True
-                        
-                        # Special handling for Elementor data
-                        if key == '_elementor_data' and value:
-                            try:
-                                # Try to parse as JSON
-                                parsed_data = json.loads(value)
-                                elementor_data[f'{key}_parsed'] = parsed_data
-                                
-                                # Extract widget types
-                                self.extract_widget_types(parsed_data)
-                                
-                            except json.JSONDecodeError:
-                                # If not JSON, store as string
-                                elementor_data[f'{key}_raw'] = value
+            if post_type == 'page':
+                elementor_pages.append(item_info)
+                self.analysis['pages_with_elementor'].append(item_info)
+            elif post_type == 'post':
+                elementor_posts.append(item_info)
+                self.analysis['posts_with_elementor'].append(item_info)
             
-            if has_elementor:
-                item_info = {
-                    'id': post_id,
-                    'title': title,
-                    'post_type': post_type,
-                    'elementor_data': elementor_data
-                }
-                
-                if post_type == 'page':
-                    elementor_pages.append(item_info)
-                    self.analysis['pages_with_elementor'].append(item_info)
-                elif post_type == 'post':
-                    elementor_posts.append(item_info)
-                    self.analysis['posts_with_elementor'].append(item_info)
-                
-                # Store in elementor_structures for easy access
-                self.analysis['elementor_structures'][f"{post_type}_{post_id}_{title}"] = elementor_data
+            # Store in elementor_structures for easy access
+            key = f"{post_type}_{item_info['id']}_{item_info['title']}"
+            self.analysis['elementor_structures'][key] = item_info['elementor_data']
         
         print(f"🎨 Found {len(elementor_pages)} pages with Elementor data")
         print(f"🎨 Found {len(elementor_posts)} posts with Elementor data")
@@ -187,35 +186,9 @@ class CholotXMLAnalyzer:
         """Extract taxonomy information"""
         print("\n🏷️  Extracting taxonomies...")
         
-        # Categories
-        categories = self.root.findall('.//{http://wordpress.org/export/1.2/}category')
-        self.analysis['taxonomies']['categories'] = []
-        for cat in categories:
-            cat_data = {}
-            for child in cat:
-                tag_name = child.tag.replace('{http://wordpress.org/export/1.2/}', 'wp:')
-                cat_data[tag_name] = child.text
-            self.analysis['taxonomies']['categories'].append(cat_data)
-        
-        # Tags
-        tags = self.root.findall('.//{http://wordpress.org/export/1.2/}tag')
-        self.analysis['taxonomies']['tags'] = []
-        for tag in tags:
-            tag_data = {}
-            for child in tag:
-                tag_name = child.tag.replace('{http://wordpress.org/export/1.2/}', 'wp:')
-                tag_data[tag_name] = child.text
-            self.analysis['taxonomies']['tags'].append(tag_data)
-        
-        # Terms (custom taxonomies)
-        terms = self.root.findall('.//{http://wordpress.org/export/1.2/}term')
-        self.analysis['taxonomies']['terms'] = []
-        for term in terms:
-            term_data = {}
-            for child in term:
-                tag_name = child.tag.replace('{http://wordpress.org/export/1.2/}', 'wp:')
-                term_data[tag_name] = child.text
-            self.analysis['taxonomies']['terms'].append(term_data)
+        # Categories, tags and terms (custom taxonomies) were collected while streaming
+        for key in ('categories', 'tags', 'terms'):
+            self.analysis['taxonomies'][key] = list(self.reader.taxonomies[key])
         
         print(f"📂 Categories: {len(self.analysis['taxonomies']['categories'])}")
         print(f"🏷️  Tags: {len(self.analysis['taxonomies']['tags'])}")
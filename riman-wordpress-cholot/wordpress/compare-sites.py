@@ -4,43 +4,99 @@ Site Comparison Utility
 Vergleicht localhost:8080 (original) vs localhost:8081 (test) 
 
 Teil der CHOLOT TEST SUITE für visuelle Verifizierung
+
+Beide Seiten aller Pages werden gleichzeitig geladen (--max-workers, ein
+gemeinsamer Keep-Alive Connection-Pool); pro Site werden Latenz-Perzentile
+(p50/p90/p95/p99) berichtet.
 Author: Claude Code Assistant (OCDI TEST SUITE BUILDER)
 Date: 2025-08-28
 """
 
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import math
 import time
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import difflib
 import re
 
+def latency_percentiles(durations: List[float]) -> Dict[str, Any]:
+    """Count, mean and nearest-rank percentiles of request durations in seconds"""
+    if not durations:
+        return {'count': 0}
+    ordered = sorted(durations)
+
+    def percentile(p):
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 4)
+
+    return {
+        'count': len(ordered),
+        'min': round(ordered[0], 4),
+        'mean': round(sum(ordered) / len(ordered), 4),
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'max': round(ordered[-1], 4),
+    }
+
+
 class SiteComparator:
     """
     Vergleicht zwei WordPress Sites (Original vs Test)
     """
     
-    def __init__(self, original_url: str = "http://localhost:8080", test_url: str = "http://localhost:8081"):
+    def __init__(self, original_url: str = "http://localhost:8080", test_url: str = "http://localhost:8081",
+                 max_workers: int = 16, session: Optional[requests.Session] = None, verbose: bool = True):
         self.original_url = original_url.rstrip('/')
         self.test_url = test_url.rstrip('/')
         self.results = {}
         self.timeout = 10
-        
-        print(f"🔍 SITE COMPARISON UTILITY")
-        print(f"==========================")
-        print(f"Original Site: {self.original_url}")
-        print(f"Test Site: {self.test_url}")
-        print(f"==========================\n")
+        self.max_workers = max(1, max_workers)
+        self.verbose = verbose
+        # Ein Session-Objekt für alle Threads: Keep-Alive Verbindungen werden wiederverwendet
+        self.session = session if session is not None else self._create_session()
+        
+        self._log(f"🔍 SITE COMPARISON UTILITY")
+        self._log(f"==========================")
+        self._log(f"Original Site: {self.original_url}")
+        self._log(f"Test Site: {self.test_url}")
+        self._log(f"==========================\n")
+    
+    def _create_session(self) -> requests.Session:
+        """Session mit einem Pool, der für alle gleichzeitigen Requests reicht"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _log(self, message: str = ""):
+        if self.verbose:
+            print(message)
+    
+    def _fetch(self, url: str) -> Tuple[Optional[requests.Response], float, Optional[Exception]]:
+        """GET über die gemeinsame Session: (Response, Dauer in s, Fehler)"""
+        start_time = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            # Body vollständig lesen, damit die Dauer die ganze Antwort umfasst
+            response.content
+            return response, time.perf_counter() - start_time, None
+        except requests.RequestException as e:
+            return None, time.perf_counter() - start_time, e
     
     def compare_sites(self, pages: List[str] = None) -> Dict[str, Any]:
         """Hauptvergleichsfunktion"""
         if pages is None:
             pages = ['/', '/about', '/services', '/contact', '/blog']
         
-        print(f"📋 Testing {len(pages)} pages...")
+        self._log(f"📋 Testing {len(pages)} pages ({self.max_workers} parallel requests)...")
         
         overall_results = {
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -53,17 +109,35 @@ class SiteComparator:
             'summary': {}
         }
         
-        for page_path in pages:
-            print(f"\n📄 Testing: {page_path}")
-            print("-" * 20)
-            
-            page_result = self._compare_single_page(page_path)
-            overall_results['page_results'][page_path] = page_result
-            
-            if page_result.get('accessible_both', False):
-                overall_results['pages_successful'] += 1
-            else:
-                overall_results['pages_failed'] += 1
+        # Beide Seiten aller Pages gleichzeitig laden; verglichen wird in Page-Reihenfolge,
+        # sobald beide Antworten einer Page da sind (während die übrigen noch laden)
+        latencies: Dict[str, List[float]] = {'original': [], 'test': []}
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetches = [
+                (page_path,
+                 executor.submit(self._fetch, urljoin(self.original_url, page_path)),
+                 executor.submit(self._fetch, urljoin(self.test_url, page_path)))
+                for page_path in pages
+            ]
+            for page_path, original_fetch, test_fetch in fetches:
+                self._log(f"\n📄 Testing: {page_path}")
+                self._log("-" * 20)
+                
+                original_fetch, test_fetch = original_fetch.result(), test_fetch.result()
+                latencies['original'].append(original_fetch[1])
+                latencies['test'].append(test_fetch[1])
+                page_result = self._compare_fetched(page_path, original_fetch, test_fetch)
+                overall_results['page_results'][page_path] = page_result
+                
+                if page_result.get('accessible_both', False):
+                    overall_results['pages_successful'] += 1
+                else:
+                    overall_results['pages_failed'] += 1
+        
+        overall_results['duration'] = round(time.perf_counter() - start_time, 3)
+        overall_results['latency'] = {side: latency_percentiles(durations)
+                                      for side, durations in latencies.items()}
         
         # Generate summary
         overall_results['summary'] = self._generate_summary(overall_results)
@@ -72,6 +146,12 @@ class SiteComparator:
     
     def _compare_single_page(self, page_path: str) -> Dict[str, Any]:
         """Vergleiche eine einzelne Seite"""
+        return self._compare_fetched(page_path,
+                                     self._fetch(urljoin(self.original_url, page_path)),
+                                     self._fetch(urljoin(self.test_url, page_path)))
+    
+    def _compare_fetched(self, page_path: str, original_fetch: Tuple, test_fetch: Tuple) -> Dict[str, Any]:
+        """Vergleiche eine Seite anhand der geladenen Antworten beider Sites"""
         original_url = urljoin(self.original_url, page_path)
         test_url = urljoin(self.test_url, page_path)
         
@@ -86,40 +166,31 @@ class SiteComparator:
             'errors': []
         }
         
-        try:
-            # Request original site
-            print(f"  🔍 Checking original: {original_url}")
-            start_time = time.time()
-            original_response = requests.get(original_url, timeout=self.timeout)
-            original_duration = time.time() - start_time
-            
-            result['status_codes']['original'] = original_response.status_code
-            result['performance']['original'] = round(original_duration, 3)
-            
-            print(f"    Status: {original_response.status_code} ({original_duration:.3f}s)")
-            
-        except requests.RequestException as e:
-            result['errors'].append(f"Original site error: {str(e)}")
-            print(f"    ❌ Error: {e}")
+        original_response, original_duration, original_error = original_fetch
+        test_response, test_duration, test_error = test_fetch
+        
+        # Original site
+        self._log(f"  🔍 Checking original: {original_url}")
+        if original_error is not None:
+            result['errors'].append(f"Original site error: {str(original_error)}")
+            self._log(f"    ❌ Error: {original_error}")
             return result
         
-        try:
-            # Request test site
-            print(f"  🔍 Checking test: {test_url}")
-            start_time = time.time()
-            test_response = requests.get(test_url, timeout=self.timeout)
-            test_duration = time.time() - start_time
-            
-            result['status_codes']['test'] = test_response.status_code
-            result['performance']['test'] = round(test_duration, 3)
-            
-            print(f"    Status: {test_response.status_code} ({test_duration:.3f}s)")
-            
-        except requests.RequestException as e:
-            result['errors'].append(f"Test site error: {str(e)}")
-            print(f"    ❌ Error: {e}")
+        result['status_codes']['original'] = original_response.status_code
+        result['performance']['original'] = round(original_duration, 3)
+        self._log(f"    Status: {original_response.status_code} ({original_duration:.3f}s)")
+        
+        # Test site
+        self._log(f"  🔍 Checking test: {test_url}")
+        if test_error is not None:
+            result['errors'].append(f"Test site error: {str(test_error)}")
+            self._log(f"    ❌ Error: {test_error}")
             return result
         
+        result['status_codes']['test'] = test_response.status_code
+        result['performance']['test'] = round(test_duration, 3)
+        self._log(f"    Status: {test_response.status_code} ({test_duration:.3f}s)")
+        
         # Both sites accessible
         if original_response.status_code == 200 and test_response.status_code == 200:
             result['accessible_both'] = True
@@ -137,21 +208,21 @@ class SiteComparator:
             result['performance']['difference'] = round(perf_diff, 3)
             
             if perf_diff < 0.5:
-                print(f"    ⚡ Performance: Similar ({perf_diff:.3f}s diff)")
+                self._log(f"    ⚡ Performance: Similar ({perf_diff:.3f}s diff)")
             else:
-                print(f"    ⚠️ Performance: {perf_diff:.3f}s difference")
+                self._log(f"    ⚠️ Performance: {perf_diff:.3f}s difference")
             
             # Content summary
             similarity = content_comparison.get('similarity_percent', 0)
             if similarity >= 90:
-                print(f"    ✅ Content: {similarity:.1f}% similar")
+                self._log(f"    ✅ Content: {similarity:.1f}% similar")
             elif similarity >= 70:
-                print(f"    ⚠️ Content: {similarity:.1f}% similar")
+                self._log(f"    ⚠️ Content: {similarity:.1f}% similar")
             else:
-                print(f"    ❌ Content: {similarity:.1f}% similar")
+                self._log(f"    ❌ Content: {similarity:.1f}% similar")
         
         elif original_response.status_code != test_response.status_code:
-            print(f"    ⚠️ Status mismatch: {original_response.status_code} vs {test_response.status_code}")
+            self._log(f"    ⚠️ Status mismatch: {original_response.status_code} vs {test_response.status_code}")
         
         return result
     
@@ -382,6 +453,10 @@ class SiteComparator:
         print(f"Average Similarity: {summary['average_similarity']:.1f}%")
         print(f"Performance Diff: {summary['performance_difference']:.3f}s")
         print(f"Elementor Consistency: {summary['elementor_consistency']}")
+        for side, stats in results.get('latency', {}).items():
+            if stats.get('count'):
+                print(f"Latency {side}: p50 {stats['p50'] * 1000:.0f} ms, p95 {stats['p95'] * 1000:.0f} ms, "
+                      f"p99 {stats['p99'] * 1000:.0f} ms ({stats['count']} requests)")
         
         if summary['issues_found']:
             print(f"\n⚠️ ISSUES FOUND:")
@@ -416,8 +491,12 @@ class SiteComparator:
 def main():
     """Main function"""
     # Parse command line arguments
-    original_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8080"
-    test_url = sys.argv[2] if len(sys.argv) > 2 else "http://localhost:8081"
+    parser = argparse.ArgumentParser(description='Compare two WordPress sites page by page')
+    parser.add_argument('original_url', nargs='?', default="http://localhost:8080")
+    parser.add_argument('test_url', nargs='?', default="http://localhost:8081")
+    parser.add_argument('pages', nargs='?', help='Comma-separated paths (default: /,/about,/services,/contact,/blog)')
+    parser.add_argument('--max-workers', type=int, default=16, help='Concurrent requests')
+    args = parser.parse_args()
     
     pages_to_test = [
         '/',
@@ -428,10 +507,10 @@ def main():
     ]
     
     # Custom pages from command line
-    if len(sys.argv) > 3:
-        pages_to_test = sys.argv[3].split(',')
+    if args.pages:
+        pages_to_test = args.pages.split(',')
     
-    comparator = SiteComparator(original_url, test_url)
+    comparator = SiteComparator(args.original_url, args.test_url, max_workers=args.max_workers)
     
     try:
         results = comparator.compare_sites(pages_to_test)
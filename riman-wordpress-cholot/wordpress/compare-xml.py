@@ -8,18 +8,176 @@ This script compares generated XML with original/reference XML files to:
 2. Compare content completeness
 3. Validate data transformation accuracy
 4. Report missing or incorrect elements
+5. Diff the Elementor trees of matching pages (inserted, deleted, moved and
+   changed widgets)
+
+Batch mode compares many generated iterations against one reference: the
+reference is parsed once, each candidate is tokenized in a single pass (in
+a process pool for --workers > 1) and the results are printed as one table
+ranked by similarity score.
+
+Usage:
+    python compare-xml.py <generated_xml> [reference_xml]
+    python compare-xml.py --batch --reference cholot-original.xml generated/ --workers 4
 """
 
+import argparse
+import glob
+import hashlib
 import sys
 import os
-import json
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from xml.dom import minidom
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set
 from datetime import datetime
 import difflib
 import re
 
+import json_backend
+from elementor_diff import diff_elementor
+from wxr_reader import WXRReader
+
+# Every tag-level statistic comes from one scan over the tags. Titles are
+# captured inside a lookahead, so the CDATA they wrap is still scanned for
+# the other tokens, as the separate findall passes did.
+TAG_TOKENS = re.compile(
+    r'<(?:(?P<item>item>)'
+    r'|wp:post_(?:type>(?P<post_type>[^<]*)(?P<post_type_end></wp:post_type>)?'
+    r'|id>(?P<post_id>\d+)</wp:post_id>)'
+    r'|title>(?=<!\[CDATA\[(?P<title>.*?)\]\]></title>))'
+)
+
+# Kept out of TAG_TOKENS: an alternative starting with '"' would be tried at
+# every quote of the Elementor JSON and makes the combined scan slower than
+# all the separate passes together
+WIDGET_TYPE_PATTERN = re.compile(r'"widgetType":"([^"]+)"')
+
+# Post types with their own counter; anything else counts as a custom post
+STANDARD_POST_TYPES = ('page', 'post', 'nav_menu_item')
+
+# Variable content removed before structures are compared, in this order
+STRUCTURE_SUBSTITUTIONS = [
+    (re.compile(r'<!\[CDATA\[.*?\]\]>', re.DOTALL), '<![CDATA[...]]>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'), 'YYYY-MM-DD HH:MM:SS'),
+    (re.compile(r'https?://[^\s<>"]+'), 'http://example.com'),
+    (re.compile(r'<wp:post_id>\d+</wp:post_id>'), '<wp:post_id>###</wp:post_id>'),
+]
+
+# Count fields the similarity score is based on
+SCORE_FIELDS = ["total_items", "pages", "posts", "elementor_blocks"]
+
+
+def collect_xml_stats(content: str) -> Dict[str, Any]:
+    """Item counts, titles, post IDs and widget types of an export, tags in one tokenizer pass"""
+    items = custom_posts = 0
+    post_types: Dict[str, int] = {}
+    titles: List[str] = []
+    post_ids: List[int] = []
+
+    for match in TAG_TOKENS.finditer(content):
+        kind = match.lastgroup
+        if kind == 'post_id':
+            post_ids.append(int(match.group('post_id')))
+        elif kind == 'title':
+            titles.append(match.group('title'))
+        elif kind == 'item':
+            items += 1
+        else:
+            post_type = match.group('post_type')
+            if kind == 'post_type_end':
+                post_types[post_type] = post_types.get(post_type, 0) + 1
+            if not post_type.startswith(STANDARD_POST_TYPES):
+                custom_posts += 1
+
+    return {
+        "file_size": len(content),
+        "total_items": items,
+        "pages": post_types.get('page', 0),
+        "posts": post_types.get('post', 0),
+        "menu_items": post_types.get('nav_menu_item', 0),
+        "elementor_blocks": content.count('_elementor_data'),
+        "custom_posts": custom_posts,
+        "media_attachments": post_types.get('attachment', 0),
+        "titles": titles,
+        "post_ids": post_ids,
+        "widget_types": list(set(WIDGET_TYPE_PATTERN.findall(content))),
+    }
+
+
+def elementor_pages(xml_content: str) -> List[Tuple[str, str, bytes]]:
+    """(slug, title, ``_elementor_data``) of every item with Elementor data"""
+    return [(item.fields.get('wp:post_name') or '', item.title or '', item.elementor_data)
+            for item in WXRReader.from_string(xml_content) if item.elementor_data]
+
+
+def pair_pages(ref_pages: List[Tuple[str, str, bytes]],
+               gen_pages: List[Tuple[str, str, bytes]]) -> Tuple[List[Tuple[str, bytes, bytes]], List[str], List[str]]:
+    """
+    Pair pages by slug, then by title. Returns (name, reference data,
+    generated data) pairs plus the unpaired reference and generated names.
+    """
+    unpaired = dict(enumerate(gen_pages))
+    by_slug: Dict[str, List[int]] = {}
+    by_title: Dict[str, List[int]] = {}
+    for index, (slug, title, _) in unpaired.items():
+        if slug:
+            by_slug.setdefault(slug, []).append(index)
+        if title:
+            by_title.setdefault(title.lower(), []).append(index)
+    
+    pairs, missing = [], []
+    for slug, title, ref_data in ref_pages:
+        candidates = by_slug.get(slug, []) + by_title.get(title.lower(), [])
+        index = next((i for i in candidates if i in unpaired), None)
+        if index is None:
+            missing.append(slug or title)
+            continue
+        pairs.append((slug or title, ref_data, unpaired.pop(index)[2]))
+    extra = [slug or title for slug, title, _ in unpaired.values()]
+    return pairs, missing, extra
+
+
+def extract_structure(xml_content: str) -> str:
+    """XML structure with CDATA, dates, URLs and post IDs blanked out"""
+    structure = xml_content
+    for pattern, replacement in STRUCTURE_SUBSTITUTIONS:
+        structure = pattern.sub(replacement, structure)
+    return structure
+
+
+def _match_ratio(reference: Set, generated: Set) -> float:
+    if reference:
+        return len(reference & generated) / len(reference)
+    return 1.0 if not generated else 0.5
+
+
+def similarity_scores(ref_stats: Dict[str, Any], gen_stats: Dict[str, Any]) -> List[float]:
+    """Per-aspect scores: count fields, then titles, widget types and post IDs"""
+    scores = []
+    for field in SCORE_FIELDS:
+        ref_val = ref_stats.get(field, 0)
+        gen_val = gen_stats.get(field, 0)
+        if ref_val == 0 and gen_val == 0:
+            scores.append(1.0)
+        elif ref_val == 0:
+            scores.append(0.0)
+        else:
+            scores.append(min(gen_val, ref_val) / max(gen_val, ref_val))
+    for key in ("titles", "widget_types", "post_ids"):
+        scores.append(_match_ratio(set(ref_stats.get(key, [])), set(gen_stats.get(key, []))))
+    return scores
+
+
+def weighted_similarity(scores: List[float]) -> float:
+    """Combine per-aspect scores into one value between 0 and 1"""
+    weights = [0.4, 0.3, 0.2, 0.1]  # Adjust as needed
+    if len(scores) > len(weights):
+        # If we have more scores than weights, use equal weighting
+        return sum(scores) / len(scores)
+    return sum(score * weight for score, weight in zip(scores, weights))
+
+
 class XMLComparator:
     def __init__(self, reference_xml: str, generated_xml: str):
         self.reference_xml = reference_xml
@@ -32,46 +190,28 @@ class XMLComparator:
             "extra_elements": [],
             "content_matches": [],
             "content_differences": [],
+            "elementor_diff": {},
             "overall_score": 0.0
         }
+        self._contents: Dict[str, str] = {}
     
     def log(self, message: str, level: str = "INFO"):
         """Log message with timestamp"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{timestamp}] [{level}] {message}")
     
+    def _read(self, xml_file: str) -> str:
+        """File content, read once per comparison"""
+        content = self._contents.get(xml_file)
+        if content is None:
+            with open(xml_file, 'r', encoding='utf-8') as f:
+                content = self._contents[xml_file] = f.read()
+        return content
+    
     def parse_xml_stats(self, xml_file: str) -> Dict[str, Any]:
         """Extract statistics from XML file"""
         try:
-            with open(xml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            stats = {
-                "file_size": len(content),
-                "total_items": len(re.findall(r'<item>', content)),
-                "pages": len(re.findall(r'<wp:post_type>page</wp:post_type>', content)),
-                "posts": len(re.findall(r'<wp:post_type>post</wp:post_type>', content)),
-                "menu_items": len(re.findall(r'<wp:post_type>nav_menu_item</wp:post_type>', content)),
-                "elementor_blocks": len(re.findall(r'_elementor_data', content)),
-                "custom_posts": len(re.findall(r'<wp:post_type>(?!page|post|nav_menu_item)', content)),
-                "media_attachments": len(re.findall(r'<wp:post_type>attachment</wp:post_type>', content))
-            }
-            
-            # Extract titles
-            titles = re.findall(r'<title><!\[CDATA\[(.*?)\]\]></title>', content)
-            stats["titles"] = titles
-            
-            # Extract post IDs
-            post_ids = re.findall(r'<wp:post_id>(\d+)</wp:post_id>', content)
-            stats["post_ids"] = [int(pid) for pid in post_ids]
-            
-            # Extract widget types from Elementor data
-            widget_types = set()
-            elementor_matches = re.findall(r'"widgetType":"([^"]+)"', content)
-            widget_types.update(elementor_matches)
-            stats["widget_types"] = list(widget_types)
-            
-            return stats
+            return collect_xml_stats(self._read(xml_file))
         
         except Exception as e:
             self.log(f"Error parsing XML stats: {str(e)}", "ERROR")
@@ -221,16 +361,9 @@ class XMLComparator:
         try:
             self.log("🌳 Comparing XML structure...")
             
-            # Parse both XML files
-            with open(self.reference_xml, 'r', encoding='utf-8') as f:
-                ref_content = f.read()
-            
-            with open(self.generated_xml, 'r', encoding='utf-8') as f:
-                gen_content = f.read()
-            
             # Extract the basic structure (remove variable content)
-            ref_structure = self._extract_structure(ref_content)
-            gen_structure = self._extract_structure(gen_content)
+            ref_structure = self._extract_structure(self._read(self.reference_xml))
+            gen_structure = self._extract_structure(self._read(self.generated_xml))
             
             # Compare structures
             if ref_structure == gen_structure:
@@ -260,21 +393,46 @@ class XMLComparator:
         except Exception as e:
             self.log(f"Error comparing XML structure: {str(e)}", "ERROR")
     
+    def compare_elementor_trees(self):
+        """Diff the Elementor element trees of pages present in both files"""
+        try:
+            self.log("🧱 Comparing Elementor trees...")
+            
+            pairs, missing, extra = pair_pages(elementor_pages(self._read(self.reference_xml)),
+                                               elementor_pages(self._read(self.generated_xml)))
+            
+            for page, ref_data, gen_data in pairs:
+                try:
+                    diff = diff_elementor(ref_data, gen_data)
+                except ValueError as e:
+                    self.log(f"Invalid Elementor JSON on page {page}: {str(e)}", "ERROR")
+                    continue
+                
+                self.comparison_results["elementor_diff"][page] = diff.to_dict()
+                if diff.identical:
+                    self.log(f"✅ {page}: Elementor tree matches")
+                    continue
+                
+                summary = diff.summary()
+                self.log(f"⚠️ {page}: {summary['insert']} inserted, {summary['delete']} deleted, "
+                         f"{summary['move']} moved, {summary['update']} changed "
+                         f"({summary['similarity']:.1f}% similar)", "WARNING")
+                for operation in diff.operations[:20]:
+                    self.log(f"  {operation.describe()}", "INFO")
+                if len(diff.operations) > 20:
+                    self.log(f"  ... ({len(diff.operations) - 20} more)", "INFO")
+            
+            if missing:
+                self.log(f"❌ Reference pages without Elementor data in generated XML: {missing}", "ERROR")
+            if extra:
+                self.log(f"➕ Generated pages without reference counterpart: {extra}", "INFO")
+        
+        except Exception as e:
+            self.log(f"Error comparing Elementor trees: {str(e)}", "ERROR")
+    
     def _extract_structure(self, xml_content: str) -> str:
         """Extract XML structure by removing variable content"""
-        # Remove CDATA content
-        structure = re.sub(r'<!\[CDATA\[.*?\]\]>', '<![CDATA[...]]>', xml_content, flags=re.DOTALL)
-        
-        # Remove dates
-        structure = re.sub(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', 'YYYY-MM-DD HH:MM:SS', structure)
-        
-        # Remove URLs
-        structure = re.sub(r'https?://[^\s<>"]+', 'http://example.com', structure)
-        
-        # Remove post IDs (keep structure)
-        structure = re.sub(r'<wp:post_id>\d+</wp:post_id>', '<wp:post_id>###</wp:post_id>', structure)
-        
-        return structure
+        return extract_structure(xml_content)
     
     def calculate_similarity_score(self) -> float:
         """Calculate overall similarity score between files"""
@@ -283,57 +441,9 @@ class XMLComparator:
         ref_stats = self.comparison_results["reference_stats"]
         gen_stats = self.comparison_results["generated_stats"]
         
-        # Calculate scores for different aspects
-        scores = []
-        
-        # 1. Content count similarity (40% weight)
-        content_fields = ["total_items", "pages", "posts", "elementor_blocks"]
-        content_score = 0
-        for field in content_fields:
-            ref_val = ref_stats.get(field, 0)
-            gen_val = gen_stats.get(field, 0)
-            if ref_val == 0 and gen_val == 0:
-                scores.append(1.0)
-            elif ref_val == 0:
-                scores.append(0.0)
-            else:
-                similarity = min(gen_val, ref_val) / max(gen_val, ref_val)
-                scores.append(similarity)
-        
-        # 2. Title matching (30% weight)
-        ref_titles = set(ref_stats.get("titles", []))
-        gen_titles = set(gen_stats.get("titles", []))
-        if ref_titles:
-            title_score = len(ref_titles & gen_titles) / len(ref_titles)
-        else:
-            title_score = 1.0 if not gen_titles else 0.5
-        scores.append(title_score)
-        
-        # 3. Widget type matching (20% weight)
-        ref_widgets = set(ref_stats.get("widget_types", []))
-        gen_widgets = set(gen_stats.get("widget_types", []))
-        if ref_widgets:
-            widget_score = len(ref_widgets & gen_widgets) / len(ref_widgets)
-        else:
-            widget_score = 1.0 if not gen_widgets else 0.5
-        scores.append(widget_score)
-        
-        # 4. Post ID matching (10% weight)
-        ref_ids = set(ref_stats.get("post_ids", []))
-        gen_ids = set(gen_stats.get("post_ids", []))
-        if ref_ids:
-            id_score = len(ref_ids & gen_ids) / len(ref_ids)
-        else:
-            id_score = 1.0 if not gen_ids else 0.5
-        scores.append(id_score)
-        
-        # Calculate weighted average
-        weights = [0.4, 0.3, 0.2, 0.1]  # Adjust as needed
-        if len(scores) > len(weights):
-            # If we have more scores than weights, use equal weighting
-            weighted_score = sum(scores) / len(scores)
-        else:
-            weighted_score = sum(score * weight for score, weight in zip(scores, weights))
+        # Count fields, titles, widget types, post IDs
+        scores = similarity_scores(ref_stats, gen_stats)
+        weighted_score = weighted_similarity(scores)
         
         self.comparison_results["overall_score"] = weighted_score * 100
         
@@ -361,6 +471,7 @@ class XMLComparator:
         self.compare_post_ids()
         self.compare_widget_types()
         self.compare_xml_structure()
+        self.compare_elementor_trees()
         
         # Calculate overall score
         self.calculate_similarity_score()
@@ -383,7 +494,7 @@ class XMLComparator:
             }
             
             with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+                json_backend.dump(report, f, indent=2, ensure_ascii=False)
             
             self.log(f"Comparison report saved to: {report_file}")
             
@@ -476,42 +587,181 @@ class XMLComparator:
             return False
 
 
+def summarize_xml(xml_file: str) -> Dict[str, Any]:
+    """Stats and structure digest of one export, from a single read"""
+    with open(xml_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    structure = extract_structure(content)
+    return {
+        "stats": collect_xml_stats(content),
+        "structure_digest": hashlib.sha256(structure.encode('utf-8')).hexdigest(),
+    }
+
+
+def compare_candidate(reference: Dict[str, Any], generated_xml: str) -> Dict[str, Any]:
+    """One row of the batch table: a candidate scored against a summarized reference"""
+    row = {"file": generated_xml, "score": 0.0, "scores": [], "error": None}
+    try:
+        summary = summarize_xml(generated_xml)
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+
+    ref_stats = reference["stats"]
+    gen_stats = summary["stats"]
+    scores = similarity_scores(ref_stats, gen_stats)
+    row.update({
+        "score": weighted_similarity(scores) * 100,
+        "scores": scores,
+        "counts": {field: gen_stats[field] for field in ["total_items", "pages", "posts", "menu_items", "elementor_blocks"]},
+        "missing_titles": len(set(ref_stats["titles"]) - set(gen_stats["titles"])),
+        "missing_widgets": sorted(set(ref_stats["widget_types"]) - set(gen_stats["widget_types"])),
+        "structure_match": summary["structure_digest"] == reference["structure_digest"],
+    })
+    return row
+
+
+# Reference summary of the current batch, set once per worker process
+_worker_reference: Optional[Dict[str, Any]] = None
+
+
+def _init_batch_worker(reference: Dict[str, Any]):
+    global _worker_reference
+    _worker_reference = reference
+
+
+def _compare_candidate_in_worker(generated_xml: str) -> Dict[str, Any]:
+    return compare_candidate(_worker_reference, generated_xml)
+
+
+def compare_batch(reference_xml: str, candidates: List[str], workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    Score every candidate against one reference. The reference is parsed
+    once; candidates run in a process pool for workers > 1. Rows are ranked
+    by score, best first; unreadable candidates come last.
+    """
+    reference = summarize_xml(reference_xml)
+
+    if workers > 1 and len(candidates) > 1:
+        chunksize = max(1, len(candidates) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(reference,)) as executor:
+            rows = list(executor.map(_compare_candidate_in_worker, candidates, chunksize=chunksize))
+    else:
+        rows = [compare_candidate(reference, candidate) for candidate in candidates]
+
+    return sorted(rows, key=lambda row: (row["error"] is not None, -row["score"], row["file"]))
+
+
+def expand_candidates(paths: List[str], exclude: Optional[str] = None) -> List[str]:
+    """Files, directories (their *.xml) and glob patterns, without the reference itself"""
+    candidates = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, '*.xml')))
+        else:
+            matches = sorted(glob.glob(path)) or [path]
+        candidates.extend(matches)
+
+    excluded = os.path.abspath(exclude) if exclude else None
+    unique = []
+    for candidate in candidates:
+        if os.path.abspath(candidate) != excluded and candidate not in unique:
+            unique.append(candidate)
+    return unique
+
+
+def print_ranked_table(reference_xml: str, rows: List[Dict[str, Any]]) -> bool:
+    """Print the batch results best first; True if every candidate could be compared"""
+    print(f"Reference: {reference_xml}")
+    print()
+    print(f"{'#':>3} {'File':<40} {'Score':>7} {'Items':>6} {'Pages':>6} {'Elem.':>6} "
+          f"{'Miss.Titles':>11} {'Miss.Widgets':>12} {'Struct':>6}")
+    print("-" * 104)
+    for rank, row in enumerate(rows, 1):
+        name = os.path.basename(row["file"])
+        if row["error"] is not None:
+            print(f"{rank:>3} {name:<40} {'ERROR':>7}  {row['error']}")
+            continue
+        counts = row["counts"]
+        print(f"{rank:>3} {name:<40} {row['score']:>6.1f}% {counts['total_items']:>6} {counts['pages']:>6} "
+              f"{counts['elementor_blocks']:>6} {row['missing_titles']:>11} {len(row['missing_widgets']):>12} "
+              f"{'✅' if row['structure_match'] else '❌':>5}")
+    return all(row["error"] is None for row in rows)
+
+
+def find_reference_xml() -> Optional[str]:
+    """Look for common reference file names next to the script"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    possible_refs = [
+        "cholot-original.xml",
+        "cholot-reference.xml",
+        "cholot-export.xml",
+        "reference.xml"
+    ]
+    for ref_name in possible_refs:
+        ref_path = os.path.join(script_dir, ref_name)
+        if os.path.exists(ref_path):
+            return ref_path
+    return None
+
+
+def _exit_without_reference():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    print("❌ No reference XML file found. Please specify one:")
+    print(f"Available files in {script_dir}:")
+    for file in os.listdir(script_dir):
+        if file.endswith('.xml'):
+            print(f"  - {file}")
+    sys.exit(1)
+
+
 def main():
     """Main execution function"""
-    if len(sys.argv) not in [2, 3]:
+    parser = argparse.ArgumentParser(
+        description='Compare generated XML with a reference XML',
+        usage='%(prog)s <generated_xml> [reference_xml]\n'
+              '       %(prog)s --batch [--reference REF] [--workers N] <candidate|dir|glob> ...')
+    parser.add_argument('paths', nargs='+', help='Generated XML and optional reference, or batch candidates')
+    parser.add_argument('--batch', action='store_true',
+                        help='Rank many candidates against one reference')
+    parser.add_argument('--reference', help='Reference XML for batch mode')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for batch mode')
+    parser.add_argument('--json', dest='json_output', help='Write the batch table as JSON')
+    args = parser.parse_args()
+    
+    if args.batch:
+        reference_xml = args.reference or find_reference_xml()
+        if not reference_xml:
+            _exit_without_reference()
+        candidates = expand_candidates(args.paths, exclude=reference_xml)
+        
+        print("🔍 CHOLOT XML COMPARATOR - BATCH")
+        print("=" * 60)
+        rows = compare_batch(reference_xml, candidates, workers=args.workers)
+        success = print_ranked_table(reference_xml, rows)
+        
+        if args.json_output:
+            with open(args.json_output, 'w', encoding='utf-8') as f:
+                json_backend.dump({'comparison_date': datetime.now().isoformat(),
+                           'reference_file': reference_xml, 'ranking': rows},
+                          f, indent=2, ensure_ascii=False)
+        sys.exit(0 if success else 1)
+    
+    if len(args.paths) not in [1, 2]:
         print("Usage: python compare-xml.py <generated_xml> [reference_xml]")
         print("Example: python compare-xml.py cholot-generated.xml cholot-original.xml")
         sys.exit(1)
     
-    generated_xml = sys.argv[1]
+    generated_xml = args.paths[0]
     
     # Try to find a reference file if not provided
-    if len(sys.argv) == 3:
-        reference_xml = sys.argv[2]
+    if len(args.paths) == 2:
+        reference_xml = args.paths[1]
     else:
-        # Look for common reference file names
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        possible_refs = [
-            "cholot-original.xml",
-            "cholot-reference.xml",
-            "cholot-export.xml",
-            "reference.xml"
-        ]
-        
-        reference_xml = None
-        for ref_name in possible_refs:
-            ref_path = os.path.join(script_dir, ref_name)
-            if os.path.exists(ref_path):
-                reference_xml = ref_path
-                break
-        
+        reference_xml = find_reference_xml()
         if not reference_xml:
-            print("❌ No reference XML file found. Please specify one:")
-            print(f"Available files in {script_dir}:")
-            for file in os.listdir(script_dir):
-                if file.endswith('.xml'):
-                    print(f"  - {file}")
-            sys.exit(1)
+            _exit_without_reference()
     
     print("🔍 CHOLOT XML COMPARATOR")
     print("=" * 60)
@@ -9,14 +9,19 @@ import yaml
 from datetime import datetime
 from pathlib import Path
 
+from media_registry import MediaRegistry
+
 class CompleteImageGenerator:
     """
     Generiert komplette WordPress XML mit Bild-Support
     """
     
-    def __init__(self):
+    def __init__(self, media_registry: MediaRegistry = None):
         self.attachment_id = 200
         self.images = {}
+        # Gleiche Bilder (andere Größe, http/https, Host-Alias) bekommen dasselbe Attachment
+        self.media_registry = media_registry if media_registry is not None else MediaRegistry()
+        self.attachments = {}  # Attachment-ID -> Bild-Info
     
     def create_riman_with_images(self):
         """
@@ -164,11 +169,22 @@ class CompleteImageGenerator:
     
     def create_image_attachment(self, url, title):
         """
-        Erstellt ein WordPress Image Attachment
+        Erstellt ein WordPress Image Attachment (einmal pro Bild) und gibt die
+        Bild-Info dieser Referenz zurück
         """
-        attachment_id = self.attachment_id
-        self.attachment_id += 1
-        
+        attachment_id = self.media_registry.find(url)
+        if attachment_id is None:
+            attachment_id = self.attachment_id
+            self.attachment_id += 1
+            self.media_registry.add(url, attachment_id)
+            # Das Attachment ist das Original, auch wenn zuerst eine kleinere Größe auftaucht
+            self.attachments[attachment_id] = self._image_info(
+                attachment_id, self.media_registry.full_size_url(url), title)
+        
+        # Nur die ID wird geteilt; URL, Titel und Alt-Text bleiben die dieser Referenz
+        return self._image_info(attachment_id, url, title)
+    
+    def _image_info(self, attachment_id, url, title):
         # Filename aus URL extrahieren
         filename = url.split('/')[-1].split('?')[0]
         if not filename or '.' not in filename:
@@ -462,7 +478,7 @@ class CompleteImageGenerator:
         """
         attachments_xml = []
         
-        for image in self.images.values():
+        for image in self.attachments.values():
             xml = f"""
     <item>
         <title><![CDATA[{image['title']}]]></title>
@@ -1,9 +1,86 @@
 #!/usr/bin/env python3
 """
 Convert XML to use WebP images instead of JPEG/PNG.
+
+With an image manifest (see image_derivatives.py), sized references such as
+``photo-300x200.jpg`` become ``photo-300x200.webp`` when that derivative
+exists; without one they fall back to the full-size ``photo.webp``.
 """
+import html
 import re
 from pathlib import Path
+from xml.sax.saxutils import escape
+
+import php_serialize
+from elementor_clone import replace_strings
+from image_derivatives import ImageManifest
+from text_rewriter import TextRewriter
+
+# Serialized _wp_attachment_metadata value, in CDATA or entity-escaped
+ATTACHMENT_METADATA = re.compile(
+    r'(?P<meta_head><wp:meta_key>(?:<!\[CDATA\[)?_wp_attachment_metadata(?:\]\]>)?</wp:meta_key>\s*'
+    r'<wp:meta_value>)(?P<meta_cdata><!\[CDATA\[)?(?P<meta_value>.*?)(?:\]\]>)?(?=</wp:meta_value>)',
+    re.DOTALL,
+)
+
+# File name characters in front of a size suffix
+_FILE_STEM = re.compile(r'[\w.%-]*\Z')
+
+def create_text_rewriter(manifest=None):
+    """JPEG -> WebP rewrites of plain text (URLs, file names, MIME types).
+
+    Sized references are kept when ``manifest`` (an ImageManifest) has the
+    WebP file of that size, and otherwise point at the full-size WebP.
+    """
+    def sized_webp(match):
+        size = match.group(1)
+        if manifest is not None:
+            stem = _FILE_STEM.search(match.string, max(0, match.start() - 255), match.start()).group(0)
+            if manifest.has_file(f'{stem}{size}.webp'):
+                return f'{size}.webp'
+        return '.webp'
+
+    return TextRewriter(
+        {
+            # Update MIME types for WebP
+            'image/jpeg': 'image/webp',
+        },
+        rules=[
+            # Sizes without a WebP derivative fall back to the full-size image
+            (r'(-\d+x\d+)\.jpg(?=["<\s])', sized_webp),
+            (r'(-\d+x\d+)\.webp', sized_webp),
+            # Replace .jpg extensions with .webp in URLs and file references
+            # (create_webp_rewriter applies these to serialized attachment metadata, too)
+            (r'\.jpg(?=["<\s])', '.webp'),
+        ],
+    )
+
+def create_webp_rewriter(manifest=None):
+    """All JPEG -> WebP rewrites as one single-pass rewriter.
+    
+    Serialized attachment metadata is unserialized, its strings are rewritten
+    and it is serialized again, so the string lengths stay correct.
+    """
+    text_rewriter = create_text_rewriter(manifest)
+
+    def rewrite_metadata(match):
+        cdata = match.group('meta_cdata')
+        value = match.group('meta_value')
+        try:
+            metadata = php_serialize.loads(value if cdata else html.unescape(value))
+        except php_serialize.PHPSerializeError:
+            # Not serialized (or already broken): plain text rewrite
+            return text_rewriter.rewrite(match.group(0))
+        # A bare file name needs its delimiter for the .jpg rules
+        rewritten = php_serialize.dumps(replace_strings(metadata, lambda text: text_rewriter.rewrite(text + '"')[:-1]))
+        if cdata:
+            return f"{match.group('meta_head')}<![CDATA[{rewritten}]]>"
+        return match.group('meta_head') + escape(rewritten, {'"': '&quot;'})
+
+    return TextRewriter(
+        text_rewriter.literals,
+        rules=[(ATTACHMENT_METADATA, rewrite_metadata)] + text_rewriter.rules,
+    )
 
 def main():
     """Convert all image references to WebP format."""
@@ -17,9 +94,11 @@ def main():
     
     print("Converting image references to WebP...")
     
-    # Replace .jpg extensions with .webp in URLs and file references
-    xml_content = re.sub(r'\.jpg(?=["<\s])', '.webp', xml_content)
-    
+    manifest = ImageManifest.load_default()
+    if manifest is not None:
+        print(f"Keeping image sizes listed in {manifest.path}")
+    xml_content = create_webp_rewriter(manifest).rewrite(xml_content)
+
     # Keep PNG files as PNG (logos need transparency)
     # But we can check if WebP versions exist for PNGs too
     png_files = [
@@ -32,21 +111,7 @@ def main():
     for png_file in png_files:
         # Keep PNGs as is for now since they need transparency
         pass
-    
-    # Update MIME types for WebP
-    xml_content = xml_content.replace('image/jpeg', 'image/webp')
-    
-    # Fix any attachment metadata that might reference JPEG
-    xml_content = re.sub(
-        r'(a:5:\{s:5:"width";i:\d+;s:6:"height";i:\d+;s:4:"file";s:\d+:")([^"]+)\.jpg(")',
-        r'\1\2.webp\3',
-        xml_content
-    )
-    
-    # Remove thumbnail sizes since we don't have WebP versions of thumbnails
-    # Or we could generate them
-    xml_content = re.sub(r'-\d+x\d+\.webp', '.webp', xml_content)
-    
+
     print(f"Writing WebP-optimized XML to: {output_file}")
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(xml_content)
@@ -8,13 +8,14 @@ Keine Template-Befüllung, sondern echter Widget-Assembly
 import yaml
 import json
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import re
 import uuid
 
+from wxr_serializer import wxr_to_string
+
 class DynamicElementorProcessor:
     def __init__(self, yaml_config: str):
         self.yaml_file = Path(yaml_config)
@@ -392,14 +393,8 @@ class DynamicElementorProcessor:
             self._add_page_to_xml(channel, page_config, elementor_data, page_id)
             page_id += 1
         
-        # Pretty print
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        
-        # Clean up
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        final_xml = '\n'.join(lines)
+        # Pretty print in a single pass
+        final_xml = wxr_to_string(root, indent="  ")
         
         # Save
         with open(output_file, 'w', encoding='utf-8') as f:
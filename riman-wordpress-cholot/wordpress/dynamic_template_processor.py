@@ -4,50 +4,60 @@ Dynamic Template Processor - Adapts template structure based on input data
 Can add/remove/duplicate widgets as needed
 """
 
-import json
+import sys
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 from typing import Dict, Any, List
 from copy import deepcopy
-import uuid
 import re
 
+import json_backend
+from elementor_clone import clone_element
+from elementor_document import ElementorDocument
+from elementor_ids import ElementorIDAllocator, ContentIDAssigner
+from page_stats import collect_page_stats
+from wxr_serializer import write_wxr
+
 class DynamicTemplateProcessor:
-    def __init__(self):
+    def __init__(self, id_allocator: ElementorIDAllocator = None, content_ids: bool = False):
         self.template_path = '/Users/holgerbrandt/Downloads/elementor-1482-2025-08-27.json'
+        self.id_allocator = id_allocator if id_allocator is not None else ElementorIDAllocator()
+        # Opt-in: once the page is assembled, replace template and clone IDs with
+        # IDs derived from path + content
+        self.content_ids = content_ids
         
     def load_template(self) -> dict:
         """Load the full Elementor template"""
         with open(self.template_path, 'r') as f:
-            return json.load(f)
+            template = json_backend.load(f)
+        
+        # Cloned widgets must not reuse IDs that are already in the template
+        self.id_allocator.reserve(self._collect_ids(template.get('content', [])))
+        return template
+    
+    def _collect_ids(self, elements: list):
+        """Yield every element ID in a tree"""
+        for element in elements:
+            if isinstance(element, dict):
+                if 'id' in element:
+                    yield element['id']
+                yield from self._collect_ids(element.get('elements', []))
     
     def generate_unique_id(self) -> str:
         """Generate unique Elementor element ID"""
-        return uuid.uuid4().hex[:7]
+        return self.id_allocator.allocate()
     
     def clone_widget(self, widget: dict) -> dict:
-        """Clone a widget with new unique IDs"""
-        cloned = deepcopy(widget)
-        cloned['id'] = self.generate_unique_id()
-        
-        # Recursively update IDs in nested elements
-        if 'elements' in cloned:
-            for element in cloned['elements']:
-                self._update_element_ids(element)
-        
-        return cloned
-    
-    def _update_element_ids(self, element: dict):
-        """Recursively update element IDs"""
-        element['id'] = self.generate_unique_id()
-        if 'elements' in element:
-            for child in element['elements']:
-                self._update_element_ids(child)
-    
-    def find_section_by_content(self, sections: List, content_type: str) -> tuple:
-        """Find a section that contains specific widget types"""
+        """Clone a widget with new unique IDs
+        
+        Element dicts and their settings dicts are copied, setting values are
+        shared with the template widget - replace them, don't mutate them.
+        """
+        return clone_element(widget, self.generate_unique_id)
+    
+    def find_section_by_content(self, sections, content_type: str) -> tuple:
+        """Find a section that contains specific widget types (sections: list or ElementorDocument)"""
         widget_map = {
             'hero': ['cholot-slider'],
             'services': ['cholot-texticon', 'cholot-iconbox'],
@@ -59,29 +69,9 @@ class DynamicTemplateProcessor:
         
         target_widgets = widget_map.get(content_type, [])
         
-        for i, section in enumerate(sections):
-            if self._section_contains_widgets(section, target_widgets):
-                return i, section
-        
-        return None, None
-    
-    def _section_contains_widgets(self, section: dict, widget_types: List[str]) -> bool:
-        """Check if section contains any of the specified widget types"""
-        def search_widgets(element):
-            if isinstance(element, dict):
-                if element.get('widgetType') in widget_types:
-                    return True
-                if 'elements' in element:
-                    for child in element['elements']:
-                        if search_widgets(child):
-                            return True
-            elif isinstance(element, list):
-                for item in element:
-                    if search_widgets(item):
-                        return True
-            return False
-        
-        return search_widgets(section)
+        if not isinstance(sections, ElementorDocument):
+            sections = ElementorDocument(sections)
+        return sections.find_section(target_widgets)
     
     def process_yaml_to_elementor(self, yaml_path: str) -> tuple[Dict, List]:
         """Dynamically convert YAML to Elementor structure"""
@@ -104,12 +94,19 @@ class DynamicTemplateProcessor:
         else:
             main_sections = []
         
+        # Index the sections once; every lookup and edit below goes through it
+        document = ElementorDocument(main_sections)
+        
         # Process each section type from YAML
         pages = config.get('pages', [])
         if pages:
             page = pages[0]
             for section_config in page.get('sections', []):
-                self._process_section(main_sections, section_config, template)
+                self._process_section(document, section_config, template)
+        
+        if self.content_ids:
+            slug = pages[0].get('slug', 'home') if pages else 'home'
+            ContentIDAssigner().assign(elementor_data, namespace=slug)
         
         return config, elementor_data
     
@@ -122,121 +119,77 @@ class DynamicTemplateProcessor:
             'elements': []
         }]
     
-    def _process_section(self, sections: List, section_config: Dict, template: Dict):
+    def _process_section(self, document: ElementorDocument, section_config: Dict, template: Dict):
         """Process a section from config and adapt template accordingly"""
         section_type = section_config.get('type')
         
         if section_type == 'hero_slider':
-            self._process_hero_section(sections, section_config, template)
+            self._process_hero_section(document, section_config, template)
         elif section_type == 'service_cards':
-            self._process_services_section(sections, section_config, template)
+            self._process_services_section(document, section_config, template)
         elif section_type == 'team':
-            self._process_team_section(sections, section_config, template)
+            self._process_team_section(document, section_config, template)
         elif section_type == 'testimonials':
-            self._process_testimonials_section(sections, section_config, template)
+            self._process_testimonials_section(document, section_config, template)
         elif section_type == 'about':
-            self._process_about_section(sections, section_config, template)
+            self._process_about_section(document, section_config, template)
         elif section_type == 'services_grid':
-            self._process_services_grid(sections, section_config, template)
+            self._process_services_grid(document, section_config, template)
         elif section_type == 'contact':
-            self._process_contact_section(sections, section_config, template)
+            self._process_contact_section(document, section_config, template)
     
-    def _process_services_section(self, sections: List, config: Dict, template: Dict):
+    def _process_services_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Dynamically process services - add more if needed"""
         services = config.get('services', [])
         if not services:
             return
         
         # Find existing services section
-        section_idx, section = self.find_section_by_content(sections, 'services')
+        section_idx, section = self.find_section_by_content(document, 'services')
         
         if section is None:
             # Create new services section if not found
             section = self._create_services_section_structure(len(services))
-            sections.append(section)
-            section_idx = len(sections) - 1
+            section_idx = document.append_section(section)
         
         # Find service widgets in the section
-        service_widgets = self._find_widgets_in_section(section, ['cholot-texticon', 'cholot-iconbox'])
+        service_widgets = document.widgets(['cholot-texticon', 'cholot-iconbox'], section=section_idx)
         
         # If we need more widgets than exist, clone them
         if len(services) > len(service_widgets):
             # Find a template widget to clone
             if service_widgets:
                 template_widget = service_widgets[0]
-                parent_column = self._find_widget_parent(section, template_widget)
                 
                 # Calculate how many columns we need
                 columns_needed = (len(services) + 1) // 2  # 2 widgets per column
-                current_columns = self._count_columns_in_section(section)
+                current_columns = len(document.children(section, 'column'))
                 
                 if columns_needed > current_columns:
                     # Need to add more columns
-                    self._add_columns_to_section(section, columns_needed - current_columns, template_widget)
+                    self._add_columns_to_section(document, section, columns_needed - current_columns, template_widget)
                 
                 # Now distribute widgets across columns
-                self._distribute_service_widgets(section, services, template_widget)
+                self._distribute_service_widgets(document, section, services, template_widget)
             else:
                 # No template widgets found, create from scratch
-                self._create_service_widgets_from_scratch(section, services)
+                self._create_service_widgets_from_scratch(document, section, services)
         else:
             # Just update existing widgets
             for widget, service in zip(service_widgets[:len(services)], services):
                 self._update_service_widget(widget, service)
     
-    def _find_widgets_in_section(self, section: dict, widget_types: List[str]) -> List[dict]:
-        """Find all widgets of specified types in a section"""
-        widgets = []
-        
-        def search(element):
-            if isinstance(element, dict):
-                if element.get('widgetType') in widget_types:
-                    widgets.append(element)
-                if 'elements' in element:
-                    for child in element['elements']:
-                        search(child)
-            elif isinstance(element, list):
-                for item in element:
-                    search(item)
-        
-        search(section)
-        return widgets
-    
-    def _find_widget_parent(self, root: dict, target_widget: dict) -> dict:
-        """Find the parent element of a widget"""
-        def search(element, parent=None):
-            if element == target_widget:
-                return parent
-            if isinstance(element, dict) and 'elements' in element:
-                for child in element['elements']:
-                    result = search(child, element)
-                    if result:
-                        return result
-            return None
-        
-        return search(root)
-    
-    def _count_columns_in_section(self, section: dict) -> int:
-        """Count columns in a section"""
-        if 'elements' in section:
-            # First level elements in a section are usually columns
-            return len([e for e in section['elements'] if e.get('elType') == 'column'])
-        return 0
-    
-    def _add_columns_to_section(self, section: dict, count: int, template_widget: dict):
+    def _add_columns_to_section(self, document: ElementorDocument, section: dict, count: int, template_widget: dict):
         """Add more columns to a section"""
-        if 'elements' not in section:
-            section['elements'] = []
-        
         # Find existing column structure
-        existing_columns = [e for e in section['elements'] if e.get('elType') == 'column']
+        existing_columns = document.children(section, 'column')
         
         if existing_columns:
             # Clone existing column
             template_column = existing_columns[0]
             for _ in range(count):
                 new_column = self.clone_widget(template_column)
-                section['elements'].append(new_column)
+                document.append_child(section, new_column)
         else:
             # Create new columns
             for _ in range(count):
@@ -248,18 +201,19 @@ class DynamicTemplateProcessor:
                     },
                     'elements': []
                 }
-                section['elements'].append(column)
+                document.append_child(section, column)
     
-    def _distribute_service_widgets(self, section: dict, services: List[Dict], template_widget: dict):
+    def _distribute_service_widgets(self, document: ElementorDocument, section: dict, services: List[Dict],
+                                    template_widget: dict):
         """Distribute service widgets across columns"""
-        columns = [e for e in section.get('elements', []) if e.get('elType') == 'column']
+        columns = document.children(section, 'column')
         
         if not columns:
             return
         
         # Clear existing widgets
         for column in columns:
-            column['elements'] = []
+            document.clear_children(column)
         
         # Distribute services across columns
         services_per_column = max(1, (len(services) + len(columns) - 1) // len(columns))
@@ -271,7 +225,7 @@ class DynamicTemplateProcessor:
             # Clone template widget
             new_widget = self.clone_widget(template_widget)
             self._update_service_widget(new_widget, service)
-            column['elements'].append(new_widget)
+            document.append_child(column, new_widget)
     
     def _update_service_widget(self, widget: dict, service: Dict):
         """Update a service widget with content"""
@@ -325,9 +279,9 @@ class DynamicTemplateProcessor:
         
         return section
     
-    def _create_service_widgets_from_scratch(self, section: dict, services: List[Dict]):
+    def _create_service_widgets_from_scratch(self, document: ElementorDocument, section: dict, services: List[Dict]):
         """Create service widgets from scratch when no template exists"""
-        columns = [e for e in section.get('elements', []) if e.get('elType') == 'column']
+        columns = document.children(section, 'column')
         
         services_per_column = max(1, (len(services) + len(columns) - 1) // len(columns))
         
@@ -356,35 +310,35 @@ class DynamicTemplateProcessor:
                     'id': ''
                 }
             
-            column['elements'].append(widget)
+            document.append_child(column, widget)
     
-    def _process_team_section(self, sections: List, config: Dict, template: Dict):
+    def _process_team_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Dynamically process team members"""
         members = config.get('members', [])
         if not members:
             return
         
-        section_idx, section = self.find_section_by_content(sections, 'team')
+        section_idx, section = self.find_section_by_content(document, 'team')
         
         if section is None:
             section = self._create_team_section_structure(len(members))
-            sections.append(section)
+            document.append_section(section)
         else:
             # Adapt existing section
-            team_widgets = self._find_widgets_in_section(section, ['cholot-team'])
+            team_widgets = document.widgets(['cholot-team'], section=section_idx)
             
             if len(members) > len(team_widgets) and team_widgets:
                 # Clone widgets as needed
                 template_widget = team_widgets[0]
-                parent = self._find_widget_parent(section, template_widget)
+                parent = document.parent(template_widget)
                 
                 for _ in range(len(members) - len(team_widgets)):
                     new_widget = self.clone_widget(template_widget)
                     if parent and 'elements' in parent:
-                        parent['elements'].append(new_widget)
+                        document.append_child(parent, new_widget)
             
             # Update all team widgets
-            team_widgets = self._find_widgets_in_section(section, ['cholot-team'])
+            team_widgets = document.widgets(['cholot-team'], section=section_idx)
             for widget, member in zip(team_widgets[:len(members)], members):
                 self._update_team_widget(widget, member)
     
@@ -454,29 +408,29 @@ class DynamicTemplateProcessor:
         
         return section
     
-    def _process_testimonials_section(self, sections: List, config: Dict, template: Dict):
+    def _process_testimonials_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Process testimonials dynamically"""
         testimonials = config.get('testimonials', [])
         if not testimonials:
             return
         
-        section_idx, section = self.find_section_by_content(sections, 'testimonials')
+        section_idx, section = self.find_section_by_content(document, 'testimonials')
         
         if section:
-            test_widgets = self._find_widgets_in_section(section, ['cholot-testimonial'])
+            test_widgets = document.widgets(['cholot-testimonial'], section=section_idx)
             
             # Clone or create widgets as needed
             if len(testimonials) > len(test_widgets) and test_widgets:
                 template_widget = test_widgets[0]
-                parent = self._find_widget_parent(section, template_widget)
+                parent = document.parent(template_widget)
                 
                 for _ in range(len(testimonials) - len(test_widgets)):
                     new_widget = self.clone_widget(template_widget)
                     if parent and 'elements' in parent:
-                        parent['elements'].append(new_widget)
+                        document.append_child(parent, new_widget)
             
             # Update widgets
-            test_widgets = self._find_widgets_in_section(section, ['cholot-testimonial'])
+            test_widgets = document.widgets(['cholot-testimonial'], section=section_idx)
             for widget, testimonial in zip(test_widgets[:len(testimonials)], testimonials):
                 self._update_testimonial_widget(widget, testimonial)
     
@@ -499,16 +453,16 @@ class DynamicTemplateProcessor:
         
         widget['settings'] = settings
     
-    def _process_hero_section(self, sections: List, config: Dict, template: Dict):
+    def _process_hero_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Process hero slider section"""
         slides = config.get('slides', [])
         if not slides:
             return
         
-        section_idx, section = self.find_section_by_content(sections, 'hero')
+        section_idx, section = self.find_section_by_content(document, 'hero')
         
         if section:
-            slider_widgets = self._find_widgets_in_section(section, ['cholot-slider'])
+            slider_widgets = document.widgets(['cholot-slider'], section=section_idx)
             
             for slider in slider_widgets:
                 if slides:
@@ -527,13 +481,13 @@ class DynamicTemplateProcessor:
                     
                     slider['settings'] = settings
     
-    def _process_about_section(self, sections: List, config: Dict, template: Dict):
+    def _process_about_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Process about section"""
-        section_idx, section = self.find_section_by_content(sections, 'about')
+        section_idx, section = self.find_section_by_content(document, 'about')
         
         if section:
-            title_widgets = self._find_widgets_in_section(section, ['cholot-title', 'heading'])
-            text_widgets = self._find_widgets_in_section(section, ['text-editor'])
+            title_widgets = document.widgets(['cholot-title', 'heading'], section=section_idx)
+            text_widgets = document.widgets(['text-editor'], section=section_idx)
             
             if config.get('title'):
                 for widget in title_widgets:
@@ -545,24 +499,24 @@ class DynamicTemplateProcessor:
             
             # Process features if present
             if config.get('features'):
-                self._process_features(section, config['features'])
+                self._process_features(document, section_idx, config['features'])
     
-    def _process_features(self, section: dict, features: List[Dict]):
+    def _process_features(self, document: ElementorDocument, section_idx: int, features: List[Dict]):
         """Process feature items within a section"""
-        icon_widgets = self._find_widgets_in_section(section, ['icon-box', 'cholot-iconbox'])
+        icon_widgets = document.widgets(['icon-box', 'cholot-iconbox'], section=section_idx)
         
         if len(features) > len(icon_widgets) and icon_widgets:
             # Clone widgets
             template_widget = icon_widgets[0]
-            parent = self._find_widget_parent(section, template_widget)
+            parent = document.parent(template_widget)
             
             for _ in range(len(features) - len(icon_widgets)):
                 new_widget = self.clone_widget(template_widget)
                 if parent and 'elements' in parent:
-                    parent['elements'].append(new_widget)
+                    document.append_child(parent, new_widget)
         
         # Update widgets
-        icon_widgets = self._find_widgets_in_section(section, ['icon-box', 'cholot-iconbox'])
+        icon_widgets = document.widgets(['icon-box', 'cholot-iconbox'], section=section_idx)
         for widget, feature in zip(icon_widgets[:len(features)], features):
             settings = widget.get('settings', {})
             settings['title_text'] = feature.get('title', '')
@@ -576,7 +530,7 @@ class DynamicTemplateProcessor:
             
             widget['settings'] = settings
     
-    def _process_services_grid(self, sections: List, config: Dict, template: Dict):
+    def _process_services_grid(self, document: ElementorDocument, config: Dict, template: Dict):
         """Process grid-style services"""
         services = config.get('services', [])
         if not services:
@@ -634,15 +588,15 @@ class DynamicTemplateProcessor:
             icon_list['settings']['icon_list'].append(item)
         
         grid_section['elements'][0]['elements'].append(icon_list)
-        sections.append(grid_section)
+        document.append_section(grid_section)
     
-    def _process_contact_section(self, sections: List, config: Dict, template: Dict):
+    def _process_contact_section(self, document: ElementorDocument, config: Dict, template: Dict):
         """Process contact section"""
-        section_idx, section = self.find_section_by_content(sections, 'contact')
+        section_idx, section = self.find_section_by_content(document, 'contact')
         
         if section:
             # Update contact widgets
-            contact_widgets = self._find_widgets_in_section(section, ['cholot-contact'])
+            contact_widgets = document.widgets(['cholot-contact'], section=section_idx)
             
             for widget in contact_widgets:
                 settings = widget.get('settings', {})
@@ -702,20 +656,9 @@ class DynamicTemplateProcessor:
         # Add Page with Elementor data
         self._add_page_item(channel, config, elementor_data)
         
-        # Format and save XML
-        xml_string = ET.tostring(rss, encoding='unicode')
-        
-        # Pretty print
-        dom = minidom.parseString(xml_string)
-        pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-        
-        # Clean and write
-        lines = pretty_xml.decode('utf-8').split('\n')
-        clean_lines = [line for line in lines if line.strip()]
-        clean_xml = '\n'.join(clean_lines)
-        
+        # Format and save XML in a single pass
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(clean_xml)
+            write_wxr(rss, f)
         
         return output_path
     
@@ -799,7 +742,7 @@ class DynamicTemplateProcessor:
             ('_elementor_edit_mode', 'builder'),
             ('_elementor_template_type', 'kit'),
             ('_elementor_version', '3.15.0'),
-            ('_elementor_page_settings', json.dumps(kit_settings))
+            ('_elementor_page_settings', json_backend.dumps(kit_settings))
         ]:
             meta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
             ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_key').text = key
@@ -859,8 +802,8 @@ class DynamicTemplateProcessor:
             ('_elementor_template_type', 'wp-page'),
             ('_elementor_version', '3.15.0'),
             ('_elementor_pro_version', '3.15.0'),
-            ('_elementor_data', json.dumps(elementor_data)),
-            ('_elementor_page_settings', json.dumps(page_settings) if page_settings else '[]'),
+            ('_elementor_data', json_backend.dumps(elementor_data)),
+            ('_elementor_page_settings', json_backend.dumps(page_settings) if page_settings else '[]'),
             ('_wp_page_template', page.get('template', 'elementor_canvas'))
         ]:
             meta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
@@ -879,16 +822,16 @@ def main():
     print("🚀 Dynamic Template Processor")
     print("=" * 50)
     
-    processor = DynamicTemplateProcessor()
+    processor = DynamicTemplateProcessor(content_ids='--content-ids' in sys.argv)
     
     # Process YAML dynamically
     config, elementor_data = processor.process_yaml_to_elementor('riman_input.yaml')
     
     # Save Elementor JSON
     with open('riman_dynamic.json', 'w') as f:
-        json.dump({'content': elementor_data}, f, indent=2)
+        json_backend.dump({'content': elementor_data}, f, indent=2)
     
-    print(f"✅ Generated dynamic Elementor JSON: {len(json.dumps(elementor_data))} characters")
+    print(f"✅ Generated dynamic Elementor JSON: {len(json_backend.dumps(elementor_data))} characters")
     
     # Generate WordPress XML
     output_path = processor.generate_wordpress_xml(config, elementor_data, 'riman_dynamic.xml')
@@ -899,19 +842,8 @@ def main():
     print(f"📄 XML file size: {file_size / 1024:.1f} KB")
     
     # Count widgets
-    def count_widgets(data, count=0):
-        if isinstance(data, dict):
-            if 'widgetType' in data:
-                count += 1
-            for v in data.values():
-                count = count_widgets(v, count)
-        elif isinstance(data, list):
-            for item in data:
-                count = count_widgets(item, count)
-        return count
-    
-    widget_count = count_widgets(elementor_data)
-    print(f"🎨 Total widgets: {widget_count}")
+    stats = collect_page_stats(elementor_data)
+    print(f"🎨 Total widgets: {stats.widget_count}")
     print(f"✅ Dynamic WordPress XML generated: {output_path}")
 
 
@@ -7,11 +7,12 @@ Ermöglicht das Ändern von Inhalten über YAML-Config
 import yaml
 import json
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
 from datetime import datetime
 import re
 
+from wxr_serializer import wxr_to_string
+
 class EditableContentGenerator:
     def __init__(self, yaml_file, xml_output):
         self.yaml_file = Path(yaml_file)
@@ -90,14 +91,8 @@ class EditableContentGenerator:
         for menu_config in self.config.get('menus', []):
             self.add_menu_items(channel, menu_config)
         
-        # Pretty print
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        
-        # Clean up empty lines
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        final_xml = '\n'.join(lines)
+        # Pretty print in a single pass
+        final_xml = wxr_to_string(root, indent="  ")
         
         # Save
         with open(self.xml_output, 'w', encoding='utf-8') as f:
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Structural-Sharing Clones
+=========================
+
+Cloning a widget, column or section used to ``deepcopy`` the whole subtree,
+including every settings value (typography dicts, repeater lists, image
+objects), even though the caller only went on to change a few top-level
+settings keys and the element IDs.
+
+The helpers here copy only the containers on the path to something that
+changes and share everything else with the original.
+
+Features:
+- clone_element(element, id_factory): fresh element dicts, ``elements``
+  lists and ``settings`` dicts along the element tree; setting values are
+  shared with the original
+- replace_strings(node, replace): rewrite string leaves, copying only the
+  dicts/lists above a string that actually changed
+- replace_key(node, key, make_value): give every dict holding ``key`` a new
+  value, copying only those dicts and their ancestors
+
+Contract: shared values must be replaced, not mutated in place. Assigning
+``clone['settings']['title'] = ...`` is fine; ``clone['settings']['image']['url'] = ...``
+would also change the original. The JSON output is the same as with
+``deepcopy``.
+
+Usage:
+    clone = clone_element(widget, allocator.allocate)
+    clone['settings']['title'] = 'Asbestsanierung'
+"""
+
+from typing import Any, Callable, Optional
+
+
+def clone_element(element: dict, id_factory: Optional[Callable[[], str]] = None) -> dict:
+    """Copy an element tree, sharing setting values with the original
+
+    With ``id_factory``, every element gets a new ``id`` in document order.
+    """
+    clone = dict(element)
+    if id_factory is not None:
+        clone['id'] = id_factory()
+    settings = clone.get('settings')
+    if isinstance(settings, dict):
+        clone['settings'] = dict(settings)
+    children = clone.get('elements')
+    if isinstance(children, list):
+        clone['elements'] = [clone_element(child, id_factory) if isinstance(child, dict) else child
+                             for child in children]
+    return clone
+
+
+def replace_strings(node: Any, replace: Callable[[str], str]) -> Any:
+    """Return ``node`` with ``replace`` applied to every string value (dict keys are left alone)
+
+    Subtrees without a changed string are returned as they are.
+    """
+    if isinstance(node, str):
+        result = replace(node)
+        return node if result == node else result
+    if isinstance(node, dict):
+        clone = None
+        for key, value in node.items():
+            result = replace_strings(value, replace)
+            if result is not value:
+                if clone is None:
+                    clone = dict(node)
+                clone[key] = result
+        return node if clone is None else clone
+    if isinstance(node, list):
+        clone = None
+        for index, value in enumerate(node):
+            result = replace_strings(value, replace)
+            if result is not value:
+                if clone is None:
+                    clone = list(node)
+                clone[index] = result
+        return node if clone is None else clone
+    return node
+
+
+def replace_key(node: Any, key: str, make_value: Callable[[], Any]) -> Any:
+    """Return ``node`` with every dict that holds ``key`` given ``make_value()``
+
+    Dicts are visited before their values, in order, so the values come out
+    in the same sequence as an in-place rewrite of a deep copy.
+    """
+    if isinstance(node, dict):
+        clone = None
+        if key in node:
+            clone = dict(node)
+            clone[key] = make_value()
+        for name, value in node.items():
+            if name == key:
+                continue
+            result = replace_key(value, key, make_value)
+            if result is not value:
+                if clone is None:
+                    clone = dict(node)
+                clone[name] = result
+        return node if clone is None else clone
+    if isinstance(node, list):
+        clone = None
+        for index, value in enumerate(node):
+            result = replace_key(value, key, make_value)
+            if result is not value:
+                if clone is None:
+                    clone = list(node)
+                clone[index] = result
+        return node if clone is None else clone
+    return node
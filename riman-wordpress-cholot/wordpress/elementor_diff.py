@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Elementor Tree Diff
+===================
+
+Semantic diff of two Elementor element trees (the parsed ``_elementor_data``
+of a page). Sections, columns and widgets are matched as nodes instead of
+comparing the JSON text line by line, and the result is a list of edit
+operations:
+
+- insert: element (and its subtree) only in the new tree
+- delete: element (and its subtree) only in the old tree
+- move:   element under a different parent, or reordered among its siblings
+- update: matched element whose settings changed (added/removed/changed keys)
+
+Matching runs in phases, each one a dictionary lookup per node, so a diff
+is near-linear in the number of elements:
+
+1. Same ``id`` (unique on both sides, same element type)
+2. Identical subtree hash (type + settings + children, IDs ignored); the
+   descendants of a matched subtree are paired with it
+3. Identical own content (type + settings)
+4. Remaining children of matched parents, paired in order by element type
+
+Reorders are found with a longest increasing subsequence over the matched
+children of each parent (O(n log n)), so only the elements that actually
+moved are reported.
+
+Usage:
+    diff = diff_elementor(reference_data, generated_data)
+    diff.summary()   # -> {'insert': 2, 'delete': 0, 'move': 1, 'update': 4, ...}
+    for operation in diff.operations:
+        print(operation.describe())
+"""
+
+import bisect
+import hashlib
+import json
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import json_backend
+
+OPERATION_TYPES = ('insert', 'delete', 'move', 'update')
+
+ElementorData = Union[str, bytes, List[dict]]
+
+
+def _without_repeater_ids(value: Any) -> Any:
+    """Repeater items get fresh ``_id`` values on every generation run; they are not content."""
+    if isinstance(value, dict):
+        return {k: _without_repeater_ids(v) for k, v in value.items() if k != '_id'}
+    if isinstance(value, list):
+        return [_without_repeater_ids(v) for v in value]
+    return value
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+class _Node:
+    """One element of a flattened tree."""
+    __slots__ = ('element', 'id', 'kind', 'path', 'parent', 'index', 'children',
+                 'settings', 'content_digest', 'subtree_digest', 'size', 'partner')
+
+    def __init__(self, element: dict, parent: Optional['_Node'], index: int):
+        self.element = element
+        self.id = element.get('id')
+        self.kind = element.get('widgetType') or element.get('elType') or 'unknown'
+        self.path = f"{parent.path}/{self.kind}[{index}]" if parent is not None else f"{self.kind}[{index}]"
+        self.parent = parent
+        self.index = index
+        self.children: List['_Node'] = []
+        settings = element.get('settings')
+        self.settings = settings if isinstance(settings, dict) else {}
+        self.content_digest = ''
+        self.subtree_digest = ''
+        self.size = 1
+        self.partner: Optional['_Node'] = None
+
+
+class _Tree:
+    """Flattened element tree in document (pre-)order."""
+
+    def __init__(self, elements: List[dict]):
+        self.roots: List[_Node] = []
+        self.nodes: List[_Node] = []
+        for index, element in enumerate(element for element in elements if isinstance(element, dict)):
+            self.roots.append(self._add(element, None, index))
+
+    def _add(self, element: dict, parent: Optional[_Node], index: int) -> _Node:
+        node = _Node(element, parent, index)
+        self.nodes.append(node)
+
+        children = element.get('elements')
+        if isinstance(children, list):
+            for child_index, child in enumerate(c for c in children if isinstance(c, dict)):
+                node.children.append(self._add(child, node, child_index))
+
+        own = f"{element.get('elType', '')}\0{element.get('widgetType', '')}\0" \
+              f"{_canonical(_without_repeater_ids(node.settings))}"
+        node.content_digest = hashlib.sha1(own.encode('utf-8')).hexdigest()
+        node.subtree_digest = hashlib.sha1(
+            (node.content_digest + ''.join(child.subtree_digest for child in node.children)).encode('ascii')
+        ).hexdigest()
+        node.size += sum(child.size for child in node.children)
+        return node
+
+
+@dataclass
+class DiffOperation:
+    """One edit between the old and the new tree."""
+    op: str
+    kind: str
+    old_id: Optional[str] = None
+    new_id: Optional[str] = None
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    size: int = 1
+    changes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        """One-line human readable form"""
+        if self.op == 'insert':
+            return f"+ {self.new_path} ({self.size} element{'s' if self.size != 1 else ''})"
+        if self.op == 'delete':
+            return f"- {self.old_path} ({self.size} element{'s' if self.size != 1 else ''})"
+        if self.op == 'move':
+            return f"~ {self.old_path} -> {self.new_path}"
+        keys = ', '.join(sorted(self.changes))
+        return f"* {self.new_path}: {keys}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in self.__dict__.items() if value not in (None, {})}
+
+
+@dataclass
+class ElementorDiff:
+    """Result of ``diff_elementor``"""
+    operations: List[DiffOperation]
+    old_count: int
+    new_count: int
+    matched: int
+
+    @property
+    def identical(self) -> bool:
+        return not self.operations
+
+    @property
+    def similarity(self) -> float:
+        """Share of elements matched and left unchanged, between 0 and 1"""
+        total = max(self.old_count, self.new_count)
+        if total == 0:
+            return 1.0
+        changed = sum(1 for op in self.operations if op.op in ('move', 'update'))
+        return max(0.0, (self.matched - changed * 0.5) / total)
+
+    def by_type(self, op: str) -> List[DiffOperation]:
+        return [operation for operation in self.operations if operation.op == op]
+
+    def summary(self) -> Dict[str, Any]:
+        counts = {op: 0 for op in OPERATION_TYPES}
+        for operation in self.operations:
+            counts[operation.op] += 1
+        counts.update({'old_elements': self.old_count, 'new_elements': self.new_count,
+                       'matched': self.matched, 'similarity': round(self.similarity * 100, 1)})
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'summary': self.summary(), 'operations': [op.to_dict() for op in self.operations]}
+
+
+def _load(data: ElementorData) -> List[dict]:
+    if isinstance(data, (str, bytes)):
+        data = json_backend.loads(data)
+    if isinstance(data, dict):
+        data = [data]
+    return data if isinstance(data, list) else []
+
+
+def _pair(old: _Node, new: _Node):
+    old.partner = new
+    new.partner = old
+
+
+def _compatible(old: _Node, new: _Node) -> bool:
+    return old.kind == new.kind and old.element.get('elType') == new.element.get('elType')
+
+
+def _match_ids(old_tree: _Tree, new_tree: _Tree):
+    new_by_id: Dict[str, List[_Node]] = defaultdict(list)
+    for node in new_tree.nodes:
+        if node.id:
+            new_by_id[node.id].append(node)
+    old_id_counts: Dict[str, int] = defaultdict(int)
+    for node in old_tree.nodes:
+        if node.id:
+            old_id_counts[node.id] += 1
+
+    for node in old_tree.nodes:
+        candidates = new_by_id.get(node.id) if node.id else None
+        if candidates and len(candidates) == 1 and old_id_counts[node.id] == 1 \
+                and _compatible(node, candidates[0]):
+            _pair(node, candidates[0])
+
+
+def _match_by_digest(old_tree: _Tree, new_tree: _Tree, attribute: str, with_descendants: bool):
+    buckets: Dict[str, deque] = defaultdict(deque)
+    for node in new_tree.nodes:
+        if node.partner is None:
+            buckets[getattr(node, attribute)].append(node)
+
+    # Pre-order: the largest identical subtrees are claimed first
+    for node in old_tree.nodes:
+        if node.partner is not None:
+            continue
+        bucket = buckets.get(getattr(node, attribute))
+        while bucket and bucket[0].partner is not None:
+            bucket.popleft()
+        if not bucket:
+            continue
+        partner = bucket.popleft()
+        _pair(node, partner)
+        if with_descendants:
+            _pair_descendants(node, partner)
+
+
+def _pair_descendants(old: _Node, new: _Node):
+    """Identical subtrees have the same shape; pair nodes that are still free"""
+    stack = list(zip(old.children, new.children))
+    while stack:
+        old_child, new_child = stack.pop()
+        if old_child.partner is None and new_child.partner is None:
+            _pair(old_child, new_child)
+        stack.extend(zip(old_child.children, new_child.children))
+
+
+def _match_children_by_type(old_tree: _Tree):
+    """Elements whose ID and content both changed, kept in place under a matched parent"""
+    for node in old_tree.nodes:
+        partner = node.partner
+        if partner is None:
+            continue
+        free: Dict[str, deque] = defaultdict(deque)
+        for child in partner.children:
+            if child.partner is None:
+                free[child.kind].append(child)
+        if not free:
+            continue
+        for child in node.children:
+            if child.partner is None and free.get(child.kind):
+                _pair(child, free[child.kind].popleft())
+
+
+def _match_roots_by_type(old_tree: _Tree, new_tree: _Tree):
+    """Top-level sections have no parent to anchor them; pair them in order by type"""
+    free: Dict[str, deque] = defaultdict(deque)
+    for root in new_tree.roots:
+        if root.partner is None:
+            free[root.kind].append(root)
+    for root in old_tree.roots:
+        if root.partner is None and free.get(root.kind):
+            _pair(root, free[root.kind].popleft())
+
+
+def _longest_increasing(sequence: List[int]) -> set:
+    """Positions (into ``sequence``) of one longest strictly increasing subsequence"""
+    tails: List[int] = []
+    tail_positions: List[int] = []
+    previous = [-1] * len(sequence)
+    for position, value in enumerate(sequence):
+        slot = bisect.bisect_left(tails, value)
+        if slot > 0:
+            previous[position] = tail_positions[slot - 1]
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+    kept = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        kept.add(position)
+        position = previous[position]
+    return kept
+
+
+def _settings_changes(old: dict, new: dict) -> Dict[str, Dict[str, Any]]:
+    changes = {}
+    for key in old.keys() | new.keys():
+        if key not in new:
+            changes[key] = {'old': old[key]}
+        elif key not in old:
+            changes[key] = {'new': new[key]}
+        elif old[key] != new[key] and _without_repeater_ids(old[key]) != _without_repeater_ids(new[key]):
+            changes[key] = {'old': old[key], 'new': new[key]}
+    return changes
+
+
+def _operations(old_tree: _Tree, new_tree: _Tree) -> List[DiffOperation]:
+    operations: List[DiffOperation] = []
+
+    for node in old_tree.nodes:
+        if node.partner is None and (node.parent is None or node.parent.partner is not None):
+            operations.append(DiffOperation('delete', node.kind, old_id=node.id,
+                                            old_path=node.path, size=node.size))
+
+    # Siblings that kept their parent: anything outside the longest run in
+    # old order was reordered
+    reordered = set()
+    for siblings in [new_tree.roots] + [node.children for node in new_tree.nodes]:
+        stayed = [child for child in siblings
+                  if child.partner is not None and _same_parent(child.partner, child)]
+        if len(stayed) > 1:
+            kept = _longest_increasing([child.partner.index for child in stayed])
+            reordered.update(id(child) for position, child in enumerate(stayed) if position not in kept)
+
+    for node in new_tree.nodes:
+        old = node.partner
+        if old is None:
+            if node.parent is None or node.parent.partner is not None:
+                operations.append(DiffOperation('insert', node.kind, new_id=node.id,
+                                                new_path=node.path, size=node.size))
+            continue
+        if not _same_parent(old, node) or id(node) in reordered:
+            operations.append(DiffOperation('move', node.kind, old_id=old.id, new_id=node.id,
+                                            old_path=old.path, new_path=node.path))
+        if old.content_digest != node.content_digest:
+            changes = _settings_changes(old.settings, node.settings)
+            if changes:
+                operations.append(DiffOperation('update', node.kind, old_id=old.id, new_id=node.id,
+                                                old_path=old.path, new_path=node.path, changes=changes))
+    return operations
+
+
+def _same_parent(old: _Node, new: _Node) -> bool:
+    if old.parent is None or new.parent is None:
+        return old.parent is None and new.parent is None
+    return old.parent.partner is new.parent
+
+
+def diff_elementor(old_data: ElementorData, new_data: ElementorData) -> ElementorDiff:
+    """
+    Diff two Elementor element trees. Either side may be a JSON string, bytes
+    (as stored in ``_elementor_data``) or the parsed list of sections.
+    """
+    old_tree = _Tree(_load(old_data))
+    new_tree = _Tree(_load(new_data))
+
+    _match_ids(old_tree, new_tree)
+    _match_by_digest(old_tree, new_tree, 'subtree_digest', with_descendants=True)
+    _match_by_digest(old_tree, new_tree, 'content_digest', with_descendants=False)
+    _match_roots_by_type(old_tree, new_tree)
+    _match_children_by_type(old_tree)
+
+    matched = sum(1 for node in old_tree.nodes if node.partner is not None)
+    return ElementorDiff(_operations(old_tree, new_tree), len(old_tree.nodes), len(new_tree.nodes), matched)
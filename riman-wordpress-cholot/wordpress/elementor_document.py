@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Elementor Document
+==================
+
+Indexed view over an Elementor element tree (a list of sections, each with
+nested ``elements``). The template processors used to answer every query by
+walking the tree again, and found a widget's parent by comparing every
+element to it with ``==`` (a deep comparison of whole subtrees).
+
+``ElementorDocument`` indexes the tree once and keeps the indexes current
+as elements are added or removed through it.
+
+Features:
+- ID -> element and element -> parent lookups in O(1)
+- widgetType -> elements, per top-level section and in document order
+- Section ordinals: which top-level section an element belongs to
+- Edits (append/insert/remove/clear) update the ID and parent indexes
+  straight away; the type index of the affected section is rebuilt on
+  the next query that needs it, so a batch of edits costs one section
+  walk instead of one full walk per query
+
+The document wraps the caller's dicts and lists; it never copies them.
+Changes made to the tree without going through the document are not
+seen by the indexes (call ``reindex()`` afterwards).
+
+Usage:
+    document = ElementorDocument(elementor_data)
+    ordinal, section = document.find_section(['cholot-texticon'])
+    widgets = document.widgets(['cholot-texticon'], section=ordinal)
+    column = document.parent(widgets[0])
+    document.append_child(column, clone)
+"""
+
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class ElementorDocument:
+    """ID, parent, widget type and section indexes over an Elementor element list"""
+
+    def __init__(self, elements: List[dict]):
+        self.elements = elements
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild every index from the current tree in one pass"""
+        self._by_id: Dict[str, dict] = {}
+        self._parents: Dict[int, Optional[dict]] = {}
+        self._section_of: Dict[int, int] = {}
+        # Document position of each element, to merge several type lists
+        self._order: Dict[int, int] = {}
+        self._types: List[Dict[str, List[dict]]] = []
+        self._dirty: Set[int] = set()
+
+        for ordinal, section in enumerate(self.elements):
+            self._types.append({})
+            if isinstance(section, dict):
+                self._index(section, None, ordinal)
+
+    def _index(self, element: dict, parent: Optional[dict], ordinal: int):
+        stack = [(element, parent)]
+        types = self._types[ordinal]
+        while stack:
+            node, node_parent = stack.pop()
+            self._parents[id(node)] = node_parent
+            self._section_of[id(node)] = ordinal
+            self._order[id(node)] = len(self._order)
+            if node.get('id'):
+                self._by_id.setdefault(node['id'], node)
+            widget_type = node.get('widgetType')
+            if widget_type:
+                types.setdefault(widget_type, []).append(node)
+            children = node.get('elements')
+            if isinstance(children, list):
+                # Reversed so nodes come off the stack in document order
+                stack.extend((child, node) for child in reversed(children) if isinstance(child, dict))
+
+    def _unindex(self, element: dict):
+        for node in _walk(element):
+            self._parents.pop(id(node), None)
+            self._section_of.pop(id(node), None)
+            self._order.pop(id(node), None)
+            if node.get('id') and self._by_id.get(node['id']) is node:
+                del self._by_id[node['id']]
+
+    def _section_types(self, ordinal: int) -> Dict[str, List[dict]]:
+        if ordinal in self._dirty:
+            self._dirty.discard(ordinal)
+            types: Dict[str, List[dict]] = {}
+            for position, node in enumerate(_walk(self.elements[ordinal])):
+                self._order[id(node)] = position
+                widget_type = node.get('widgetType')
+                if widget_type:
+                    types.setdefault(widget_type, []).append(node)
+            self._types[ordinal] = types
+        return self._types[ordinal]
+
+    # Lookups
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __contains__(self, element: dict) -> bool:
+        return id(element) in self._parents
+
+    def get(self, element_id: str) -> Optional[dict]:
+        """Element with this ``id`` (the first one, if IDs repeat)"""
+        return self._by_id.get(element_id)
+
+    def parent(self, element: dict) -> Optional[dict]:
+        """Parent element, or None for top-level sections and unknown elements"""
+        return self._parents.get(id(element))
+
+    def section_index(self, element: dict) -> Optional[int]:
+        """Ordinal of the top-level section the element belongs to"""
+        return self._section_of.get(id(element))
+
+    def section(self, ordinal: int) -> dict:
+        return self.elements[ordinal]
+
+    def widgets(self, widget_types: Iterable[str], section: Optional[int] = None) -> List[dict]:
+        """Widgets of any of the given types in document order, optionally within one section"""
+        widget_types = [widget_types] if isinstance(widget_types, str) else list(widget_types)
+        ordinals = [section] if section is not None else range(len(self.elements))
+        found = []
+        for ordinal in ordinals:
+            types = self._section_types(ordinal)
+            matches = [types[t] for t in widget_types if t in types]
+            if len(matches) == 1:
+                found.extend(matches[0])
+            elif matches:
+                # Each list is in document order; merge them
+                found.extend(heapq.merge(*matches, key=lambda node: self._order[id(node)]))
+        return found
+
+    def contains(self, ordinal: int, widget_types: Iterable[str]) -> bool:
+        """True if the section holds a widget of any of the given types"""
+        types = self._section_types(ordinal)
+        return any(types.get(t) for t in widget_types)
+
+    def find_section(self, widget_types: Iterable[str]) -> Tuple[Optional[int], Optional[dict]]:
+        """First top-level section containing any of the widget types"""
+        widget_types = list(widget_types)
+        for ordinal in range(len(self.elements)):
+            if self.contains(ordinal, widget_types):
+                return ordinal, self.elements[ordinal]
+        return None, None
+
+    def children(self, element: dict, el_type: Optional[str] = None) -> List[dict]:
+        """Direct children, optionally only those of one ``elType``"""
+        return [child for child in element.get('elements', [])
+                if isinstance(child, dict) and (el_type is None or child.get('elType') == el_type)]
+
+    # Edits
+
+    def append_section(self, section: dict) -> int:
+        """Add a top-level section; returns its ordinal"""
+        self.elements.append(section)
+        self._types.append({})
+        self._index(section, None, len(self.elements) - 1)
+        return len(self.elements) - 1
+
+    def append_child(self, parent: dict, child: dict) -> dict:
+        """Append ``child`` (and its subtree) to ``parent['elements']``"""
+        return self.insert_child(parent, len(parent.get('elements', [])), child)
+
+    def insert_child(self, parent: dict, index: int, child: dict) -> dict:
+        """Insert ``child`` (and its subtree) at ``index`` in ``parent['elements']``"""
+        ordinal = self._section_of[id(parent)]
+        parent.setdefault('elements', []).insert(index, child)
+        self._index(child, parent, ordinal)
+        # The new widgets were appended to the type lists; their order is
+        # restored on the next query of this section
+        self._dirty.add(ordinal)
+        return child
+
+    def remove(self, element: dict):
+        """Detach ``element`` (and its subtree) from its parent"""
+        parent = self._parents.get(id(element))
+        if parent is None:
+            raise ValueError("Top-level sections are removed with reindex() after editing the list")
+        ordinal = self._section_of[id(element)]
+        parent['elements'] = [child for child in parent['elements'] if child is not element]
+        self._unindex(element)
+        self._dirty.add(ordinal)
+
+    def clear_children(self, parent: dict):
+        """Remove every child of ``parent``"""
+        for child in parent.get('elements', []):
+            if isinstance(child, dict):
+                self._unindex(child)
+        parent['elements'] = []
+        self._dirty.add(self._section_of[id(parent)])
+
+
+def _walk(element: dict) -> Iterator[dict]:
+    """Element and its descendants in document order"""
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = node.get('elements')
+        if isinstance(children, list):
+            stack.extend(child for child in reversed(children) if isinstance(child, dict))
@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import copy
 
+import php_serialize
+
 # Import the section processor for Elementor data
 from section_based_processor import SectionBasedProcessor
 
@@ -397,7 +399,7 @@ class EnhancedSiteGenerator:
         
         meta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
         ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_key').text = '_wp_attachment_metadata'
-        ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_value').text = f'<![CDATA[a:1:{{s:4:"file";s:19:"2024/08/{filename}";}}]]>'
+        ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_value').text = f'<![CDATA[{php_serialize.dumps({"file": f"2024/08/{filename}"})}]]>'
         
         return item_id
     
@@ -8,6 +8,8 @@ import re
 import sys
 from pathlib import Path
 
+from text_rewriter import TextRewriter
+
 def fix_image_urls(json_file, output_file, new_base_url="http://localhost:8082"):
     """Fix all image URLs in Elementor JSON data."""
     
@@ -15,25 +17,24 @@ def fix_image_urls(json_file, output_file, new_base_url="http://localhost:8082")
     with open(json_file, 'r') as f:
         content = f.read()
     
-    # URL patterns to replace
-    replacements = [
+    # URLs to replace, plain and with JSON-escaped slashes
+    escaped_base_url = new_base_url.replace('/', '\\/')
+    rewriter = TextRewriter({
         # Replace localhost:8080 with new base URL
-        (r'http://localhost:8080', new_base_url),
-        (r'http:\\/\\/localhost:8080', new_base_url.replace('/', '\\/')),
+        'http://localhost:8080': new_base_url,
+        'http:\\/\\/localhost:8080': escaped_base_url,
         
         # Replace theme.winnertheme.com URLs
-        (r'https://theme\.winnertheme\.com/cholot', new_base_url),
-        (r'https:\\/\\/theme\\.winnertheme\\.com\\/cholot', new_base_url.replace('/', '\\/')),
+        'https://theme.winnertheme.com/cholot': new_base_url,
+        'https:\\/\\/theme.winnertheme.com\\/cholot': escaped_base_url,
         
         # Fix uploadz to uploads
-        (r'/uploadz/', '/uploads/'),
-        (r'\\/uploadz\\/', '\\/uploads\\/')
-    ]
+        '/uploadz/': '/uploads/',
+        '\\/uploadz\\/': '\\/uploads\\/',
+    })
     
-    # Apply replacements
-    fixed_content = content
-    for pattern, replacement in replacements:
-        fixed_content = re.sub(pattern, replacement, fixed_content)
+    # Apply replacements in one pass
+    fixed_content = rewriter.rewrite(content)
     
     # Parse to verify JSON is still valid
     try:
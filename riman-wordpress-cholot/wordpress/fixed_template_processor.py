@@ -7,18 +7,20 @@ import json
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 from typing import Dict, Any, List
 from copy import deepcopy
-import uuid
+
+from elementor_ids import ElementorIDAllocator
+from page_stats import collect_page_stats
+from wxr_serializer import write_wxr
 
 class FixedTemplateProcessor:
-    def __init__(self):
-        pass
+    def __init__(self, id_allocator: ElementorIDAllocator = None):
+        self.id_allocator = id_allocator if id_allocator is not None else ElementorIDAllocator()
     
     def generate_unique_id(self) -> str:
         """Generate unique Elementor element ID"""
-        return uuid.uuid4().hex[:7]
+        return self.id_allocator.allocate()
     
     def process_yaml_to_elementor(self, yaml_path: str) -> tuple[Dict, List]:
         """Convert YAML to clean Elementor structure"""
@@ -624,27 +626,9 @@ class FixedTemplateProcessor:
         # Add page
         self._add_page_item(channel, config, elementor_data)
         
-        # Format and save XML
-        xml_string = ET.tostring(rss, encoding='unicode')
-        
-        # Try to format nicely but handle parsing errors gracefully
-        try:
-            dom = minidom.parseString(xml_string)
-            pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-            
-            # Clean up extra blank lines
-            lines = pretty_xml.decode('utf-8').split('\n')
-            clean_lines = [line for line in lines if line.strip()]
-            clean_xml = '\n'.join(clean_lines)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(clean_xml)
-        except Exception as e:
-            print(f"Warning: Could not format XML nicely: {e}")
-            # Fallback: write unformatted XML
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-                f.write(xml_string)
+        # Format and save XML in a single pass
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_wxr(rss, f)
         
         return output_path
     
@@ -733,19 +717,8 @@ def main():
     print(f"📄 XML file size: {file_size / 1024:.1f} KB")
     
     # Count widgets
-    def count_widgets(data, count=0):
-        if isinstance(data, dict):
-            if 'widgetType' in data:
-                count += 1
-            for v in data.values():
-                count = count_widgets(v, count)
-        elif isinstance(data, list):
-            for item in data:
-                count = count_widgets(item, count)
-        return count
-    
-    widget_count = count_widgets(elementor_data)
-    print(f"🎨 Total widgets: {widget_count}")
+    stats = collect_page_stats(elementor_data)
+    print(f"🎨 Total widgets: {stats.widget_count}")
     print(f"✅ Clean WordPress XML generated: {output_path}")
 
 
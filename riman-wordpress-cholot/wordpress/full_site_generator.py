@@ -8,15 +8,33 @@ import json
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from xml.dom import minidom
 from typing import Dict, Any, List, Optional
 from copy import deepcopy
-import uuid
 import random
 import re
 
+import php_serialize
+from elementor_ids import ElementorIDAllocator
+from image_derivatives import ImageManifest
+from image_metadata import DEFAULT_CACHE_PATH, ImageMetadataReader
+from media_registry import MediaRegistry
+from wxr_serializer import write_wxr
+
 class FullSiteGenerator:
-    def __init__(self):
+    CDATA_TAGS = frozenset([
+        'wp:term_slug', 'wp:term_name',
+        'title', 'wp:post_name', 'guid', 'dc:creator', 'wp:meta_value'
+    ])
+    
+    def __init__(self, id_allocator: ElementorIDAllocator = None, image_manifest: ImageManifest = None,
+                 image_metadata: ImageMetadataReader = None, media_registry: MediaRegistry = None):
+        self.id_allocator = id_allocator if id_allocator is not None else ElementorIDAllocator()
+        self.image_manifest = image_manifest  # Real sizes of image-server files, if built
+        # Header-based metadata of local images that are not in the manifest
+        self.image_metadata = image_metadata if image_metadata is not None else ImageMetadataReader()
+        # One attachment per image, however its URL is spelled
+        self.media_registry = (media_registry if media_registry is not None
+                               else MediaRegistry(reader=self.image_metadata))
         self.item_counter = 100  # Start IDs from 100
         self.attachment_ids = {}  # Track attachment IDs for reuse
         self.menu_items = []      # Track menu items for ordering
@@ -25,7 +43,7 @@ class FullSiteGenerator:
         
     def generate_unique_id(self) -> str:
         """Generate unique Elementor element ID"""
-        return uuid.uuid4().hex[:7]
+        return self.id_allocator.allocate()
     
     def get_next_id(self) -> int:
         """Get next WordPress item ID"""
@@ -200,13 +218,17 @@ class FullSiteGenerator:
                 })
         
         # Add each unique media item
-        processed_urls = set()
         for media_item in media:
             url = media_item.get('url')
-            if url and url not in processed_urls:
-                processed_urls.add(url)
-                attachment_id = self._add_attachment_item(channel, media_item)
-                self.attachment_ids[url] = attachment_id
+            if not url:
+                continue
+            attachment_id = self.media_registry.find(url)
+            if attachment_id is None:
+                # The attachment is the original image, even if a smaller size came first
+                attachment_id = self._add_attachment_item(
+                    channel, dict(media_item, url=self.media_registry.full_size_url(url)))
+                self.media_registry.add(url, attachment_id)
+            self.attachment_ids[url] = attachment_id
     
     def _add_attachment_item(self, channel: ET.Element, media_data: Dict) -> int:
         """Add single attachment item"""
@@ -268,12 +290,32 @@ class FullSiteGenerator:
         ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_value').text = f'2024/{filename}'
         
         # Add image metadata for better compatibility
-        if 'unsplash' in url.lower():
+        manifest_metadata = None
+        if self.image_manifest is not None:
+            manifest_metadata = self.image_manifest.attachment_metadata(filename, '2024')
+        if manifest_metadata is None:
+            manifest_metadata = self.image_metadata.attachment_metadata(url, '2024')
+        if manifest_metadata is not None:
+            # Real dimensions and sizes, so the import does not regenerate thumbnails
+            meta2 = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
+            ET.SubElement(meta2, '{http://wordpress.org/export/1.2/}meta_key').text = '_wp_attachment_metadata'
+            ET.SubElement(meta2, '{http://wordpress.org/export/1.2/}meta_value').text = php_serialize.dumps(manifest_metadata)
+        elif 'unsplash' in url.lower():
             meta2 = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
             ET.SubElement(meta2, '{http://wordpress.org/export/1.2/}meta_key').text = '_wp_attachment_metadata'
             # Basic metadata structure
-            metadata = 'a:5:{s:5:"width";i:1920;s:6:"height";i:1080;s:4:"file";s:%d:"%s";s:5:"sizes";a:0:{}s:10:"image_meta";a:12:{s:8:"aperture";s:1:"0";s:6:"credit";s:0:"";s:6:"camera";s:0:"";s:7:"caption";s:0:"";s:17:"created_timestamp";s:1:"0";s:9:"copyright";s:0:"";s:12:"focal_length";s:1:"0";s:3:"iso";s:1:"0";s:13:"shutter_speed";s:1:"0";s:5:"title";s:0:"";s:11:"orientation";s:1:"0";s:8:"keywords";a:0:{}}}' % (len(f'2024/{filename}'), f'2024/{filename}')
-            ET.SubElement(meta2, '{http://wordpress.org/export/1.2/}meta_value').text = metadata
+            metadata = {
+                'width': 1920,
+                'height': 1080,
+                'file': f'2024/{filename}',
+                'sizes': {},
+                'image_meta': {
+                    'aperture': '0', 'credit': '', 'camera': '', 'caption': '',
+                    'created_timestamp': '0', 'copyright': '', 'focal_length': '0', 'iso': '0',
+                    'shutter_speed': '0', 'title': '', 'orientation': '0', 'keywords': [],
+                },
+            }
+            ET.SubElement(meta2, '{http://wordpress.org/export/1.2/}meta_value').text = php_serialize.dumps(metadata)
         
         return item_id
     
@@ -621,54 +663,16 @@ class FullSiteGenerator:
     
     def generate_wordpress_xml(self, config: Dict, rss: ET.Element, output_path: str) -> str:
         """Generate WordPress XML file with proper CDATA wrapping"""
-        # Format and save XML
-        xml_string = ET.tostring(rss, encoding='unicode')
-        
-        # Wrap nav_menu terms and categories properly in CDATA
-        import re
-        
-        # Wrap nav_menu term values in CDATA
-        xml_string = re.sub(
-            r'<wp:term_slug>([^<]*)</wp:term_slug>',
-            lambda m: f'<wp:term_slug><![CDATA[{m.group(1)}]]></wp:term_slug>' if m.group(1) and not m.group(1).startswith('<![CDATA[') else m.group(0),
-            xml_string
-        )
-        xml_string = re.sub(
-            r'<wp:term_name>([^<]*)</wp:term_name>',
-            lambda m: f'<wp:term_name><![CDATA[{m.group(1)}]]></wp:term_name>' if m.group(1) and not m.group(1).startswith('<![CDATA[') else m.group(0),
-            xml_string
-        )
-        
-        # Wrap nav_menu category names in CDATA
-        xml_string = re.sub(
-            r'<category domain="nav_menu"([^>]*)>([^<]*)</category>',
-            lambda m: f'<category domain="nav_menu"{m.group(1)}><![CDATA[{m.group(2)}]]></category>' if m.group(2) and not m.group(2).startswith('<![CDATA[') else m.group(0),
-            xml_string
-        )
-        
-        # Wrap other important fields in CDATA
-        for tag in ['title', 'wp:post_name', 'guid', 'dc:creator', 'wp:meta_value']:
-            xml_string = re.sub(
-                f'<{tag}([^>]*)>([^<]+)</{tag}>',
-                lambda m: f'<{tag}{m.group(1)}><![CDATA[{m.group(2)}]]></{tag}>' if not m.group(2).startswith('<![CDATA[') else m.group(0),
-                xml_string
-            )
-        
-        try:
-            dom = minidom.parseString(xml_string)
-            pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-            
-            lines = pretty_xml.decode('utf-8').split('\n')
-            clean_lines = [line for line in lines if line.strip()]
-            clean_xml = '\n'.join(clean_lines)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(clean_xml)
-        except Exception as e:
-            print(f"Warning: Using fallback XML formatting: {e}")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-                f.write(xml_string)
+        
+        def use_cdata(tag: str, elem: ET.Element) -> bool:
+            # nav_menu terms, nav_menu category names and other important fields
+            if tag in self.CDATA_TAGS:
+                return True
+            return tag == 'category' and elem.get('domain') == 'nav_menu'
+        
+        # Format and save XML in a single pass
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_wxr(rss, f, cdata=use_cdata)
         
         return output_path
 
@@ -681,7 +685,8 @@ def main():
     print("🚀 Full WordPress Site Generator")
     print("=" * 60)
     
-    generator = FullSiteGenerator()
+    generator = FullSiteGenerator(image_manifest=ImageManifest.load_default(),
+                                  image_metadata=ImageMetadataReader(cache_path=DEFAULT_CACHE_PATH))
     
     # Get YAML file from command line or use default
     yaml_file = sys.argv[1] if len(sys.argv) > 1 else 'full-site.yaml'
@@ -693,6 +698,7 @@ def main():
     # Generate XML
     output_name = yaml_file.replace('.yaml', '.xml').replace('.yml', '.xml')
     output_path = generator.generate_wordpress_xml(config, rss, output_name)
+    generator.image_metadata.save()
     
     # Statistics
     file_size = os.path.getsize(output_path)
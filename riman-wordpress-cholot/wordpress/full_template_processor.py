@@ -3,15 +3,18 @@
 Full Template Processor - Uses complete Elementor template to generate 80KB WordPress XML
 """
 
-import json
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 from typing import Dict, Any, List
 from copy import deepcopy
 import re
 
+import json_backend
+from elementor_document import ElementorDocument
+from page_stats import collect_page_stats
+from wxr_serializer import write_wxr
+
 class FullTemplateProcessor:
     def __init__(self):
         self.template_path = '/Users/holgerbrandt/Downloads/elementor-1482-2025-08-27.json'
@@ -19,7 +22,7 @@ class FullTemplateProcessor:
     def load_template(self) -> dict:
         """Load the full Elementor template"""
         with open(self.template_path, 'r') as f:
-            return json.load(f)
+            return json_backend.load(f)
     
     def process_yaml_to_elementor(self, yaml_path: str) -> tuple[Dict, Dict]:
         """Convert YAML to full Elementor structure using complete template"""
@@ -31,28 +34,20 @@ class FullTemplateProcessor:
         template = self.load_template()
         elementor_data = deepcopy(template['content'])
         
+        # One index over the template serves every widget type lookup
+        document = ElementorDocument(elementor_data)
+        
         # Update content while preserving ALL structure and styling
-        self._update_hero_section(elementor_data, config)
-        self._update_services_section(elementor_data, config)
-        self._update_about_section(elementor_data, config)
-        self._update_team_section(elementor_data, config)
-        self._update_testimonials_section(elementor_data, config)
-        self._update_contact_section(elementor_data, config)
+        self._update_hero_section(document, config)
+        self._update_services_section(document, config)
+        self._update_about_section(document, config)
+        self._update_team_section(document, config)
+        self._update_testimonials_section(document, config)
+        self._update_contact_section(document, config)
         
         return config, elementor_data
     
-    def _find_widget_by_type(self, elements: List, widget_type: str):
-        """Recursively find widgets by type"""
-        widgets = []
-        for element in elements:
-            if isinstance(element, dict):
-                if element.get('widgetType') == widget_type:
-                    widgets.append(element)
-                if 'elements' in element:
-                    widgets.extend(self._find_widget_by_type(element['elements'], widget_type))
-        return widgets
-    
-    def _update_hero_section(self, data: List, config: Dict):
+    def _update_hero_section(self, document: ElementorDocument, config: Dict):
         """Update hero slider content"""
         pages = config.get('pages', [])
         if not pages:
@@ -64,7 +59,7 @@ class FullTemplateProcessor:
         
         if hero and hero.get('slides'):
             # Find cholot-slider widgets
-            sliders = self._find_widget_by_type(data, 'cholot-slider')
+            sliders = document.widgets('cholot-slider')
             
             if sliders:
                 slider = sliders[0]
@@ -79,7 +74,7 @@ class FullTemplateProcessor:
                 
                 # Keep all other styling intact
     
-    def _update_services_section(self, data: List, config: Dict):
+    def _update_services_section(self, document: ElementorDocument, config: Dict):
         """Update services cards"""
         pages = config.get('pages', [])
         if not pages:
@@ -91,7 +86,7 @@ class FullTemplateProcessor:
         
         if services and services.get('services'):
             # Find cholot-texticon widgets
-            texticons = self._find_widget_by_type(data, 'cholot-texticon')
+            texticons = document.widgets('cholot-texticon')
             
             for i, (widget, service) in enumerate(zip(texticons[:4], services['services'][:4])):
                 settings = widget.get('settings', {})
@@ -106,7 +101,7 @@ class FullTemplateProcessor:
                         'library': 'fa-solid'
                     }
     
-    def _update_about_section(self, data: List, config: Dict):
+    def _update_about_section(self, document: ElementorDocument, config: Dict):
         """Update about section"""
         pages = config.get('pages', [])
         if not pages:
@@ -118,7 +113,7 @@ class FullTemplateProcessor:
         
         if about:
             # Find cholot-title widgets in about section
-            titles = self._find_widget_by_type(data, 'cholot-title')
+            titles = document.widgets('cholot-title')
             
             for title_widget in titles:
                 settings = title_widget.get('settings', {})
@@ -126,7 +121,7 @@ class FullTemplateProcessor:
                     settings['title'] = about.get('title', 'About Us')
                     settings['editor'] = about.get('content', '')
     
-    def _update_team_section(self, data: List, config: Dict):
+    def _update_team_section(self, document: ElementorDocument, config: Dict):
         """Update team members"""
         pages = config.get('pages', [])
         if not pages:
@@ -138,7 +133,7 @@ class FullTemplateProcessor:
         
         if team and team.get('members'):
             # Find cholot-team widgets
-            team_widgets = self._find_widget_by_type(data, 'cholot-team')
+            team_widgets = document.widgets('cholot-team')
             
             for widget, member in zip(team_widgets[:3], team['members'][:3]):
                 settings = widget.get('settings', {})
@@ -151,7 +146,7 @@ class FullTemplateProcessor:
                         'id': ''
                     }
     
-    def _update_testimonials_section(self, data: List, config: Dict):
+    def _update_testimonials_section(self, document: ElementorDocument, config: Dict):
         """Update testimonials"""
         pages = config.get('pages', [])
         if not pages:
@@ -163,7 +158,7 @@ class FullTemplateProcessor:
         
         if testimonials and testimonials.get('testimonials'):
             # Find cholot-testimonial widgets
-            test_widgets = self._find_widget_by_type(data, 'cholot-testimonial')
+            test_widgets = document.widgets('cholot-testimonial')
             
             for widget, testimonial in zip(test_widgets[:3], testimonials['testimonials'][:3]):
                 settings = widget.get('settings', {})
@@ -177,12 +172,12 @@ class FullTemplateProcessor:
                         'id': ''
                     }
     
-    def _update_contact_section(self, data: List, config: Dict):
+    def _update_contact_section(self, document: ElementorDocument, config: Dict):
         """Update contact information"""
         company = config.get('company', {})
         
         # Find contact-related widgets
-        contact_widgets = self._find_widget_by_type(data, 'cholot-contact')
+        contact_widgets = document.widgets('cholot-contact')
         
         for widget in contact_widgets:
             settings = widget.get('settings', {})
@@ -234,20 +229,9 @@ class FullTemplateProcessor:
         # Add Page with full Elementor data
         self._add_page_with_full_data(channel, config, elementor_data)
         
-        # Format and save XML
-        xml_string = ET.tostring(rss, encoding='unicode')
-        
-        # Pretty print
-        dom = minidom.parseString(xml_string)
-        pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-        
-        # Clean up and write
-        lines = pretty_xml.decode('utf-8').split('\n')
-        clean_lines = [line for line in lines if line.strip()]
-        clean_xml = '\n'.join(clean_lines)
-        
+        # Format and save XML in a single pass
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(clean_xml)
+            write_wxr(rss, f)
         
         return output_path
     
@@ -333,7 +317,7 @@ class FullTemplateProcessor:
             ('_elementor_edit_mode', 'builder'),
             ('_elementor_template_type', 'kit'),
             ('_elementor_version', '3.15.0'),
-            ('_elementor_page_settings', json.dumps(kit_settings))
+            ('_elementor_page_settings', json_backend.dumps(kit_settings))
         ]:
             meta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
             ET.SubElement(meta, '{http://wordpress.org/export/1.2/}meta_key').text = key
@@ -391,7 +375,7 @@ class FullTemplateProcessor:
             ('_elementor_template_type', 'wp-page'),
             ('_elementor_version', '3.15.0'),
             ('_elementor_pro_version', '3.15.0'),
-            ('_elementor_data', json.dumps(elementor_data)),  # Full template data
+            ('_elementor_data', json_backend.dumps(elementor_data)),  # Full template data
             ('_elementor_page_settings', '{}')
         ]:
             meta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
@@ -415,9 +399,9 @@ def main():
     
     # Save Elementor JSON for debugging
     with open('riman_full_template.json', 'w') as f:
-        json.dump({'content': elementor_data}, f, indent=2)
+        json_backend.dump({'content': elementor_data}, f, indent=2)
     
-    print(f"✅ Generated Elementor JSON: {len(json.dumps(elementor_data))} characters")
+    print(f"✅ Generated Elementor JSON: {len(json_backend.dumps(elementor_data))} characters")
     
     # Generate WordPress XML
     output_path = processor.generate_wordpress_xml(config, elementor_data, 'riman_full_output.xml')
@@ -428,19 +412,8 @@ def main():
     print(f"📄 XML file size: {file_size / 1024:.1f} KB")
     
     # Count widgets
-    def count_widgets(data, count=0):
-        if isinstance(data, dict):
-            if 'widgetType' in data:
-                count += 1
-            for v in data.values():
-                count = count_widgets(v, count)
-        elif isinstance(data, list):
-            for item in data:
-                count = count_widgets(item, count)
-        return count
-    
-    widget_count = count_widgets(elementor_data)
-    print(f"🎨 Total widgets: {widget_count}")
+    stats = collect_page_stats(elementor_data)
+    print(f"🎨 Total widgets: {stats.widget_count}")
     print(f"✅ WordPress XML generated: {output_path}")
 
 
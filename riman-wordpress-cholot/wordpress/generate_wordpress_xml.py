@@ -24,12 +24,18 @@ import yaml
 import re
 import uuid
 import html
+import io
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, IO, Iterable, Iterator
 import markdown
 import frontmatter
 
+import json_backend
+import php_serialize
+from elementor_ids import ElementorIDAllocator, ContentIDAssigner, BASE36_ALPHABET
+from page_stats import collect_elements_usage
+
 
 class CholotThemeConfig:
     """Configuration for Cholot theme defaults and color scheme."""
@@ -62,20 +68,20 @@ class CholotThemeConfig:
 class ElementorIDGenerator:
     """Generates unique Elementor-style IDs for sections, columns, and widgets."""
     
-    @staticmethod
-    def generate_id() -> str:
+    def __init__(self, allocator: ElementorIDAllocator = None):
+        self.allocator = allocator if allocator is not None else ElementorIDAllocator(alphabet=BASE36_ALPHABET)
+    
+    def generate_id(self) -> str:
         """Generate a 7-character alphanumeric ID like Elementor uses."""
-        import random
-        import string
-        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=7))
+        return self.allocator.allocate()
 
 
 class CholotComponentFactory:
     """Factory class to create all 13 Cholot widget types with proper defaults."""
     
-    def __init__(self):
+    def __init__(self, id_generator: ElementorIDGenerator = None):
         self.theme_config = CholotThemeConfig()
-        self.id_generator = ElementorIDGenerator()
+        self.id_generator = id_generator or ElementorIDGenerator()
     
     def create_texticon_widget(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Create cholot-texticon widget."""
@@ -728,7 +734,7 @@ class InputFormatParser:
     @staticmethod
     def parse_json(content: str) -> Dict[str, Any]:
         """Parse JSON content."""
-        data = json.loads(content)
+        data = json_backend.loads(content)
         return {
             'data': data,
             'format': 'json'
@@ -777,8 +783,10 @@ class InputFormatParser:
 class WordPressXMLGenerator:
     """Main generator class that creates complete WordPress XML files."""
     
-    def __init__(self):
-        self.factory = CholotComponentFactory()
+    def __init__(self, id_allocator: ElementorIDAllocator = None, content_ids: bool = False):
+        self.factory = CholotComponentFactory(ElementorIDGenerator(id_allocator))
+        # Opt-in: re-key factory IDs from path + content so reruns give identical _elementor_data
+        self.content_id_assigner = ContentIDAssigner(alphabet=BASE36_ALPHABET) if content_ids else None
         self.parser = InputFormatParser()
         self.base_url = "http://localhost:8082"
         self.site_title = "Generated Site"
@@ -788,6 +796,43 @@ class WordPressXMLGenerator:
     def generate_xml(self, input_data: Union[str, Dict], site_config: Dict = None) -> str:
         """Generate complete WordPress XML from input data."""
         
+        parsed_data = self._prepare_input(input_data, site_config)
+        
+        # Generate XML structure
+        xml_content = self._build_xml_structure(parsed_data)
+        
+        return xml_content
+    
+    def generate_xml_stream(self, input_data: Union[str, Dict], fp: IO, site_config: Dict = None) -> int:
+        """
+        Stream WordPress XML to a file-like object item by item.
+        
+        Produces exactly the same document as generate_xml(), but writes the
+        channel header, terms, kit and every <item> to ``fp`` as soon as it
+        is built, so memory stays bounded by the largest single page. ``fp``
+        may be a text stream, a binary stream (written as UTF-8) or a socket
+        file from ``socket.makefile('wb')``. ``pages`` may be any iterable,
+        including a generator.
+        
+        Returns the number of characters written.
+        """
+        parsed_data = self._prepare_input(input_data, site_config)
+        
+        binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(fp, 'mode', '')
+        written = 0
+        
+        for chunk in self._iter_xml_chunks(parsed_data):
+            fp.write(chunk.encode('utf-8') if binary else chunk)
+            written += len(chunk)
+        
+        if hasattr(fp, 'flush'):
+            fp.flush()
+        
+        return written
+    
+    def _prepare_input(self, input_data: Union[str, Dict], site_config: Dict = None) -> Dict:
+        """Parse input data and apply site configuration."""
+        
         # Parse input if it's a string
         if isinstance(input_data, str):
             parsed_data = self.parser.auto_detect_and_parse(input_data)
@@ -801,13 +846,14 @@ class WordPressXMLGenerator:
             self.base_url = site_config.get('base_url', self.base_url)
             self.language = site_config.get('language', self.language)
         
-        # Generate XML structure
-        xml_content = self._build_xml_structure(parsed_data)
-        
-        return xml_content
+        return parsed_data
     
     def _build_xml_structure(self, parsed_data: Dict) -> str:
         """Build the complete WordPress XML structure."""
+        return ''.join(self._iter_xml_chunks(parsed_data))
+    
+    def _iter_xml_chunks(self, parsed_data: Dict) -> Iterator[str]:
+        """Yield the WordPress XML document in order, one top-level block at a time."""
         
         # Extract data based on format
         if parsed_data['format'] in ['yaml', 'json', 'dict']:
@@ -818,11 +864,8 @@ class WordPressXMLGenerator:
         else:
             data = {}
         
-        # Generate pages from data
-        pages_xml = self._generate_pages(data.get('pages', []))
-        
-        # Build complete XML
-        xml_template = f'''<?xml version="1.0" encoding="UTF-8" ?>
+        # Channel header
+        yield f'''<?xml version="1.0" encoding="UTF-8" ?>
 <!-- Generated WordPress XML using Cholot Theme Generator -->
 <rss version="2.0"
     xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
@@ -851,14 +894,19 @@ class WordPressXMLGenerator:
         <wp:author_last_name><![CDATA[]]></wp:author_last_name>
     </wp:author>
 
-    {self._generate_terms()}
-    
-    {pages_xml}
+    '''
+        
+        yield self._generate_terms()
+        yield '\n    \n    '
+        
+        # Kit first, then one <item> per page
+        for i, page_xml in enumerate(self._iter_pages(data.get('pages', []))):
+            yield page_xml if i == 0 else '\n' + page_xml
+        
+        yield '''
 
 </channel>
 </rss>'''
-        
-        return xml_template
     
     def _generate_terms(self) -> str:
         """Generate taxonomy terms (categories, tags, etc.)."""
@@ -888,18 +936,17 @@ class WordPressXMLGenerator:
     
     def _generate_pages(self, pages_data: List[Dict]) -> str:
         """Generate page items from data."""
-        pages_xml = []
+        return '\n'.join(self._iter_pages(pages_data))
+    
+    def _iter_pages(self, pages_data: Iterable[Dict]) -> Iterator[str]:
+        """Yield the Elementor Kit item followed by one item per page."""
         
         # First, generate the Elementor Kit
-        kit_xml = self._generate_elementor_kit()
-        pages_xml.append(kit_xml)
+        yield self._generate_elementor_kit()
         
         # Then generate regular pages
         for i, page_data in enumerate(pages_data, 1):
-            page_xml = self._generate_single_page(page_data, i + 100)  # Start page IDs at 101
-            pages_xml.append(page_xml)
-        
-        return '\n'.join(pages_xml)
+            yield self._generate_single_page(page_data, i + 100)  # Start page IDs at 101
     
     def _generate_single_page(self, page_data: Dict, page_id: int) -> str:
         """Generate a single page XML."""
@@ -916,23 +963,25 @@ class WordPressXMLGenerator:
         if 'elementor_data_file' in page_data:
             # Load elementor data from file
             with open(page_data['elementor_data_file'], 'r') as f:
-                elementor_data = json.load(f)
-            elementor_json = json.dumps(elementor_data, separators=(',', ':'))
-            elements_usage = self._calculate_elements_usage(elementor_data)
+                elementor_data = json_backend.load(f)
+            elementor_json = json_backend.dumps(elementor_data, separators=(',', ':'))
+            elements_usage = collect_elements_usage(elementor_data)
         elif 'elementor_data' in page_data:
             # Use raw elementor data exactly as provided
             elementor_json = page_data['elementor_data']
-            # Try to parse and calculate elements usage
+            # Try to parse and calculate usage
             try:
-                elementor_data = json.loads(elementor_json)
-                elements_usage = self._calculate_elements_usage(elementor_data)
+                elementor_data = json_backend.loads(elementor_json)
+                elements_usage = collect_elements_usage(elementor_data)
             except:
                 elements_usage = {}
         else:
             # Generate Elementor data from sections (legacy support)
             elementor_data = self._generate_elementor_data(page_data.get('sections', []))
-            elementor_json = json.dumps(elementor_data, separators=(',', ':'))
-            elements_usage = self._calculate_elements_usage(elementor_data)
+            if self.content_id_assigner is not None:
+                self.content_id_assigner.assign(elementor_data, namespace=slug)
+            elementor_json = json_backend.dumps(elementor_data, separators=(',', ':'))
+            elements_usage = collect_elements_usage(elementor_data)
         
         elements_usage_serialized = self._php_serialize_array(elements_usage)
         
@@ -990,6 +1039,14 @@ class WordPressXMLGenerator:
             <wp:meta_value><![CDATA[{elementor_json}]]></wp:meta_value>
         </wp:postmeta>'''
 
+        # Elements usage as in WordPress exports (unless given explicitly)
+        if elements_usage and '_elementor_elements_usage' not in additional_meta:
+            page_xml += f'''
+        <wp:postmeta>
+            <wp:meta_key><![CDATA[_elementor_elements_usage]]></wp:meta_key>
+            <wp:meta_value><![CDATA[{elements_usage_serialized}]]></wp:meta_value>
+        </wp:postmeta>'''
+
         # Add additional meta fields
         for key, value in additional_meta.items():
             page_xml += f'''
@@ -1027,7 +1084,7 @@ class WordPressXMLGenerator:
             "space_between_widgets": {"size": 20, "unit": "px"}
         }
         
-        kit_json = json.dumps(kit_settings, separators=(',', ':'))
+        kit_json = json_backend.dumps(kit_settings, separators=(',', ':'))
         
         return f'''    <item>
         <title>Default Kit</title>
@@ -1148,35 +1205,9 @@ class WordPressXMLGenerator:
             print(f"Warning: Unknown widget type '{widget_type}' - skipping")
             return None
     
-    def _calculate_elements_usage(self, elementor_data: List[Dict]) -> Dict[str, int]:
-        """Calculate element usage statistics."""
-        usage = {}
-        
-        def count_elements(elements):
-            for element in elements:
-                el_type = element.get('elType', '')
-                widget_type = element.get('widgetType', '')
-                
-                if el_type == 'widget' and widget_type:
-                    usage[widget_type] = usage.get(widget_type, 0) + 1
-                elif el_type in ['section', 'column']:
-                    usage[el_type] = usage.get(el_type, 0) + 1
-                
-                # Recursively count nested elements
-                if 'elements' in element:
-                    count_elements(element['elements'])
-        
-        count_elements(elementor_data)
-        return usage
-    
     def _php_serialize_array(self, data: Dict[str, int]) -> str:
         """Create PHP-serialized array format for WordPress."""
-        items = []
-        for key, value in data.items():
-            items.append(f's:{len(key)}:"{key}";i:{value}')
-        
-        array_content = ''.join(items)
-        return f'a:{len(data)}:{{{array_content}}}'
+        return php_serialize.dumps(data)
 
 
 def main():
@@ -1187,6 +1218,10 @@ def main():
     parser = argparse.ArgumentParser(description='Generate WordPress XML from YAML/JSON/Markdown')
     parser.add_argument('-i', '--input', required=True, help='Input file path')
     parser.add_argument('-o', '--output', required=True, help='Output XML file path')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write items to the output file as they are generated (bounded memory)')
+    parser.add_argument('--content-ids', action='store_true',
+                        help='Derive Elementor IDs from element path and content (reproducible output)')
     
     args = parser.parse_args()
     
@@ -1195,27 +1230,34 @@ def main():
         yaml_input = f.read()
     
     # Create generator and generate XML
-    generator = WordPressXMLGenerator()
+    generator = WordPressXMLGenerator(content_ids=args.content_ids)
     
     # Parse YAML and extract site config
     parsed = yaml.safe_load(yaml_input)
     site_config = parsed.get('site', {})
     
-    # Generate XML
-    xml_output = generator.generate_xml(yaml_input, site_config)
-    
-    # Save to file
     output_path = Path(args.output).resolve()
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(xml_output)
+    
+    if args.stream:
+        # Stream straight to disk
+        with open(output_path, 'w', encoding='utf-8') as f:
+            output_size = generator.generate_xml_stream(yaml_input, f, site_config)
+    else:
+        # Generate XML
+        xml_output = generator.generate_xml(yaml_input, site_config)
+        output_size = len(xml_output)
+        
+        # Save to file
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(xml_output)
     
     print(f"✅ Generated WordPress XML: {output_path}")
-    print(f"📄 File size: {len(xml_output):,} characters")
+    print(f"📄 File size: {output_size:,} characters")
     
     # Validate XML
     try:
         import xml.etree.ElementTree as ET
-        ET.fromstring(xml_output)
+        ET.parse(output_path)
         print("✅ XML validation successful - file is well-formed")
     except ET.ParseError as e:
         print(f"❌ XML validation failed: {e}")
@@ -12,9 +12,13 @@ import json
 import yaml
 from typing import Dict, List, Any, Optional
 from pathlib import Path
-import copy
 import hashlib
+import random
 import re
+import string
+
+from elementor_clone import replace_key, replace_strings
+from page_stats import collect_page_stats
 
 class HybridElementorGenerator:
     """
@@ -351,11 +355,9 @@ class HybridElementorGenerator:
             block_id = block["id"]
             block_content = content.get(block_id, {})
             
-            # Clone template
-            section_json = copy.deepcopy(block["json_template"])
-            
-            # Replace placeholders
-            section_json = self.replace_placeholders(section_json, block_content)
+            # Replace placeholders (copies only what changes, the rest is
+            # shared with the block template)
+            section_json = self.replace_placeholders(block["json_template"], block_content)
             
             # Validate section
             if self.validate_section(section_json):
@@ -369,20 +371,22 @@ class HybridElementorGenerator:
         return final_sections
     
     def replace_placeholders(self, json_obj: Any, content: Dict) -> Any:
-        """Recursively replace {{PLACEHOLDER}} with actual content"""
-        if isinstance(json_obj, dict):
-            return {k: self.replace_placeholders(v, content) for k, v in json_obj.items()}
-        elif isinstance(json_obj, list):
-            return [self.replace_placeholders(item, content) for item in json_obj]
-        elif isinstance(json_obj, str):
+        """Replace {{PLACEHOLDER}} with actual content
+        
+        Returns a new object only along the paths to changed strings; the
+        rest is shared with ``json_obj``.
+        """
+        replacements = [(f"{{{{{key}}}}}", str(value)) for key, value in content.items()]
+        
+        def replace(text: str) -> str:
+            if '{{' not in text:
+                return text
             # Replace all {{KEY}} patterns
-            result = json_obj
-            for key, value in content.items():
-                pattern = f"{{{{{key}}}}}"
-                result = result.replace(pattern, str(value))
-            return result
-        else:
-            return json_obj
+            for pattern, value in replacements:
+                text = text.replace(pattern, value)
+            return text
+        
+        return replace_strings(json_obj, replace)
     
     def validate_section(self, section: Dict) -> bool:
         """Validate that section has proper Elementor structure"""
@@ -416,26 +420,11 @@ class HybridElementorGenerator:
         return True
     
     def regenerate_ids(self, section: Dict) -> Dict:
-        """Generate unique IDs for all elements"""
-        section = copy.deepcopy(section)
-        
+        """Generate unique IDs for all elements (the input is left untouched)"""
         def generate_id():
-            import random
-            import string
             return ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
         
-        def update_ids(obj):
-            if isinstance(obj, dict):
-                if "id" in obj:
-                    obj["id"] = generate_id()
-                for value in obj.values():
-                    update_ids(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    update_ids(item)
-        
-        update_ids(section)
-        return section
+        return replace_key(section, "id", generate_id)
     
     def extract_keywords(self, business_info: Dict) -> List[str]:
         """Extract SEO keywords from business info"""
@@ -467,12 +456,8 @@ class HybridElementorGenerator:
             return "responsive_grid"
     
     def count_elements(self, sections: List[Dict]) -> int:
-        """Count total elements in all sections"""
-        count = 0
-        for section in sections:
-            for column in section.get('elements', []):
-                count += len(column.get('elements', []))
-        return count
+        """Count total elements in all sections (the widgets and inner sections of their columns)"""
+        return collect_page_stats(sections).depth_counts.get(2, 0)
 
 
 def test_hybrid_generator():
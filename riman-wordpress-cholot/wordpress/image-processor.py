@@ -10,14 +10,24 @@ import re
 from datetime import datetime
 from urllib.parse import urlparse
 import os
+from xml.sax.saxutils import escape
+
+import php_serialize
+from image_metadata import DEFAULT_CACHE_PATH, ImageMetadataReader
+from media_registry import MediaRegistry
 
 class ImageProcessor:
     """
     Verarbeitet Bilder für WordPress XML Import
     """
     
-    def __init__(self):
+    def __init__(self, metadata_reader: ImageMetadataReader = None, media_registry: MediaRegistry = None):
         self.attachment_id = 200  # Start-ID für Media Attachments
+        # Liest Maße und Größen lokaler Bilder (image-server) aus den Datei-Headern
+        self.metadata_reader = metadata_reader if metadata_reader is not None else ImageMetadataReader()
+        # Gleiche Bilder (andere Größe, http/https, Host-Alias) bekommen dasselbe Attachment
+        self.media_registry = media_registry if media_registry is not None else MediaRegistry(reader=self.metadata_reader)
+        self.attachments = {}  # Attachment-ID -> Bild-Info
     
     def process_config_images(self, config):
         """
@@ -60,31 +70,52 @@ class ImageProcessor:
         """
         Bereitet ein einzelnes Bild für WordPress vor
         """
+        attachment_id = self.media_registry.find(image_path)
+        if attachment_id is None:
+            attachment_id = self.attachment_id
+            self.attachment_id += 1
+            self.media_registry.add(image_path, attachment_id)
+            # Das Attachment ist das Original, auch wenn zuerst eine kleinere Größe auftaucht
+            full_size_path = self.media_registry.full_size_url(image_path)
+            self.attachments[attachment_id] = {
+                'id': attachment_id,
+                'url': full_size_path,
+                'filename': self._filename(full_size_path, attachment_id),
+                'alt': alt_text,
+                'title': alt_text,
+                'mime_type': self.metadata_reader.mime_type(full_size_path),
+                # None, wenn die Datei nicht lokal vorliegt (WordPress erzeugt die Größen dann selbst)
+                'metadata': self.metadata_reader.attachment_metadata(full_size_path),
+            }
+        
+        # Nur die ID wird geteilt; URL, Titel und Alt-Text bleiben die dieser Referenz
+        return dict(self.attachments[attachment_id], url=image_path,
+                    filename=self._filename(image_path, attachment_id), alt=alt_text, title=alt_text)
+    
+    def _filename(self, image_path, attachment_id):
         # Prüfe ob URL oder lokaler Pfad
         if image_path.startswith(('http://', 'https://')):
             # URL - WordPress lädt automatisch herunter
             filename = os.path.basename(urlparse(image_path).path)
             if not filename:
-                filename = f"image_{self.attachment_id}.jpg"
+                filename = f"image_{attachment_id}.jpg"
         else:
             # Lokaler Pfad - muss hochgeladen werden
             filename = os.path.basename(image_path)
-        
-        attachment_id = self.attachment_id
-        self.attachment_id += 1
-        
-        return {
-            'id': attachment_id,
-            'url': image_path,
-            'filename': filename,
-            'alt': alt_text,
-            'title': alt_text
-        }
+        return filename
     
     def generate_attachment_xml(self, image_info):
         """
         Generiert WordPress XML für ein Bild-Attachment
         """
+        metadata_xml = ''
+        if image_info.get('metadata'):
+            # Fertige Metadaten: WordPress muss beim Import keine Thumbnails erzeugen
+            metadata_xml = f"""
+        <wp:postmeta>
+            <wp:meta_key><![CDATA[_wp_attachment_metadata]]></wp:meta_key>
+            <wp:meta_value>{escape(php_serialize.dumps(image_info['metadata']), {'"': '&quot;'})}</wp:meta_value>
+        </wp:postmeta>"""
         return f"""
     <item>
         <title>{image_info['title']}</title>
@@ -99,7 +130,7 @@ class ImageProcessor:
         <wp:post_name><![CDATA[{image_info['filename']}]]></wp:post_name>
         <wp:status><![CDATA[inherit]]></wp:status>
         <wp:post_type><![CDATA[attachment]]></wp:post_type>
-        <wp:post_mime_type>image/jpeg</wp:post_mime_type>
+        <wp:post_mime_type>{image_info.get('mime_type', 'image/jpeg')}</wp:post_mime_type>
         <wp:postmeta>
             <wp:meta_key><![CDATA[_wp_attached_file]]></wp:meta_key>
             <wp:meta_value><![CDATA[{image_info['filename']}]]></wp:meta_value>
@@ -107,7 +138,7 @@ class ImageProcessor:
         <wp:postmeta>
             <wp:meta_key><![CDATA[_wp_attachment_image_alt]]></wp:meta_key>
             <wp:meta_value><![CDATA[{image_info['alt']}]]></wp:meta_value>
-        </wp:postmeta>
+        </wp:postmeta>{metadata_xml}
     </item>"""
     
     def enhance_elementor_structure_with_images(self, structure, images):
@@ -267,17 +298,18 @@ def main():
     config = create_image_test_config()
     
     # Image Processor
-    processor = ImageProcessor()
+    processor = ImageProcessor(ImageMetadataReader(cache_path=DEFAULT_CACHE_PATH))
     images = processor.process_config_images(config)
+    processor.metadata_reader.save()
     
-    print(f"✅ {len(images)} Bilder gefunden:")
+    print(f"✅ {len(images)} Bilder gefunden ({len(processor.attachments)} verschiedene):")
     for key, image in images.items():
         print(f"   • {key}: {image['filename']} (ID: {image['id']})")
     
-    # Generiere Attachment XMLs
+    # Generiere Attachment XMLs (eins pro Bild, auch wenn es mehrfach verwendet wird)
     print(f"\n📄 Generiere WordPress XML Attachments...")
     attachments_xml = []
-    for image in images.values():
+    for image in processor.attachments.values():
         attachments_xml.append(processor.generate_attachment_xml(image))
     
     print(f"✅ {len(attachments_xml)} Attachment XMLs generiert")
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Image Derivatives
+=================
+
+Build stage for the image server: renders every WordPress image size of
+every source image as JPEG, WebP and (when Pillow can write it) AVIF, and
+writes a manifest the XML generators read, so attachment metadata and
+``srcset`` entries only name files that exist.
+
+Features:
+- WordPress size rules: thumbnail 150x150 cropped, medium 300x300,
+  medium_large 768 wide, large 1024x1024, 1536x1536 and 2048x2048; no
+  upscaling; files named ``<name>-<width>x<height>.<ext>``
+- One source per name (PNG before JPEG before WebP); existing ``-WxH``
+  files are never sources
+- Sources rendered in a process pool, each decoded once for all its outputs
+- Up-to-date sources are skipped: unchanged size and mtime, or (after a
+  touch or copy) an unchanged SHA-256; settings changes rebuild everything
+- Outputs are written atomically; the manifest too
+- AVIF is used when Pillow has an AVIF encoder (Pillow 11.2+, or the
+  pillow-avif-plugin package)
+
+The manifest (``image-manifest.json`` in the output directory) maps each
+image name to its source, dimensions and, per size, the file of each
+format. ImageManifest reads it without needing Pillow.
+
+Usage:
+    python image_derivatives.py                      # the repo's image-server/
+    python image_derivatives.py path/to/images --workers 4 --formats jpg webp
+
+    manifest = ImageManifest.load('image-server/image-manifest.json')
+    manifest.srcset('asbestsanierung-schutzausruestung-fachpersonal.jpg', 'http://localhost:8082')
+    manifest.attachment_metadata('asbestsanierung-schutzausruestung-fachpersonal.webp', '2025/08')
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import json_backend
+from build_cache import fingerprint
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = ImageOps = None
+
+try:
+    import pillow_avif  # noqa: F401 - registers the AVIF plugin on older Pillow
+except ImportError:  # pragma: no cover - optional dependency
+    pillow_avif = None
+
+DEFAULT_IMAGE_DIR = Path(__file__).resolve().parents[2] / 'image-server'
+MANIFEST_NAME = 'image-manifest.json'
+MANIFEST_FORMAT = 1
+# Bump to rebuild every derivative after a change to the rendering below
+PIPELINE_VERSION = 1
+
+# name, max width, max height (0 = unlimited), crop
+WORDPRESS_SIZES: Tuple[Tuple[str, int, int, bool], ...] = (
+    ('thumbnail', 150, 150, True),
+    ('medium', 300, 300, False),
+    ('medium_large', 768, 0, False),
+    ('large', 1024, 1024, False),
+    ('1536x1536', 1536, 1536, False),
+    ('2048x2048', 2048, 2048, False),
+)
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')  # in order of preference
+MIME_TYPES = {'jpg': 'image/jpeg', 'webp': 'image/webp', 'avif': 'image/avif'}
+# image_meta of an image without EXIF/IPTC data, as WordPress stores it
+EMPTY_IMAGE_META = {
+    'aperture': '0', 'credit': '', 'camera': '', 'caption': '', 'created_timestamp': '0', 'copyright': '',
+    'focal_length': '0', 'iso': '0', 'shutter_speed': '0', 'title': '', 'orientation': '0', 'keywords': [],
+}
+_PIL_FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP', 'avif': 'AVIF'}
+_SIZED_NAME = re.compile(r'-\d+x\d+\.[A-Za-z]+\Z')
+_EXTENSION = re.compile(r'(?:-\d+x\d+)?\.[A-Za-z]+\Z')
+
+
+def available_formats() -> List[str]:
+    """Output formats Pillow can write here"""
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt, pil_format in _PIL_FORMATS.items() if pil_format in Image.SAVE]
+
+
+def image_name(filename: str) -> str:
+    """Manifest key of a file name or URL: no directory, size suffix, extension or query"""
+    basename = filename.split('?', 1)[0].rsplit('/', 1)[-1]
+    return _EXTENSION.sub('', basename)
+
+
+def find_sources(image_dir: Union[str, Path], generated: Iterable[str] = ()) -> List[Path]:
+    """One source file per image name, sorted by name
+
+    ``generated`` names files an earlier build wrote, which are not sources.
+    """
+    generated = set(generated)
+    sources: Dict[str, Path] = {}
+    for path in sorted(Path(image_dir).iterdir()):
+        suffix = path.suffix.lower()
+        if (suffix not in SOURCE_EXTENSIONS or path.name in generated or _SIZED_NAME.search(path.name)
+                or not path.is_file()):
+            continue
+        current = sources.get(path.stem)
+        if current is None or SOURCE_EXTENSIONS.index(suffix) < SOURCE_EXTENSIONS.index(current.suffix.lower()):
+            sources[path.stem] = path
+    return [sources[name] for name in sorted(sources)]
+
+
+def resize_dimensions(width: int, height: int, max_width: int, max_height: int,
+                      crop: bool) -> Optional[Tuple[int, int]]:
+    """Size WordPress would create, or None if it would skip it (never upscales)"""
+    if crop:
+        new_width, new_height = min(max_width, width), min(max_height, height)
+    else:
+        ratios = [limit / actual for limit, actual in ((max_width, width), (max_height, height)) if limit]
+        ratio = min(ratios) if ratios else 1
+        if ratio >= 1:
+            return None
+        new_width = max(1, round(width * ratio))
+        new_height = max(1, round(height * ratio))
+    if (new_width, new_height) == (width, height) or new_width > width or new_height > height:
+        return None
+    return new_width, new_height
+
+
+def plan_sizes(width: int, height: int, sizes: Iterable[Tuple[str, int, int, bool]] = WORDPRESS_SIZES
+               ) -> List[Tuple[str, int, int, bool]]:
+    """``(size name, width, height, crop)`` of every size an image of this size gets"""
+    plan = []
+    for name, max_width, max_height, crop in sizes:
+        dimensions = resize_dimensions(width, height, max_width, max_height, crop)
+        if dimensions is not None:
+            plan.append((name, dimensions[0], dimensions[1], crop))
+    return plan
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _settings_digest(formats: List[str], quality: int, sizes) -> str:
+    return fingerprint(PIPELINE_VERSION, formats, quality, [list(size) for size in sizes])
+
+
+def _outputs_exist(entry: Dict[str, Any], output_dir: Path) -> bool:
+    return all((output_dir / info['file']).is_file()
+               for size in entry['sizes'].values() for info in size['files'].values())
+
+
+def _save(image, path: Path, fmt: str, quality: int) -> int:
+    """Write ``image`` atomically; returns the file size"""
+    if fmt == 'jpg' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    options = {'quality': quality}
+    if fmt == 'jpg':
+        options.update(optimize=True, progressive=True)
+    elif fmt == 'webp':
+        options['method'] = 4
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, _PIL_FORMATS[fmt], **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path.stat().st_size
+
+
+def _render(image, width: int, height: int, crop: bool):
+    if crop:
+        return ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def build_source(source: Union[str, Path], output_dir: Union[str, Path], formats: List[str],
+                 quality: int, settings: str, previous: Optional[Dict[str, Any]] = None,
+                 force: bool = False, sizes=WORDPRESS_SIZES) -> Tuple[str, Dict[str, Any], bool]:
+    """Render all derivatives of one source unless ``previous`` is still valid
+
+    Returns ``(image name, manifest entry, rebuilt)``. Runs in a worker process.
+    """
+    source, output_dir = Path(source), Path(output_dir)
+    stat = source.stat()
+    digest = None
+
+    if (not force and previous is not None and previous.get('settings') == settings
+            and previous.get('source') == source.name):
+        unchanged = (previous.get('mtime_ns') == stat.st_mtime_ns and previous.get('bytes') == stat.st_size)
+        if not unchanged and previous.get('bytes') == stat.st_size:
+            digest = file_sha256(source)
+            unchanged = digest == previous.get('sha256')
+        if unchanged and _outputs_exist(previous, output_dir):
+            entry = dict(previous, mtime_ns=stat.st_mtime_ns)
+            return source.stem, entry, False
+
+    digest = digest or file_sha256(source)
+    source_format = {'.jpg': 'jpg', '.jpeg': 'jpg', '.webp': 'webp'}.get(source.suffix.lower())
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    width, height = image.size
+
+    entry = {
+        'source': source.name,
+        'sha256': digest,
+        'mtime_ns': stat.st_mtime_ns,
+        'bytes': stat.st_size,
+        'settings': settings,
+        'width': width,
+        'height': height,
+        'sizes': {},
+    }
+
+    # Full size: the source itself for its own format, converted for the others.
+    # Full-size files already next to the source (``name.webp`` beside
+    # ``name.jpg``) are originals too and are kept as they are.
+    in_place = source.parent.resolve() == output_dir.resolve()
+    originals = set(previous.get('originals', ())) if previous else set()
+    full_files = {}
+    for fmt in formats:
+        path = source if fmt == source_format and in_place else output_dir / f'{source.stem}.{fmt}'
+        if in_place and previous is None and path != source and path.is_file():
+            originals.add(path.name)
+        if path == source or path.name in originals:
+            full_files[fmt] = {'file': path.name, 'filesize': path.stat().st_size}
+            continue
+        full_files[fmt] = {'file': path.name, 'filesize': _save(image, path, fmt, quality)}
+    entry['originals'] = sorted(originals)
+    entry['sizes']['full'] = {'width': width, 'height': height, 'files': full_files}
+
+    for size_name, size_width, size_height, crop in plan_sizes(width, height, sizes):
+        resized = _render(image, size_width, size_height, crop)
+        files = {}
+        for fmt in formats:
+            path = output_dir / f'{source.stem}-{size_width}x{size_height}.{fmt}'
+            files[fmt] = {'file': path.name, 'filesize': _save(resized, path, fmt, quality)}
+        entry['sizes'][size_name] = {'width': size_width, 'height': size_height, 'files': files}
+
+    return source.stem, entry, True
+
+
+def _build_source_args(args):
+    return build_source(*args)
+
+
+class ImageManifest:
+    """The derivative manifest, keyed by image name"""
+
+    def __init__(self, images: Optional[Dict[str, Dict[str, Any]]] = None,
+                 path: Optional[Union[str, Path]] = None):
+        self.images: Dict[str, Dict[str, Any]] = images or {}
+        self.path = Path(path) if path is not None else None
+        self._files = {info['file'] for entry in self.images.values()
+                       for size in entry['sizes'].values() for info in size['files'].values()}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ImageManifest':
+        """Read a manifest; a missing or unusable file gives an empty manifest"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json_backend.load(f)
+        except (OSError, ValueError):
+            return cls(path=path)
+        if not isinstance(data, dict) or data.get('format') != MANIFEST_FORMAT:
+            return cls(path=path)
+        return cls(data.get('images', {}), path)
+
+    @classmethod
+    def load_default(cls) -> Optional['ImageManifest']:
+        """The manifest of the repo's image-server/, or None if it has not been built"""
+        path = DEFAULT_IMAGE_DIR / MANIFEST_NAME
+        return cls.load(path) if path.exists() else None
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the manifest atomically"""
+        path = Path(path) if path is not None else self.path
+        data = {'format': MANIFEST_FORMAT, 'images': dict(sorted(self.images.items()))}
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json_backend.dumps(data, indent=2, ensure_ascii=False))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def __contains__(self, filename: str) -> bool:
+        return image_name(filename) in self.images
+
+    def has_file(self, filename: str) -> bool:
+        """True if ``filename`` (or the last part of a URL) is a file the manifest lists"""
+        return filename.split('?', 1)[0].rsplit('/', 1)[-1] in self._files
+
+    def entry(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of a file name or URL (any size or format of the image)"""
+        return self.images.get(image_name(filename))
+
+    def sizes(self, filename: str, fmt: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """``{size name: {'file', 'width', 'height', 'filesize'}}`` of one format, full size included
+
+        ``fmt`` defaults to the format of ``filename``.
+        """
+        entry = self.entry(filename)
+        fmt = fmt or _format_of(filename)
+        if entry is None:
+            return {}
+        return {name: dict(size['files'][fmt], width=size['width'], height=size['height'])
+                for name, size in entry['sizes'].items() if fmt in size['files']}
+
+    def srcset(self, filename: str, base_url: str, fmt: Optional[str] = None) -> str:
+        """``srcset`` value: every width with the image's aspect ratio, smallest first
+
+        Like WordPress, cropped sizes (the thumbnail) are left out.
+        """
+        base_url = base_url.rstrip('/')
+        sizes = self.sizes(filename, fmt)
+        if 'full' not in sizes:
+            return ''
+        full = sizes['full']
+        by_width = {}
+        for size in sizes.values():
+            # wp_image_matches_ratio(): compare the sizes after scaling to the smaller width
+            scaled = round(full['height'] * size['width'] / full['width'])
+            if abs(scaled - size['height']) <= 1:
+                by_width.setdefault(size['width'], size['file'])
+        return ', '.join(f'{base_url}/{file} {width}w' for width, file in sorted(by_width.items()))
+
+    def attachment_metadata(self, filename: str, upload_dir: str = '', fmt: Optional[str] = None
+                            ) -> Optional[Dict[str, Any]]:
+        """``_wp_attachment_metadata`` for the image, or None if it is not in the manifest"""
+        fmt = fmt or _format_of(filename)
+        sizes = self.sizes(filename, fmt)
+        if 'full' not in sizes:
+            return None
+        full = sizes.pop('full')
+        prefix = f"{upload_dir.strip('/')}/" if upload_dir.strip('/') else ''
+        return {
+            'width': full['width'],
+            'height': full['height'],
+            'file': prefix + full['file'],
+            'filesize': full['filesize'],
+            'sizes': {name: {'file': size['file'], 'width': size['width'], 'height': size['height'],
+                             'mime-type': MIME_TYPES[fmt], 'filesize': size['filesize']}
+                      for name, size in sizes.items()},
+            'image_meta': dict(EMPTY_IMAGE_META, keywords=[]),
+        }
+
+
+def _format_of(filename: str) -> str:
+    extension = filename.split('?', 1)[0].rsplit('.', 1)[-1].lower()
+    return 'jpg' if extension == 'jpeg' else extension
+
+
+def build_derivatives(image_dir: Union[str, Path] = DEFAULT_IMAGE_DIR, output_dir: Union[str, Path] = None,
+                      formats: Optional[Iterable[str]] = None, quality: int = 82, workers: int = None,
+                      force: bool = False, verbose: bool = True) -> Tuple[ImageManifest, Dict[str, int]]:
+    """Bring all derivatives and the manifest up to date
+
+    Returns the manifest and ``{'built': n, 'skipped': n}``.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to build image derivatives (pip install Pillow)")
+    image_dir = Path(image_dir)
+    output_dir = Path(output_dir) if output_dir is not None else image_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    writable = available_formats()
+    formats = [fmt for fmt in (formats or writable) if fmt in writable]
+    settings = _settings_digest(formats, quality, WORDPRESS_SIZES)
+
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = ImageManifest.load(manifest_path).images
+    generated = {size['files'][fmt]['file'] for entry in previous.values() for size in entry['sizes'].values()
+                 for fmt in size['files']} - {entry['source'] for entry in previous.values()}
+    generated -= {name for entry in previous.values() for name in entry.get('originals', ())}
+    sources = find_sources(image_dir, generated if image_dir.resolve() == output_dir.resolve() else ())
+    tasks = [(source, output_dir, formats, quality, settings, previous.get(source.stem), force)
+             for source in sources]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_build_source_args, tasks))
+    else:
+        results = [build_source(*task) for task in tasks]
+
+    images, counts = {}, {'built': 0, 'skipped': 0}
+    for name, entry, rebuilt in results:
+        images[name] = entry
+        counts['built' if rebuilt else 'skipped'] += 1
+        if verbose and rebuilt:
+            print(f"  🖼️  {entry['source']}: {len(entry['sizes'])} sizes × {', '.join(formats)}")
+
+    manifest = ImageManifest(images, manifest_path)
+    manifest.save()
+    return manifest, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build WordPress image sizes for the image server')
+    parser.add_argument('image_dir', nargs='?', default=str(DEFAULT_IMAGE_DIR))
+    parser.add_argument('--output', help='Output directory (default: the image directory)')
+    parser.add_argument('--formats', nargs='*', choices=sorted(_PIL_FORMATS), help='Default: all available')
+    parser.add_argument('--quality', type=int, default=82)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild everything')
+    args = parser.parse_args()
+
+    print("🚀 Image Derivative Build")
+    print("=" * 60)
+    print(f"📁 {args.image_dir} ({', '.join(args.formats or available_formats())})")
+    start = time.perf_counter()
+    manifest, counts = build_derivatives(args.image_dir, args.output, args.formats, args.quality,
+                                         args.workers, args.force)
+    print(f"✅ {counts['built']} built, {counts['skipped']} up to date "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"📄 Manifest: {manifest.path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
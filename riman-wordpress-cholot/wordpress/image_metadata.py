@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Image Metadata
+==============
+
+Builds ``_wp_attachment_metadata`` for attachments from the image files on
+disk, so WordPress does not have to open and resize every image on import.
+
+Dimensions come from the file headers (PNG IHDR, JPEG SOF, GIF screen
+descriptor, WebP VP8/VP8L/VP8X, AVIF ispe); pixels are never decoded. The
+sizes array lists the ``<name>-<width>x<height>.<ext>`` files next to the
+image (see image_derivatives.py), named after the WordPress size whose
+dimensions they have.
+
+Features:
+- Header reads of a few hundred bytes; other formats fall back to Pillow's
+  lazy ``Image.open`` when Pillow is installed
+- MIME type from the file content, not the extension
+- Results cached by path, mtime and size, in memory and optionally in a
+  BuildCache file shared between runs
+- Attachment URLs (``http://localhost:8082/<file>``) resolved against the
+  image directories by file name
+
+Usage:
+    reader = ImageMetadataReader(cache_path=DEFAULT_CACHE_PATH)
+    reader.attachment_metadata('http://localhost:8082/logo.png', '2024/08')
+    reader.save()
+"""
+
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+from build_cache import BuildCache
+from image_derivatives import DEFAULT_IMAGE_DIR, EMPTY_IMAGE_META, WORDPRESS_SIZES, plan_sizes
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+DEFAULT_IMAGE_DIRS = (DEFAULT_IMAGE_DIR, Path(__file__).resolve().parent / 'images')
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / '.image-metadata.buildcache.json'
+CACHE_NAMESPACE = 'image-metadata'
+_HEADER_BYTES = 64 * 1024
+_SIZED_FILE = re.compile(r'(?P<stem>.+)-(?P<width>\d+)x(?P<height>\d+)\.(?P<ext>[A-Za-z]+)\Z')
+# JPEG start-of-frame markers (not DHT C4, JPG C8 or DAC CC)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class ImageHeaderError(ValueError):
+    """The file is not an image or its header is unreadable"""
+
+
+class ImageInfo(NamedTuple):
+    width: int
+    height: int
+    mime_type: str
+    filesize: int
+
+
+def _jpeg_size(f) -> Tuple[int, int]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':  # tolerate garbage between segments
+            byte = f.read(1)
+        while byte == b'\xff':  # fill bytes
+            byte = f.read(1)
+        if not byte:
+            raise ImageHeaderError('JPEG without a frame header')
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # no length
+            continue
+        if marker == 0xD9:
+            raise ImageHeaderError('JPEG without a frame header')
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            raise ImageHeaderError('truncated JPEG')
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF:
+            frame = f.read(5)
+            if len(frame) < 5:
+                raise ImageHeaderError('truncated JPEG')
+            height, width = struct.unpack('>xHH', frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_size(head: bytes) -> Tuple[int, int]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and head[20:21] == b'\x2f':
+        bits = struct.unpack('<I', head[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return (int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1)
+    raise ImageHeaderError('unknown WebP chunk')
+
+
+def _avif_size(head: bytes) -> Tuple[int, int]:
+    # Image spatial extents properties; the largest is the primary image (or its grid)
+    sizes = []
+    position = head.find(b'ispe')
+    while position != -1 and position + 16 <= len(head):
+        sizes.append(struct.unpack('>II', head[position + 8:position + 16]))
+        position = head.find(b'ispe', position + 4)
+    if not sizes:
+        raise ImageHeaderError('AVIF without image extents')
+    return max(sizes, key=lambda size: size[0] * size[1])
+
+
+def read_header(path: Union[str, Path]) -> Tuple[int, int, str]:
+    """``(width, height, mime type)`` of an image file, read from its header"""
+    with open(path, 'rb') as f:
+        head = f.read(_HEADER_BYTES)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return (*struct.unpack('>II', head[16:24]), 'image/png')
+        if head.startswith(b'\xff\xd8'):
+            return (*_jpeg_size(f), 'image/jpeg')
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return (*struct.unpack('<HH', head[6:10]), 'image/gif')
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return (*_webp_size(head), 'image/webp')
+        if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+            return (*_avif_size(head), 'image/avif')
+
+    if Image is not None:
+        # Lazy: reads the header, decodes nothing until pixel data is accessed
+        try:
+            with Image.open(path) as image:
+                mime_type = Image.MIME.get(image.format)
+                if mime_type:
+                    return image.width, image.height, mime_type
+        except (OSError, SyntaxError, ValueError):
+            pass
+    raise ImageHeaderError(f'unsupported image format: {path}')
+
+
+def size_name(width: int, height: int, original: Tuple[int, int],
+              sizes=WORDPRESS_SIZES) -> str:
+    """Name of the WordPress size an image of ``original`` size would get at ``width`` x ``height``"""
+    for name, planned_width, planned_height, _ in plan_sizes(*original, sizes):
+        if (planned_width, planned_height) == (width, height):
+            return name
+    return f'{width}x{height}'
+
+
+class ImageMetadataReader:
+    """Cached image headers and attachment metadata for local image files"""
+
+    def __init__(self, image_dirs: Iterable[Union[str, Path]] = DEFAULT_IMAGE_DIRS,
+                 cache_path: Optional[Union[str, Path]] = None):
+        self.image_dirs = [Path(directory) for directory in image_dirs]
+        self.cache = BuildCache(cache_path, CACHE_NAMESPACE) if cache_path is not None else None
+        self._info: Dict[str, Tuple[str, Optional[ImageInfo]]] = {}
+        self._siblings: Dict[Path, Tuple[int, Dict[Tuple[str, str], list]]] = {}
+
+    def resolve(self, source: str) -> Optional[Path]:
+        """Local file of a path or URL; URLs are looked up by file name in the image directories"""
+        if not source:
+            return None
+        if not source.startswith(('http://', 'https://')):
+            path = Path(source)
+            if path.is_file():
+                return path
+        filename = unquote(os.path.basename(urlparse(source).path))
+        for directory in self.image_dirs:
+            path = directory / filename
+            if filename and path.is_file():
+                return path
+        return None
+
+    def info(self, path: Union[str, Path]) -> Optional[ImageInfo]:
+        """Header data of an image file, or None if it is missing or not an image"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        digest = f'{stat.st_mtime_ns}:{stat.st_size}'
+
+        cached = self._info.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        value = self.cache.get(key, digest) if self.cache is not None else None
+        if value is not None:
+            info = ImageInfo(*value) if value else None
+        else:
+            try:
+                info = ImageInfo(*read_header(path), stat.st_size)
+            except (OSError, ImageHeaderError, struct.error):
+                info = None
+            if self.cache is not None:
+                self.cache.put(key, digest, list(info) if info else [])
+        self._info[key] = (digest, info)
+        return info
+
+    def _sized_files(self, path: Path) -> list:
+        """``(width, height, file)`` of the ``-WxH`` files of ``path`` in its directory"""
+        directory = path.parent
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            return []
+        cached = self._siblings.get(directory)
+        if cached is None or cached[0] != mtime:
+            index: Dict[Tuple[str, str], list] = {}
+            for name in os.listdir(directory):
+                match = _SIZED_FILE.match(name)
+                if match:
+                    key = (match.group('stem'), match.group('ext').lower())
+                    index.setdefault(key, []).append((int(match.group('width')), int(match.group('height')), name))
+            cached = self._siblings[directory] = (mtime, index)
+        return sorted(cached[1].get((path.stem, path.suffix[1:].lower()), ()))
+
+    def attachment_metadata(self, source: str, upload_dir: str = '') -> Optional[Dict[str, Any]]:
+        """``_wp_attachment_metadata`` of a local file or image-server URL, or None if unknown
+
+        ``file`` is ``upload_dir/<file name>`` like ``_wp_attached_file``.
+        """
+        path = self.resolve(source)
+        info = self.info(path) if path is not None else None
+        if info is None:
+            return None
+
+        sizes = {}
+        for _, _, name in self._sized_files(path):
+            sized = self.info(path.parent / name)
+            if sized is None or sized.mime_type != info.mime_type:
+                continue
+            size = size_name(sized.width, sized.height, (info.width, info.height))
+            if size not in sizes:
+                sizes[size] = {'file': name, 'width': sized.width, 'height': sized.height,
+                               'mime-type': sized.mime_type, 'filesize': sized.filesize}
+
+        prefix = f"{upload_dir.strip('/')}/" if upload_dir.strip('/') else ''
+        return {
+            'width': info.width,
+            'height': info.height,
+            'file': prefix + path.name,
+            'filesize': info.filesize,
+            'sizes': dict(sorted(sizes.items(), key=lambda item: item[1]['width'])),
+            'image_meta': dict(EMPTY_IMAGE_META, keywords=[]),
+        }
+
+    def mime_type(self, source: str, default: str = 'image/jpeg') -> str:
+        """MIME type of a local file or image-server URL, guessed from the extension if unknown"""
+        path = self.resolve(source)
+        info = self.info(path) if path is not None else None
+        if info is not None:
+            return info.mime_type
+        extension = os.path.splitext(urlparse(source).path)[1].lower()
+        return {'.png': 'image/png', '.gif': 'image/gif', '.webp': 'image/webp', '.avif': 'image/avif',
+                '.svg': 'image/svg+xml', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}.get(extension, default)
+
+    def save(self) -> None:
+        """Persist the header cache, if it has a file"""
+        if self.cache is not None:
+            self.cache.save()
@@ -1,83 +1,225 @@
 #!/usr/bin/env python3
 """
 Importiert Bilder vom lokalen Image-Server in die WordPress Media Library
+
+Standard ist der Bulk-Modus: je Batch ein ``wp eval-file`` Aufruf, der alle
+Bilder des Batches mit einem einzigen WordPress-Bootstrap importiert und
+eine JSON-Zuordnung (ID, URL) zurückgibt. Mehrere Batches laufen parallel
+(begrenzt durch --workers). ``--single`` nutzt den alten Weg mit
+``media import`` und ``post get`` pro Bild.
+
+Usage:
+    python import_images_to_wordpress.py
+    python import_images_to_wordpress.py --batch-size 20 --workers 4
+    python import_images_to_wordpress.py --wp-cli wp --single
 """
 
-import os
-import subprocess
+import argparse
 import json
+import shlex
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from image_derivatives import DEFAULT_IMAGE_DIR
+
+# Liste der wichtigsten Bilder für RIMAN
+PRIORITY_IMAGES = [
+    "systematischer-gebaeuderueckbau-kreislaufwirtschaft.jpg",
+    "asbestsanierung-schutzausruestung-fachpersonal.jpg",
+    "schadstoffsanierung-industrieanlage-riman-gmbh.jpg",
+    "dr-michael-riman-geschaeftsfuehrer.jpg",
+    "sabine-weber-projektleitung.jpg",
+    "thomas-mueller-technische-leitung.jpg",
+    "sicherheitsvorbereitung-schutzausruestung-schritt-3.jpg",
+    "sanierung-durchfuehrung-fachgerecht-schritt-4.jpg",
+    "luftqualitaet-monitoring-echtzeitdaten-schritt-5.jpg",
+    "materialverarbeitung-entsorgung-vorschriften-schritt-6.jpg",
+    "qualitaetskontrolle-abnahme-pruefung-schritt-7.jpg",
+    "zertifizierung-dokumentation-abschluss-schritt-8.jpg",
+    "nachhaltiger-rueckbau-baustelle-recycling.jpg",
+    "altlastensanierung-grundwasser-bodenschutz.jpg",
+    "umweltingenieur-bodenproben-analyse-labor.jpg",
+    "riman-gmbh-logo.png"
+]
+
+# Zeilenpräfix der JSON-Antwort des Batch-Skripts (andere Ausgaben von Plugins werden ignoriert)
+BULK_MARKER = 'BULK_MEDIA_IMPORT '
+
+# Läuft per `wp eval-file` in WordPress; $args[0] ist die Job-Datei
+BULK_IMPORT_PHP = r"""<?php
+require_once ABSPATH . 'wp-admin/includes/file.php';
+require_once ABSPATH . 'wp-admin/includes/media.php';
+require_once ABSPATH . 'wp-admin/includes/image.php';
+
+$job = json_decode(file_get_contents($args[0]), true);
+$results = array();
+foreach ($job['images'] as $image) {
+    // media_handle_sideload() verschiebt die Datei, also wie `wp media import` eine Kopie übergeben
+    $tmp = wp_tempnam($image['path']);
+    if (!$tmp || !copy($image['path'], $tmp)) {
+        $results[] = array('key' => $image['key'], 'error' => 'Kopieren fehlgeschlagen: ' . $image['path']);
+        continue;
+    }
+    $id = media_handle_sideload(
+        array('name' => basename($image['path']), 'tmp_name' => $tmp),
+        0, null, array('post_title' => $image['title'])
+    );
+    if (is_wp_error($id)) {
+        @unlink($tmp);
+        $results[] = array('key' => $image['key'], 'error' => $id->get_error_message());
+        continue;
+    }
+    update_post_meta($id, '_wp_attachment_image_alt', $image['alt']);
+    $results[] = array('key' => $image['key'], 'id' => $id, 'url' => get_post_field('guid', $id));
+}
+echo 'BULK_MEDIA_IMPORT ' . wp_json_encode($results) . "\n";
+"""
+
+
+def image_title(image_name: str) -> str:
+    return image_name.replace("-", " ").replace(".jpg", "").replace(".png", "").title()
+
+
+def image_alt(image_name: str) -> str:
+    return image_name.replace("-", " ").replace(".jpg", "").replace(".png", "")
+
 
 class WordPressImageImporter:
-    def __init__(self):
-        self.image_server_dir = Path("/Users/holgerbrandt/dev/claude-code/projects/riman-wordpress/image-server")
+    def __init__(self, image_server_dir: Path = DEFAULT_IMAGE_DIR,
+                 wp_cli: Sequence[str] = ("php", "wp-cli.phar"),
+                 batch_size: int = 25, workers: int = 3):
+        self.image_server_dir = Path(image_server_dir)
+        self.wp_cli = list(wp_cli)
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
         self.image_mapping = {}
-        
-    def import_images(self):
+        self.errors: Dict[str, str] = {}
+
+    def import_images(self, image_names: Optional[List[str]] = None, bulk: bool = True,
+                      mapping_file: Optional[str] = "image_mapping.json"):
         """Importiere alle relevanten Bilder in WordPress"""
         print("🖼️  Importiere Bilder in WordPress Media Library...")
-        
-        # Liste der wichtigsten Bilder für RIMAN
-        priority_images = [
-            "systematischer-gebaeuderueckbau-kreislaufwirtschaft.jpg",
-            "asbestsanierung-schutzausruestung-fachpersonal.jpg",
-            "schadstoffsanierung-industrieanlage-riman-gmbh.jpg",
-            "dr-michael-riman-geschaeftsfuehrer.jpg",
-            "sabine-weber-projektleitung.jpg",
-            "thomas-mueller-technische-leitung.jpg",
-            "sicherheitsvorbereitung-schutzausruestung-schritt-3.jpg",
-            "sanierung-durchfuehrung-fachgerecht-schritt-4.jpg",
-            "luftqualitaet-monitoring-echtzeitdaten-schritt-5.jpg",
-            "materialverarbeitung-entsorgung-vorschriften-schritt-6.jpg",
-            "qualitaetskontrolle-abnahme-pruefung-schritt-7.jpg",
-            "zertifizierung-dokumentation-abschluss-schritt-8.jpg",
-            "nachhaltiger-rueckbau-baustelle-recycling.jpg",
-            "altlastensanierung-grundwasser-bodenschutz.jpg",
-            "umweltingenieur-bodenproben-analyse-labor.jpg",
-            "riman-gmbh-logo.png"
-        ]
-        
-        for image_name in priority_images:
+
+        jobs = []
+        for image_name in image_names or PRIORITY_IMAGES:
             image_path = self.image_server_dir / image_name
             if image_path.exists():
-                # Importiere mit WP-CLI
-                cmd = [
-                    "php", "wp-cli.phar", "media", "import",
-                    str(image_path),
-                    "--title=" + image_name.replace("-", " ").replace(".jpg", "").replace(".png", "").title(),
-                    "--alt=" + image_name.replace("-", " ").replace(".jpg", "").replace(".png", ""),
-                    "--porcelain"  # Gibt nur die ID zurück
-                ]
-                
-                try:
-                    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                    media_id = result.stdout.strip()
-                    
-                    # Hole die URL des importierten Bildes
-                    url_cmd = ["php", "wp-cli.phar", "post", "get", media_id, "--field=guid"]
-                    url_result = subprocess.run(url_cmd, capture_output=True, text=True, check=True)
-                    media_url = url_result.stdout.strip()
-                    
-                    self.image_mapping[f"http://localhost:8082/{image_name}"] = {
-                        "id": media_id,
-                        "url": media_url,
-                        "title": image_name.replace("-", " ").replace(".jpg", "").replace(".png", "").title()
-                    }
-                    
-                    print(f"  ✅ {image_name} -> ID: {media_id}")
-                    
-                except subprocess.CalledProcessError as e:
-                    print(f"  ❌ Fehler bei {image_name}: {e.stderr}")
-        
+                jobs.append({
+                    "key": f"http://localhost:8082/{image_name}",
+                    "path": str(image_path.resolve()),
+                    "title": image_title(image_name),
+                    "alt": image_alt(image_name),
+                })
+
+        if bulk:
+            self._import_bulk(jobs)
+        else:
+            for job in jobs:
+                self._import_single(job)
+
         # Speichere Mapping für späteren Gebrauch
-        with open("image_mapping.json", "w") as f:
-            json.dump(self.image_mapping, f, indent=2, ensure_ascii=False)
-        
+        if mapping_file:
+            with open(mapping_file, "w") as f:
+                json.dump(self.image_mapping, f, indent=2, ensure_ascii=False)
+
         print(f"\n✅ {len(self.image_mapping)} Bilder importiert")
-        print(f"   Mapping gespeichert in: image_mapping.json")
-        
+        if self.errors:
+            print(f"   ❌ {len(self.errors)} Fehler")
+        if mapping_file:
+            print(f"   Mapping gespeichert in: {mapping_file}")
+
         return self.image_mapping
 
+    def _import_single(self, job: Dict[str, str]):
+        """Zwei WP-CLI Aufrufe (und zwei WordPress-Bootstraps) pro Bild"""
+        image_name = Path(job["path"]).name
+        cmd = self.wp_cli + [
+            "media", "import", job["path"],
+            "--title=" + job["title"],
+            "--alt=" + job["alt"],
+            "--porcelain"  # Gibt nur die ID zurück
+        ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            media_id = result.stdout.strip()
+
+            # Hole die URL des importierten Bildes
+            url_cmd = self.wp_cli + ["post", "get", media_id, "--field=guid"]
+            url_result = subprocess.run(url_cmd, capture_output=True, text=True, check=True)
+            self._record(job, media_id, url_result.stdout.strip())
+
+        except subprocess.CalledProcessError as e:
+            self.errors[job["key"]] = e.stderr
+            print(f"  ❌ Fehler bei {image_name}: {e.stderr}")
+
+    def _import_bulk(self, jobs: List[Dict[str, str]]):
+        """Ein ``wp eval-file`` pro Batch, bis zu ``workers`` Batches gleichzeitig"""
+        batches = [jobs[i:i + self.batch_size] for i in range(0, len(jobs), self.batch_size)]
+        if not batches:
+            return
+
+        with tempfile.TemporaryDirectory(prefix="wp-media-import-") as tmp:
+            script = Path(tmp) / "bulk-media-import.php"
+            script.write_text(BULK_IMPORT_PHP, encoding="utf-8")
+
+            def run(indexed_batch):
+                index, batch = indexed_batch
+                job_file = Path(tmp) / f"batch-{index}.json"
+                job_file.write_text(json.dumps({"images": batch}, ensure_ascii=False), encoding="utf-8")
+                return batch, self._run_batch(script, job_file)
+
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as executor:
+                # Ergebnisse in Batch-Reihenfolge, damit das Mapping stabil bleibt
+                for batch, (results, error) in executor.map(run, enumerate(batches)):
+                    by_key = {result.get("key"): result for result in results}
+                    for job in batch:
+                        result = by_key.get(job["key"], {"error": error or "keine Antwort"})
+                        if "id" in result:
+                            self._record(job, str(result["id"]), result.get("url", ""))
+                        else:
+                            self.errors[job["key"]] = result["error"]
+                            print(f"  ❌ Fehler bei {Path(job['path']).name}: {result['error']}")
+
+    def _run_batch(self, script: Path, job_file: Path):
+        """``(results, error)`` eines Batches; ``error`` gilt für Bilder ohne eigenes Ergebnis"""
+        cmd = self.wp_cli + ["eval-file", str(script), str(job_file)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        for line in reversed(result.stdout.splitlines()):
+            if line.startswith(BULK_MARKER):
+                try:
+                    return json.loads(line[len(BULK_MARKER):]), None
+                except ValueError:
+                    break
+        error = result.stderr.strip() or f"{shlex.join(cmd)} endete mit Code {result.returncode}"
+        return [], error
+
+    def _record(self, job: Dict[str, str], media_id: str, media_url: str):
+        self.image_mapping[job["key"]] = {
+            "id": media_id,
+            "url": media_url,
+            "title": job["title"]
+        }
+        print(f"  ✅ {Path(job['path']).name} -> ID: {media_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bilder in die WordPress Media Library importieren')
+    parser.add_argument('images', nargs='*', help='Dateinamen im Image-Server (Standard: RIMAN-Bilder)')
+    parser.add_argument('--image-dir', default=str(DEFAULT_IMAGE_DIR))
+    parser.add_argument('--wp-cli', default='php wp-cli.phar', help='WP-CLI Befehl (Standard: "php wp-cli.phar")')
+    parser.add_argument('--batch-size', type=int, default=25)
+    parser.add_argument('--workers', type=int, default=3, help='Parallele Batches')
+    parser.add_argument('--single', action='store_true', help='Ein WP-CLI Aufruf pro Bild (alter Modus)')
+    parser.add_argument('--mapping', default='image_mapping.json')
+    args = parser.parse_args()
+
+    importer = WordPressImageImporter(args.image_dir, shlex.split(args.wp_cli), args.batch_size, args.workers)
+    importer.import_images(args.images or None, bulk=not args.single, mapping_file=args.mapping)
+
+
 if __name__ == "__main__":
-    importer = WordPressImageImporter()
-    importer.import_images()
\ No newline at end of file
+    main()
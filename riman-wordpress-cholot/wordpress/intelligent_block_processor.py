@@ -5,14 +5,15 @@ Assembliert dynamisch WordPress-Seiten aus Block-Library basierend auf YAML-Conf
 """
 
 import yaml
-import json
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import re
-import copy
+
+import json_backend
+from block_templates import CompiledBlockTemplate, compile_block_library
+from wxr_serializer import wxr_to_string
 
 class IntelligentBlockProcessor:
     def __init__(self, yaml_config: str, block_library_dir: str = "block_library"):
@@ -20,6 +21,7 @@ class IntelligentBlockProcessor:
         self.block_library_dir = Path(block_library_dir)
         self.config = None
         self.blocks = {}
+        self.compiled_blocks = {}
         self.assembled_pages = []
         self.namespaces = {
             'excerpt': 'http://wordpress.org/export/1.2/excerpt/',
@@ -43,7 +45,7 @@ class IntelligentBlockProcessor:
             return False
             
         with open(index_file, 'r') as f:
-            index = json.load(f)
+            index = json_backend.load(f)
         
         print(f"📚 Lade {index['total']} Blocks aus Library...")
         
@@ -52,7 +54,10 @@ class IntelligentBlockProcessor:
             if block_file.exists():
                 with open(block_file, 'r') as f:
                     self.blocks[block_info['type']] = self.blocks.get(block_info['type'], [])
-                    self.blocks[block_info['type']].append(json.load(f))
+                    self.blocks[block_info['type']].append(json_backend.load(f))
+        
+        # Platzhalter-Slots einmalig lokalisieren
+        self.compiled_blocks = compile_block_library(self.blocks)
                     
         print(f"✅ {len(self.blocks)} Block-Typen geladen")
         return True
@@ -100,9 +105,9 @@ class IntelligentBlockProcessor:
         
         return page_data
     
-    def _select_block_variant(self, block_type: str, config: Dict) -> Dict:
+    def _select_block_variant(self, block_type: str, config: Dict) -> CompiledBlockTemplate:
         """Wähle die beste Block-Variante basierend auf Config"""
-        available_variants = self.blocks.get(block_type, [])
+        available_variants = self.compiled_blocks.get(block_type, [])
         
         if not available_variants:
             return None
@@ -112,11 +117,12 @@ class IntelligentBlockProcessor:
         # TODO: Intelligente Auswahl basierend auf Config
         selected = available_variants[0]
         
-        return copy.deepcopy(selected['structure'])
+        return selected
     
-    def _fill_block_template(self, template: Dict, config: Dict) -> Dict:
+    def _fill_block_template(self, template, config: Dict) -> Dict:
         """Fülle Block-Template mit Inhalten aus Config"""
-        filled = copy.deepcopy(template)
+        if not isinstance(template, CompiledBlockTemplate):
+            template = CompiledBlockTemplate(template)
         
         # Erstelle Content-Map aus verschiedenen Config-Feldern
         content_map = {}
@@ -150,32 +156,22 @@ class IntelligentBlockProcessor:
             else:
                 content_map['CONTENT'] = config['content']
         
-        # Rekursive Funktion zum Ersetzen von Platzhaltern
-        def replace_placeholders(element: Any, content: Dict) -> Any:
-            if isinstance(element, str):
-                # Ersetze Platzhalter
-                for key, value in content.items():
-                    placeholder = f"{{{{{key}}}}}"
-                    if placeholder in element:
-                        element = element.replace(placeholder, str(value))
-                return element
-            elif isinstance(element, dict):
-                result = {}
-                for k, v in element.items():
-                    result[k] = replace_placeholders(v, content)
-                
-                # Spezielle Behandlung für bestimmte Widget-Typen
-                if 'widgetType' in result:
-                    result = self._handle_widget_content(result, config)
-                    
-                return result
+        # Ersetze Platzhalter mit Inhalten - frische Kopie, da Widgets und
+        # Design-Settings den Block anschließend in-place verändern
+        filled = template.fill(content_map, share=False)
+        
+        # Spezielle Behandlung für bestimmte Widget-Typen
+        def handle_widgets(element: Any):
+            if isinstance(element, dict):
+                for value in element.values():
+                    handle_widgets(value)
+                if 'widgetType' in element:
+                    self._handle_widget_content(element, config)
             elif isinstance(element, list):
-                return [replace_placeholders(item, content) for item in element]
-            else:
-                return element
+                for item in element:
+                    handle_widgets(item)
         
-        # Ersetze Platzhalter mit Inhalten
-        filled = replace_placeholders(filled, content_map)
+        handle_widgets(filled)
         
         # Handle spezielle Konfigurationen
         if 'settings' in config:
@@ -319,14 +315,8 @@ class IntelligentBlockProcessor:
         for menu_config in self.config.get('navigation', []):
             self._add_menu_to_xml(channel, menu_config)
         
-        # Pretty print
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        
-        # Clean up
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        final_xml = '\n'.join(lines)
+        # Pretty print in a single pass
+        final_xml = wxr_to_string(root, indent="  ")
         
         # Save
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -363,7 +353,7 @@ class IntelligentBlockProcessor:
         # Elementor data
         postmeta = ET.SubElement(item, 'wp:postmeta')
         ET.SubElement(postmeta, 'wp:meta_key').text = '_elementor_data'
-        ET.SubElement(postmeta, 'wp:meta_value').text = json.dumps(page_data['elementor_data'], ensure_ascii=False)
+        ET.SubElement(postmeta, 'wp:meta_value').text = json_backend.dumps(page_data['elementor_data'], ensure_ascii=False)
         
         # Elementor settings
         postmeta = ET.SubElement(item, 'wp:postmeta')
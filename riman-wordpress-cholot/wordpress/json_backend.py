@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+JSON Backend
+============
+
+One place to encode and decode ``_elementor_data`` and the other JSON the
+generators and validators write. Uses orjson or ujson when one of them is
+installed and falls back to the standard library ``json`` module.
+
+The output is byte-identical to ``json.dumps`` with the same arguments:
+- Only call shapes a fast backend can reproduce take the fast path:
+  compact separators ``(',', ':')``, or ``indent=2`` (orjson only)
+- ``ensure_ascii=True`` output is produced by escaping the fast backend's
+  UTF-8 output exactly like the stdlib does
+- Floats the backends format differently (exponents, numbers below 1e-4)
+  are detected in the output and the call is redone with the stdlib
+- Anything a fast backend rejects (non-str keys, ints beyond 64 bit,
+  unknown types, circular or very deep data) is redone with the stdlib,
+  so errors are the stdlib's errors, too
+- Calls with ``default=`` always use the stdlib
+
+Decoding falls back the same way, so invalid input raises
+``json.JSONDecodeError`` as before.
+
+Known differences with orjson, for input that is not JSON to begin with:
+NaN and Infinity come out as ``null`` (the stdlib writes ``NaN``), and
+UUID and Enum values are encoded where the stdlib raises TypeError.
+
+Usage:
+    import json_backend
+    text = json_backend.dumps(elementor_data, separators=(',', ':'))
+    data = json_backend.loads(text)
+    json_backend.BACKEND            # 'orjson', 'ujson' or 'json'
+    json_backend.set_backend('json')  # e.g. to compare against the stdlib
+"""
+
+import codecs
+import json
+from typing import IO, Any, Callable, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+COMPACT = (',', ':')
+
+# Digits masked to '0', so number shapes can be found with bytes.find
+_MASK_DIGITS = bytes.maketrans(b'123456789', b'000000000')
+_NUMBER_CHARS = frozenset(b'0.-+e')
+_TOKEN_STARTS = frozenset(b'[:, \n')
+_TOKEN_ENDS = frozenset(b']}, \n')
+
+# Float shapes (after masking) the fast backends may format differently
+# from repr(): exponents, and orjson's plain notation below 1e-4
+_FLOAT_NEEDLES = (b'0e', b'0.0000')
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    return [name for name, module in (('orjson', orjson), ('ujson', ujson)) if module is not None] + ['json']
+
+
+BACKEND = available_backends()[0]
+
+
+def set_backend(name: str) -> str:
+    """Switch backend (``'orjson'``, ``'ujson'`` or ``'json'``); returns the previous one"""
+    global BACKEND
+    if name not in available_backends():
+        raise ValueError(f"JSON backend not available: {name}")
+    previous, BACKEND = BACKEND, name
+    return previous
+
+
+def _differs_at(raw: bytes, masked: bytes, position: int) -> bool:
+    """True if ``position`` lies in a float token that repr() would write differently"""
+    start = end = position
+    while start > 0 and masked[start - 1] in _NUMBER_CHARS:
+        start -= 1
+    while end < len(masked) and masked[end] in _NUMBER_CHARS:
+        end += 1
+    if (start > 0 and masked[start - 1] not in _TOKEN_STARTS) or \
+            (end < len(masked) and masked[end] not in _TOKEN_ENDS):
+        return False  # inside a string
+    token = raw[start:end].decode('ascii')
+    try:
+        return repr(float(token)) != token
+    except ValueError:
+        return False
+
+
+def _may_differ(raw: bytes) -> bool:
+    """True if ``raw`` holds a float the stdlib would write differently
+
+    Number-like text inside a string (``"1e5"`` after a colon, say) at most
+    costs a stdlib re-run.
+    """
+    masked = raw.translate(_MASK_DIGITS)
+    for needle in _FLOAT_NEEDLES:
+        position = masked.find(needle)
+        while position != -1:
+            if _differs_at(raw, masked, position):
+                return True
+            position = masked.find(needle, position + 1)
+    return False
+
+
+def _escape_non_ascii(error: UnicodeEncodeError):
+    """Codec error handler: \\uXXXX escapes (surrogate pairs above U+FFFF), as the stdlib writes them"""
+    parts = []
+    for char in error.object[error.start:error.end]:
+        code = ord(char)
+        if code < 0x10000:
+            parts.append('\\u%04x' % code)
+        else:
+            code -= 0x10000
+            parts.append('\\u%04x\\u%04x' % (0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff)))
+    return ''.join(parts), error.end
+
+
+codecs.register_error('json_backend.escape', _escape_non_ascii)
+
+
+def _to_text(raw: bytes, ensure_ascii: bool) -> str:
+    """Fast backend UTF-8 output as the stdlib would have written it"""
+    if raw.isascii():
+        text = raw.decode('ascii')
+    else:
+        text = raw.decode('utf-8')
+        if ensure_ascii:
+            text = text.encode('ascii', 'json_backend.escape').decode('ascii')
+    if ensure_ascii and '\x7f' in text:
+        text = text.replace('\x7f', '\\u007f')
+    return text
+
+
+def _fast_dumps(obj: Any, indent: Optional[int], ensure_ascii: bool, sort_keys: bool) -> Optional[str]:
+    """JSON from the fast backend, or None if the stdlib has to do it"""
+    try:
+        if BACKEND == 'orjson':
+            option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+            if indent == 2:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            raw = orjson.dumps(obj, option=option)
+        elif indent is None and not sort_keys:
+            # ujson escapes like the stdlib, except that it leaves DEL as is
+            text = ujson.dumps(obj, ensure_ascii=ensure_ascii, escape_forward_slashes=False)
+            raw = text.encode('utf-8')
+        else:
+            return None
+    except Exception:
+        return None
+    if _may_differ(raw):
+        return None
+    return _to_text(raw, ensure_ascii)
+
+
+def dumps(obj: Any, *, separators: Optional[Tuple[str, str]] = None, indent: Optional[int] = None,
+          ensure_ascii: bool = True, sort_keys: bool = False, default: Optional[Callable] = None) -> str:
+    """Same as ``json.dumps`` with these arguments, faster when a backend is installed"""
+    if BACKEND != 'json' and default is None:
+        if indent is None:
+            fast = separators == COMPACT
+        else:
+            fast = indent == 2 and separators in (None, (',', ': '))
+        if fast:
+            text = _fast_dumps(obj, indent, ensure_ascii, sort_keys)
+            if text is not None:
+                return text
+    return json.dumps(obj, separators=separators, indent=indent, ensure_ascii=ensure_ascii,
+                      sort_keys=sort_keys, default=default)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Same as ``json.loads``, faster when a backend is installed"""
+    if BACKEND == 'orjson':
+        raw = data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else bytes(data)
+        # orjson decodes integers beyond 64 bit as floats
+        if raw.translate(_MASK_DIGITS).find(b'0' * 20) == -1:
+            try:
+                return orjson.loads(raw)
+            except Exception:
+                pass
+    elif BACKEND == 'ujson':
+        try:
+            return ujson.loads(data)
+        except Exception:
+            pass
+    return json.loads(data)
+
+
+def dump(obj: Any, fp: IO[str], **kwargs) -> None:
+    """``json.dump`` counterpart of ``dumps``"""
+    fp.write(dumps(obj, **kwargs))
+
+
+def load(fp: IO) -> Any:
+    """``json.load`` counterpart of ``loads``"""
+    return loads(fp.read())
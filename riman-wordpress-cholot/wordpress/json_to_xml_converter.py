@@ -18,7 +18,6 @@ Features:
 import json
 import logging
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -28,6 +27,8 @@ import re
 import uuid
 import argparse
 
+from wxr_serializer import wxr_to_string
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -292,23 +293,7 @@ To import this information into a WordPress site follow these steps:
     
     def _format_xml(self, root: ET.Element) -> str:
         """Format XML with proper indentation and encoding"""
-        # Convert to string with minidom for pretty printing
-        rough_string = ET.tostring(root, encoding='unicode')
-        
-        # Parse with minidom for pretty printing
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ")
-        
-        # Clean up extra blank lines and encoding issues
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        
-        # Ensure proper XML declaration
-        if not lines[0].startswith('<?xml'):
-            lines.insert(0, '<?xml version="1.0" encoding="UTF-8" ?>')
-        else:
-            lines[0] = '<?xml version="1.0" encoding="UTF-8" ?>'
-        
-        # Add WordPress XML comments
+        # WordPress XML comments go right after the XML declaration
         xml_comment = [
             '<!-- This is a WordPress eXtended RSS file generated by WordPress as an export of your site. -->',
             '<!-- It contains information about your site\'s posts, pages, comments, categories, and other content. -->',
@@ -329,10 +314,8 @@ To import this information into a WordPress site follow these steps:
             ''
         ]
         
-        # Insert comments after XML declaration
-        lines = lines[:1] + xml_comment + lines[1:]
-        
-        return '\n'.join(lines)
+        # Single-pass indenting serializer (no minidom re-parse)
+        return wxr_to_string(root, indent="  ", preamble='\n'.join(xml_comment))
 
 
 class JSONToXMLConverter:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Media Registry
+==============
+
+Maps every reference to the same image onto one attachment ID, so an image
+used on ten pages is exported (and imported) once instead of ten times.
+
+References are compared by canonical URL:
+- ``http``/``https`` and default ports are ignored, host names lowercased
+- Host aliases are merged (``localhost:8081`` and ``127.0.0.1:8082`` are the
+  image server at ``localhost:8082``)
+- WordPress size suffixes are dropped (``hero-300x200.jpg``,
+  ``hero-scaled.jpg`` -> ``hero.jpg``), as are image CDN resize parameters
+  (``w``, ``h``, ``fit``, ``crop``, ``q``, ...); other query parameters
+  (``?random=3``) still tell images apart
+- Optionally, local files (paths, or image server URLs found in the image
+  directories) are compared by SHA-256, so copies under other names match too
+
+Only the attachment ID is shared: every reference keeps its own URL (a
+thumbnail stays a thumbnail), while the attachment itself is created from
+``full_size_url``, the original of whichever size was seen first.
+
+Usage:
+    registry = MediaRegistry(hash_files=True)
+    attachment_id = registry.find(url)
+    if attachment_id is None:
+        attachment_id = create_attachment(registry.full_size_url(url))
+        registry.add(url, attachment_id)
+"""
+
+import os
+import re
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+from build_cache import file_digest
+from image_metadata import ImageMetadataReader
+
+# Other names of the local image server
+DEFAULT_HOST_ALIASES = {
+    'localhost:8081': 'localhost:8082',
+    '127.0.0.1:8081': 'localhost:8082',
+    '127.0.0.1:8082': 'localhost:8082',
+}
+# Query parameters of image CDNs (Unsplash/imgix, picsum, Cloudinary fetch) that only resize
+RESIZE_PARAMETERS = frozenset([
+    'w', 'h', 'width', 'height', 'fit', 'crop', 'q', 'quality', 'auto', 'fm', 'format', 'dpr',
+    'ixlib', 'ixid', 'cs', 'resize', 'size',
+])
+_SIZE_SUFFIX = re.compile(r'-(?:\d+x\d+|scaled|rotated)(?=\.[A-Za-z0-9]+\Z)')
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class MediaRegistry:
+    """Attachment IDs by canonical URL and (optionally) by file content"""
+
+    def __init__(self, host_aliases: Mapping[str, str] = DEFAULT_HOST_ALIASES, hash_files: bool = False,
+                 reader: Optional[ImageMetadataReader] = None):
+        self.host_aliases = {host.lower(): alias.lower() for host, alias in host_aliases.items()}
+        self.hash_files = hash_files
+        self.reader = reader if reader is not None else ImageMetadataReader()
+        self.by_url: Dict[str, int] = {}
+        self.by_hash: Dict[str, int] = {}
+        self._hashes: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
+        self.reused = 0  # References answered with an existing attachment
+
+    def canonical_url(self, url: str) -> str:
+        """Key under which all spellings of one image's URL agree"""
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            # Local path
+            return 'file:' + _SIZE_SUFFIX.sub('', os.path.normpath(os.path.abspath(unquote(url))))
+
+        host = parts.hostname or ''
+        port = parts.port
+        if port is not None and port != _DEFAULT_PORTS[parts.scheme]:
+            host = f'{host}:{port}'
+        host = self.host_aliases.get(host, host)
+        path = _SIZE_SUFFIX.sub('', unquote(parts.path)) or '/'
+        query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                                 if key.lower() not in RESIZE_PARAMETERS))
+        return f'//{host}{path}' + (f'?{query}' if query else '')
+
+    def full_size_url(self, url: str) -> str:
+        """``url`` of the original image: size suffix and resize parameters removed"""
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            # Local path: only if the original is there
+            original = _SIZE_SUFFIX.sub('', url)
+            return original if os.path.exists(original) else url
+
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        kept = [(key, value) for key, value in query if key.lower() not in RESIZE_PARAMETERS]
+        return urlunsplit(parts._replace(path=_SIZE_SUFFIX.sub('', parts.path),
+                                         query=parts.query if len(kept) == len(query) else urlencode(kept)))
+
+    def content_hash(self, url: str) -> Optional[str]:
+        """SHA-256 of the local file behind ``url``, or None (cached by mtime and size)"""
+        path = self.reader.resolve(url)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key, version = os.path.abspath(path), (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashes.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._hashes[key] = (version, file_digest(path))
+        return cached[1]
+
+    def find(self, url: str) -> Optional[int]:
+        """Attachment ID already registered for this image, or None"""
+        if not url:
+            return None
+        canonical = self.canonical_url(url)
+        attachment_id = self.by_url.get(canonical)
+        if attachment_id is None and self.hash_files and self.by_hash:
+            digest = self.content_hash(url)
+            if digest is not None:
+                attachment_id = self.by_hash.get(digest)
+                if attachment_id is not None:
+                    self.by_url[canonical] = attachment_id
+        if attachment_id is not None:
+            self.reused += 1
+        return attachment_id
+
+    def add(self, url: str, attachment_id: int) -> None:
+        """Register the attachment created for ``url``"""
+        self.by_url.setdefault(self.canonical_url(url), attachment_id)
+        if self.hash_files:
+            digest = self.content_hash(url)
+            if digest is not None:
+                self.by_hash.setdefault(digest, attachment_id)
+
+    def __len__(self) -> int:
+        return len(set(self.by_url.values()))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Page Statistics
+===============
+
+One traversal of an Elementor element tree that collects everything the
+XML writer, the validators and the benchmark used to get from separate
+walks of their own (elements usage, widget counts, ID checks, required
+fields, ...).
+
+Features:
+- Widget histogram and the ``_elementor_elements_usage`` map (same keys
+  and order as WordPressXMLGenerator used to compute)
+- Element, widget and per-depth counts, maximum depth
+- Element ID set and duplicate IDs
+- Sections and widgets missing required fields
+- Image URLs from media controls in settings (repeaters included)
+- Extra visitors run in the same traversal
+
+Only the element tree (``elements`` lists) is walked; settings are looked
+at for image URLs only. ``collect_elements_usage`` is the lean variant for the
+XML writer, which needs nothing but the elements usage map.
+
+Usage:
+    stats = collect_page_stats(elementor_data)
+    stats.elements_usage          # {'section': 3, 'column': 5, 'cholot-title': 2, ...}
+    stats.duplicate_ids           # ['a1b2c3d']
+    stats.missing_fields          # [('0/1/0', ('settings',))]
+    collect_elements_usage(elementor_data)  # == stats.elements_usage
+
+    class SliderCounter(PageVisitor):
+        def __init__(self):
+            self.slides = 0
+        def visit(self, element, depth, parent):
+            self.slides += len(element.get('settings', {}).get('slider_list', []))
+
+    stats = collect_page_stats(elementor_data, visitors=[SliderCounter()])
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+REQUIRED_FIELDS = {
+    'section': ('id', 'elType', 'elements'),
+    'widget': ('id', 'elType', 'widgetType', 'settings'),
+}
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg')
+
+
+class PageVisitor:
+    """Hook for extra per-element work in the statistics traversal"""
+
+    def visit(self, element: dict, depth: int, parent: Optional[dict]):
+        """Called once per element, in document order (``depth`` 0 = top level)"""
+
+
+@dataclass
+class PageStats:
+    """Everything collected in one traversal"""
+    element_count: int = 0
+    widget_count: int = 0
+    widget_types: Dict[str, int] = field(default_factory=dict)
+    elements_usage: Dict[str, int] = field(default_factory=dict)
+    depth_counts: Dict[int, int] = field(default_factory=dict)
+    max_depth: int = -1
+    ids: Set[str] = field(default_factory=set)
+    duplicate_ids: List[str] = field(default_factory=list)
+    missing_fields: List[Tuple[str, Tuple[str, ...]]] = field(default_factory=list)
+    image_urls: List[str] = field(default_factory=list)
+
+    @property
+    def ids_unique(self) -> bool:
+        return not self.duplicate_ids
+
+    @property
+    def required_fields_present(self) -> bool:
+        return not self.missing_fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'element_count': self.element_count,
+            'widget_count': self.widget_count,
+            'widget_types': dict(self.widget_types),
+            'max_depth': self.max_depth,
+            'duplicate_ids': list(self.duplicate_ids),
+            'missing_fields': [{'path': path, 'missing': list(missing)} for path, missing in self.missing_fields],
+            'image_urls': list(self.image_urls),
+        }
+
+
+def _is_image_url(url: str) -> bool:
+    return url.split('?', 1)[0].lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _collect_image_urls(node: Any, found: Dict[str, None]):
+    """Add the ``url`` of every image-like dict below ``node`` to ``found``, in document order"""
+    if isinstance(node, dict):
+        url = node.get('url')
+        if url.__class__ is str and url and _is_image_url(url):
+            found[url] = None
+        values = node.values()
+    else:
+        values = node
+    for value in values:
+        if value.__class__ is dict or value.__class__ is list:
+            _collect_image_urls(value, found)
+
+
+def collect_page_stats(elements: Iterable[dict], visitors: Iterable[PageVisitor] = ()) -> PageStats:
+    """Walk ``elements`` once and return its PageStats (``visitors`` are called for every element)"""
+    stats = PageStats()
+    visitors = list(visitors)
+    usage = stats.elements_usage
+    widget_types = stats.widget_types
+    depth_counts = stats.depth_counts
+    ids = stats.ids
+    duplicates: Dict[str, None] = {}
+    images: Dict[str, None] = {}
+
+    stack = [(element, 0, None, str(index)) for index, element in reversed(list(enumerate(elements)))]
+    while stack:
+        element, depth, parent, path = stack.pop()
+        if not isinstance(element, dict):
+            continue
+
+        stats.element_count += 1
+        depth_counts[depth] = depth_counts.get(depth, 0) + 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+        el_type = element.get('elType', '')
+        widget_type = element.get('widgetType', '')
+        if el_type == 'widget':
+            stats.widget_count += 1
+            if widget_type:
+                widget_types[widget_type] = widget_types.get(widget_type, 0) + 1
+                usage[widget_type] = usage.get(widget_type, 0) + 1
+        elif el_type in ('section', 'column'):
+            usage[el_type] = usage.get(el_type, 0) + 1
+
+        required = REQUIRED_FIELDS.get(el_type)
+        if required:
+            missing = tuple(name for name in required if name not in element)
+            if missing:
+                stats.missing_fields.append((path, missing))
+
+        element_id = element.get('id')
+        if element_id is not None:
+            if element_id in ids:
+                duplicates[element_id] = None
+            else:
+                ids.add(element_id)
+
+        settings = element.get('settings')
+        if isinstance(settings, dict):
+            _collect_image_urls(settings, images)
+
+        for visitor in visitors:
+            visitor.visit(element, depth, parent)
+
+        children = element.get('elements')
+        if isinstance(children, list):
+            stack.extend((child, depth + 1, element, f'{path}/{index}')
+                         for index, child in reversed(list(enumerate(children))))
+
+    stats.duplicate_ids = list(duplicates)
+    stats.image_urls = list(images)
+    return stats
+
+
+def collect_elements_usage(elements: Iterable[dict]) -> Dict[str, int]:
+    """Only ``PageStats.elements_usage``: no settings, IDs or paths are looked at"""
+    usage: Dict[str, int] = {}
+    stack = list(elements)[::-1]
+    while stack:
+        element = stack.pop()
+        if not isinstance(element, dict):
+            continue
+        el_type = element.get('elType', '')
+        if el_type == 'widget':
+            widget_type = element.get('widgetType', '')
+            if widget_type:
+                usage[widget_type] = usage.get(widget_type, 0) + 1
+        elif el_type in ('section', 'column'):
+            usage[el_type] = usage.get(el_type, 0) + 1
+
+        children = element.get('elements')
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+    return usage
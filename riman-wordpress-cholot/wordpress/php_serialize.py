@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+PHP Serialization
+=================
+
+PHP ``serialize()``/``unserialize()`` for WordPress meta values such as
+``_wp_attachment_metadata`` and ``_elementor_controls_usage``, so they can
+be built and rewritten as data instead of by string formatting and regexes.
+
+Features:
+- String lengths are UTF-8 byte counts, as PHP counts them
+- Nested arrays: dicts keep their key order, lists and tuples get the keys
+  0..n-1; decimal string keys become integer keys, as in a PHP array
+- Floats are written like PHP 7.1+ does (shortest round-trip digits,
+  ``1.0E+25``, ``INF``, ``NAN``)
+- Objects (``O:``) are read and written as PHPObject
+- Decoded strings round-trip byte for byte, invalid UTF-8 included
+  (``surrogateescape``)
+- iter_items() streams the entries of a top-level array one by one, from
+  a binary file read in chunks (memory bounded by the largest entry)
+- Malformed input raises PHPSerializeError (a ValueError) with the byte
+  offset; references (``r:``/``R:``) and custom objects (``C:``) are not
+  supported
+
+Usage:
+    import php_serialize
+    php_serialize.dumps({'file': '2025/08/größe.webp', 'sizes': {}})
+    # 'a:2:{s:4:"file";s:20:"2025/08/größe.webp";s:5:"sizes";a:0:{}}'
+    metadata = php_serialize.loads(meta_value)
+
+    with open('controls-usage.txt', 'rb') as fp:
+        for key, value in php_serialize.iter_items(fp):
+            ...
+"""
+
+import math
+import re
+from decimal import Decimal
+from typing import IO, Any, Dict, Iterator, NamedTuple, Tuple, Union
+
+ENCODING = 'utf-8'
+ERRORS = 'surrogateescape'
+
+# Array keys PHP stores as integers
+_INTEGER_KEY = re.compile(r'(?:0|-?[1-9][0-9]*)\Z')
+_PHP_INT_MIN, _PHP_INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class PHPSerializeError(ValueError):
+    """Value that cannot be serialized, or malformed serialized data"""
+
+
+class PHPObject(NamedTuple):
+    """A serialized PHP object: class name and properties in order"""
+    class_name: str
+    properties: Dict[Union[int, str], Any]
+
+
+def _php_float(value: float) -> str:
+    """``value`` as PHP writes it with serialize_precision = -1"""
+    if math.isnan(value):
+        return 'NAN'
+    if math.isinf(value):
+        return 'INF' if value > 0 else '-INF'
+    sign = '-' if math.copysign(1.0, value) < 0 else ''
+    if value == 0:
+        return sign + '0'
+    # Shortest round-trip digits and the decimal point position, as zend_dtoa mode 0 gives them
+    _, digit_tuple, exponent = Decimal(repr(abs(value))).as_tuple()
+    decpt = len(digit_tuple) + exponent
+    digits = ''.join(map(str, digit_tuple)).rstrip('0')
+    if decpt < -3 or decpt > 17:
+        mantissa = digits[0] + '.' + (digits[1:] or '0')
+        return f"{sign}{mantissa}E{'-' if decpt - 1 < 0 else '+'}{abs(decpt - 1)}"
+    if decpt <= 0:
+        return f"{sign}0.{'0' * -decpt}{digits}"
+    if len(digits) <= decpt:
+        return sign + digits + '0' * (decpt - len(digits))
+    return f"{sign}{digits[:decpt]}.{digits[decpt:]}"
+
+
+def _key(key: Any) -> str:
+    kind = type(key)
+    if kind is str:
+        first = key[:1]
+        if ('0' <= first <= '9' or first == '-') and _INTEGER_KEY.match(key) \
+                and _PHP_INT_MIN <= int(key) <= _PHP_INT_MAX:
+            return f'i:{key};'
+        return _string(key)
+    if kind is int or isinstance(key, int):
+        return f'i:{int(key)};'
+    if isinstance(key, str):
+        return _key(str(key))
+    raise PHPSerializeError(f"unsupported array key type: {kind.__name__}")
+
+
+def _string(value: str) -> str:
+    length = len(value) if value.isascii() else len(value.encode(ENCODING, ERRORS))
+    return f's:{length}:"{value}";'
+
+
+def _serialize(value: Any, out: list):
+    kind = type(value)
+    if kind is str:
+        out.append(_string(value))
+    elif kind is int:
+        out.append(f'i:{value};')
+    elif kind is dict:
+        out.append(f'a:{len(value)}:{{')
+        for key, item in value.items():
+            out.append(_key(key))
+            _serialize(item, out)
+        out.append('}')
+    elif value is None:
+        out.append('N;')
+    elif kind is bool:
+        out.append('b:1;' if value else 'b:0;')
+    elif kind is float:
+        out.append(f'd:{_php_float(value)};')
+    elif kind is list or kind is tuple:
+        out.append(f'a:{len(value)}:{{')
+        for index, item in enumerate(value):
+            out.append(f'i:{index};')
+            _serialize(item, out)
+        out.append('}')
+    elif isinstance(value, bytes):
+        out.append(f's:{len(value)}:"{value.decode(ENCODING, ERRORS)}";')
+    elif isinstance(value, PHPObject):
+        out.append(f'O:{len(value.class_name.encode(ENCODING, ERRORS))}:"{value.class_name}":'
+                   f'{len(value.properties)}:{{')
+        for key, item in value.properties.items():
+            out.append(_key(key))
+            _serialize(item, out)
+        out.append('}')
+    elif isinstance(value, bool):
+        _serialize(bool(value), out)
+    elif isinstance(value, int):
+        _serialize(int(value), out)
+    elif isinstance(value, float):
+        _serialize(float(value), out)
+    elif isinstance(value, str):
+        _serialize(str(value), out)
+    elif isinstance(value, dict):
+        _serialize(dict(value), out)
+    elif isinstance(value, (list, tuple)):
+        _serialize(list(value), out)
+    else:
+        raise PHPSerializeError(f"cannot serialize {kind.__name__}")
+
+
+def dumps(value: Any) -> str:
+    """PHP ``serialize()`` of ``value``"""
+    out = []
+    _serialize(value, out)
+    return ''.join(out)
+
+
+def dump(value: Any, fp: IO[str]) -> None:
+    """``dumps`` to a text file"""
+    fp.write(dumps(value))
+
+
+# One token per value header; the group that matched says which type it is
+_TOKEN = re.compile(
+    rb's:([0-9]+):"'         # 1: string length
+    rb'|i:([-+]?[0-9]+);'    # 2: integer
+    rb'|a:([0-9]+):\{'       # 3: array length
+    rb'|b:([01]);'           # 4: boolean
+    rb'|d:([^;:"{}]*);'      # 5: float
+    rb'|O:([0-9]+):"'        # 6: class name length
+    rb'|N;'
+)
+_OBJECT_LENGTH = re.compile(rb'":([0-9]+):\{')
+_ARRAY_HEAD = re.compile(rb'a:([0-9]+):\{')
+_NO_KEY = object()
+
+
+def _parse(raw: bytes, pos: int, decode: bool, offset: int = 0) -> Tuple[Any, int]:
+    """The value starting at ``raw[pos]`` and the position after it
+
+    Iterative, with one frame per open array: ``[entries, remaining, key, class_name]``.
+    """
+    match_token = _TOKEN.match
+    stack = []
+    while True:
+        match = match_token(raw, pos)
+        if match is None:
+            raise PHPSerializeError(f"invalid or truncated value {raw[pos:pos + 12]!r} at offset {offset + pos}")
+        group = match.lastindex
+        start, pos = pos, match.end()
+        if group == 1:
+            stop = pos + int(match.group(1))
+            if raw[stop:stop + 2] != b'";':
+                raise PHPSerializeError(f"string length does not match at offset {offset + start}")
+            value = raw[pos:stop].decode(ENCODING, ERRORS) if decode else raw[pos:stop]
+            pos = stop + 2
+        elif group == 2:
+            value = int(match.group(2))
+        elif group == 3 or group == 6:
+            class_name = None
+            if group == 6:
+                stop = pos + int(match.group(6))
+                length = _OBJECT_LENGTH.match(raw, stop)
+                if length is None:
+                    raise PHPSerializeError(f"invalid or truncated object at offset {offset + start}")
+                class_name = raw[pos:stop].decode(ENCODING, ERRORS)
+                count, pos = int(length.group(1)), length.end()
+            else:
+                count = int(match.group(3))
+            if count:
+                stack.append([{}, count, _NO_KEY, class_name])
+                continue
+            if raw[pos:pos + 1] != b'}':
+                raise PHPSerializeError(f"expected '}}' at offset {offset + pos}")
+            pos += 1
+            value = {} if class_name is None else PHPObject(class_name, {})
+        elif group is None:
+            value = None
+        elif group == 4:
+            value = match.group(4) == b'1'
+        else:
+            try:
+                value = float(match.group(5))
+            except ValueError:
+                raise PHPSerializeError(f"invalid float {match.group(5)[:20]!r} at offset {offset + start}") from None
+
+        # Store the value in the open array, closing every array it completes
+        while True:
+            if not stack:
+                return value, pos
+            frame = stack[-1]
+            if frame[2] is _NO_KEY:
+                if type(value) is not int and type(value) is not str and type(value) is not bytes:
+                    raise PHPSerializeError(f"invalid array key at offset {offset + start}")
+                frame[2] = value
+                break
+            frame[0][frame[2]] = value
+            frame[2] = _NO_KEY
+            frame[1] -= 1
+            if frame[1]:
+                break
+            if raw[pos:pos + 1] != b'}':
+                raise PHPSerializeError(f"expected '}}' at offset {offset + pos}")
+            pos += 1
+            stack.pop()
+            value = frame[0] if frame[3] is None else PHPObject(frame[3], frame[0])
+
+
+def _as_bytes(data: Union[str, bytes, bytearray]) -> bytes:
+    return data.encode(ENCODING, ERRORS) if isinstance(data, str) else bytes(data)
+
+
+def loads(data: Union[str, bytes, bytearray], decode: bool = True) -> Any:
+    """PHP ``unserialize()``; arrays become dicts (``decode=False`` keeps strings as bytes)"""
+    raw = _as_bytes(data)
+    value, end = _parse(raw, 0, decode)
+    if raw[end:].strip():
+        raise PHPSerializeError(f"trailing data at offset {end}")
+    return value
+
+
+def load(fp: IO, decode: bool = True) -> Any:
+    """``loads`` from a binary or text file"""
+    return loads(fp.read(), decode)
+
+
+class _Stream:
+    """Buffer over a binary file; parsers are retried with more data until they succeed or the file ends
+
+    Every serialized value ends with ``;`` or ``}``, so a parse that succeeds
+    on a prefix of the data gives the same result as on the whole data.
+    """
+
+    def __init__(self, raw: bytes = b'', fp: IO[bytes] = None, chunk_size: int = 65536):
+        self.buffer = raw
+        self.pos = 0
+        self.offset = 0  # file offset of buffer[0]
+        self.fp = fp
+        self.chunk_size = chunk_size
+
+    def _fill(self, size: int) -> bool:
+        chunk = self.fp.read(size) if self.fp is not None else b''
+        if not chunk:
+            self.fp = None
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + _as_bytes(chunk)
+        self.pos = 0
+        return True
+
+    def parse(self, parser):
+        """Run ``parser(buffer, pos, offset) -> (result, end)`` and consume what it read"""
+        size = self.chunk_size
+        while True:
+            try:
+                result, self.pos = parser(self.buffer, self.pos, self.offset)
+                return result
+            except PHPSerializeError:
+                if not self._fill(size):
+                    raise
+                size *= 2  # an entry larger than the buffer: grow geometrically
+
+
+def iter_items(source: Union[str, bytes, IO[bytes]], decode: bool = True,
+               chunk_size: int = 65536) -> Iterator[Tuple[Any, Any]]:
+    """Yield the ``(key, value)`` entries of a serialized top-level array one at a time
+
+    ``source`` is serialized data or a binary file; a file is read in chunks,
+    so memory is bounded by the largest entry, not by the array.
+    """
+    if isinstance(source, (str, bytes, bytearray)):
+        stream = _Stream(_as_bytes(source))
+    else:
+        stream = _Stream(fp=source, chunk_size=chunk_size)
+
+    def head(raw, pos, offset):
+        match = _ARRAY_HEAD.match(raw, pos)
+        if match is None:
+            raise PHPSerializeError(f"expected an array at offset {offset + pos}")
+        return int(match.group(1)), match.end()
+
+    def entry(raw, pos, offset):
+        key, pos = _parse(raw, pos, decode, offset)
+        if type(key) is not int and type(key) is not str and type(key) is not bytes:
+            raise PHPSerializeError(f"invalid array key {key!r} at offset {offset + pos}")
+        value, pos = _parse(raw, pos, decode, offset)
+        return (key, value), pos
+
+    def close(raw, pos, offset):
+        if raw[pos:pos + 1] != b'}':
+            raise PHPSerializeError(f"expected '}}' at offset {offset + pos}")
+        return None, pos + 1
+
+    for _ in range(stream.parse(head)):
+        yield stream.parse(entry)
+    stream.parse(close)
@@ -5,12 +5,23 @@ Placeholder System Design
 
 Advanced placeholder system with validation, content injection, and template management
 Based on the hybrid architecture for maximum flexibility with reliability
+
+Templates are tokenized once into an AST (LOOP, IF, FUNC, transform, default
+and simple nodes) and rendered straight into Python objects - no JSON
+round-trip. Dict templates are compiled once per template name.
+
+Structured template syntax:
+- A string that is exactly one placeholder renders the native value
+  ({{layout}} -> dict, {{FUNC:calculate_column_width:layout.columns}} -> float)
+- A dict key that renders empty drops the entry: "{{IF:subtitle}}subtitle{{/IF}}"
+- A list item {"{{LOOP:services}}": {...}} expands to one item per entry
 """
 
 import re
 import json
 import copy
-from typing import Dict, List, Any, Optional, Union, Callable
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -24,79 +35,131 @@ class PlaceholderType(Enum):
     LOOP = "loop"              # {{LOOP:key}}...{{/LOOP}}
     FUNCTION = "function"      # {{FUNC:function_name:key}}
     NESTED = "nested"          # {{parent.child.field}}
-    TRANSFORM = "transform"    # {{key|transform_name}}
+    TRANSFORM = "transform"    # {{key|transform_name(params)}}
+
+
+TAG_PATTERN = re.compile(r'\{\{([^{}]*)\}\}')
+TRANSFORM_PATTERN = re.compile(r'(\w+)\((.*)\)', re.DOTALL)
+LOOP_KEY_PATTERN = re.compile(r'\{\{LOOP:(\w+)\}\}')
 
 
-@dataclass
-class PlaceholderPattern:
-    """Pattern definition for placeholder types"""
-    pattern: str
+@dataclass(frozen=True)
+class TemplateNode:
+    """A placeholder in a tokenized template; literal text is kept as plain str"""
     type: PlaceholderType
-    processor: Callable
-    description: str
+    source: str                    # original tag, returned for unresolved placeholders
+    key: str = ''                  # lowercased lookup path (FUNC: raw parameter path)
+    arg: str = ''                  # default value, transform or function name
+    params: Tuple[str, ...] = ()   # transform parameters
+    default: str = ''              # raw text after '|', used when the transform is unknown
+    children: Tuple[Any, ...] = () # IF / LOOP body
+
+
+@lru_cache(maxsize=4096)
+def parse_template(text: str) -> Tuple[Any, ...]:
+    """Tokenize a template string into a tuple of str and TemplateNode"""
+    root: List[Any] = []
+    stack = [(None, root, None)]
+    pos = 0
+
+    for match in TAG_PATTERN.finditer(text):
+        if match.start() > pos:
+            stack[-1][1].append(text[pos:match.start()])
+        pos = match.end()
+        tag = match.group(1).strip()
+
+        if tag.startswith(('LOOP:', 'IF:')):
+            block, key = tag.split(':', 1)
+            stack.append((block, [], (match.group(0), key.strip().lower())))
+        elif tag in ('/LOOP', '/IF'):
+            block, children, opener = stack.pop() if len(stack) > 1 else (None, None, None)
+            if block != tag[1:]:
+                raise PlaceholderResolutionError(f"Unexpected {match.group(0)} in template: {text[:80]}")
+            node_type = PlaceholderType.LOOP if block == 'LOOP' else PlaceholderType.CONDITIONAL
+            stack[-1][1].append(TemplateNode(node_type, source=opener[0], key=opener[1], children=tuple(children)))
+        elif tag.startswith('FUNC:'):
+            _, name, param = (tag.split(':', 2) + [''])[:3]
+            stack[-1][1].append(TemplateNode(PlaceholderType.FUNCTION, match.group(0), key=param.strip(), arg=name))
+        elif '|' in tag:
+            key, rest = tag.split('|', 1)
+            transform = TRANSFORM_PATTERN.fullmatch(rest)
+            if transform:
+                params = tuple(p.strip().strip("'\"") for p in transform.group(2).split(',') if p.strip())
+                stack[-1][1].append(TemplateNode(PlaceholderType.TRANSFORM, match.group(0), key=key.strip().lower(),
+                                                 arg=transform.group(1), params=params, default=rest))
+            else:
+                stack[-1][1].append(TemplateNode(PlaceholderType.DEFAULT, match.group(0),
+                                                 key=key.strip().lower(), arg=rest))
+        else:
+            stack[-1][1].append(TemplateNode(PlaceholderType.SIMPLE, match.group(0), key=tag.lower()))
+
+    if len(stack) > 1:
+        raise PlaceholderResolutionError(f"Unclosed {stack[-1][2][0]} in template: {text[:80]}")
+    if pos < len(text):
+        root.append(text[pos:])
+    return tuple(root)
+
+
+# Compiled template kinds
+_STATIC = 0
+_STRING = 1
+_DICT = 2
+_LIST = 3
+_LOOP = 4
+
+
+def compile_template(template: Any):
+    """Compile a dict/list/str template into a render plan
+
+    Dicts and lists without any placeholder below them compile to _STATIC
+    and are shared with the template when rendered.
+    """
+    if isinstance(template, str):
+        nodes = parse_template(template)
+        if all(isinstance(node, str) for node in nodes):
+            return (_STATIC, template)
+        return (_STRING, nodes)
+    if isinstance(template, dict):
+        items = tuple((compile_template(key), compile_template(value)) for key, value in template.items())
+        if all(key[0] == _STATIC and value[0] == _STATIC for key, value in items):
+            return (_STATIC, template)
+        return (_DICT, items)
+    if isinstance(template, list):
+        items = []
+        for item in template:
+            if isinstance(item, dict) and len(item) == 1:
+                key, body = next(iter(item.items()))
+                loop = LOOP_KEY_PATTERN.fullmatch(key) if isinstance(key, str) else None
+                if loop:
+                    items.append((_LOOP, loop.group(1).lower(), compile_template(body)))
+                    continue
+            items.append(compile_template(item))
+        if all(item[0] == _STATIC for item in items):
+            return (_STATIC, template)
+        return (_LIST, tuple(items))
+    return (_STATIC, template)
 
 
 class PlaceholderResolver:
     """
     Advanced placeholder resolution system for widget templates
     """
-    
+
     def __init__(self, theme_config=None):
         self.theme_config = theme_config
         self.logger = logging.getLogger(__name__)
         self.custom_transforms = {}
         self.custom_functions = {}
-        
-        # Initialize built-in patterns
-        self.patterns = self._init_patterns()
-        
+
+        # Compiled dict templates by template name
+        self._compiled: Dict[str, Tuple[Any, Any]] = {}
+
         # Initialize built-in transforms
         self._init_transforms()
-        
+
         # Initialize built-in functions
         self._init_functions()
-    
-    def _init_patterns(self) -> List[PlaceholderPattern]:
-        """Initialize placeholder patterns with their processors"""
-        return [
-            PlaceholderPattern(
-                pattern=r'\{\{LOOP:(\w+)\}\}(.*?)\{\{/LOOP\}\}',
-                type=PlaceholderType.LOOP,
-                processor=self._process_loop,
-                description="Process array loops: {{LOOP:items}}template{{/LOOP}}"
-            ),
-            PlaceholderPattern(
-                pattern=r'\{\{IF:(\w+)\}\}(.*?)\{\{/IF\}\}',
-                type=PlaceholderType.CONDITIONAL,
-                processor=self._process_conditional,
-                description="Conditional content: {{IF:field}}content{{/IF}}"
-            ),
-            PlaceholderPattern(
-                pattern=r'\{\{FUNC:(\w+):([^}]+)\}\}',
-                type=PlaceholderType.FUNCTION,
-                processor=self._process_function,
-                description="Function calls: {{FUNC:function_name:parameter}}"
-            ),
-            PlaceholderPattern(
-                pattern=r'\{\{([^|}]+)\|([^}]+)\}\}',
-                type=PlaceholderType.DEFAULT,
-                processor=self._process_default,
-                description="Default values: {{key|default_value}}"
-            ),
-            PlaceholderPattern(
-                pattern=r'\{\{([^|}]+)\|(\w+)\((.*?)\)\}\}',
-                type=PlaceholderType.TRANSFORM,
-                processor=self._process_transform,
-                description="Transforms: {{key|transform_name(params)}}"
-            ),
-            PlaceholderPattern(
-                pattern=r'\{\{([^|}]+)\}\}',
-                type=PlaceholderType.SIMPLE,
-                processor=self._process_simple,
-                description="Simple substitution: {{key}}"
-            )
-        ]
-    
+
     def _init_transforms(self):
         """Initialize built-in transforms"""
         self.custom_transforms.update({
@@ -112,7 +175,7 @@ class PlaceholderResolver:
             'to_int': lambda x, *args: int(x) if str(x).isdigit() else 0,
             'format_url': lambda x, *args: x if x.startswith(('http://', 'https://')) else f'https://{x}',
         })
-    
+
     def _init_functions(self):
         """Initialize built-in functions"""
         self.custom_functions.update({
@@ -123,14 +186,17 @@ class PlaceholderResolver:
             'random_choice': lambda *choices: self._random_choice(*choices),
             'calculate_column_width': lambda column_count: 100 / int(column_count),
         })
-    
-    def resolve(self, template: Union[str, Dict], content_data: Dict[str, Any]) -> Union[str, Dict]:
+
+    def resolve(self, template: Union[str, Dict], content_data: Dict[str, Any],
+                template_name: Optional[str] = None) -> Union[str, Dict]:
         """
         Main resolution method - handles both string templates and dict templates
+
+        Pass template_name to reuse the compiled form of a dict template.
         """
         try:
             if isinstance(template, dict):
-                return self._resolve_dict(template, content_data)
+                return self._resolve_dict(template, content_data, template_name)
             elif isinstance(template, str):
                 return self._resolve_string(template, content_data)
             else:
@@ -138,175 +204,182 @@ class PlaceholderResolver:
         except Exception as e:
             self.logger.error(f"Placeholder resolution failed: {e}")
             raise PlaceholderResolutionError(f"Failed to resolve placeholders: {e}")
-    
-    def _resolve_dict(self, template: Dict, content_data: Dict[str, Any]) -> Dict:
+
+    def _resolve_dict(self, template: Dict, content_data: Dict[str, Any],
+                      template_name: Optional[str] = None) -> Dict:
         """Resolve placeholders in dictionary template"""
-        resolved = copy.deepcopy(template)
-        
-        # Convert to string, resolve, then parse back
-        json_str = json.dumps(resolved)
-        resolved_str = self._resolve_string(json_str, content_data)
-        
-        try:
-            return json.loads(resolved_str)
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON decode error after placeholder resolution: {e}")
-            # Fallback: try to fix common JSON issues
-            resolved_str = self._fix_json_issues(resolved_str)
-            return json.loads(resolved_str)
-    
+        if template_name is None:
+            return self._render(compile_template(template), content_data)
+
+        cached = self._compiled.get(template_name)
+        if cached is None or cached[0] is not template:
+            cached = (template, compile_template(template))
+            self._compiled[template_name] = cached
+        return self._render(cached[1], content_data)
+
     def _resolve_string(self, template: str, content_data: Dict[str, Any]) -> str:
         """Resolve placeholders in string template"""
-        resolved = template
-        
-        # Process patterns in order of complexity (most complex first)
-        for pattern_def in self.patterns:
-            matches = list(re.finditer(pattern_def.pattern, resolved, re.DOTALL))
-            # Process matches in reverse order to avoid index shifting
-            for match in reversed(matches):
-                try:
-                    replacement = pattern_def.processor(match, content_data)
-                    resolved = resolved[:match.start()] + replacement + resolved[match.end():]
-                except Exception as e:
-                    self.logger.warning(f"Pattern {pattern_def.type} processing failed: {e}")
-                    # Keep original placeholder on error for debugging
-                    continue
-        
-        return resolved
-    
-    def _process_loop(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{LOOP:items}}template{{/LOOP}} patterns"""
-        loop_key = match.group(1).lower()
-        template = match.group(2)
-        
+        return self._render_text(parse_template(template), content_data)
+
+    def _render(self, compiled, content_data: Dict[str, Any]) -> Any:
+        """Render a compiled template into Python objects
+
+        Only dicts and lists that hold a placeholder are built anew; static
+        subtrees and dict/list values taken from content_data are shared,
+        so replace values in the result instead of mutating them (or use
+        TemplateLibrary.get_template for a private copy).
+        """
+        kind = compiled[0]
+        if kind == _STATIC:
+            return compiled[1]
+        if kind == _STRING:
+            nodes = compiled[1]
+            if len(nodes) == 1 and nodes[0].type not in (PlaceholderType.CONDITIONAL, PlaceholderType.LOOP):
+                value = self._evaluate(nodes[0], content_data)
+                return value
+            return self._render_text(nodes, content_data)
+        if kind == _DICT:
+            result = {}
+            for key_plan, value_plan in compiled[1]:
+                if key_plan[0] == _STATIC:
+                    key = key_plan[1]
+                else:
+                    key = self._render_text(key_plan[1], content_data)
+                    if not key:
+                        continue  # conditional key evaluated to nothing
+                result[key] = self._render(value_plan, content_data)
+            return result
+
+        result = []
+        for item in compiled[1]:
+            if item[0] == _LOOP:
+                result.extend(self._render(item[2], context) for context in self._loop_contexts(item[1], content_data))
+            else:
+                result.append(self._render(item, content_data))
+        return result
+
+    def _render_text(self, nodes: Tuple[Any, ...], content_data: Dict[str, Any]) -> str:
+        """Render tokenized nodes as a string"""
+        parts = []
+        for node in nodes:
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.type == PlaceholderType.CONDITIONAL:
+                if self._is_truthy(self._get_nested_value(content_data, node.key)):
+                    parts.append(self._render_text(node.children, content_data))
+            elif node.type == PlaceholderType.LOOP:
+                parts.append(','.join(self._render_text(node.children, context)
+                                      for context in self._loop_contexts(node.key, content_data)))
+            else:
+                value = self._evaluate(node, content_data)
+                parts.append(json.dumps(value) if isinstance(value, (dict, list)) else str(value))
+        return ''.join(parts)
+
+    def _loop_contexts(self, loop_key: str, content_data: Dict[str, Any]):
+        """Yield the render context for each item of a LOOP"""
         items = self._get_nested_value(content_data, loop_key)
         if not isinstance(items, list):
-            return ""
-        
-        results = []
+            return
+
         for i, item in enumerate(items):
-            item_template = template
-            
             # Create item context
             item_context = content_data.copy()
             if isinstance(item, dict):
                 item_context.update(item)
-                item_context['item'] = item
-            else:
-                item_context['item'] = item
-            
+            item_context['item'] = item
+
             item_context['index'] = i
             item_context['index_1'] = i + 1  # 1-based index
             item_context['is_first'] = i == 0
             item_context['is_last'] = i == len(items) - 1
-            
-            # Resolve nested placeholders in item template
-            resolved_item = self._resolve_string(item_template, item_context)
-            results.append(resolved_item)
-        
-        return ','.join(results) if results else ""
-    
-    def _process_conditional(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{IF:condition}}content{{/IF}} patterns"""
-        condition_key = match.group(1).lower()
-        content_block = match.group(2)
-        
-        condition_value = self._get_nested_value(content_data, condition_key)
-        
-        # Evaluate condition
-        if self._is_truthy(condition_value):
-            # Resolve nested placeholders in content block
-            return self._resolve_string(content_block, content_data)
-        else:
-            return ""
-    
-    def _process_function(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{FUNC:function_name:parameter}} patterns"""
-        function_name = match.group(1)
-        parameter = match.group(2)
-        
+            yield item_context
+
+    def _evaluate(self, node: TemplateNode, content_data: Dict[str, Any]) -> Any:
+        """Evaluate a FUNC, transform, default or simple node to its native value"""
+        if node.type == PlaceholderType.FUNCTION:
+            return self._process_function(node, content_data)
+        if node.type == PlaceholderType.TRANSFORM:
+            return self._process_transform(node, content_data)
+        if node.type == PlaceholderType.DEFAULT:
+            return self._process_default(node, content_data)
+        return self._process_simple(node, content_data)
+
+    def _process_function(self, node: TemplateNode, content_data: Dict[str, Any]) -> Any:
+        """Process {{FUNC:function_name:parameter}} nodes"""
+        function_name = node.arg
+
         if function_name not in self.custom_functions:
             self.logger.warning(f"Unknown function: {function_name}")
-            return match.group(0)  # Return original if function not found
-        
+            return node.source  # Return original if function not found
+
         try:
-            # Get parameter value from content_data
-            param_value = self._get_nested_value(content_data, parameter)
-            result = self.custom_functions[function_name](param_value)
-            return str(result)
+            # Get parameter value from content_data; {{FUNC:name:}} takes no argument
+            if not node.key:
+                return self.custom_functions[function_name]()
+            param_value = self._get_nested_value(content_data, node.key)
+            return self.custom_functions[function_name](param_value)
         except Exception as e:
             self.logger.error(f"Function {function_name} execution failed: {e}")
             return ""
-    
-    def _process_transform(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{key|transform_name(params)}} patterns"""
-        key = match.group(1).lower()
-        transform_name = match.group(2)
-        params_str = match.group(3)
-        
+
+    def _process_transform(self, node: TemplateNode, content_data: Dict[str, Any]) -> Any:
+        """Process {{key|transform_name(params)}} nodes"""
+        transform_name = node.arg
+
         # Get value
-        value = self._get_nested_value(content_data, key)
-        
+        value = self._get_nested_value(content_data, node.key)
+
         if transform_name not in self.custom_transforms:
-            self.logger.warning(f"Unknown transform: {transform_name}")
-            return str(value)
-        
+            # Not a transform after all, e.g. {{overlay_color|rgba(0,0,0,0.6)}}
+            return self._process_default(node, content_data)
+
         try:
-            # Parse parameters
-            params = [p.strip().strip("'\"") for p in params_str.split(',') if p.strip()]
-            result = self.custom_transforms[transform_name](value, *params)
-            return str(result)
+            return self.custom_transforms[transform_name](value, *node.params)
         except Exception as e:
             self.logger.error(f"Transform {transform_name} execution failed: {e}")
-            return str(value)
-    
-    def _process_default(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{key|default_value}} patterns"""
-        key = match.group(1).lower()
-        default_value = match.group(2)
-        
-        value = self._get_nested_value(content_data, key)
-        
+            return value
+
+    def _process_default(self, node: TemplateNode, content_data: Dict[str, Any]) -> Any:
+        """Process {{key|default_value}} nodes"""
+        default_value = node.default if node.type == PlaceholderType.TRANSFORM else node.arg
+
+        value = self._get_nested_value(content_data, node.key)
+
         if value is None or value == "":
             # Handle special default values
             if default_value == "SPACING_OBJECT":
-                return json.dumps(self._get_spacing_object())
+                return self._get_spacing_object()
             elif default_value.startswith("THEME_"):
                 color_name = default_value.replace("THEME_", "").lower()
                 return self._get_theme_color(color_name)
             else:
                 return default_value
-        
-        return str(value)
-    
-    def _process_simple(self, match, content_data: Dict[str, Any]) -> str:
-        """Process {{key}} patterns"""
-        key = match.group(1).lower()
-        value = self._get_nested_value(content_data, key)
-        
+
+        return value
+
+    def _process_simple(self, node: TemplateNode, content_data: Dict[str, Any]) -> Any:
+        """Process {{key}} nodes"""
+        value = self._get_nested_value(content_data, node.key)
+
         if value is None:
-            self.logger.warning(f"Undefined placeholder: {key}")
-            return match.group(0)  # Return original placeholder
-        
-        # Handle special value types
-        if isinstance(value, dict) or isinstance(value, list):
-            return json.dumps(value)
-        
-        return str(value)
-    
+            self.logger.warning(f"Undefined placeholder: {node.key}")
+            return node.source  # Return original placeholder
+
+        return value
+
     def _get_nested_value(self, data: Dict[str, Any], key_path: str) -> Any:
         """Get value from nested dictionary using dot notation"""
         keys = key_path.split('.')
         current = data
-        
+
         for key in keys:
             if isinstance(current, dict) and key in current:
                 current = current[key]
             else:
                 return None
-        
+
         return current
-    
+
     def _is_truthy(self, value: Any) -> bool:
         """Evaluate if value is truthy for conditional logic"""
         if value is None or value == "":
@@ -318,17 +391,7 @@ class PlaceholderResolver:
         if isinstance(value, str):
             return value.lower() not in ('false', '0', 'no', 'off', 'none')
         return bool(value)
-    
-    def _fix_json_issues(self, json_str: str) -> str:
-        """Attempt to fix common JSON issues after placeholder resolution"""
-        # Remove trailing commas
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-        
-        # Fix double quotes in strings
-        json_str = re.sub(r'(?<!\\)"(?=[^,}\]\s])', r'\\"', json_str)
-        
-        return json_str
-    
+
     def _generate_elementor_id(self) -> str:
         """Generate Elementor-style ID"""
         import random
@@ -400,8 +463,8 @@ class TemplateLibrary:
                 "elType": "widget", 
                 "settings": {
                     "title": "{{title}}",
-                    "{{IF:subtitle}}subtitle": "{{subtitle}}",{{/IF}}
-                    "{{IF:text}}text": "{{text|wrap_html(p)}}",{{/IF}}
+                    "{{IF:subtitle}}subtitle{{/IF}}": "{{subtitle}}",
+                    "{{IF:text}}text{{/IF}}": "{{text|wrap_html(p)}}",
                     "selected_icon": {
                         "value": "{{icon|fas fa-crown}}",
                         "library": "fa-solid"
@@ -443,12 +506,27 @@ class TemplateLibrary:
                     "structure": "{{layout.structure|33}}",
                     "gap": "extended",
                     "padding": {"unit": "px", "top": 60, "right": 0, "bottom": 60, "left": 0},
-                    "{{IF:background}}background_background": "{{background.type|classic}}",
-                    "background_color": "{{background.color|#ffffff}}"{{/IF}}
+                    "{{IF:background}}background_background{{/IF}}": "{{background.type|classic}}",
+                    "{{IF:background}}background_color{{/IF}}": "{{background.color|#ffffff}}"
                 },
-                "elements": [
-                    "{{LOOP:services}}{\"id\": \"{{FUNC:generate_id:}}\", \"elType\": \"column\", \"settings\": {\"_column_size\": {{FUNC:calculate_column_width:layout.columns}}, \"_inline_size\": null}, \"elements\": [{\"id\": \"{{FUNC:generate_id:}}\", \"elType\": \"widget\", \"widgetType\": \"cholot-texticon\", \"settings\": {\"title\": \"{{title}}\", \"text\": \"{{text|wrap_html(p)}}\", \"selected_icon\": {\"value\": \"{{icon|fas fa-check}}\", \"library\": \"fa-solid\"}}}], \"isInner\": false}{{/LOOP}}"
-                ],
+                "elements": [{
+                    "{{LOOP:services}}": {
+                        "id": "{{FUNC:generate_id:}}",
+                        "elType": "column",
+                        "settings": {"_column_size": "{{FUNC:calculate_column_width:layout.columns}}", "_inline_size": None},
+                        "elements": [{
+                            "id": "{{FUNC:generate_id:}}",
+                            "elType": "widget",
+                            "widgetType": "cholot-texticon",
+                            "settings": {
+                                "title": "{{title}}",
+                                "text": "{{text|wrap_html(p)}}",
+                                "selected_icon": {"value": "{{icon|fas fa-check}}", "library": "fa-solid"}
+                            }
+                        }],
+                        "isInner": False
+                    }
+                }],
                 "isInner": False
             }
         })
@@ -504,6 +582,12 @@ class TemplateLibrary:
             raise ValueError(f"Template not found: {template_name}")
         return copy.deepcopy(self.templates[template_name])
     
+    def render(self, template_name: str, content_data: Dict[str, Any], resolver: 'PlaceholderResolver') -> Dict[str, Any]:
+        """Resolve a template by name, reusing the resolver's compiled form"""
+        if template_name not in self.templates:
+            raise ValueError(f"Template not found: {template_name}")
+        return resolver.resolve(self.templates[template_name], content_data, template_name=template_name)
+    
     def list_templates(self) -> List[str]:
         """List available templates"""
         return list(self.templates.keys())
@@ -518,8 +602,9 @@ class ContentValidator:
     Validates content data against template requirements
     """
     
-    def __init__(self, template_library: TemplateLibrary):
+    def __init__(self, template_library: TemplateLibrary, resolver: Optional[PlaceholderResolver] = None):
         self.template_library = template_library
+        self.resolver = resolver if resolver is not None else PlaceholderResolver()
     
     def validate_content(self, template_name: str, content_data: Dict[str, Any]) -> List[str]:
         """
@@ -544,37 +629,52 @@ class ContentValidator:
         return errors
     
     def _extract_required_placeholders(self, template: Any) -> List[str]:
-        """Extract required placeholders (those not in IF blocks)"""
-        template_str = json.dumps(template)
-        
-        # Find all placeholders
-        all_placeholders = re.findall(r'\{\{([^|}]+)(?:\|[^}]*)?\}\}', template_str)
-        
-        # Filter out conditional ones
-        conditional_blocks = re.findall(r'\{\{IF:[^}]+\}\}(.*?)\{\{/IF\}\}', template_str, re.DOTALL)
-        conditional_placeholders = set()
-        
-        for block in conditional_blocks:
-            block_placeholders = re.findall(r'\{\{([^|}]+)(?:\|[^}]*)?\}\}', block)
-            conditional_placeholders.update(block_placeholders)
-        
-        # Required are those not in conditional blocks
-        required = [p for p in all_placeholders if p not in conditional_placeholders and not p.startswith('FUNC:')]
-        
-        return list(set(required))
+        """Extract required placeholders (outside IF blocks and conditional keys, without default)"""
+        required, _ = self._collect_placeholders(template)
+        return sorted(required)
     
     def _extract_optional_placeholders(self, template: Any) -> List[str]:
-        """Extract optional placeholders (those in IF blocks)"""
-        template_str = json.dumps(template)
-        
-        conditional_blocks = re.findall(r'\{\{IF:[^}]+\}\}(.*?)\{\{/IF\}\}', template_str, re.DOTALL)
-        optional_placeholders = set()
-        
-        for block in conditional_blocks:
-            block_placeholders = re.findall(r'\{\{([^|}]+)(?:\|[^}]*)?\}\}', block)
-            optional_placeholders.update(block_placeholders)
+        """Extract optional placeholders (in IF blocks, behind conditional keys or with a default)"""
+        _, optional = self._collect_placeholders(template)
+        return sorted(optional)
+    
+    def _collect_placeholders(self, template: Any) -> Tuple[set, set]:
+        """Walk the template AST and sort placeholder keys into (required, optional)"""
+        required, optional = set(), set()
         
-        return list(optional_placeholders)
+        def visit_nodes(nodes, is_optional: bool):
+            for node in nodes:
+                if isinstance(node, str) or node.type == PlaceholderType.FUNCTION:
+                    continue
+                if node.type == PlaceholderType.CONDITIONAL:
+                    visit_nodes(node.children, True)
+                    continue
+                # LOOP bodies reference item fields, only the list itself is checked
+                has_default = node.type == PlaceholderType.DEFAULT or (
+                    node.type == PlaceholderType.TRANSFORM and node.arg not in self.resolver.custom_transforms)
+                target = optional if is_optional or has_default else required
+                target.add(node.key)
+        
+        def visit(value: Any, is_optional: bool):
+            if isinstance(value, str):
+                visit_nodes(parse_template(value), is_optional)
+            elif isinstance(value, dict):
+                for key, item in value.items():
+                    loop = LOOP_KEY_PATTERN.fullmatch(key) if isinstance(key, str) else None
+                    if loop:
+                        (optional if is_optional else required).add(loop.group(1).lower())
+                        continue
+                    key_nodes = parse_template(key) if isinstance(key, str) else ()
+                    visit_nodes(key_nodes, is_optional)
+                    conditional_key = any(not isinstance(n, str) and n.type == PlaceholderType.CONDITIONAL
+                                          for n in key_nodes)
+                    visit(item, is_optional or conditional_key)
+            elif isinstance(value, list):
+                for item in value:
+                    visit(item, is_optional)
+        
+        visit(template, False)
+        return required, optional - required
     
     def _has_content_for_placeholder(self, placeholder: str, content_data: Dict[str, Any]) -> bool:
         """Check if content data has value for placeholder"""
@@ -646,14 +746,12 @@ if __name__ == "__main__":
         print("Content validation passed!")
     
     # Resolve template
-    template = template_library.get_template('cholot-texticon')
-    resolved_widget = resolver.resolve(template, content_data)
+    resolved_widget = template_library.render('cholot-texticon', content_data, resolver)
     
     print(f"Generated widget ID: {resolved_widget['id']}")
     print(f"Widget title: {resolved_widget['settings']['title']}")
     
     # Test section template
-    section_template = template_library.get_template('cholot-services-section')
-    resolved_section = resolver.resolve(section_template, content_data)
+    resolved_section = template_library.render('cholot-services-section', content_data, resolver)
     
     print(f"Generated section with {len(resolved_section['elements'])} columns")
\ No newline at end of file
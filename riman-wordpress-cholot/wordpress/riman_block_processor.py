@@ -4,30 +4,44 @@ RIMAN Website Block Processor
 Erweiterte Version des intelligenten Block-Processors für RIMAN Relaunch
 """
 
-import json
+import sys
 import yaml
-import copy
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Optional
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import re
 
+import block_templates
+import json_backend
+import wxr_serializer
+from block_templates import CompiledBlockTemplate, compile_block_library
+from build_cache import BuildCache, fingerprint, source_fingerprint, text_digest
+from wxr_serializer import WXRSerializer
+
+# libyaml ist um ein Vielfaches schneller; sonst der reine Python-Loader
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class RIMANBlockProcessor:
     def __init__(self, config_file: str):
         self.config_file = config_file
         self.config = None
         self.blocks = {}
+        self.compiled_blocks: Dict[str, List[CompiledBlockTemplate]] = {}
         self.block_library_path = Path("block_library")
         self.generated_pages = []
         self.generated_posts = []
         self.generated_menus = []
+        self.serializer = WXRSerializer(indent='  ')
+        self.page_spans = []  # [start, end] der Seiten-Items als str-Indizes (Zeichen, keine Bytes)
+        self._source_digest_value: Optional[str] = None
+        self._template_digests: Dict[str, str] = {}
         
     def load_config(self) -> bool:
         """Lade YAML-Konfiguration"""
         try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=YAML_LOADER)
             print(f"✅ Config geladen: {self.config_file}")
             return True
         except Exception as e:
@@ -39,12 +53,13 @@ class RIMANBlockProcessor:
         if not self.block_library_path.exists():
             print("⚠️  Block-Library nicht gefunden, erstelle Standard-Blocks...")
             self.create_default_blocks()
+            self.compiled_blocks = compile_block_library(self.blocks)
             return
             
         # Lade existierende Blocks
         for block_file in self.block_library_path.glob("*.json"):
             with open(block_file, 'r', encoding='utf-8') as f:
-                block_data = json.load(f)
+                block_data = json_backend.load(f)
                 block_type = block_data.get('type', 'unknown')
                 
                 if block_type not in self.blocks:
@@ -55,6 +70,9 @@ class RIMANBlockProcessor:
         # Erstelle zusätzliche RIMAN-spezifische Blocks
         self.create_riman_blocks()
         
+        # Platzhalter-Slots einmalig lokalisieren
+        self.compiled_blocks = compile_block_library(self.blocks)
+        
         print(f"✅ {len(self.blocks)} Block-Typen geladen")
     
     def create_riman_blocks(self):
@@ -719,7 +737,7 @@ class RIMANBlockProcessor:
                 continue
                 
             # Wähle Block-Template
-            block_template = self.blocks[block_type][0]['structure']
+            block_template = self._compiled_block(block_type)
             
             # Fülle Template mit Daten
             filled_block = self._fill_block_template(block_template, block_config)
@@ -731,32 +749,28 @@ class RIMANBlockProcessor:
         
         return page_data
     
-    def _fill_block_template(self, template: Dict, config: Dict) -> Dict:
-        """Fülle Block-Template mit Inhalten aus Config"""
-        filled = copy.deepcopy(template)
+    def _compiled_block(self, block_type: str) -> CompiledBlockTemplate:
+        """Kompiliertes Template der ersten Variante (nachträglich hinzugefügte Blocks werden nachkompiliert)"""
+        compiled = self.compiled_blocks.get(block_type)
+        structure = self.blocks[block_type][0]['structure']
+        if not compiled or compiled[0].template is not structure:
+            compiled = [CompiledBlockTemplate(variant.get('structure')) for variant in self.blocks[block_type]]
+            self.compiled_blocks[block_type] = compiled
+        return compiled[0]
+    
+    def _fill_block_template(self, template, config: Dict) -> Dict:
+        """Fülle Block-Template mit Inhalten aus Config
+        
+        Nur die Pfade zu Platzhaltern werden kopiert, der Rest wird mit dem
+        Template geteilt - das Ergebnis daher nicht in-place verändern.
+        """
+        if not isinstance(template, CompiledBlockTemplate):
+            template = CompiledBlockTemplate(template)
         
         # Erstelle Content-Map basierend auf Block-Typ
         content_map = self._create_content_map(config)
         
-        # Rekursive Ersetzung
-        def replace_placeholders(element: Any, content: Dict) -> Any:
-            if isinstance(element, str):
-                for key, value in content.items():
-                    placeholder = f"{{{{{key}}}}}"
-                    if placeholder in element:
-                        element = element.replace(placeholder, str(value))
-                return element
-            elif isinstance(element, dict):
-                result = {}
-                for k, v in element.items():
-                    result[k] = replace_placeholders(v, content)
-                return result
-            elif isinstance(element, list):
-                return [replace_placeholders(item, content) for item in element]
-            else:
-                return element
-        
-        return replace_placeholders(filled, content_map)
+        return template.fill(content_map)
     
     def _create_content_map(self, config: Dict) -> Dict:
         """Erstelle Content-Map für verschiedene Block-Typen"""
@@ -937,11 +951,11 @@ class RIMANBlockProcessor:
         self._generate_menus(channel)
         
         # Seiten generieren
-        page_id = 1000
-        for page_config in self.config.get('pages', []):
+        page_items = []
+        for page_id, page_config in self._iter_page_configs():
+            print(f"\n📄 Verarbeite: {page_config.get('title', 'Untitled')}")
             page_data = self.assemble_page(page_config)
-            self._add_page_to_xml(channel, page_data, page_id)
-            page_id += 1
+            page_items.append(self._add_page_to_xml(channel, page_data, page_id))
             self.generated_pages.append(page_data)
         
         # Blog-Posts generieren
@@ -950,14 +964,124 @@ class RIMANBlockProcessor:
             self._add_post_to_xml(channel, post_config, post_id)
             post_id += 1
         
-        # XML formatieren
-        xml_string = ET.tostring(root, encoding='unicode')
+        # XML formatieren (ein Durchlauf, ohne DOM)
+        xml_output = self.serializer.to_string(root)
         
-        # DOCTYPE hinzufügen
-        xml_output = '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_string
+        # Positionen der Seiten merken, damit ein späterer Lauf sie ersetzen kann.
+        # Zeichen-Indizes in den als UTF-8 gelesenen Text, keine Byte-Offsets: in der
+        # Datei verschieben Umlaute sie, also nur auf dem dekodierten Text verwenden
+        self.page_spans = []
+        cursor = 0
+        for item in page_items:
+            fragment = self.serializer.element_to_string(item, 2)
+            start = xml_output.index(fragment, cursor)
+            cursor = start + len(fragment)
+            self.page_spans.append([start, cursor])
         
         return xml_output
     
+    def _iter_page_configs(self):
+        """Seiten-Configs mit ihren Post-IDs"""
+        for page_id, page_config in enumerate(self.config.get('pages', []), start=1000):
+            yield page_id, page_config
+    
+    def _page_fingerprint(self, page_config: Dict, page_id: int) -> str:
+        """Fingerprint aus Seiten-Config, verwendeten Block-Templates und Generator-Code"""
+        templates = {}
+        for block_config in page_config.get('blocks', []):
+            block_type = block_config.get('type')
+            if block_type in self.blocks and block_type not in templates:
+                if block_type not in self._template_digests:
+                    self._template_digests[block_type] = fingerprint(self.blocks[block_type][0]['structure'])
+                templates[block_type] = self._template_digests[block_type]
+        return fingerprint(page_config, page_id, templates, self._source_digest())
+    
+    def _shell_fingerprint(self) -> str:
+        """Fingerprint von allem außer den Seiteninhalten (Site, Menüs, Posts, Seitenliste)"""
+        page_keys = [(page_id, page_config.get('slug', '')) for page_id, page_config in self._iter_page_configs()]
+        return fingerprint(
+            self.config.get('site', {}), self.config.get('menus', []), self.config.get('posts', []),
+            page_keys, self._source_digest()
+        )
+    
+    def _source_digest(self) -> str:
+        if self._source_digest_value is None:
+            self._source_digest_value = source_fingerprint(
+                __file__, block_templates.__file__, json_backend.__file__, wxr_serializer.__file__
+            )
+        return self._source_digest_value
+    
+    def generate_wordpress_xml_incremental(self, output_file: str, cache: BuildCache) -> str:
+        """
+        Inkrementeller Build: nur geänderte Seiten neu assemblieren und in das
+        vorherige WXR einsetzen. Fällt auf einen vollständigen Build zurück, wenn
+        sich Site, Menüs, Posts oder die Seitenliste geändert haben oder die
+        vorherige Ausgabe fehlt bzw. verändert wurde.
+        """
+        shell_digest = self._shell_fingerprint()
+        page_digests = [(page_id, page_config, self._page_fingerprint(page_config, page_id))
+                        for page_id, page_config in self._iter_page_configs()]
+        
+        previous = self._read_previous_output(output_file, cache, shell_digest, page_digests)
+        if previous is None:
+            print("🔄 Kein verwendbarer Build-Cache, vollständiger Build...")
+            xml_output = self.generate_wordpress_xml()
+            cache.clear()
+            for (page_id, _, digest), span in zip(page_digests, self.page_spans):
+                cache.put(f'page:{page_id}', digest, span)
+        else:
+            xml_output = self._splice_pages(previous, cache, page_digests)
+        
+        cache.set_meta('shell', shell_digest)
+        cache.set_meta('output', text_digest(xml_output))
+        return xml_output
+    
+    def _read_previous_output(self, output_file: str, cache: BuildCache, shell_digest: str,
+                              page_digests: List) -> Optional[str]:
+        """Vorheriges WXR, falls es zum Cache passt"""
+        if cache.meta.get('shell') != shell_digest:
+            return None
+        if any(f'page:{page_id}' not in cache.entries for page_id, _, _ in page_digests):
+            return None
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                previous = f.read()
+        except OSError:
+            return None
+        if cache.meta.get('output') != text_digest(previous):
+            return None
+        return previous
+    
+    def _splice_pages(self, previous: str, cache: BuildCache, page_digests: List) -> str:
+        """Ersetze geänderte Seiten-Items im vorherigen WXR (Spans sind str-Indizes in ``previous``)"""
+        pieces = []
+        cursor = 0
+        length = 0
+        
+        for page_id, page_config, digest in page_digests:
+            key = f'page:{page_id}'
+            start, end = cache.entries[key]['value']
+            
+            pieces.append(previous[cursor:start])
+            length += start - cursor
+            
+            if cache.get(key, digest) is not None:
+                fragment = previous[start:end]
+            else:
+                print(f"\n📄 Verarbeite: {page_config.get('title', 'Untitled')}")
+                page_data = self.assemble_page(page_config)
+                item = self._add_page_to_xml(ET.Element('channel'), page_data, page_id)
+                fragment = self.serializer.element_to_string(item, 2)
+                self.generated_pages.append(page_data)
+            
+            pieces.append(fragment)
+            cache.put(key, digest, [length, length + len(fragment)])
+            length += len(fragment)
+            cursor = end
+        
+        pieces.append(previous[cursor:])
+        return ''.join(pieces)
+    
     def _generate_menus(self, channel):
         """Generiere WordPress-Menüs"""
         for menu_config in self.config.get('menus', []):
@@ -998,10 +1122,11 @@ class RIMANBlockProcessor:
         # Submenü-Items
         if 'submenu' in item_config:
             for sub_item in item_config['submenu']:
-                sub_item['parent_id'] = item_config.get('id', 0)
+                # Kopie, damit die Config unverändert bleibt (Build-Cache-Fingerprints)
+                sub_item = dict(sub_item, parent_id=item_config.get('id', 0))
                 self._add_menu_item_to_xml(channel, sub_item, menu_id)
     
-    def _add_page_to_xml(self, channel, page_data: Dict, page_id: int):
+    def _add_page_to_xml(self, channel, page_data: Dict, page_id: int) -> ET.Element:
         """Füge Seite zu XML hinzu"""
         item = ET.SubElement(channel, 'item')
         
@@ -1021,7 +1146,7 @@ class RIMANBlockProcessor:
         if 'elementor_data' in page_data:
             postmeta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
             ET.SubElement(postmeta, '{http://wordpress.org/export/1.2/}meta_key').text = '_elementor_data'
-            ET.SubElement(postmeta, '{http://wordpress.org/export/1.2/}meta_value').text = json.dumps(page_data['elementor_data'])
+            ET.SubElement(postmeta, '{http://wordpress.org/export/1.2/}meta_value').text = json_backend.dumps(page_data['elementor_data'])
             
             # Elementor-Einstellungen
             postmeta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
@@ -1031,6 +1156,8 @@ class RIMANBlockProcessor:
             postmeta = ET.SubElement(item, '{http://wordpress.org/export/1.2/}postmeta')
             ET.SubElement(postmeta, '{http://wordpress.org/export/1.2/}meta_key').text = '_wp_page_template'
             ET.SubElement(postmeta, '{http://wordpress.org/export/1.2/}meta_value').text = page_data.get('template', 'elementor_canvas')
+        
+        return item
     
     def _add_post_to_xml(self, channel, post_config: Dict, post_id: int):
         """Füge Blog-Post zu XML hinzu"""
@@ -1052,7 +1179,7 @@ class RIMANBlockProcessor:
         category = ET.SubElement(item, 'category', {'domain': 'category'})
         category.text = post_config.get('category', 'News')
     
-    def process(self):
+    def process(self, output_file: str = 'riman-complete.xml', incremental: bool = False):
         """Hauptverarbeitungsmethode"""
         print("\n🚀 RIMAN Website Block Processor")
         print("="*50)
@@ -1067,22 +1194,22 @@ class RIMANBlockProcessor:
         
         # Generiere WordPress XML
         print(f"\n📝 Generiere WordPress XML...")
-        
-        # Assembliere alle Seiten
         print(f"\n🔨 Assembliere {len(self.config.get('pages', []))} Seiten...")
-        for page_config in self.config.get('pages', []):
-            print(f"\n📄 Verarbeite: {page_config.get('title', 'Untitled')}")
-            page_data = self.assemble_page(page_config)
-            self.generated_pages.append(page_data)
         
-        # Generiere XML
-        xml_output = self.generate_wordpress_xml()
+        if incremental:
+            cache = BuildCache.for_output(output_file, namespace='riman_block_processor')
+            xml_output = self.generate_wordpress_xml_incremental(output_file, cache)
+        else:
+            xml_output = self.generate_wordpress_xml()
         
         # Speichere XML
-        output_file = 'riman-complete.xml'
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(xml_output)
         
+        if incremental:
+            # Cache erst nach der Ausgabe schreiben, sonst passt er nicht zum WXR
+            cache.save()
+        
         print(f"\n✅ XML generiert: {output_file} ({len(xml_output)} bytes)")
         print(f"📊 {len(self.generated_pages)} Seiten assembliert")
         print(f"📊 {len(self.config.get('posts', []))} Blog-Posts erstellt")
@@ -1096,7 +1223,7 @@ class RIMANBlockProcessor:
 def main():
     """Hauptausführung"""
     processor = RIMANBlockProcessor('riman-relaunch-complete.yaml')
-    success = processor.process()
+    success = processor.process(incremental='--incremental' in sys.argv)
     return success
 
 if __name__ == "__main__":
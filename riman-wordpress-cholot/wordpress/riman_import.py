@@ -7,13 +7,14 @@ Assembliert dynamisch WordPress-Seiten aus Block-Library basierend auf YAML-Conf
 import yaml
 import json
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import re
 import copy
 
+from wxr_serializer import wxr_to_string
+
 class IntelligentBlockProcessor:
     def __init__(self, yaml_config: str, block_library_dir: str = "block_library"):
         self.yaml_file = Path(yaml_config)
@@ -303,14 +304,8 @@ class IntelligentBlockProcessor:
         for menu_config in self.config.get('navigation', []):
             self._add_menu_to_xml(channel, menu_config)
         
-        # Pretty print
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        
-        # Clean up
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        final_xml = '\n'.join(lines)
+        # Pretty print in a single pass
+        final_xml = wxr_to_string(root, indent="  ")
         
         # Save
         with open(output_file, 'w', encoding='utf-8') as f:
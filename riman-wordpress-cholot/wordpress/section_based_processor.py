@@ -3,22 +3,27 @@
 Section-Based Processor - Uses classic Section/Column structure for maximum compatibility
 """
 
-import json
+import sys
 import yaml
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from xml.dom import minidom
 from typing import Dict, Any, List
 from copy import deepcopy
-import uuid
+
+import json_backend
+from elementor_ids import ElementorIDAllocator, ContentIDAssigner
+from page_stats import collect_page_stats
+from wxr_serializer import write_wxr
 
 class SectionBasedProcessor:
-    def __init__(self):
-        pass
+    def __init__(self, id_allocator: ElementorIDAllocator = None, content_ids: bool = False):
+        self.id_allocator = id_allocator if id_allocator is not None else ElementorIDAllocator()
+        # Opt-in: derive IDs from path + content so unchanged sections stay byte-identical
+        self.content_ids = content_ids
     
     def generate_unique_id(self) -> str:
         """Generate unique Elementor element ID"""
-        return uuid.uuid4().hex[:7]
+        return self.id_allocator.allocate()
     
     def process_yaml_to_elementor(self, yaml_path: str) -> tuple:
         """Convert YAML to classic Section/Column Elementor structure"""
@@ -29,6 +34,10 @@ class SectionBasedProcessor:
         # Create classic Elementor structure with sections
         elementor_data = self._create_sections_page(config)
         
+        if self.content_ids:
+            page = config.get('pages', [{}])[0]
+            ContentIDAssigner().assign(elementor_data, namespace=page.get('slug', 'home'))
+        
         return config, elementor_data
     
     def _create_sections_page(self, config: Dict) -> List:
@@ -655,24 +664,9 @@ class SectionBasedProcessor:
         # Add page
         self._add_page_item(channel, config, elementor_data)
         
-        # Format and save XML
-        xml_string = ET.tostring(rss, encoding='unicode')
-        
-        try:
-            dom = minidom.parseString(xml_string)
-            pretty_xml = dom.toprettyxml(indent='    ', encoding='UTF-8')
-            
-            lines = pretty_xml.decode('utf-8').split('\n')
-            clean_lines = [line for line in lines if line.strip()]
-            clean_xml = '\n'.join(clean_lines)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(clean_xml)
-        except Exception as e:
-            print(f"Warning: Using fallback XML formatting: {e}")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-                f.write(xml_string)
+        # Format and save XML in a single pass
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_wxr(rss, f)
         
         return output_path
     
@@ -714,7 +708,7 @@ class SectionBasedProcessor:
         cat.text = 'Uncategorized'
         
         # Clean JSON
-        clean_json = json.dumps(elementor_data, separators=(',', ':'))
+        clean_json = json_backend.dumps(elementor_data, separators=(',', ':'))
         
         # Elementor meta - minimal set
         for key, value in [
@@ -733,16 +727,16 @@ def main():
     print("🚀 Section-Based Processor (Maximum Compatibility)")
     print("=" * 60)
     
-    processor = SectionBasedProcessor()
+    processor = SectionBasedProcessor(content_ids='--content-ids' in sys.argv)
     
     # Process YAML to section-based Elementor structure
     config, elementor_data = processor.process_yaml_to_elementor('riman_input.yaml')
     
     # Save Elementor JSON
     with open('riman_sections.json', 'w') as f:
-        json.dump({'content': elementor_data}, f, indent=2)
+        json_backend.dump({'content': elementor_data}, f, indent=2)
     
-    print(f"✅ Generated section-based Elementor JSON: {len(json.dumps(elementor_data))} characters")
+    print(f"✅ Generated section-based Elementor JSON: {len(json_backend.dumps(elementor_data))} characters")
     
     # Generate WordPress XML
     output_path = processor.generate_wordpress_xml(config, elementor_data, 'riman_sections.xml')
@@ -753,19 +747,8 @@ def main():
     print(f"📄 XML file size: {file_size / 1024:.1f} KB")
     
     # Count widgets
-    def count_widgets(data, count=0):
-        if isinstance(data, dict):
-            if 'widgetType' in data:
-                count += 1
-            for v in data.values():
-                count = count_widgets(v, count)
-        elif isinstance(data, list):
-            for item in data:
-                count = count_widgets(item, count)
-        return count
-    
-    widget_count = count_widgets(elementor_data)
-    print(f"🎨 Total widgets: {widget_count}")
+    stats = collect_page_stats(elementor_data)
+    print(f"🎨 Total widgets: {stats.widget_count}")
     print(f"✅ Compatible WordPress XML generated: {output_path}")
     print("\n💡 This uses classic Section/Column structure for maximum compatibility!")
 
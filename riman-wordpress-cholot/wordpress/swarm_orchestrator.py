@@ -2,14 +2,24 @@
 """
 SWARM Orchestrator for Elementor Template-Based Generation
 Optimized workflow for generating WordPress pages using extracted templates
+
+generate_batch() runs the page structure -> format -> XML pipeline in
+memory for many companies at once, optionally across worker processes,
+and reports per-company timings.
 """
 
 import json
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from template_based_generator import TemplateBasedFactory
+from format_for_wordpress import format_for_wordpress_xml
+from generate_wordpress_xml import WordPressXMLGenerator
 
 class SwarmOrchestrator:
     def __init__(self):
@@ -20,8 +30,18 @@ class SwarmOrchestrator:
             'xml_files_created': []
         }
     
-    def generate_company_pages(self, companies: List[Dict[str, Any]]):
-        """Generate pages for multiple companies in parallel-like fashion"""
+    def generate_company_pages(self, companies: List[Dict[str, Any]], in_process: bool = True,
+                               workers: int = 1):
+        """Generate pages for multiple companies (in memory, or via the legacy subprocess pipeline)"""
+        if in_process:
+            for result in self.generate_batch(companies, workers=workers, output_dir='.'):
+                if result['error']:
+                    print(f"  ⚠️ {result['company']}: {result['error']}")
+                    continue
+                self.results['pages_generated'] += 1
+                self.results['xml_files_created'].append(result['xml_file'])
+                print(f"  ✅ Complete: {result['xml_file']} ({result['timings']['total'] * 1000:.1f} ms)")
+            return
         
         for company in companies:
             print(f"\n🏢 Processing: {company['name']}")
@@ -42,6 +62,101 @@ class SwarmOrchestrator:
                 self.results['xml_files_created'].append(xml_file)
                 print(f"  ✅ Complete: {xml_file}")
     
+    def generate_batch(self, companies: List[Dict[str, Any]], workers: Optional[int] = 1,
+                       output_dir: Optional[str] = None, save_json: bool = False) -> List[Dict[str, Any]]:
+        """
+        Generate WordPress XML for many companies without subprocesses or temp files.
+        
+        Args:
+            companies: Company dicts (same shape as for generate_company_pages)
+            workers: Worker processes; 1 runs in this process, None uses all CPUs
+            output_dir: Write <company>_elementor.xml here; if None the XML is returned
+            save_json: Also write the Elementor JSON next to the XML (debugging)
+        
+        Returns:
+            One result per company, in input order, with keys company, xml_file,
+            xml (only without output_dir), xml_size, timings and error.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(companies) <= 1:
+            return [self.generate_company(company, output_dir, save_json) for company in companies]
+        
+        workers = min(workers, len(companies))
+        chunksize = max(1, len(companies) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            return list(executor.map(_generate_company_in_worker, companies,
+                                     repeat(output_dir), repeat(save_json), chunksize=chunksize))
+    
+    def generate_company(self, company: Dict[str, Any], output_dir: Optional[str] = None,
+                         save_json: bool = False) -> Dict[str, Any]:
+        """Run the in-memory pipeline for one company and time each stage"""
+        timings = {}
+        result = {
+            'company': company.get('name', ''),
+            'xml_file': None,
+            'xml_size': 0,
+            'timings': timings,
+            'error': None
+        }
+        start = stage = time.perf_counter()
+        
+        def lap(name):
+            nonlocal stage
+            now = time.perf_counter()
+            timings[name] = now - stage
+            stage = now
+        
+        try:
+            page_data = self._create_page_structure(company)
+            lap('structure')
+            
+            formatted = format_for_wordpress_xml(page_data, company['name'])
+            lap('format')
+            
+            generator = WordPressXMLGenerator()
+            xml_output = generator.generate_xml(self._formatted_to_generator_input(formatted),
+                                                formatted['site'])
+            result['xml_size'] = len(xml_output)
+            lap('xml')
+            
+            if output_dir is None:
+                result['xml'] = xml_output
+            else:
+                base = Path(output_dir) / self._company_file_stem(company['name'])
+                base.parent.mkdir(parents=True, exist_ok=True)
+                xml_file = f"{base}.xml"
+                with open(xml_file, 'w', encoding='utf-8') as f:
+                    f.write(xml_output)
+                if save_json:
+                    with open(f"{base}.json", 'w', encoding='utf-8') as f:
+                        json.dump(page_data, f, indent=2, ensure_ascii=False)
+                result['xml_file'] = xml_file
+                lap('write')
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        
+        timings['total'] = time.perf_counter() - start
+        return result
+    
+    @staticmethod
+    def _company_file_stem(company_name: str) -> str:
+        """Same naming as the file-based pipeline: riman_gmbh_elementor"""
+        return f"{company_name.replace(' ', '_').lower()}_elementor"
+    
+    @staticmethod
+    def _formatted_to_generator_input(formatted: Dict[str, Any]) -> Dict[str, Any]:
+        """Map format_for_wordpress_xml output onto WordPressXMLGenerator's pages input"""
+        pages = []
+        for post in formatted.get('posts', []):
+            pages.append({
+                'title': post['title'],
+                'slug': post['slug'],
+                'status': post.get('status', 'publish'),
+                'template': post.get('template', 'elementor_canvas'),
+                'elementor_data': post['meta']['_elementor_data']
+            })
+        return {'pages': pages}
+    
     def _create_page_structure(self, company: Dict[str, Any]) -> List[dict]:
         """Create complete page structure from company data"""
         sections = []
@@ -186,6 +301,20 @@ class SwarmOrchestrator:
             for xml_file in self.results['xml_files_created']:
                 print(f"  • {xml_file}")
 
+
+_worker_orchestrator: Optional[SwarmOrchestrator] = None
+
+
+def _init_worker():
+    """Load the widget templates once per worker process"""
+    global _worker_orchestrator
+    _worker_orchestrator = SwarmOrchestrator()
+
+
+def _generate_company_in_worker(company: Dict[str, Any], output_dir: Optional[str],
+                                save_json: bool) -> Dict[str, Any]:
+    return _worker_orchestrator.generate_company(company, output_dir, save_json)
+
 def main():
     # Test data - RIMAN GmbH and additional companies
     companies = [
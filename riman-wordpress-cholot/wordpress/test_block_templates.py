@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for compiled block templates
+========================================
+Checks CompiledBlockTemplate against the previous deepcopy + str.replace
+fill on the real block library and the RIMAN site config.
+"""
+
+import contextlib
+import copy
+import io
+import json
+from pathlib import Path
+
+import yaml
+
+from block_templates import CompiledBlockTemplate
+from intelligent_block_processor import IntelligentBlockProcessor
+from riman_block_processor import RIMANBlockProcessor
+
+HERE = Path(__file__).parent
+SOURCE_CONFIG = HERE / 'riman-relaunch-complete.yaml'
+
+
+def legacy_fill(template, content):
+    """The fill both processors used before templates were compiled"""
+    def replace(element):
+        if isinstance(element, str):
+            for key, value in content.items():
+                element = element.replace(f"{{{{{key}}}}}", str(value))
+            return element
+        if isinstance(element, dict):
+            return {k: replace(v) for k, v in element.items()}
+        if isinstance(element, list):
+            return [replace(item) for item in element]
+        return element
+    return replace(copy.deepcopy(template))
+
+
+def load_riman_processor():
+    processor = RIMANBlockProcessor(str(SOURCE_CONFIG))
+    processor.block_library_path = HERE / 'block_library'
+    with open(SOURCE_CONFIG, 'r', encoding='utf-8') as f:
+        processor.config = yaml.safe_load(f)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.load_block_library()
+        processor.create_default_blocks()
+    return processor
+
+
+def test_fill_matches_legacy():
+    """Every block of the site config fills exactly like the old replace loop"""
+    print("🧪 Testing compiled fill against legacy fill...")
+    processor = load_riman_processor()
+    checked = 0
+    for page in processor.config['pages']:
+        for block_config in page.get('blocks', []):
+            block_type = block_config.get('type')
+            if block_type not in processor.blocks:
+                continue
+            structure = processor.blocks[block_type][0]['structure']
+            content_map = processor._create_content_map(block_config)
+            expected = legacy_fill(structure, content_map)
+            assert processor._fill_block_template(processor._compiled_block(block_type), block_config) == expected
+            checked += 1
+    assert checked > 10
+    print(f"✅ {checked} blocks identical to legacy fill")
+
+
+def test_fill_shares_static_parts():
+    """Shared fill leaves the template untouched and reuses placeholder-free subtrees"""
+    print("🧪 Testing structural sharing...")
+    template = {
+        'elType': 'section',
+        'settings': {'gap': 'no', 'background': {'color': '#fff'}},
+        'elements': [
+            {'widgetType': 'heading', 'settings': {'title': '{{TITLE}} | {{MISSING}}'}},
+            {'widgetType': 'divider', 'settings': {'style': 'solid'}},
+        ],
+    }
+    snapshot = json.dumps(template, sort_keys=True)
+    compiled = CompiledBlockTemplate(template)
+    assert compiled.placeholders == {'TITLE', 'MISSING'} and compiled.slot_count == 1
+
+    filled = compiled.fill({'TITLE': 42})
+    assert filled['elements'][0]['settings']['title'] == '42 | {{MISSING}}'
+    assert filled['settings'] is template['settings']
+    assert filled['elements'][1] is template['elements'][1]
+    assert filled['elements'][0] is not template['elements'][0]
+
+    copied = compiled.fill({'TITLE': 'x'}, share=False)
+    assert copied['settings'] is not template['settings']
+    assert copied['elements'][1] == template['elements'][1]
+    assert json.dumps(template, sort_keys=True) == snapshot
+    print("✅ Static parts are shared, template stays untouched")
+
+
+def test_intelligent_processor_keeps_library_clean():
+    """Widget handlers and design settings mutate the filled copy, never the library"""
+    print("🧪 Testing IntelligentBlockProcessor fills...")
+    processor = IntelligentBlockProcessor('unused.yaml', str(HERE / 'block_library'))
+    processor.config = {'design': {'primary_color': '#123456', 'spacing': 'large'}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert processor.load_block_library()
+    snapshot = json.dumps(processor.blocks, sort_keys=True)
+
+    block_config = {'type': 'service-cards', 'title': 'Leistungen',
+                    'services': [{'title': 'Asbest', 'text': 'Sanierung', 'icon': 'fa fa-shield'}]}
+    page = {'title': 'Test', 'blocks': [block_config, block_config]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = processor.assemble_page(page)
+        second = processor.assemble_page(page)
+
+    assert first['elementor_data'] == second['elementor_data']
+    dumped = json.dumps(first['elementor_data'])
+    assert 'Asbest' in dumped and '{{SERVICE_TITLE}}' not in dumped
+    assert json.dumps(processor.blocks, sort_keys=True) == snapshot
+    print("✅ Block library unchanged after assembling")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Block Template Test Suite")
+    print("=" * 50)
+    test_fill_matches_legacy()
+    test_fill_shares_static_parts()
+    test_intelligent_processor_keeps_library_clean()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental rebuilds
+====================================
+Covers the on-disk build cache and the incremental paths of
+RIMANBlockProcessor and YAMLToJSONProcessor.
+"""
+
+import contextlib
+import copy
+import io
+import logging
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import yaml
+
+from build_cache import BuildCache, fingerprint
+from riman_block_processor import RIMANBlockProcessor
+from yaml_to_json_processor import YAMLToJSONProcessor
+
+SOURCE_CONFIG = Path(__file__).parent / 'riman-relaunch-complete.yaml'
+
+
+def load_site():
+    with open(SOURCE_CONFIG, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def strip_dates(xml_text):
+    return re.sub(r'<wp:post_date>[^<]*</wp:post_date>', '', xml_text)
+
+
+def test_cache_round_trip():
+    """Entries survive a save/load; stale, corrupt and foreign caches are ignored"""
+    print("🧪 Testing build cache persistence...")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'site.xml')
+
+        cache = BuildCache.for_output(output, namespace='test')
+        digest = fingerprint({'title': 'Home', 'blocks': [1, 2]}, 1000)
+        assert fingerprint({'blocks': [1, 2], 'title': 'Home'}, 1000) == digest
+        cache.put('page:1000', digest, [0, 10])
+        cache.put('page:1001', 'old', [10, 20])
+        cache.retain(['page:1000'])
+        cache.save()
+
+        reloaded = BuildCache.for_output(output, namespace='test')
+        assert reloaded.get('page:1000', digest) == [0, 10]
+        assert reloaded.get('page:1000', 'changed') is None
+        assert 'page:1001' not in reloaded.entries
+        assert BuildCache.for_output(output, namespace='other').entries == {}
+
+        with open(f'{output}.buildcache.json', 'w') as f:
+            f.write('{not json')
+        assert BuildCache.for_output(output, namespace='test').entries == {}
+    print("✅ Build cache persistence works")
+
+
+def test_riman_incremental_matches_full_build():
+    """Splicing one edited page into the previous WXR equals a fresh full build"""
+    print("🧪 Testing incremental RIMAN build...")
+    site = load_site()
+    edited = copy.deepcopy(site)
+    edited['pages'][1]['title'] = 'Geänderte Seite'
+
+    def build(config, output, incremental):
+        processor = RIMANBlockProcessor('unused.yaml')
+        processor.config = config
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.load_block_library()
+            if incremental:
+                cache = BuildCache.for_output(output, namespace='riman_block_processor')
+                xml_output = processor.generate_wordpress_xml_incremental(output, cache)
+            else:
+                xml_output = processor.generate_wordpress_xml()
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(xml_output)
+        if incremental:
+            cache.save()
+        return processor, xml_output
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # block_library is resolved relative to the working directory
+        try:
+            output = os.path.join(tmp, 'riman.xml')
+            _, first = build(site, output, True)
+            processor, unchanged = build(site, output, True)
+            assert unchanged == first
+            assert processor.generated_pages == []
+
+            processor, spliced = build(edited, output, True)
+            assert len(processor.generated_pages) == 1
+            _, fresh = build(edited, os.path.join(tmp, 'fresh.xml'), False)
+        finally:
+            os.chdir(cwd)
+
+    assert strip_dates(spliced) == strip_dates(fresh)
+    assert 'Geänderte Seite' in spliced
+    ET.fromstring(spliced.encode('utf-8'))
+    print("✅ Incremental build matches full build")
+
+
+def test_yaml_to_json_reuses_clean_pages():
+    """Only the edited page is re-processed; the result equals a full run"""
+    print("🧪 Testing incremental YAML to JSON...")
+    logging.disable(logging.INFO)
+    site = {
+        'site': {'title': 'Test'},
+        'pages': [
+            {'title': f'Page {i}', 'slug': f'page-{i}',
+             'sections': [{'type': 'hero', 'title': f'Hero {i}'}]}
+            for i in range(5)
+        ]
+    }
+    edited = copy.deepcopy(site)
+    edited['pages'][2]['sections'][0]['title'] = 'New hero'
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'pages.json')
+
+            def build(config):
+                cache = BuildCache.for_output(output, namespace='yaml_to_json')
+                result = YAMLToJSONProcessor(id_mode='content', build_cache=cache).process_yaml_data(config)
+                return result, cache
+
+            build(site)
+            result, cache = build(edited)
+            assert (cache.hits, cache.misses) == (4, 1)
+
+            expected = YAMLToJSONProcessor(id_mode='content').process_yaml_data(edited)
+            assert result == expected
+    finally:
+        logging.disable(logging.NOTSET)
+    print("✅ Clean pages reused from the build cache")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Build Cache Test Suite")
+    print("=" * 50)
+    test_cache_round_trip()
+    test_riman_incremental_matches_full_build()
+    test_yaml_to_json_reuses_clean_pages()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the concurrent site comparison
+==============================================
+Compares two local http.server stand-ins (200 pages each, with a fixed
+response delay) and checks results, concurrency, connection reuse and the
+latency percentiles.
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+DELAY = 0.05
+PAGES = [f'/page-{i}' for i in range(200)]
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def page_html(path, variant):
+    widgets = ''.join(f'<div class="elementor-widget-heading">Widget {i}</div>' for i in range(3))
+    extra = '<p>Nur auf der Test-Seite</p>' * 20 if variant == 'test' and path == '/page-7' else ''
+    return (f'<html><head><title>{path}</title></head><body>'
+            f'<section data-element_type="section">{widgets}<p>Inhalt von {path}</p>{extra}</section>'
+            f'</body></html>')
+
+
+def start_site(variant):
+    """Threaded stand-in site that keeps connections alive and counts them"""
+    stats = {'connections': set(), 'active': 0, 'most_active': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            with lock:
+                stats['connections'].add(self.client_address)
+                stats['active'] += 1
+                stats['most_active'] = max(stats['most_active'], stats['active'])
+            time.sleep(DELAY)
+            missing = variant == 'test' and self.path == '/page-13'
+            body = b'not found' if missing else page_html(self.path, variant).encode('utf-8')
+            # Counted as done before the client can see the response and send its next request
+            with lock:
+                stats['active'] -= 1
+            self.send_response(404 if missing else 200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def test_concurrent_comparison():
+    """200 pages compared concurrently over pooled keep-alive connections"""
+    print("🧪 Testing concurrent site comparison...")
+    compare_sites = load_script('compare-sites.py')
+    original, original_stats = start_site('original')
+    test, test_stats = start_site('test')
+    try:
+        comparator = compare_sites.SiteComparator(
+            f'http://127.0.0.1:{original.server_port}', f'http://127.0.0.1:{test.server_port}',
+            max_workers=16, verbose=False)
+        start = time.perf_counter()
+        results = comparator.compare_sites(PAGES)
+        elapsed = time.perf_counter() - start
+    finally:
+        original.shutdown()
+        test.shutdown()
+        original.server_close()
+        test.server_close()
+
+    # Sequentially this takes 2 * 200 * DELAY = 20 s
+    assert elapsed < 2 * len(PAGES) * DELAY / 3, elapsed
+    assert 1 < original_stats['most_active'] + test_stats['most_active'] <= 16
+    # Keep-alive: at most one pool (max_workers connections) per site for 2 * 200 requests
+    assert len(original_stats['connections']) <= 16 and len(test_stats['connections']) <= 16
+
+    assert list(results['page_results']) == PAGES
+    assert results['pages_successful'] == 199 and results['pages_failed'] == 1
+    page = results['page_results']['/page-13']
+    assert page['status_codes'] == {'original': 200, 'test': 404} and not page['accessible_both']
+    assert results['page_results']['/page-0']['content_comparison']['similarity_percent'] == 100.0
+    assert results['page_results']['/page-7']['content_comparison']['similarity_percent'] < 100.0
+
+    for side in ('original', 'test'):
+        latency = results['latency'][side]
+        assert latency['count'] == len(PAGES)
+        assert DELAY <= latency['min'] <= latency['p50'] <= latency['p90'] <= latency['p95'] <= latency['p99'] <= latency['max']
+    print(f"✅ {len(PAGES)} pages compared in {elapsed:.2f}s")
+
+
+def test_percentiles_and_errors():
+    """Nearest-rank percentiles; unreachable sites are reported per page"""
+    print("🧪 Testing percentiles and connection errors...")
+    compare_sites = load_script('compare-sites.py')
+    stats = compare_sites.latency_percentiles([i / 100 for i in range(100, 0, -1)])
+    assert (stats['count'], stats['min'], stats['p50'], stats['p90'], stats['p99'], stats['max']) == (
+        100, 0.01, 0.5, 0.9, 0.99, 1.0)
+    assert compare_sites.latency_percentiles([]) == {'count': 0}
+
+    comparator = compare_sites.SiteComparator('http://127.0.0.1:9', 'http://127.0.0.1:9', max_workers=4, verbose=False)
+    results = comparator.compare_sites(['/', '/about'])
+    assert results['pages_failed'] == 2
+    assert results['page_results']['/']['errors'][0].startswith('Original site error')
+    assert results['latency']['original']['count'] == 2
+    # A second run reports only its own requests
+    assert comparator.compare_sites(['/'])['latency']['test']['count'] == 1
+    print("✅ Percentiles and errors reported")
+
+
+def main():
+    print("🚀 Site Comparison Tests")
+    print("=" * 60)
+    test_concurrent_comparison()
+    test_percentiles_and_errors()
+    print("\n🎉 All site comparison tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the XML comparator batch mode
+=============================================
+Checks the one-pass stats tokenizer against the separate regex passes it
+replaced, and that batch mode ranks candidates with the same scores as
+single comparisons, serially and in a process pool.
+"""
+
+import contextlib
+import importlib.util
+import io
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+
+def make_export(pages, widgets=('cholot-texticon', 'cholot-title'), attachments=1, post_type_cdata=False):
+    """Small export; post types optionally wrapped in CDATA as some generators write them"""
+    post_type = '<![CDATA[page]]>' if post_type_cdata else 'page'
+    data = ','.join(f'{{"elType":"widget","widgetType":"{widget}"}}' for widget in widgets)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+             '<title><![CDATA[Cholot]]></title>\n']
+    for n in range(pages):
+        parts.append(
+            f'<item>\n<title><![CDATA[Seite {n} _elementor_data]]></title>\n'
+            f'<wp:post_date>2024-01-0{n % 9 + 1} 10:00:00</wp:post_date>\n'
+            f'<link>https://riman.example/seite-{n}/</link>\n'
+            f'<wp:post_id>{100 + n}</wp:post_id>\n<wp:post_type>{post_type}</wp:post_type>\n'
+            f'<wp:postmeta><wp:meta_key>_elementor_data</wp:meta_key>'
+            f'<wp:meta_value><![CDATA[[{data}]]]></wp:meta_value></wp:postmeta>\n</item>\n')
+    for n in range(attachments):
+        parts.append(f'<item>\n<title><![CDATA[Bild {n}]]></title>\n<wp:post_id>{900 + n}</wp:post_id>\n'
+                     f'<wp:post_type>attachment</wp:post_type>\n</item>\n')
+    parts.append('<item><title>Menü</title><wp:post_type>nav_menu_item</wp:post_type></item>\n'
+                 '<item><wp:post_type>cholot_service</wp:post_type></item>\n</channel></rss>\n')
+    return ''.join(parts)
+
+
+def legacy_stats(content):
+    """Statistics as the separate findall passes produced them"""
+    return {
+        "file_size": len(content),
+        "total_items": len(re.findall(r'<item>', content)),
+        "pages": len(re.findall(r'<wp:post_type>page</wp:post_type>', content)),
+        "posts": len(re.findall(r'<wp:post_type>post</wp:post_type>', content)),
+        "menu_items": len(re.findall(r'<wp:post_type>nav_menu_item</wp:post_type>', content)),
+        "elementor_blocks": len(re.findall(r'_elementor_data', content)),
+        "custom_posts": len(re.findall(r'<wp:post_type>(?!page|post|nav_menu_item)', content)),
+        "media_attachments": len(re.findall(r'<wp:post_type>attachment</wp:post_type>', content)),
+        "titles": re.findall(r'<title><!\[CDATA\[(.*?)\]\]></title>', content),
+        "post_ids": [int(pid) for pid in re.findall(r'<wp:post_id>(\d+)</wp:post_id>', content)],
+        "widget_types": sorted(set(re.findall(r'"widgetType":"([^"]+)"', content))),
+    }
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle the module's functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_candidates(directory):
+    """Reference plus candidates of decreasing similarity"""
+    files = {
+        'reference.xml': make_export(6),
+        'iter-1.xml': make_export(6, attachments=0),
+        'iter-2.xml': make_export(3, widgets=('cholot-texticon',)),
+        'iter-3.xml': make_export(6),
+        'iter-4.xml': make_export(1, widgets=()),
+    }
+    for name, content in files.items():
+        (Path(directory) / name).write_text(content, encoding='utf-8')
+    return str(Path(directory) / 'reference.xml'), sorted(str(p) for p in Path(directory).glob('iter-*.xml'))
+
+
+def test_stats_match_separate_passes():
+    """One tokenizer pass yields exactly what the eight findall passes did"""
+    print("🧪 Testing stats tokenizer...")
+    module = load_script('compare-xml.py')
+    for content in (make_export(4), make_export(2, post_type_cdata=True), make_export(0, widgets=())):
+        stats = module.collect_xml_stats(content)
+        stats["widget_types"] = sorted(stats["widget_types"])
+        assert stats == legacy_stats(content)
+
+    stats = module.collect_xml_stats(make_export(2, post_type_cdata=True))
+    # CDATA post types never counted as pages
+    assert (stats["pages"], stats["custom_posts"], stats["media_attachments"]) == (0, 4, 1)
+    print("✅ Stats identical to separate passes")
+
+
+def test_batch_ranking():
+    """Batch rows carry the single-comparison scores, best first, in a pool too"""
+    print("🧪 Testing batch ranking...")
+    module = load_script('compare-xml.py')
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_xml, candidates = write_candidates(tmp)
+
+        expected = {}
+        for candidate in candidates:
+            comparator = module.XMLComparator(reference_xml, candidate)
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected[candidate] = comparator.run_comparison()["overall_score"]
+
+        serial = module.compare_batch(reference_xml, candidates)
+        assert [row["file"] for row in serial] == sorted(candidates, key=lambda c: (-expected[c], c))
+        assert all(abs(row["score"] - expected[row["file"]]) < 1e-9 for row in serial)
+        assert Path(serial[0]["file"]).name == 'iter-3.xml' and serial[0]["structure_match"]
+        assert serial[0]["score"] == 100.0
+        assert not any(row["structure_match"] for row in serial[1:])
+        assert serial[-1]["missing_widgets"] == ['cholot-texticon', 'cholot-title']
+
+        assert module.compare_batch(reference_xml, candidates, workers=2) == serial
+
+        # Directories expand to their exports, without the reference itself
+        assert module.expand_candidates([tmp], exclude=reference_xml) == candidates
+    print("✅ Candidates ranked by similarity")
+
+
+def test_unreadable_candidate():
+    """A missing candidate is reported last instead of aborting the batch"""
+    print("🧪 Testing unreadable candidate...")
+    module = load_script('compare-xml.py')
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_xml, candidates = write_candidates(tmp)
+        rows = module.compare_batch(reference_xml, candidates + [str(Path(tmp) / 'missing.xml')])
+        assert rows[-1]["error"] is not None and rows[-1]["file"].endswith('missing.xml')
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert module.print_ranked_table(reference_xml, rows) is False
+    print("✅ Unreadable candidate listed as error")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 XML Comparator Test Suite")
+    print("=" * 50)
+    test_stats_match_separate_passes()
+    test_batch_ranking()
+    test_unreadable_candidate()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
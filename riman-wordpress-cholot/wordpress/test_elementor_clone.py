@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for structural-sharing clones
+=========================================
+Checks that clones copy only the containers that change, serialize exactly
+like deep copies, and that the processors using them leave their templates
+untouched.
+"""
+
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from elementor_clone import clone_element, replace_key, replace_strings
+from elementor_ids import ContentIDAssigner, ElementorIDAllocator
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def column():
+    widget = {'id': 'w1', 'elType': 'widget', 'widgetType': 'cholot-texticon',
+              'settings': {'title': '{{TITLE}}', 'title_margin': {'unit': 'px', 'top': '0'},
+                           'icon_list': [{'_id': 'a1', 'text': 'Asbest'}]},
+              'elements': []}
+    return {'id': 'c1', 'elType': 'column', 'settings': {'_column_size': 50}, 'elements': [widget]}
+
+
+def test_clone_element():
+    """New element, elements and settings containers; setting values shared"""
+    print("🧪 Testing clone_element...")
+    original = column()
+    snapshot = json.dumps(original)
+    allocator = ElementorIDAllocator(mode='counter')
+    clone = clone_element(original, allocator.allocate)
+
+    widget, original_widget = clone['elements'][0], original['elements'][0]
+    assert [clone['id'], widget['id']] == ['0000000', '0000001']
+    assert widget is not original_widget and widget['settings'] is not original_widget['settings']
+    assert widget['settings']['title_margin'] is original_widget['settings']['title_margin']
+
+    widget['settings']['title'] = 'Asbestsanierung'
+    clone['elements'].append({'id': 'w2', 'elType': 'widget', 'settings': {}})
+    assert json.dumps(original) == snapshot
+
+    # Same JSON as a deep copy with the same IDs
+    deep = copy.deepcopy(original)
+    deep['id'], deep['elements'][0]['id'] = '0000002', '0000003'
+    assert json.dumps(clone_element(original, allocator.allocate)) == json.dumps(deep)
+
+    # Repeater IDs are written to new lists, not into the shared items
+    ContentIDAssigner().assign([clone])
+    assert original_widget['settings']['icon_list'][0]['_id'] == 'a1'
+    assert widget['settings']['icon_list'][0]['_id'] != 'a1'
+    print("✅ Clones share setting values only")
+
+
+def test_path_copies():
+    """Only dicts and lists above a changed value are copied"""
+    print("🧪 Testing replace_strings and replace_key...")
+    original = column()
+    snapshot = json.dumps(original)
+
+    filled = replace_strings(original, lambda text: text.replace('{{TITLE}}', 'Leistungen'))
+    assert filled['elements'][0]['settings']['title'] == 'Leistungen'
+    assert filled['settings'] is original['settings']
+    assert filled['elements'][0]['settings']['icon_list'] is original['elements'][0]['settings']['icon_list']
+    assert replace_strings(original, str.strip) is original
+
+    counter = iter(range(100))
+    renumbered = replace_key(original, 'id', lambda: f'n{next(counter)}')
+    assert (renumbered['id'], renumbered['elements'][0]['id']) == ('n0', 'n1')
+    assert renumbered['elements'][0]['settings'] is original['elements'][0]['settings']
+    assert json.dumps(original) == snapshot
+    print("✅ Unchanged subtrees are shared")
+
+
+def test_processors_keep_templates():
+    """Hybrid assembly and placeholder rendering share, but never change, their templates"""
+    print("🧪 Testing processors...")
+    hybrid = load_script('hybrid_generator', 'hybrid-generator.py')
+    generator = hybrid.HybridElementorGenerator('does-not-exist.json')
+    block = {'id': 'services', 'name': 'Services', 'json_template': {
+        'id': 's1', 'elType': 'section', 'settings': {'gap': 'no'}, 'elements': [column()]}}
+    snapshot = json.dumps(block)
+
+    random.seed(3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sections = generator.assemble_and_validate([block, block], {'services': {'TITLE': 'Leistungen'}})
+    assert json.dumps(block) == snapshot
+    assert [s['elements'][0]['elements'][0]['settings']['title'] for s in sections] == ['Leistungen'] * 2
+    assert sections[0]['id'] != sections[1]['id']
+    assert sections[0]['settings'] is block['json_template']['settings']
+
+    placeholder = load_script('placeholder_system_design', 'placeholder-system-design.py')
+    library = placeholder.TemplateLibrary()
+    template = library.templates['cholot-texticon']
+    widget = library.render('cholot-texticon', {'title': 'Asbest'}, placeholder.PlaceholderResolver())
+    assert widget['settings']['title'] == 'Asbest'
+    assert widget['settings']['title_typography_font_size'] is template['settings']['title_typography_font_size']
+    print("✅ Templates untouched")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Structural-Sharing Clone Test Suite")
+    print("=" * 50)
+    test_clone_element()
+    test_path_copies()
+    test_processors_keep_templates()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
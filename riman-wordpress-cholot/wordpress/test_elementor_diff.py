@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for the Elementor tree diff
+=======================================
+Checks matching by ID and by content, the reported insert/delete/move/update
+operations, and the per-page diff in the XML comparator.
+"""
+
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from elementor_diff import diff_elementor
+
+
+def widget(n, widget_type='cholot-texticon', **settings):
+    return {'id': f'w{n}', 'elType': 'widget', 'widgetType': widget_type,
+            'settings': {'title': f'Leistung {n}', **settings}, 'elements': []}
+
+
+def section(n, widgets):
+    column = {'id': f'c{n}', 'elType': 'column', 'settings': {'_column_size': 100}, 'elements': widgets}
+    return {'id': f's{n}', 'elType': 'section', 'settings': {'gap': 'no'}, 'elements': [column]}
+
+
+def page():
+    return [section(1, [widget(1), widget(2), widget(3)]),
+            section(2, [widget(4), widget(5, 'cholot-title')])]
+
+
+def column_of(data, n):
+    return data[n]['elements'][0]['elements']
+
+
+def renumber(elements, prefix):
+    for element in elements:
+        element['id'] = prefix + element['id']
+        renumber(element['elements'], prefix)
+
+
+def test_identical_content():
+    """New IDs and repeater IDs alone are not changes"""
+    print("🧪 Testing identical content...")
+    old = page()
+    column_of(old, 0)[0]['settings']['icon_list'] = [{'_id': 'a1', 'text': 'Asbest'}]
+    new = copy.deepcopy(old)
+    renumber(new, 'x')
+    column_of(new, 0)[0]['settings']['icon_list'][0]['_id'] = 'b2'
+
+    diff = diff_elementor(json.dumps(old), json.dumps(new).encode('utf-8'))
+    assert diff.identical and diff.matched == 9 and diff.similarity == 1.0
+    print("✅ Regenerated IDs ignored")
+
+
+def test_operations():
+    """Inserted, deleted, reordered and changed widgets are reported once each"""
+    print("🧪 Testing edit operations...")
+    old = page()
+    new = copy.deepcopy(old)
+    column_of(new, 0).reverse()                  # w3, w2, w1
+    del column_of(new, 0)[0]                     # drop w3
+    column_of(new, 1)[1]['settings']['title'] = 'Kontakt'
+    column_of(new, 1).append(widget(6))
+
+    diff = diff_elementor(old, new)
+    summary = diff.summary()
+    assert (summary['insert'], summary['delete'], summary['move'], summary['update']) == (1, 1, 1, 1)
+
+    assert diff.by_type('delete')[0].old_path == 'section[0]/column[0]/cholot-texticon[2]'
+    assert diff.by_type('insert')[0].new_id == 'w6'
+    moved = diff.by_type('move')[0]
+    assert moved.old_id == 'w2' and (moved.old_path, moved.new_path) == (
+        'section[0]/column[0]/cholot-texticon[1]', 'section[0]/column[0]/cholot-texticon[0]')
+    update = diff.by_type('update')[0]
+    assert update.new_id == 'w5'
+    assert update.changes == {'title': {'old': 'Leistung 5', 'new': 'Kontakt'}}
+    print("✅ Operations reported")
+
+
+def test_content_matching():
+    """Without usable IDs, widgets are matched by content, including across parents"""
+    print("🧪 Testing content matching...")
+    old = page()
+    new = copy.deepcopy(old)
+    moved = column_of(new, 0).pop(1)             # w2 goes to section 2
+    column_of(new, 1).insert(0, moved)
+    column_of(new, 1)[2]['settings']['align'] = 'center'
+    renumber(new, 'x')
+
+    diff = diff_elementor(old, new)
+    assert [op.op for op in diff.operations] == ['move', 'update']
+    assert diff.operations[0].old_path == 'section[0]/column[0]/cholot-texticon[1]'
+    assert diff.operations[0].new_path == 'section[1]/column[0]/cholot-texticon[0]'
+    assert diff.operations[1].changes == {'align': {'new': 'center'}}
+
+    # A whole section inserted is one operation covering its subtree
+    new.append(section(3, [widget(7), widget(8)]))
+    inserted = diff_elementor(old, new).by_type('insert')
+    assert len(inserted) == 1 and inserted[0].size == 4
+    print("✅ Content matching works")
+
+
+def test_comparator_page_diff():
+    """compare-xml.py diffs the Elementor tree of each page pair"""
+    print("🧪 Testing comparator page diff...")
+    spec = importlib.util.spec_from_file_location('compare_xml', HERE / 'compare-xml.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def export(data, slug):
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" '
+                'xmlns:wp="http://wordpress.org/export/1.2/"><channel><item><title>Home</title>'
+                f'<wp:post_name>{slug}</wp:post_name><wp:post_type>page</wp:post_type>'
+                '<wp:postmeta><wp:meta_key>_elementor_data</wp:meta_key>'
+                f'<wp:meta_value><![CDATA[{json.dumps(data)}]]></wp:meta_value></wp:postmeta>'
+                '</item></channel></rss>\n')
+
+    new = page()
+    column_of(new, 1).pop()
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = Path(tmp) / 'reference.xml'
+        generated = Path(tmp) / 'generated.xml'
+        reference.write_text(export(page(), 'home'), encoding='utf-8')
+        # Pages are paired by title when the slug differs
+        generated.write_text(export(new, ''), encoding='utf-8')
+
+        comparator = module.XMLComparator(str(reference), str(generated))
+        with contextlib.redirect_stdout(io.StringIO()):
+            comparator.compare_elementor_trees()
+    result = comparator.comparison_results["elementor_diff"]["home"]
+    assert result["summary"]["delete"] == 1
+    assert result["operations"][0]["old_path"] == 'section[1]/column[0]/cholot-title[1]'
+    print("✅ Page diff in comparison results")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Elementor Diff Test Suite")
+    print("=" * 50)
+    test_identical_content()
+    test_operations()
+    test_content_matching()
+    test_comparator_page_diff()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed Elementor document
+==============================================
+Checks ID, parent, widget type and section lookups, that edits made through
+the document keep the indexes current, and DynamicTemplateProcessor on top
+of it.
+"""
+
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from dynamic_template_processor import DynamicTemplateProcessor
+from elementor_document import ElementorDocument
+from elementor_ids import ElementorIDAllocator
+
+
+def widget(widget_id, widget_type, **settings):
+    return {'id': widget_id, 'elType': 'widget', 'widgetType': widget_type, 'settings': dict(settings)}
+
+
+def column(column_id, *widgets):
+    return {'id': column_id, 'elType': 'column', 'settings': {'_column_size': 50}, 'elements': list(widgets)}
+
+
+def sections():
+    """Hero, a services section with an inner section, and a team section"""
+    inner = {'id': 'inner', 'elType': 'section', 'settings': {}, 'elements': [
+        column('ic1', widget('t1', 'cholot-texticon'), widget('b1', 'cholot-iconbox')),
+        column('ic2', widget('t2', 'cholot-texticon')),
+    ]}
+    return [
+        {'id': 'hero', 'elType': 'section', 'settings': {}, 'elements': [
+            column('hc', widget('slider', 'cholot-slider'))]},
+        {'id': 'services', 'elType': 'section', 'settings': {}, 'elements': [
+            column('sc1', widget('head', 'cholot-title'), inner),
+            column('sc2', widget('t3', 'cholot-texticon'))]},
+        {'id': 'team', 'elType': 'section', 'settings': {}, 'elements': [
+            column('tc', widget('m1', 'cholot-team'), widget('m2', 'cholot-team'))]},
+    ]
+
+
+def test_lookups():
+    """IDs, parents, section ordinals and widget types answered from the index"""
+    print("🧪 Testing lookups...")
+    data = sections()
+    document = ElementorDocument(data)
+
+    assert len(document) == 18
+    t2 = document.get('t2')
+    assert t2['widgetType'] == 'cholot-texticon'
+    assert document.parent(t2)['id'] == 'ic2'
+    assert document.parent(document.get('inner'))['id'] == 'sc1'
+    assert document.parent(data[0]) is None
+    assert document.section_index(t2) == 1
+
+    # Several types come back merged in document order
+    assert [w['id'] for w in document.widgets(['cholot-iconbox', 'cholot-texticon'])] == ['t1', 'b1', 't2', 't3']
+    assert [w['id'] for w in document.widgets('cholot-team', section=2)] == ['m1', 'm2']
+    assert document.widgets(['cholot-team'], section=1) == []
+    assert document.find_section(['cholot-team', 'cholot-contact']) == (2, data[2])
+    assert document.find_section(['cholot-contact']) == (None, None)
+    assert [c['id'] for c in document.children(data[1], 'column')] == ['sc1', 'sc2']
+    print("✅ Lookups answered from the index")
+
+
+def test_edits_keep_index():
+    """Inserted, removed and cleared elements are reflected in every index"""
+    print("🧪 Testing edits...")
+    data = sections()
+    document = ElementorDocument(data)
+
+    document.insert_child(document.get('ic1'), 0, widget('t0', 'cholot-texticon'))
+    assert [w['id'] for w in document.widgets('cholot-texticon', section=1)] == ['t0', 't1', 't2', 't3']
+    assert document.parent(document.get('t0'))['id'] == 'ic1'
+    assert data[1]['elements'][0]['elements'][1]['elements'][0]['elements'][0]['id'] == 't0'
+
+    inner = document.get('inner')
+    document.remove(inner)
+    assert document.get('t1') is None and document.get('inner') is None
+    assert [w['id'] for w in document.widgets(['cholot-texticon', 'cholot-iconbox'], section=1)] == ['t3']
+
+    document.clear_children(document.get('tc'))
+    assert document.find_section(['cholot-team']) == (None, None)
+
+    ordinal = document.append_section({'id': 'contact', 'elType': 'section', 'elements': [
+        column('cc', widget('form', 'cholot-contact'))]})
+    assert ordinal == 3 and document.section_index(document.get('form')) == 3
+    assert len(data) == 4
+    print("✅ Indexes follow edits")
+
+
+def test_processor_clones_into_parent():
+    """Extra team members are cloned next to the template widget"""
+    print("🧪 Testing DynamicTemplateProcessor...")
+    processor = DynamicTemplateProcessor(id_allocator=ElementorIDAllocator(mode='counter'))
+    data = sections()
+    document = ElementorDocument(data)
+
+    members = [{'name': f'Mitarbeiter {n}', 'position': 'Bauleitung'} for n in range(4)]
+    processor._process_section(document, {'type': 'team', 'members': members}, {})
+    team = document.widgets('cholot-team', section=2)
+    assert [w['settings']['title'] for w in team] == [m['name'] for m in members]
+    assert all(document.parent(w)['id'] == 'tc' for w in team)
+    assert len({w['id'] for w in team}) == 4
+
+    services = [{'title': f'Leistung {n}'} for n in range(6)]
+    processor._process_section(document, {'type': 'service_cards', 'services': services}, {})
+    service_widgets = document.widgets(['cholot-texticon', 'cholot-iconbox'], section=1)
+    assert [w['settings']['title'] for w in service_widgets] == [s['title'] for s in services]
+    # Two template columns, three needed for six services
+    assert len(document.children(data[1], 'column')) == 3
+
+    assert processor.find_section_by_content(data, 'hero') == (0, data[0])
+    print("✅ Processor edits through the document")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Elementor Document Test Suite")
+    print("=" * 50)
+    test_lookups()
+    test_edits_keep_index()
+    test_processor_clones_into_parent()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
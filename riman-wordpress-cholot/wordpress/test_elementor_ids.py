@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the Elementor ID allocator
+==========================================
+Covers uniqueness, reproducibility, batch allocation and reserved IDs.
+"""
+
+import copy
+
+import pytest
+
+from elementor_ids import BASE36_ALPHABET, ContentIDAssigner, ElementorIDAllocator
+
+
+def test_random_ids_are_unique():
+    """Random mode never repeats an ID"""
+    allocator = ElementorIDAllocator()
+    ids = [allocator.allocate() for _ in range(5000)] + allocator.allocate_many(5000)
+
+    assert len(set(ids)) == 10000
+    assert len(allocator) == 10000
+    assert all(len(element_id) == 7 for element_id in ids)
+    assert all(c in '0123456789abcdef' for c in ''.join(ids))
+
+
+def test_seeded_ids_are_reproducible():
+    """Same seed gives the same sequence, one by one and in batches"""
+    first = ElementorIDAllocator(mode='seeded', seed=42)
+    second = ElementorIDAllocator(mode='seeded', seed=42)
+
+    assert [first.allocate() for _ in range(100)] == [second.allocate() for _ in range(100)]
+    assert first.allocate_many(1000) == second.allocate_many(1000)
+    assert ElementorIDAllocator(mode='seeded', seed=43).allocate() != \
+        ElementorIDAllocator(mode='seeded', seed=42).allocate()
+
+
+def test_counter_skips_reserved_ids():
+    """Counter mode is sequential and steps over reserved IDs"""
+    allocator = ElementorIDAllocator(mode='counter')
+    allocator.reserve(['0000001', '0000003'])
+
+    assert allocator.allocate() == '0000000'
+    assert allocator.allocate_many(3) == ['0000002', '0000004', '0000005']
+    assert '0000003' in allocator
+
+
+def test_base36_and_exhaustion():
+    """Custom alphabets work and a full ID space raises"""
+    allocator = ElementorIDAllocator(length=2, alphabet=BASE36_ALPHABET)
+    ids = allocator.allocate_many(36 * 36)
+
+    assert len(set(ids)) == 36 * 36
+    assert all(c in BASE36_ALPHABET for c in ''.join(ids))
+    with pytest.raises(RuntimeError):
+        allocator.allocate()
+
+
+def test_invalid_configuration():
+    """Unknown modes and unseeded 'seeded' mode are rejected"""
+    with pytest.raises(ValueError):
+        ElementorIDAllocator(mode='uuid')
+    with pytest.raises(ValueError):
+        ElementorIDAllocator(mode='seeded')
+
+
+def make_page(about_text='About us'):
+    """Two sections; the second has two identical widgets and a repeater"""
+    def widget(widget_type, **settings):
+        return {'id': 'x', 'elType': 'widget', 'widgetType': widget_type,
+                'settings': settings, 'elements': []}
+
+    def section(*widgets):
+        column = {'id': 'x', 'elType': 'column', 'settings': {}, 'elements': list(widgets)}
+        return {'id': 'x', 'elType': 'section', 'settings': {}, 'elements': [column]}
+
+    return [
+        section(widget('cholot-title', title=about_text)),
+        section(widget('cholot-text-line', title='Same'), widget('cholot-text-line', title='Same'),
+                widget('cholot-team', social_icon_list=[{'_id': 'x', 'url': '#'},
+                                                        {'_id': 'x', 'url': '#'}])),
+    ]
+
+
+def element_ids(elements):
+    for element in elements:
+        yield element['id']
+        for item in element['settings'].get('social_icon_list', []):
+            yield item['_id']
+        yield from element_ids(element['elements'])
+
+
+def test_content_ids_are_stable():
+    """Same tree gives the same IDs; editing one section leaves the other alone"""
+    assigner = ContentIDAssigner()
+    first = assigner.assign(make_page(), namespace='home')
+    second = assigner.assign(make_page(), namespace='home')
+    edited = assigner.assign(make_page('About the team'), namespace='home')
+
+    assert first == second
+    assert first[1] == edited[1]
+    assert first[0]['id'] != edited[0]['id']
+
+    ids = list(element_ids(first))
+    assert len(ids) == len(set(ids)) == 10
+
+
+def test_content_ids_ignore_position_and_old_ids():
+    """Inserting a section in front does not move existing IDs; incoming IDs are ignored"""
+    assigner = ContentIDAssigner(length=8)
+    base = assigner.assign(make_page(), namespace='home')
+
+    shifted = make_page()
+    shifted.insert(0, copy.deepcopy(shifted[0]))
+    shifted[0]['elements'][0]['elements'][0]['settings']['title'] = 'New intro'
+    shifted[1]['id'] = 'stale01'
+    assigner.assign(shifted, namespace='home')
+
+    assert shifted[1:] == base
+    assert ContentIDAssigner(length=8).assign(make_page(), namespace='about')[0]['id'] != base[0]['id']
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Elementor ID Allocator Test Suite")
+    print("=" * 50)
+    test_random_ids_are_unique()
+    test_seeded_ids_are_reproducible()
+    test_counter_skips_reserved_ids()
+    test_base36_and_exhaustion()
+    test_invalid_configuration()
+    test_content_ids_are_stable()
+    test_content_ids_ignore_position_and_old_ids()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
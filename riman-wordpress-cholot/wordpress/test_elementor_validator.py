@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass Elementor validator
+===================================================
+Checks post-ID attribution when pages share identical Elementor data, that
+validation reads the export exactly once, and the per-block result cache
+and process pool.
+"""
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+SHARED = '[{"id":"s1","elType":"section","elements":[{"id":"c1","elType":"column","elements":[]}]}]'
+
+EXPORT = f'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+    <item>
+        <title>Start</title>
+        <wp:post_id>10</wp:post_id>
+        <wp:post_type>page</wp:post_type>
+        <wp:postmeta><wp:meta_key>_elementor_data</wp:meta_key><wp:meta_value><![CDATA[{SHARED}]]></wp:meta_value></wp:postmeta>
+    </item>
+    <item>
+        <title>Logo</title>
+        <wp:post_id>11</wp:post_id>
+        <wp:post_type>attachment</wp:post_type>
+    </item>
+    <item>
+        <title>Kopie</title>
+        <wp:post_id>12</wp:post_id>
+        <wp:post_type>page</wp:post_type>
+        <wp:postmeta><wp:meta_key><![CDATA[_elementor_edit_mode]]></wp:meta_key><wp:meta_value>builder</wp:meta_value></wp:postmeta>
+        <wp:postmeta><wp:meta_key><![CDATA[_elementor_data]]></wp:meta_key><wp:meta_value><![CDATA[{SHARED}]]></wp:meta_value></wp:postmeta>
+    </item>
+</channel>
+</rss>'''
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle the module's functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_validation(module, xml_text, **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_file = Path(tmp) / 'export.xml'
+        xml_file.write_text(xml_text, encoding='utf-8')
+        validator = module.ElementorValidator(str(xml_file), **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return validator.run_validation()
+
+
+def test_shared_data_keeps_owner():
+    """Two pages with identical data are reported under their own post IDs"""
+    print("🧪 Testing post-ID attribution...")
+    results = run_validation(load_script('validate-elementor.py'), EXPORT)
+
+    assert [d['post_id'] for d in results['details']] == [10, 12]
+    assert [d['post_title'] for d in results['details']] == ['Start', 'Kopie']
+    assert results['pages_with_elementor'] == 2 and results['valid_elementor_data'] == 2
+    assert results['total_pages'] == 2
+    # _elementor_template_type and _elementor_version are missing
+    assert results['missing_meta_keys'] == 2
+    print("✅ Each block attributed to its own page")
+
+
+def test_single_pass():
+    """Blocks and meta keys come from one read of the export"""
+    print("🧪 Testing single pass...")
+    module = load_script('validate-elementor.py')
+    opened = []
+    reader_class = module.WXRReader
+
+    def counting_reader(source):
+        opened.append(source)
+        return reader_class(source)
+
+    module.WXRReader = counting_reader
+    run_validation(module, EXPORT)
+    assert len(opened) == 1
+    print("✅ Export read once")
+
+
+def test_block_cache():
+    """Identical blocks are validated once, across pages, exports and runs"""
+    print("🧪 Testing block result cache...")
+    module = load_script('validate-elementor.py')
+    uncached = run_validation(module, EXPORT)
+
+    cache = module.BlockResultCache()
+    assert run_validation(module, EXPORT, block_cache=cache) == uncached
+    assert (cache.misses, cache.hits, len(cache)) == (1, 1, 1)
+    run_validation(module, EXPORT, block_cache=cache)
+    assert (cache.misses, cache.hits) == (1, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = Path(tmp) / 'validation-cache.json'
+        run_validation(module, EXPORT, block_cache=module.BlockResultCache(str(cache_file)))
+        assert cache_file.exists()
+
+        warm = module.BlockResultCache(str(cache_file))
+        assert run_validation(module, EXPORT, block_cache=warm) == uncached
+        assert (warm.misses, warm.hits) == (0, 2)
+    print("✅ Cached results reused")
+
+
+def test_pool_matches_serial():
+    """Validation in worker processes reports the same results in document order"""
+    print("🧪 Testing process pool...")
+    module = load_script('validate-elementor.py')
+    broken = EXPORT.replace(
+        f'<![CDATA[_elementor_data]]></wp:meta_key><wp:meta_value><![CDATA[{SHARED}]]>',
+        '<![CDATA[_elementor_data]]></wp:meta_key><wp:meta_value><![CDATA[[{"id": ]]]>')
+    for xml_text in (EXPORT, broken):
+        serial = run_validation(module, xml_text)
+        parallel = run_validation(module, xml_text, workers=2)
+        assert parallel == serial
+    assert [d['json_valid'] for d in serial['details']] == [True, False]
+    print("✅ Pool results match serial validation")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Elementor Validator Test Suite")
+    print("=" * 50)
+    test_shared_data_keeps_owner()
+    test_single_pass()
+    test_block_cache()
+    test_pool_matches_serial()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,7 @@ import time
 sys.path.insert(0, str(Path(__file__).parent))
 
 from generate_wordpress_xml import WordPressXMLGenerator, CholotComponentFactory
+from elementor_ids import ElementorIDAllocator
 
 
 def test_basic_functionality():
@@ -487,6 +488,101 @@ def test_xml_structure_compliance():
         return False
 
 
+def test_streaming_output():
+    """Test that streaming output matches in-memory generation."""
+    print("🧪 Testing Streaming Output...")
+    
+    import io
+    import re
+    import xml.etree.ElementTree as ET
+    
+    def make_pages(count):
+        for i in range(count):
+            yield {
+                'title': f'Stream Page {i+1}',
+                'slug': f'stream-page-{i+1}',
+                'sections': [{
+                    'structure': '100',
+                    'columns': [{'width': 100, 'widgets': [{'type': 'title', 'title': f'Title {i+1}'}]}]
+                }]
+            }
+    
+    def strip_dates(xml_text):
+        return re.sub(r'<pubDate>.*?</pubDate>|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', '', xml_text)
+    
+    site_config = {'title': 'Stream Site', 'base_url': 'http://localhost:8082'}
+    
+    def seeded_generator():
+        return WordPressXMLGenerator(ElementorIDAllocator(mode='seeded', seed=42))
+    
+    expected = seeded_generator().generate_xml({'pages': list(make_pages(25))}, site_config)
+    
+    # Text stream fed from a page generator
+    text_buffer = io.StringIO()
+    written = seeded_generator().generate_xml_stream({'pages': make_pages(25)}, text_buffer, site_config)
+    
+    # Binary stream (file opened with 'wb', socket.makefile('wb'))
+    binary_buffer = io.BytesIO()
+    seeded_generator().generate_xml_stream({'pages': make_pages(25)}, binary_buffer, site_config)
+    
+    assert written == len(text_buffer.getvalue())
+    assert strip_dates(text_buffer.getvalue()) == strip_dates(expected)
+    assert strip_dates(binary_buffer.getvalue().decode('utf-8')) == strip_dates(expected)
+    
+    root = ET.fromstring(binary_buffer.getvalue())
+    assert len(root.findall('.//item')) == 26  # kit + 25 pages
+    
+    print("✅ Streaming output test passed")
+    return True
+
+
+def test_content_ids():
+    """Test that content-addressed IDs are identical across runs."""
+    print("🧪 Testing Content-Addressed IDs...")
+    
+    import re
+    import xml.etree.ElementTree as ET
+    
+    def page(slug, title):
+        return {
+            'title': title,
+            'slug': slug,
+            'sections': [{
+                'structure': '50',
+                'columns': [
+                    {'width': 50, 'widgets': [{'type': 'title', 'title': title}]},
+                    {'width': 50, 'widgets': [{'type': 'text-line', 'title': 'Same'},
+                                              {'type': 'text-line', 'title': 'Same'}]}
+                ]
+            }]
+        }
+    
+    def page_data(xml_text, slug):
+        root = ET.fromstring(xml_text.encode('utf-8'))
+        for item in root.iter('item'):
+            if item.findtext('{http://wordpress.org/export/1.2/}post_name') != slug:
+                continue
+            for meta in item.findall('{http://wordpress.org/export/1.2/}postmeta'):
+                if meta.findtext('{http://wordpress.org/export/1.2/}meta_key') == '_elementor_data':
+                    return meta.findtext('{http://wordpress.org/export/1.2/}meta_value')
+    
+    first = WordPressXMLGenerator(content_ids=True).generate_xml(
+        {'pages': [page('home', 'Home'), page('about', 'About')]})
+    second = WordPressXMLGenerator(content_ids=True).generate_xml(
+        {'pages': [page('home', 'Home'), page('about', 'About us')]})
+    
+    # Unchanged page keeps byte-identical data; the edited one changes
+    assert page_data(first, 'home') == page_data(second, 'home')
+    assert page_data(first, 'about') != page_data(second, 'about')
+    
+    # Identical sibling widgets still get distinct IDs
+    ids = re.findall(r'"id":"(\w+)"', page_data(first, 'home'))
+    assert len(ids) == len(set(ids)) == 6
+    
+    print("✅ Content-addressed ID test passed")
+    return True
+
+
 def run_performance_test():
     """Test performance with large datasets."""
     print("🧪 Running Performance Test...")
@@ -570,6 +666,8 @@ def main():
         ("Input Formats", test_input_formats),
         ("Example Files", test_example_files),
         ("XML Structure Compliance", test_xml_structure_compliance),
+        ("Streaming Output", test_streaming_output),
+        ("Content-Addressed IDs", test_content_ids),
         ("Performance", run_performance_test)
     ]
     
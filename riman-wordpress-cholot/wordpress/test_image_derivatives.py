@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the image derivative pipeline
+=============================================
+Builds WordPress sizes of small generated images, checks the up-to-date
+checks and the manifest, and the WebP rewriter and FullSiteGenerator that
+read it.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from PIL import Image
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import php_serialize
+from full_site_generator import FullSiteGenerator
+from image_derivatives import ImageManifest, build_derivatives, find_sources, image_name, plan_sizes
+
+FORMATS = ['jpg', 'webp']
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_images(directory):
+    Image.new('RGB', (1600, 900), (200, 40, 40)).save(directory / 'sanierung.jpg', quality=90)
+    Image.new('RGB', (1600, 900), (40, 40, 200)).save(directory / 'sanierung.webp')
+    Image.new('RGB', (300, 300)).save(directory / 'sanierung-300x300.jpg')  # handmade size
+    Image.new('RGBA', (400, 200), (0, 120, 0, 128)).save(directory / 'logo.png')
+
+
+def test_sizes():
+    """WordPress size rules: cropped thumbnail, proportional sizes, no upscaling"""
+    print("🧪 Testing size planning...")
+    assert [size[:3] for size in plan_sizes(1600, 900)] == [
+        ('thumbnail', 150, 150), ('medium', 300, 169), ('medium_large', 768, 432), ('large', 1024, 576),
+        ('1536x1536', 1536, 864)]
+    assert [size[:3] for size in plan_sizes(400, 200)] == [('thumbnail', 150, 150), ('medium', 300, 150)]
+    assert plan_sizes(150, 150) == []
+    assert image_name('http://localhost:8082/sanierung-300x169.webp?v=2') == 'sanierung'
+    print("✅ Sizes match WordPress")
+
+
+def test_build_and_skip():
+    """Parallel build, manifest contents, mtime and hash skips, rebuild on change"""
+    print("🧪 Testing derivative build...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        make_images(directory)
+        assert [path.name for path in find_sources(directory)] == ['logo.png', 'sanierung.jpg']
+
+        manifest, counts = build_derivatives(directory, formats=FORMATS, workers=2, verbose=False)
+        assert counts == {'built': 2, 'skipped': 0}
+        entry = manifest.entry('sanierung.jpg')
+        assert (entry['width'], entry['height']) == (1600, 900)
+        assert entry['originals'] == ['sanierung.webp']
+        for size in entry['sizes'].values():
+            for info in size['files'].values():
+                with Image.open(directory / info['file']) as image:
+                    assert image.size == (size['width'], size['height'])
+        # The existing full-size WebP is kept, not replaced by a conversion
+        with Image.open(directory / 'sanierung.webp') as image:
+            assert image.getpixel((0, 0))[2] > 150
+        # The PNG source gets full-size JPEG and WebP versions; transparency is flattened in JPEG
+        assert manifest.sizes('logo.png', 'jpg')['full']['file'] == 'logo.jpg'
+        assert not (directory / 'logo-300x300.jpg').exists()
+
+        srcset = manifest.srcset('sanierung.jpg', 'http://localhost:8082/')
+        assert srcset.split(', ') == [
+            'http://localhost:8082/sanierung-300x169.jpg 300w', 'http://localhost:8082/sanierung-768x432.jpg 768w',
+            'http://localhost:8082/sanierung-1024x576.jpg 1024w', 'http://localhost:8082/sanierung-1536x864.jpg 1536w',
+            'http://localhost:8082/sanierung.jpg 1600w']
+        for candidate in srcset.split(', '):
+            assert (directory / candidate.split()[0].rsplit('/', 1)[1]).is_file()
+
+        # Unchanged: nothing rebuilt; the generated logo.jpg does not become a source
+        manifest, counts = build_derivatives(directory, formats=FORMATS, workers=1, verbose=False)
+        assert counts == {'built': 0, 'skipped': 2}
+        assert manifest.entry('logo.png')['source'] == 'logo.png'
+
+        # Touched (same content, new mtime): the hash check skips it
+        os.utime(directory / 'logo.png', ns=(1, 1))
+        _, counts = build_derivatives(directory, formats=FORMATS, workers=1, verbose=False)
+        assert counts == {'built': 0, 'skipped': 2}
+
+        # Changed content, deleted output, other settings, --force: rebuilt
+        Image.new('RGBA', (400, 200), (0, 0, 120, 255)).save(directory / 'logo.png')
+        (directory / 'sanierung-768x432.webp').unlink()
+        _, counts = build_derivatives(directory, formats=FORMATS, workers=1, verbose=False)
+        assert counts == {'built': 2, 'skipped': 0}
+        assert (directory / 'sanierung-768x432.webp').is_file()
+        _, counts = build_derivatives(directory, formats=FORMATS, quality=60, workers=1, verbose=False)
+        assert counts == {'built': 2, 'skipped': 0}
+        manifest, counts = build_derivatives(directory, formats=FORMATS, quality=60, workers=1, force=True,
+                                             verbose=False)
+        assert counts == {'built': 2, 'skipped': 0}
+        assert manifest.entry('sanierung.jpg')['originals'] == ['sanierung.webp']
+
+        assert len(ImageManifest.load(directory / 'image-manifest.json')) == 2
+        assert len(ImageManifest.load(directory / 'missing.json')) == 0
+    print("✅ Derivatives are built once and kept up to date")
+
+
+def test_consumers():
+    """The WebP rewriter keeps existing sizes; FullSiteGenerator writes real metadata"""
+    print("🧪 Testing manifest consumers...")
+    convert = load_script('convert-to-webp-xml.py')
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        make_images(directory)
+        manifest, _ = build_derivatives(directory, formats=FORMATS, workers=1, verbose=False)
+
+        text = '<img src="http://x/sanierung-300x169.jpg" srcset="http://x/sanierung-300x300.jpg 300w">'
+        assert convert.create_webp_rewriter().rewrite(text) == (
+            '<img src="http://x/sanierung.webp" srcset="http://x/sanierung.webp 300w">')
+        assert convert.create_webp_rewriter(manifest).rewrite(text) == (
+            '<img src="http://x/sanierung-300x169.webp" srcset="http://x/sanierung.webp 300w">')
+
+        generator = FullSiteGenerator(image_manifest=manifest)
+        channel = ET.Element('channel')
+        generator._add_attachment_item(channel, {'title': 'Sanierung', 'url': 'http://localhost:8082/sanierung.webp'})
+        values = {meta.findtext('{http://wordpress.org/export/1.2/}meta_key'):
+                  meta.findtext('{http://wordpress.org/export/1.2/}meta_value')
+                  for meta in channel.iter('{http://wordpress.org/export/1.2/}postmeta')}
+        metadata = php_serialize.loads(values['_wp_attachment_metadata'])
+        assert metadata['file'] == '2024/sanierung.webp'
+        assert (metadata['width'], metadata['height']) == (1600, 900)
+        assert metadata['sizes']['medium'] == {
+            'file': 'sanierung-300x169.webp', 'width': 300, 'height': 169, 'mime-type': 'image/webp',
+            'filesize': (directory / 'sanierung-300x169.webp').stat().st_size}
+
+        # Unknown files keep the previous behaviour
+        generator._add_attachment_item(channel, {'title': 'Other', 'url': 'http://localhost:8082/other.jpg'})
+        assert sum(1 for _ in channel.iter('{http://wordpress.org/export/1.2/}postmeta')) == 3
+    print("✅ Consumers use the manifest")
+
+
+def main():
+    print("🚀 Image Derivative Tests")
+    print("=" * 60)
+    test_sizes()
+    test_build_and_skip()
+    test_consumers()
+    print("\n🎉 All image derivative tests passed!")
+
+
+if __name__ == "__main__":
+    main()
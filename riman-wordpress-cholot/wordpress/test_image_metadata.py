@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script for header-based attachment metadata
+================================================
+Checks the image header parsers against Pillow, the path/mtime cache and
+the _wp_attachment_metadata written by ImageProcessor and
+FullSiteGenerator.
+"""
+
+import html
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from PIL import Image
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import image_metadata
+import php_serialize
+from full_site_generator import FullSiteGenerator
+from image_metadata import ImageMetadataReader, read_header
+
+WP = '{http://wordpress.org/export/1.2/}'
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_headers():
+    """Dimensions and MIME types match Pillow without decoding pixel data"""
+    print("🧪 Testing header parsers...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        cases = [
+            ('a.png', 'PNG', 'RGBA', {}), ('b.jpg', 'JPEG', 'RGB', {'progressive': True}),
+            ('c.jpg', 'JPEG', 'L', {}), ('d.gif', 'GIF', 'P', {}), ('e.webp', 'WEBP', 'RGB', {}),
+            ('f.webp', 'WEBP', 'RGB', {'lossless': True}), ('g.webp', 'WEBP', 'RGBA', {}),
+            ('h.bmp', 'BMP', 'RGB', {}),
+        ]
+        if 'AVIF' in Image.SAVE:
+            cases.append(('i.avif', 'AVIF', 'RGB', {}))
+        for index, (name, pil_format, mode, options) in enumerate(cases):
+            size = (37 + index * 11, 23 + index * 7)
+            Image.new(mode, size).save(directory / name, pil_format, **options)
+            assert read_header(directory / name) == (*size, Image.MIME[pil_format]), name
+
+        # SOF behind a large APP segment (ICC profile) and fill bytes
+        buffer = io.BytesIO()
+        Image.new('RGB', (640, 480)).save(buffer, 'JPEG', icc_profile=b'\0' * 100000)
+        data = buffer.getvalue()
+        (directory / 'icc.jpg').write_bytes(data[:2] + b'\xff\xff' + data[2:])
+        assert read_header(directory / 'icc.jpg') == (640, 480, 'image/jpeg')
+
+        # Only the header is read: files truncated after it still work
+        (directory / 'cut.jpg').write_bytes(data[:data.index(b'\xff\xc0') + 20])
+        assert read_header(directory / 'cut.jpg') == (640, 480, 'image/jpeg')
+        png = (directory / 'a.png').read_bytes()
+        (directory / 'cut.png').write_bytes(png[:40])
+        assert read_header(directory / 'cut.png') == (37, 23, 'image/png')
+
+        (directory / 'text.jpg').write_text('not an image')
+        try:
+            read_header(directory / 'text.jpg')
+        except image_metadata.ImageHeaderError:
+            pass
+        else:
+            raise AssertionError('text file accepted as image')
+    print("✅ Headers parsed")
+
+
+def test_cache():
+    """Results are cached by path and mtime, and persisted between runs"""
+    print("🧪 Testing metadata cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        Image.new('RGB', (800, 600)).save(directory / 'bild.jpg')
+        cache_path = directory / 'cache.json'
+
+        reads = []
+        original = image_metadata.read_header
+        image_metadata.read_header = lambda path: reads.append(path) or original(path)
+        try:
+            reader = ImageMetadataReader([directory], cache_path)
+            assert reader.info(directory / 'bild.jpg').width == 800
+            assert reader.info(directory / 'bild.jpg').width == 800
+            assert reader.info(directory / 'missing.jpg') is None
+            assert len(reads) == 1
+            reader.save()
+
+            reader = ImageMetadataReader([directory], cache_path)
+            assert reader.info(directory / 'bild.jpg') == (800, 600, 'image/jpeg', (directory / 'bild.jpg').stat().st_size)
+            assert len(reads) == 1
+
+            Image.new('RGB', (400, 300)).save(directory / 'bild.jpg')
+            os.utime(directory / 'bild.jpg', ns=(1, 1))
+            assert reader.info(directory / 'bild.jpg').width == 400
+            assert len(reads) == 2
+        finally:
+            image_metadata.read_header = original
+    print("✅ Cache works")
+
+
+def test_attachment_metadata():
+    """Sizes come from the -WxH files; both generators write the metadata"""
+    print("🧪 Testing attachment metadata...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        Image.new('RGBA', (1456, 816)).save(directory / 'logo.png')
+        for size in ((150, 150), (300, 168), (768, 430)):
+            Image.new('RGBA', size).save(directory / f'logo-{size[0]}x{size[1]}.png')
+        Image.new('RGB', (300, 300)).save(directory / 'logo-300x300.png')  # no WordPress size
+        Image.new('RGB', (100, 100)).save(directory / 'logo-100x100.jpg')  # other format
+        reader = ImageMetadataReader([directory])
+
+        metadata = reader.attachment_metadata('http://localhost:8082/logo.png', '2024')
+        assert (metadata['width'], metadata['height'], metadata['file']) == (1456, 816, '2024/logo.png')
+        assert metadata['filesize'] == (directory / 'logo.png').stat().st_size
+        assert list(metadata['sizes']) == ['thumbnail', 'medium', '300x300', 'medium_large']
+        assert metadata['sizes']['medium_large'] == {
+            'file': 'logo-768x430.png', 'width': 768, 'height': 430, 'mime-type': 'image/png',
+            'filesize': (directory / 'logo-768x430.png').stat().st_size}
+        assert reader.attachment_metadata('https://picsum.photos/400/300?random=3') is None
+        assert reader.mime_type('https://example.com/x.webp') == 'image/webp'
+
+        image_processor = load_script('image-processor.py')
+        processor = image_processor.ImageProcessor(reader)
+        images = processor.process_config_images({'company': {'logo': 'http://localhost:8082/logo.png'},
+                                                  'hero_background': {'image': 'https://picsum.photos/1920/600'}})
+        logo_xml = processor.generate_attachment_xml(images['logo'])
+        assert '<wp:post_mime_type>image/png</wp:post_mime_type>' in logo_xml
+        value = logo_xml.split('_wp_attachment_metadata]]></wp:meta_key>')[1].split('<wp:meta_value>')[1]
+        assert php_serialize.loads(html.unescape(value.split('</wp:meta_value>')[0]))['file'] == 'logo.png'
+        hero_xml = processor.generate_attachment_xml(images['hero_bg'])
+        assert '<wp:post_mime_type>image/jpeg</wp:post_mime_type>' in hero_xml
+        assert '_wp_attachment_metadata' not in hero_xml
+
+        generator = FullSiteGenerator(image_metadata=reader)
+        channel = ET.Element('channel')
+        generator._add_attachment_item(channel, {'title': 'Logo', 'url': 'http://localhost:8082/logo.png'})
+        values = {meta.findtext(f'{WP}meta_key'): meta.findtext(f'{WP}meta_value')
+                  for meta in channel.iter(f'{WP}postmeta')}
+        assert values['_wp_attachment_metadata'] == php_serialize.dumps(metadata)
+    print("✅ Attachment metadata written")
+
+
+def main():
+    print("🚀 Image Metadata Tests")
+    print("=" * 60)
+    test_headers()
+    test_cache()
+    test_attachment_metadata()
+    print("\n🎉 All image metadata tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk media import
+=====================================
+Runs WordPressImageImporter against a stub wp-cli that imitates
+``media import``, ``post get`` and ``eval-file`` and logs its calls.
+"""
+
+import json
+import sys
+import tempfile
+import textwrap
+import zlib
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from import_images_to_wordpress import BULK_IMPORT_PHP, WordPressImageImporter
+
+STUB = textwrap.dedent('''
+    import json, sys, time, zlib
+    from pathlib import Path
+
+    log = Path(__file__).with_name('calls.log')
+    args = sys.argv[1:]
+    with open(log, 'a') as f:
+        f.write(json.dumps(['start', time.time(), args[0]]) + '\\n')
+
+    def media_id(path):
+        return zlib.crc32(path.encode()) % 100000
+
+    if args[0] == 'eval-file':
+        assert 'media_handle_sideload' in Path(args[1]).read_text()
+        images = json.loads(Path(args[2]).read_text())['images']
+        if any('crash' in image['path'] for image in images):
+            sys.stderr.write('PHP Fatal error: out of memory')
+            sys.exit(255)
+        time.sleep(0.2)
+        results = [{'key': image['key'], 'error': 'Sorry, this file type is not permitted'}
+                   if 'broken' in image['path'] else
+                   {'key': image['key'], 'id': media_id(image['path']),
+                    'url': 'http://localhost/wp-content/uploads/' + Path(image['path']).name}
+                   for image in images]
+        print('Warning: some plugin output')
+        print('BULK_MEDIA_IMPORT ' + json.dumps(results))
+    elif args[:2] == ['media', 'import']:
+        if 'broken' in args[2]:
+            sys.stderr.write('Error: Sorry, this file type is not permitted')
+            sys.exit(1)
+        print(media_id(args[2]))
+    elif args[:2] == ['post', 'get']:
+        print('http://localhost/wp-content/uploads/' + NAMES[int(args[2])])
+
+    with open(log, 'a') as f:
+        f.write(json.dumps(['end', time.time(), args[0]]) + '\\n')
+''')
+
+
+def make_stub(directory, names):
+    images = directory / 'images'
+    images.mkdir()
+    for name in names:
+        (images / name).write_bytes(b'image')
+    # Media IDs are derived from the path, so both modes assign the same ones
+    ids = {zlib.crc32(str((images / name).resolve()).encode()) % 100000: name for name in names}
+    stub = directory / 'wp-stub.py'
+    stub.write_text(f'NAMES = {ids!r}\n' + STUB)
+    return images, [sys.executable, str(stub)], directory / 'calls.log'
+
+
+def read_log(log):
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def test_bulk_matches_single():
+    """Bulk mode gives the single-image mapping with one wp-cli call per batch"""
+    print("🧪 Testing bulk import...")
+    names = [f'bild-{i}.jpg' for i in range(7)] + ['broken.jpg', 'logo.png']
+    with tempfile.TemporaryDirectory() as tmp:
+        images, wp_cli, log = make_stub(Path(tmp), names)
+
+        single = WordPressImageImporter(images, wp_cli)
+        expected = single.import_images(names + ['missing.jpg'], bulk=False, mapping_file=None)
+        assert [call[0] for call in read_log(log)].count('start') == 2 * 8 + 1  # two calls per image
+        assert len(expected) == 8 and set(single.errors) == {'http://localhost:8082/broken.jpg'}
+        assert expected['http://localhost:8082/logo.png']['title'] == 'Logo'
+        log.unlink()
+
+        bulk = WordPressImageImporter(images, wp_cli, batch_size=4, workers=2)
+        mapping_file = Path(tmp) / 'mapping.json'
+        assert bulk.import_images(names + ['missing.jpg'], mapping_file=str(mapping_file)) == expected
+        assert list(bulk.image_mapping) == list(expected)
+        assert json.loads(mapping_file.read_text()) == expected
+        assert 'Sorry' in bulk.errors['http://localhost:8082/broken.jpg']
+
+        calls = read_log(log)
+        assert [call[2] for call in calls] == ['eval-file'] * 6  # 3 batches
+        running, most = 0, 0
+        for event, _, _ in sorted(calls, key=lambda call: call[1]):
+            running += 1 if event == 'start' else -1
+            most = max(most, running)
+        assert most <= 2
+    print("✅ Bulk import matches per-image import")
+
+
+def test_failed_batch():
+    """A crashed batch reports wp-cli's error for its images and keeps the others"""
+    print("🧪 Testing failed batch...")
+    names = ['a.jpg', 'crash.jpg', 'b.jpg', 'c.jpg']
+    with tempfile.TemporaryDirectory() as tmp:
+        images, wp_cli, _ = make_stub(Path(tmp), names)
+        importer = WordPressImageImporter(images, wp_cli, batch_size=2, workers=3)
+        mapping = importer.import_images(names, mapping_file=None)
+        assert list(mapping) == ['http://localhost:8082/b.jpg', 'http://localhost:8082/c.jpg']
+        assert set(importer.errors) == {'http://localhost:8082/a.jpg', 'http://localhost:8082/crash.jpg'}
+        assert 'out of memory' in importer.errors['http://localhost:8082/a.jpg']
+
+        importer = WordPressImageImporter(images, [sys.executable, '-c', 'print("no marker")'])
+        assert importer.import_images(['a.jpg'], mapping_file=None) == {}
+        assert 'endete mit Code 0' in importer.errors['http://localhost:8082/a.jpg']
+    assert BULK_IMPORT_PHP.count("'key' => $image['key']") == 3
+    print("✅ Batch errors are reported per image")
+
+
+def main():
+    print("🚀 Bulk Media Import Tests")
+    print("=" * 60)
+    test_bulk_matches_single()
+    test_failed_batch()
+    print("\n🎉 All bulk media import tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON backend
+================================
+Every installed backend must produce byte-identical output to the stdlib
+``json`` module on the repo's ``*elementor*.json`` fixtures and on edge
+cases (floats, escapes, values only the stdlib can encode).
+"""
+
+import json
+import random
+import struct
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import json_backend
+
+# Call shapes used by the generators and validators
+SHAPES = [
+    {'separators': (',', ':')},
+    {'separators': (',', ':'), 'ensure_ascii': False},
+    {'indent': 2},
+    {'indent': 2, 'ensure_ascii': False},
+    {'separators': (',', ':'), 'sort_keys': True, 'ensure_ascii': False},
+    {},
+]
+
+
+def corpus():
+    """Parsed ``*elementor*.json`` fixtures (empty or broken files are skipped)"""
+    documents = []
+    for path in sorted(HERE.glob('*elementor*.json')):
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except ValueError:
+            continue
+        documents.append((path.name, data))
+    return documents
+
+
+def each_backend(test):
+    previous = json_backend.BACKEND
+    try:
+        for backend in json_backend.available_backends():
+            json_backend.set_backend(backend)
+            test()
+    finally:
+        json_backend.set_backend(previous)
+
+
+def check(obj, label):
+    """Every backend against the stdlib, for every call shape"""
+    for shape in SHAPES:
+        expected = json.dumps(obj, **shape)
+        decoded = json.loads(expected)
+
+        def run():
+            actual = json_backend.dumps(obj, **shape)
+            assert actual == expected, f"{json_backend.BACKEND}: {label} differs with {shape}"
+            assert json_backend.loads(expected) == decoded
+
+        each_backend(run)
+
+
+def test_fixture_corpus():
+    """The repo's Elementor fixtures encode byte-identically with every backend"""
+    print(f"🧪 Testing fixture corpus with {', '.join(json_backend.available_backends())}...")
+    documents = corpus()
+    assert len(documents) >= 10
+
+    for name, data in documents:
+        check(data, name)
+        encoded = json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+        def decode():
+            assert json_backend.loads(encoded) == data, f"{json_backend.BACKEND}: {name} decodes differently"
+
+        each_backend(decode)
+    print(f"✅ {len(documents)} fixtures identical")
+
+
+def test_floats_and_escapes():
+    """Floats the fast backends format differently and every escape class"""
+    print("🧪 Testing floats and escapes...")
+    rng = random.Random(18)
+    floats = [1e16, 1e-5, 1.5e-05, 0.0001, 1e22, -2.5e-300, 5e-324, 100.0, 0.1, 33.333333333333336]
+    floats += [struct.unpack('d', struct.pack('Q', rng.getrandbits(64)))[0] for _ in range(2000)]
+    floats = [f for f in floats if f == f and abs(f) != float('inf')]
+    text = 'Schadstoffsanierung – Größe ✓ 😀 \x00\x1f\x7f "quoted" \\ / \n\t  <b>&amp;</b>'
+    samples = [
+        {'size': value, 'label': f'{value}'} for value in floats
+    ] + [
+        {'title': text, text: [text, {'nested': text}]},
+        {'id': '5e0803d', 'time': '18:58:05.000001', 'css': 'margin:1e5,0', 'n': [0, -1, 2 ** 63 - 1]},
+        {'big': 2 ** 70, 'keys': {1: 'int key', 2.5: 'float key'}},
+        [], {}, 'plain', 1.0, -0.0,
+    ]
+
+    for sample in samples:
+        check(sample, repr(sample)[:40])
+    print("✅ Floats and escapes identical")
+
+
+def test_errors_match_stdlib():
+    """Invalid input raises the stdlib's exceptions"""
+    print("🧪 Testing errors...")
+
+    def run():
+        for broken in ('{"a": }', '[1,', '', '{"a":1}x'):
+            try:
+                json_backend.loads(broken)
+            except json.JSONDecodeError:
+                continue
+            raise AssertionError(f"{json_backend.BACKEND} accepted {broken!r}")
+        try:
+            json_backend.dumps({'set': {1, 2}}, separators=(',', ':'))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"{json_backend.BACKEND} encoded a set")
+        assert json_backend.loads('123456789012345678901234567890') == 123456789012345678901234567890
+
+    each_backend(run)
+    print("✅ Errors come from the stdlib")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 JSON Backend Test Suite")
+    print("=" * 50)
+    test_fixture_corpus()
+    test_floats_and_escapes()
+    test_errors_match_stdlib()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for media deduplication
+===================================
+Checks URL canonicalization and content hashing of MediaRegistry and that
+ImageProcessor, CompleteImageGenerator and FullSiteGenerator create one
+attachment per image.
+"""
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from full_site_generator import FullSiteGenerator
+from image_metadata import ImageMetadataReader
+from media_registry import MediaRegistry
+
+WP = '{http://wordpress.org/export/1.2/}'
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_canonical_urls():
+    """Scheme, ports, host aliases, size suffixes and resize parameters are ignored"""
+    print("🧪 Testing URL canonicalization...")
+    registry = MediaRegistry(reader=ImageMetadataReader([]))
+    same = [
+        'http://localhost:8082/hero.jpg',
+        'https://localhost:8082/hero.jpg',
+        'http://LOCALHOST:8081/hero-300x200.jpg',
+        'http://127.0.0.1:8082/hero-scaled.jpg',
+        ' http://localhost:8082/%68ero-1024x683.jpg ',
+    ]
+    assert len({registry.canonical_url(url) for url in same}) == 1
+    assert registry.canonical_url('https://example.com:443/a.png') == registry.canonical_url('http://example.com/a.png')
+    assert registry.canonical_url('http://localhost:8083/hero.jpg') != registry.canonical_url(same[0])
+    assert registry.canonical_url('http://localhost:8082/hero.png') != registry.canonical_url(same[0])
+    assert registry.canonical_url('http://localhost:8082/hero-300x200-2.jpg') != registry.canonical_url(same[0])
+
+    unsplash = 'https://images.unsplash.com/photo-1504307651254-35680f356dfd?ixlib=rb-4.0.3&w={}&fit=crop&q=80'
+    assert registry.canonical_url(unsplash.format(1920)) == registry.canonical_url(unsplash.format(600))
+    assert registry.canonical_url('https://picsum.photos/400/300?random=3&w=10') == (
+        registry.canonical_url('https://picsum.photos/400/300?random=3'))
+    assert registry.canonical_url('https://picsum.photos/400/300?random=3') != (
+        registry.canonical_url('https://picsum.photos/400/300?random=4'))
+    assert registry.canonical_url('images/hero.jpg') == registry.canonical_url('./images/hero-150x150.jpg')
+    assert registry.full_size_url('http://localhost:8082/hero-300x300.jpg') == 'http://localhost:8082/hero.jpg'
+    assert registry.full_size_url(unsplash.format(600)) == (
+        'https://images.unsplash.com/photo-1504307651254-35680f356dfd')
+    assert registry.full_size_url('https://picsum.photos/400/300?random=3') == 'https://picsum.photos/400/300?random=3'
+    assert registry.full_size_url('missing/hero-150x150.jpg') == 'missing/hero-150x150.jpg'
+
+    for url in same:
+        if registry.find(url) is None:
+            registry.add(url, 7)
+    assert len(registry) == 1 and registry.reused == len(same) - 1
+    assert registry.find('') is None and registry.find('http://localhost:8082/other.jpg') is None
+    print("✅ URLs canonicalized")
+
+
+def test_content_hash():
+    """With hash_files, copies under other names share one attachment"""
+    print("🧪 Testing content hashing...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / 'hero.jpg').write_bytes(b'hero image')
+        shutil.copy(directory / 'hero.jpg', directory / 'hero-copy.jpg')
+        (directory / 'team.jpg').write_bytes(b'team image')
+        reader = ImageMetadataReader([directory])
+
+        plain = MediaRegistry(reader=reader)
+        plain.add('http://localhost:8082/hero.jpg', 1)
+        assert plain.find('http://localhost:8082/hero-copy.jpg') is None
+
+        hashing = MediaRegistry(hash_files=True, reader=reader)
+        hashing.add('http://localhost:8082/hero.jpg', 1)
+        assert hashing.find('http://localhost:8082/hero-copy.jpg') == 1
+        assert hashing.find(str(directory / 'hero-copy.jpg')) == 1
+        assert hashing.find('http://localhost:8082/team.jpg') is None
+        assert hashing.find('http://example.com/missing.jpg') is None
+    print("✅ Copies detected by content")
+
+
+def test_generators():
+    """Every reference to one image gets the same attachment ID and one item"""
+    print("🧪 Testing generators...")
+    image_processor = load_script('image-processor.py')
+    processor = image_processor.ImageProcessor(ImageMetadataReader([]))
+    images = processor.process_config_images({
+        'hero_background': {'image': 'http://localhost:8082/hero.jpg'},
+        'services': [{'title': 'A', 'image': 'https://localhost:8082/hero-768x512.jpg'},
+                     {'title': 'B', 'image': 'http://localhost:8082/team.jpg'}],
+        'gallery': {'images': [{'image': 'http://localhost:8081/hero.jpg'}, {'image': 'http://localhost:8082/team.jpg'}]},
+    })
+    assert len(images) == 5 and len(processor.attachments) == 2
+    assert images['hero_bg']['id'] == images['service_0']['id'] == images['gallery_0']['id'] == 200
+    assert images['service_1']['id'] == images['gallery_1']['id'] == 201
+    assert processor.attachment_id == 202
+    # Only the ID is shared: each reference keeps its URL and alt text, the attachment is the original
+    assert images['service_0']['url'] == 'https://localhost:8082/hero-768x512.jpg'
+    assert images['service_0']['alt'] == 'Service: A' and images['gallery_0']['alt'] == 'Gallery Image 1'
+    assert processor.attachments[200]['url'] == 'http://localhost:8082/hero.jpg'
+
+    complete = load_script('complete-image-generator.py').CompleteImageGenerator()
+    images = complete.process_images(complete.create_riman_with_images())
+    # The hero background and the first gallery image are the same Unsplash photo
+    assert images['hero_bg']['id'] == images['gallery_1']['id']
+    assert len(complete.generate_attachments_xml()) == len(images) - 1
+    thumb = complete.create_image_attachment('http://localhost:8082/hero-300x300.jpg', 'thumb')
+    hero = complete.create_image_attachment('https://localhost:8081/hero.jpg', 'Hero')
+    assert thumb['id'] == hero['id']
+    assert (thumb['url'], thumb['alt']) == ('http://localhost:8082/hero-300x300.jpg', 'thumb')
+    assert (hero['url'], hero['alt'], hero['filename']) == ('https://localhost:8081/hero.jpg', 'Hero', 'hero.jpg')
+    assert complete.attachments[thumb['id']]['url'] == 'http://localhost:8082/hero.jpg'
+
+    generator = FullSiteGenerator(image_metadata=ImageMetadataReader([]))
+    channel = ET.Element('channel')
+    generator._add_media_attachments(channel, {
+        'media': [{'url': 'http://localhost:8082/hero.jpg', 'title': 'Hero'}],
+        'pages': [{'title': 'Start', 'featured_image': 'https://localhost:8082/hero-1024x683.jpg'},
+                  {'title': 'Team', 'featured_image': 'http://localhost:8082/team.jpg'}],
+        'posts': [{'title': 'News', 'featured_image': 'http://127.0.0.1:8082/hero.jpg'}],
+    })
+    assert [item.findtext(f'{WP}post_id') for item in channel.findall('item')] == ['101', '102']
+    assert generator.attachment_ids == {
+        'http://localhost:8082/hero.jpg': 101, 'https://localhost:8082/hero-1024x683.jpg': 101,
+        'http://localhost:8082/team.jpg': 102, 'http://127.0.0.1:8082/hero.jpg': 101}
+    generator._add_media_attachments(channel, {'media': [{'url': 'http://localhost:8082/logo-150x150.png'}]})
+    assert channel.findall('item')[-1].findtext(f'{WP}attachment_url') == 'http://localhost:8082/logo.png'
+    print("✅ One attachment per image")
+
+
+def main():
+    print("🚀 Media Registry Tests")
+    print("=" * 60)
+    test_canonical_urls()
+    test_content_hash()
+    test_generators()
+    print("\n🎉 All media registry tests passed!")
+
+
+if __name__ == "__main__":
+    main()
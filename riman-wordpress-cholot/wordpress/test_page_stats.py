@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for page statistics
+===============================
+One traversal must give the same numbers as the separate walks it replaces
+(elements usage, widget counts, required fields, element counts) and find
+duplicate IDs, missing fields and image URLs.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import re
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+from generate_wordpress_xml import WordPressXMLGenerator
+import php_serialize
+from page_stats import PageVisitor, collect_elements_usage, collect_page_stats
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_usage(elements, usage=None):
+    """The recursive walk WordPressXMLGenerator used before"""
+    usage = {} if usage is None else usage
+    for element in elements:
+        el_type = element.get('elType', '')
+        widget_type = element.get('widgetType', '')
+        if el_type == 'widget' and widget_type:
+            usage[widget_type] = usage.get(widget_type, 0) + 1
+        elif el_type in ['section', 'column']:
+            usage[el_type] = usage.get(el_type, 0) + 1
+        if 'elements' in element:
+            reference_usage(element['elements'], usage)
+    return usage
+
+
+def reference_widget_count(elements):
+    return sum((element.get('elType') == 'widget') + reference_widget_count(element.get('elements', []))
+               for element in elements)
+
+
+def page(widget_settings=None, widget_id='w1'):
+    widget = {'id': widget_id, 'elType': 'widget', 'widgetType': 'cholot-texticon',
+              'settings': widget_settings or {}, 'elements': []}
+    column = {'id': 'c1', 'elType': 'column', 'settings': {}, 'elements': [widget]}
+    return [{'id': 's1', 'elType': 'section', 'settings': {}, 'elements': [column]}]
+
+
+def test_matches_reference_walks():
+    """Usage map (keys and order) and widget count equal the old walks on the fixtures"""
+    print("🧪 Testing against the old walks...")
+    checked = 0
+    for path in sorted(HERE.glob('*elementor*.json')):
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except ValueError:
+            continue
+        elements = data if isinstance(data, list) else data.get('content', [])
+        if not isinstance(elements, list) or not all(isinstance(e, dict) for e in elements):
+            continue
+        stats = collect_page_stats(elements)
+        assert list(stats.elements_usage.items()) == list(reference_usage(elements).items()), path.name
+        assert list(collect_elements_usage(elements).items()) == list(stats.elements_usage.items()), path.name
+        assert stats.widget_count == reference_widget_count(elements), path.name
+        checked += 1
+    assert checked >= 5
+    print(f"✅ {checked} fixtures match")
+
+
+def test_checks():
+    """Duplicate IDs, missing required fields, image URLs, depths and visitors"""
+    print("🧪 Testing checks...")
+    elements = page({'image': {'id': 7, 'url': 'http://localhost/a.jpg'},
+                     'slider_list': [{'_id': 'x', 'image': {'url': 'http://localhost/b.webp?v=2'}},
+                                     {'_id': 'y', 'link': {'url': 'http://localhost/kontakt/'}}]})
+    elements.append({'id': 's1', 'elType': 'section', 'elements': [
+        {'id': 'c2', 'elType': 'column', 'elements': [{'id': 'w2', 'elType': 'widget', 'widgetType': 'cholot-title'}]}]})
+
+    class SlideCounter(PageVisitor):
+        slides = 0
+
+        def visit(self, element, depth, parent):
+            self.slides += len(element.get('settings', {}).get('slider_list', []))
+
+    counter = SlideCounter()
+    stats = collect_page_stats(elements, visitors=[counter])
+    assert stats.duplicate_ids == ['s1'] and not stats.ids_unique
+    assert stats.missing_fields == [('1/0/0', ('settings',))]
+    assert stats.image_urls == ['http://localhost/a.jpg', 'http://localhost/b.webp?v=2']
+    assert stats.depth_counts == {0: 2, 1: 2, 2: 2} and stats.max_depth == 2
+    assert stats.widget_types == {'cholot-texticon': 1, 'cholot-title': 1}
+    assert counter.slides == 2
+    assert json.loads(json.dumps(stats.to_dict()))['element_count'] == 6
+
+    clean = collect_page_stats(page())
+    assert clean.ids_unique and clean.required_fields_present and clean.image_urls == []
+    print("✅ Checks found")
+
+
+def test_consumers():
+    """Generator, hybrid generator, benchmark suite and validator use the shared statistics"""
+    print("🧪 Testing consumers...")
+    generator = WordPressXMLGenerator()
+    xml_output = generator.generate_xml({'pages': [{'title': 'Leistungen', 'slug': 'leistungen',
+                                                     'elementor_data': json.dumps(page())}]})
+    usage = re.search(r'_elementor_elements_usage\]\]></wp:meta_key>\s*<wp:meta_value><!\[CDATA\[(.*?)\]\]>',
+                      xml_output).group(1)
+    assert php_serialize.loads(usage) == {'section': 1, 'column': 1, 'cholot-texticon': 1}
+
+    hybrid = load_script('hybrid_generator', 'hybrid-generator.py')
+    assert hybrid.HybridElementorGenerator('does-not-exist.json').count_elements(page() + page()) == 2
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        validation = load_script('validation_report_generator', 'validation_report_generator.py')
+        validator = validation.ValidationReportGenerator()
+        assert validator._check_id_uniqueness(xml_output)
+        assert validator._check_elementor_structure(xml_output)
+        reader, pages = validator._read_pages(xml_output)
+        assert reader.root_tag == 'rss' and reader.has_channel and reader.channel_elements['item'] >= len(pages) == 1
+        assert pages[0][1].elements_usage == {'section': 1, 'column': 1, 'cholot-texticon': 1}
+        duplicated = generator.generate_xml({'pages': [{'title': 'Doppelt', 'slug': 'doppelt',
+                                                        'elementor_data': json.dumps(page() + page())}]})
+        assert not validator._check_id_uniqueness(duplicated)
+
+        suite = load_script('benchmark_suite', 'benchmark-suite.py')
+    result = suite.BenchmarkSuite()._analyze_result(
+        'fixed', 'check', xml_output, {'generation_time': 0.1}, {'services': ['Asbest']})
+    assert result.widget_count == 1 and result.required_fields_present
+    print("✅ Consumers agree")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Page Statistics Test Suite")
+    print("=" * 50)
+    test_matches_reference_walks()
+    test_checks()
+    test_consumers()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Test script for PHP serialization
+=================================
+Fuzzes php_serialize against a small, obviously-correct reference
+implementation (random nested arrays, UTF-8 and undecodable strings, keys
+PHP turns into integers, float corner cases, chunked streaming, corrupted
+input), checks known PHP outputs, and the WebP conversion of attachment
+metadata.
+"""
+
+import importlib.util
+import io
+import json
+import math
+import random
+import re
+import struct
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+sys.path.insert(0, str(HERE))
+
+import php_serialize
+from php_serialize import PHPObject, PHPSerializeError
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Reference implementation: straight from the format description, no shortcuts
+
+def reference_float(value):
+    if value != value:
+        return 'NAN'
+    if value in (float('inf'), float('-inf')):
+        return 'INF' if value > 0 else '-INF'
+    if value == 0:
+        return '-0' if str(value).startswith('-') else '0'
+    for precision in range(1, 18):
+        text = '%.*e' % (precision - 1, value)
+        if float(text) == value:
+            break
+    mantissa, exponent = text.split('e')
+    negative = mantissa.startswith('-')
+    digits = mantissa.lstrip('-').replace('.', '').rstrip('0')
+    decpt = int(exponent) + 1
+    if decpt < -3 or decpt > 17:
+        body = digits[0] + '.' + (digits[1:] or '0') + 'E' + ('-' if decpt - 1 < 0 else '+') + str(abs(decpt - 1))
+    elif decpt <= 0:
+        body = '0.' + '0' * -decpt + digits
+    elif len(digits) <= decpt:
+        body = digits.ljust(decpt, '0')
+    else:
+        body = digits[:decpt] + '.' + digits[decpt:]
+    return ('-' if negative else '') + body
+
+
+def reference_dumps(value):
+    if value is None:
+        return 'N;'
+    if value is True or value is False:
+        return 'b:%d;' % value
+    if isinstance(value, int):
+        return 'i:%d;' % value
+    if isinstance(value, float):
+        return 'd:%s;' % reference_float(value)
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'surrogateescape')
+    if isinstance(value, str):
+        return 's:%d:"%s";' % (len(value.encode('utf-8', 'surrogateescape')), value)
+    if isinstance(value, (list, tuple)):
+        value = dict(enumerate(value))
+    body = ''
+    for key, item in value.items():
+        if isinstance(key, str) and re.fullmatch(r'0|-?[1-9][0-9]*', key) and -2 ** 63 <= int(key) < 2 ** 63:
+            key = int(key)
+        body += reference_dumps(key) + reference_dumps(item)
+    return 'a:%d:{%s}' % (len(value), body)
+
+
+def reference_loads(raw, index=0):
+    """Returns (value, next index); raises on anything malformed"""
+    kind = raw[index:index + 1]
+    if kind == b'N':
+        assert raw[index + 1:index + 2] == b';'
+        return None, index + 2
+    assert raw[index + 1:index + 2] == b':'
+    index += 2
+    if kind in (b'i', b'b', b'd'):
+        end = raw.index(b';', index)
+        text = raw[index:end].decode('ascii')
+        if kind == b'i':
+            assert re.fullmatch(r'[-+]?[0-9]+', text)
+            return int(text), end + 1
+        if kind == b'b':
+            assert text in ('0', '1')
+            return text == '1', end + 1
+        return float(text), end + 1
+    if kind == b's':
+        colon = raw.index(b':', index)
+        length = int(raw[index:colon])
+        assert length >= 0 and raw[colon + 1:colon + 2] == b'"'
+        start = colon + 2
+        assert len(raw) >= start + length + 2 and raw[start + length:start + length + 2] == b'";'
+        return raw[start:start + length].decode('utf-8', 'surrogateescape'), start + length + 2
+    if kind == b'a':
+        colon = raw.index(b':', index)
+        count = int(raw[index:colon])
+        assert count >= 0 and raw[colon + 1:colon + 2] == b'{'
+        index = colon + 2
+        result = {}
+        for _ in range(count):
+            key, index = reference_loads(raw, index)
+            assert isinstance(key, (int, str)) and not isinstance(key, bool)
+            result[key], index = reference_loads(raw, index)
+        assert raw[index:index + 1] == b'}'
+        return result, index + 1
+    raise AssertionError(f'unsupported type {kind!r}')
+
+
+def normalized_key(key):
+    return int(key) if isinstance(key, str) and re.fullmatch(r'0|-?[1-9][0-9]*', key) else key
+
+
+def normalized(value):
+    """What a PHP round trip gives back: arrays as dicts, integer-like keys as ints, strings decoded"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'surrogateescape')
+    if isinstance(value, (list, tuple)):
+        value = dict(enumerate(value))
+    if isinstance(value, dict):
+        return {normalized_key(key): normalized(item) for key, item in value.items()}
+    return value
+
+
+# Random values
+
+ALPHABET = 'abcxyz_-09 "\';:{}\\\n' + 'äöüßé–✓€😀' + '\udc80\udcff'
+
+
+def random_text(rng):
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+def random_key(rng):
+    return rng.choice([rng.randint(-5, 50), random_text(rng), str(rng.randint(-99, 99)), '05', '-0', '1.5'])
+
+
+def random_float(rng):
+    if rng.random() < 0.5:
+        return rng.choice([0.1, 1.0, -0.0, 0.0, 1e15, 1e16, 1e17, 1e18, 1e-4, 1e-5, 123.456, 5e-324, 1e308, 1e22])
+    value = struct.unpack('d', struct.pack('Q', rng.getrandbits(64)))[0]
+    return value if math.isfinite(value) else 2.5
+
+
+def random_value(rng, depth=0):
+    choice = rng.randint(0, 9 if depth < 4 else 6)
+    if choice == 0:
+        return None
+    if choice == 1:
+        return rng.random() < 0.5
+    if choice == 2:
+        return rng.randint(-2 ** 63, 2 ** 63 - 1)
+    if choice == 3:
+        return random_float(rng)
+    if choice in (4, 5):
+        return random_text(rng)
+    if choice == 6:
+        return bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 6)))
+    if choice == 7:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    # Keys that are the same PHP key (0 and '0') would collapse into one entry
+    entries = {}
+    for _ in range(rng.randint(0, 5)):
+        key = random_key(rng)
+        entries.setdefault(normalized_key(key), (key, random_value(rng, depth + 1)))
+    return dict(entries.values())
+
+
+def test_known_php_output():
+    """Output PHP's serialize() gives for the same values"""
+    print("🧪 Testing known PHP output...")
+    assert php_serialize.dumps({'a': 1, 'b': [True, None, 1.5]}) == 'a:2:{s:1:"a";i:1;s:1:"b";a:3:{i:0;b:1;i:1;N;i:2;d:1.5;}}'
+    assert php_serialize.dumps('ü') == 's:2:"ü";'
+    assert php_serialize.dumps({'5': 'x', '05': 'y'}) == 'a:2:{i:5;s:1:"x";s:2:"05";s:1:"y";}'
+    floats = {0.1: '0.1', 1.0: '1', -0.0: '-0', 1e100: '1.0E+100', 1e-5: '1.0E-5', 0.0001: '0.0001',
+              float('inf'): 'INF', float('-inf'): '-INF', 0.30000000000000004: '0.30000000000000004'}
+    for value, text in floats.items():
+        assert php_serialize.dumps(value) == f'd:{text};', value
+    assert php_serialize.dumps(float('nan')) == 'd:NAN;' and math.isnan(php_serialize.loads('d:NAN;'))
+    obj = 'O:8:"stdClass":1:{s:4:"file";s:5:"a.jpg";}'
+    assert php_serialize.loads(obj) == PHPObject('stdClass', {'file': 'a.jpg'})
+    assert php_serialize.dumps(php_serialize.loads(obj)) == obj
+
+    # The generator's elements usage counted characters before
+    generator = load_script('generate_wordpress_xml', 'generate_wordpress_xml.py').WordPressXMLGenerator()
+    assert generator._php_serialize_array({'übersicht': 2}) == 'a:1:{s:10:"übersicht";i:2;}'
+    print("✅ Known output matches")
+
+
+def test_fuzz_against_reference():
+    """Random values: same text as the reference, same values back, also streamed in chunks"""
+    print("🧪 Fuzzing against the reference implementation...")
+    rng = random.Random(20)
+    for _ in range(3000):
+        value = random_value(rng)
+        text = php_serialize.dumps(value)
+        assert text == reference_dumps(value), value
+        raw = text.encode('utf-8', 'surrogateescape')
+        expected, end = reference_loads(raw)
+        assert end == len(raw)
+        assert php_serialize.loads(text) == php_serialize.loads(raw) == expected == normalized(value)
+        assert php_serialize.dumps(expected) == text
+
+        chunk_size = rng.randint(1, 9)
+        assert php_serialize.load(io.BytesIO(raw)) == expected
+        if isinstance(expected, dict):
+            items = list(php_serialize.iter_items(io.BytesIO(raw), chunk_size=chunk_size))
+            assert items == list(expected.items())
+    print("✅ 3000 random values agree")
+
+
+def test_fuzz_corrupted_input():
+    """Truncated or mutated data parses like the reference or raises PHPSerializeError"""
+    print("🧪 Fuzzing corrupted input...")
+    rng = random.Random(2020)
+    rejected = 0
+    for _ in range(3000):
+        raw = bytearray(php_serialize.dumps(random_value(rng)).encode('utf-8', 'surrogateescape'))
+        if rng.random() < 0.3:
+            raw = raw[:rng.randint(0, len(raw) - 1)]
+        else:
+            for _ in range(rng.randint(1, 3)):
+                raw[rng.randrange(len(raw))] = rng.choice(b'0123456789:;"{}aisdbNO-x')
+        try:
+            expected, end = reference_loads(bytes(raw))
+            assert end == len(raw)
+        except Exception:
+            expected = PHPSerializeError
+        try:
+            actual = php_serialize.loads(bytes(raw))
+        except PHPSerializeError:
+            actual = PHPSerializeError
+            rejected += 1
+        if expected is not PHPSerializeError:
+            assert actual == expected or (actual != actual and expected != expected), bytes(raw)
+    assert rejected > 1000
+    print(f"✅ {rejected} corrupted inputs rejected cleanly")
+
+
+def test_webp_conversion_keeps_lengths():
+    """convert-to-webp-xml.py rewrites attachment metadata structurally"""
+    print("🧪 Testing WebP conversion of attachment metadata...")
+    webp = load_script('convert_to_webp_xml', 'convert-to-webp-xml.py')
+    metadata = {'width': 1920, 'height': 1080, 'file': '2019/06/Größe.jpg',
+                'sizes': {'thumbnail': {'file': 'Größe-150x150.jpg', 'width': 150, 'height': 150,
+                                        'mime-type': 'image/jpeg'}},
+                'image_meta': {'caption': '', 'keywords': []}}
+    value = php_serialize.dumps(metadata)
+    xml = ('<wp:postmeta>\n<wp:meta_key><![CDATA[_wp_attachment_metadata]]></wp:meta_key>\n'
+           f'<wp:meta_value><![CDATA[{value}]]></wp:meta_value>\n</wp:postmeta>\n'
+           '<wp:postmeta><wp:meta_key>_wp_attachment_metadata</wp:meta_key>'
+           f'<wp:meta_value>{value.replace(chr(34), "&quot;")}</wp:meta_value></wp:postmeta>\n'
+           '<guid>http://localhost/Größe-300x200.jpg</guid>')
+    converted = webp.create_webp_rewriter().rewrite(xml)
+    values = re.findall(r'<wp:meta_value>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</wp:meta_value>', converted)
+    assert len(values) == 2
+    for found in (values[0], values[1].replace('&quot;', '"')):
+        rewritten = php_serialize.loads(found)
+        assert rewritten['file'] == '2019/06/Größe.webp'
+        assert rewritten['sizes']['thumbnail'] == {'file': 'Größe.webp', 'width': 150, 'height': 150,
+                                                   'mime-type': 'image/webp'}
+    assert '<guid>http://localhost/Größe.webp</guid>' in converted
+    print("✅ Serialized lengths stay correct")
+
+
+def test_generator_elements_usage():
+    """WordPressXMLGenerator writes byte-accurate lengths for non-ASCII widget types"""
+    print("🧪 Testing elements usage of the XML generator...")
+    from generate_wordpress_xml import WordPressXMLGenerator
+    widget = 'cholot-überschrift'
+    elements = [{'id': 's1', 'elType': 'section', 'settings': {}, 'elements': [
+        {'id': 'c1', 'elType': 'column', 'settings': {}, 'elements': [
+            {'id': 'w1', 'elType': 'widget', 'widgetType': widget, 'settings': {}, 'elements': []},
+            {'id': 'w2', 'elType': 'widget', 'widgetType': widget, 'settings': {}, 'elements': []}]}]}]
+    xml_output = WordPressXMLGenerator().generate_xml(
+        {'pages': [{'title': 'Größen', 'slug': 'groessen', 'elementor_data': json.dumps(elements)}]})
+    value = re.search(r'_elementor_elements_usage\]\]></wp:meta_key>\s*<wp:meta_value><!\[CDATA\[(.*?)\]\]>',
+                      xml_output).group(1)
+    assert f's:{len(widget.encode("utf-8"))}:"{widget}";i:2;' in value
+    assert php_serialize.loads(value) == {'section': 1, 'column': 1, widget: 2}
+    print("✅ Usage round-trips")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 PHP Serialization Test Suite")
+    print("=" * 50)
+    test_known_php_output()
+    test_fuzz_against_reference()
+    test_fuzz_corrupted_input()
+    test_webp_conversion_keeps_lengths()
+    test_generator_elements_usage()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the placeholder template engine
+===============================================
+Covers tokenizing, native rendering and the compiled-template cache of
+placeholder-system-design.py.
+"""
+
+import importlib.util
+import logging
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    'placeholder_system_design', Path(__file__).parent / 'placeholder-system-design.py')
+placeholder_system = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(placeholder_system)
+
+PlaceholderResolver = placeholder_system.PlaceholderResolver
+PlaceholderResolutionError = placeholder_system.PlaceholderResolutionError
+TemplateLibrary = placeholder_system.TemplateLibrary
+ContentValidator = placeholder_system.ContentValidator
+
+CONTENT = {
+    'title': 'Professional Services',
+    'subtitle': 'Quality Guaranteed',
+    'text': 'We provide top-notch professional services',
+    'services': [
+        {'title': 'Service 1', 'text': 'Description 1', 'icon': 'fas fa-check'},
+        {'title': 'Service 2', 'text': 'Description 2'},
+        {'title': 'Service 3', 'text': 'Description 3', 'icon': 'fas fa-heart'},
+    ],
+    'layout': {'structure': '33', 'columns': 3},
+}
+
+
+def test_string_templates():
+    """Every node type renders in text context, including nested blocks"""
+    print("🧪 Testing string templates...")
+    logging.disable(logging.WARNING)
+    try:
+        resolver = PlaceholderResolver()
+        assert resolver.resolve('{{TITLE}} | {{missing}}', CONTENT) == 'Professional Services | {{missing}}'
+        assert resolver.resolve('{{missing|Fallback}} {{title|uppercase()}}', CONTENT) == \
+            'Fallback PROFESSIONAL SERVICES'
+        assert resolver.resolve('{{text|truncate(3)}}', CONTENT) == 'We ...'
+        assert resolver.resolve('{{missing|rgba(0,0,0,0.6)}}', CONTENT) == 'rgba(0,0,0,0.6)'
+        assert resolver.resolve('{{FUNC:calculate_column_width:layout.columns}}', CONTENT) == str(100 / 3)
+        assert resolver.resolve('{{IF:missing}}hidden{{/IF}}{{IF:subtitle}}<{{subtitle}}>{{/IF}}', CONTENT) == \
+            '<Quality Guaranteed>'
+        assert resolver.resolve(
+            '{{LOOP:services}}{{index_1}}:{{title}}{{IF:icon}}*{{/IF}}{{/LOOP}}', CONTENT) == \
+            '1:Service 1*,2:Service 2,3:Service 3*'
+        assert resolver.resolve('{{layout}}', CONTENT) == '{"structure": "33", "columns": 3}'
+
+        for broken in ('{{IF:title}}open', '{{/LOOP}}', '{{IF:a}}{{LOOP:b}}{{/IF}}{{/LOOP}}'):
+            try:
+                resolver.resolve(broken, CONTENT)
+            except PlaceholderResolutionError:
+                continue
+            raise AssertionError(f'{broken!r} should not resolve')
+    finally:
+        logging.disable(logging.NOTSET)
+    print("✅ String templates render")
+
+
+def test_dict_templates_render_native_values():
+    """Dict templates render into Python objects with loops, conditional keys and native values"""
+    print("🧪 Testing dict templates...")
+    resolver = PlaceholderResolver()
+    library = TemplateLibrary()
+
+    widget = library.render('cholot-texticon', {'title': 'Only title'}, resolver)
+    settings = widget['settings']
+    assert settings['title'] == 'Only title'
+    assert 'subtitle' not in settings and 'text' not in settings
+    assert settings['selected_icon'] == {'value': 'fas fa-crown', 'library': 'fa-solid'}
+    assert settings['title_margin'] == {'unit': 'px', 'top': '0', 'right': '0', 'bottom': '0',
+                                        'left': '0', 'isLinked': False}
+    assert settings['title_margin'] is not settings['sb_margin']
+    assert len(widget['id']) == 7 and widget['elements'] == []
+
+    section = library.render('cholot-services-section', CONTENT, resolver)
+    assert 'background_background' not in section['settings']
+    assert section['settings']['structure'] == '33'
+    assert [column['settings']['_column_size'] for column in section['elements']] == [100 / 3] * 3
+    icons = [column['elements'][0]['settings']['selected_icon']['value'] for column in section['elements']]
+    assert icons == ['fas fa-check', 'fas fa-check', 'fas fa-heart']
+    assert section['elements'][1]['elements'][0]['settings']['text'] == '<p>Description 2</p>'
+    assert len({column['id'] for column in section['elements']}) == 3
+
+    with_background = dict(CONTENT, background={'color': '#000000'})
+    settings = library.render('cholot-services-section', with_background, resolver)['settings']
+    assert settings['background_background'] == 'classic' and settings['background_color'] == '#000000'
+    print("✅ Dict templates render native values")
+
+
+def test_compiled_templates_are_cached_by_name():
+    """A named template compiles once and recompiles when it is replaced"""
+    print("🧪 Testing compiled template cache...")
+    resolver = PlaceholderResolver()
+    library = TemplateLibrary()
+
+    library.render('hero-section', {'hero': {'title': 'A'}}, resolver)
+    cached = resolver._compiled['hero-section']
+    hero = library.render('hero-section', {'hero': {'title': 'B'}}, resolver)
+    assert resolver._compiled['hero-section'] is cached
+    assert hero['elements'][0]['elements'][0]['settings']['slider_list'][0]['title'] == 'B'
+    assert hero['elements'][0]['elements'][0]['settings']['slider_list'][0]['subtitle'] == ''
+
+    library.register_template('hero-section', {'title': '{{hero.title|uppercase()}}'})
+    assert library.render('hero-section', {'hero': {'title': 'c'}}, resolver) == {'title': 'C'}
+    assert resolver._compiled['hero-section'] is not cached
+    print("✅ Compiled templates are cached by name")
+
+
+def test_validator_uses_template_ast():
+    """Placeholders behind IF, conditional keys or defaults are optional"""
+    print("🧪 Testing content validation...")
+    validator = ContentValidator(TemplateLibrary())
+    template = validator.template_library.get_template('cholot-services-section')
+    assert validator._extract_required_placeholders(template) == ['services']
+    assert 'background.color' in validator._extract_optional_placeholders(template)
+
+    assert validator.validate_content('cholot-texticon', {'title': 'x'}) == []
+    assert validator.validate_content('cholot-services-section', {'services': 'x'}) == \
+        ["Field 'services' should be list, got str"]
+    assert validator.validate_content('hero-section', {}) == [
+        'Required content missing for: hero.background_image',
+        'Required content missing for: hero.image_url',
+        'Required content missing for: hero.title',
+    ]
+    print("✅ Content validation works")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Placeholder System Test Suite")
+    print("=" * 50)
+    test_string_templates()
+    test_dict_templates_render_native_values()
+    test_compiled_templates_are_cached_by_name()
+    test_validator_uses_template_ast()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the SWARM batch API
+===================================
+Runs the in-memory company pipeline serially and with a worker pool.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from swarm_orchestrator import SwarmOrchestrator
+
+WP = '{http://wordpress.org/export/1.2/}'
+
+
+@contextlib.contextmanager
+def in_script_dir():
+    """TemplateBasedFactory loads templates/ relative to the working directory"""
+    cwd = os.getcwd()
+    os.chdir(Path(__file__).parent)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def make_companies(count):
+    return [{
+        'name': f'Tenant {i}',
+        'tagline': 'Sanierung',
+        'services': [{'title': f'Service {i}', 'description': 'Beschreibung'}],
+        'about': {'title': 'Über uns', 'content': f'Firma Nummer {i}'},
+        'contact': {},
+    } for i in range(count)]
+
+
+def page_elementor_data(xml_text):
+    root = ET.fromstring(xml_text.encode('utf-8'))
+    for item in root.iter('item'):
+        if item.findtext(f'{WP}post_type') != 'page':
+            continue
+        for meta in item.findall(f'{WP}postmeta'):
+            if meta.findtext(f'{WP}meta_key') == '_elementor_data':
+                return json.loads(meta.findtext(f'{WP}meta_value'))
+    return None
+
+
+def test_batch_in_memory():
+    """Each company gets a page with its own content, plus stage timings"""
+    print("🧪 Testing in-memory batch generation...")
+    with in_script_dir():
+        results = SwarmOrchestrator().generate_batch(make_companies(3))
+
+    assert [r['company'] for r in results] == ['Tenant 0', 'Tenant 1', 'Tenant 2']
+    for i, result in enumerate(results):
+        assert result['error'] is None
+        assert set(result['timings']) == {'structure', 'format', 'xml', 'total'}
+        elementor_data = page_elementor_data(result['xml'])
+        assert elementor_data and f'Firma Nummer {i}' in json.dumps(elementor_data, ensure_ascii=False)
+    print("✅ In-memory batch generation works")
+
+
+def test_batch_worker_pool_writes_files():
+    """A worker pool keeps input order and writes one XML per company"""
+    print("🧪 Testing pooled batch generation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, 'out')
+        with in_script_dir():
+            results = SwarmOrchestrator().generate_batch(make_companies(4), workers=2, output_dir=output_dir)
+
+        assert [r['company'] for r in results] == [f'Tenant {i}' for i in range(4)]
+        for i, result in enumerate(results):
+            assert result['error'] is None and 'xml' not in result
+            assert result['xml_file'] == os.path.join(output_dir, f'tenant_{i}_elementor.xml')
+            with open(result['xml_file'], encoding='utf-8') as f:
+                assert f'Firma Nummer {i}' in json.dumps(page_elementor_data(f.read()), ensure_ascii=False)
+    print("✅ Pooled batch generation works")
+
+
+def test_batch_reports_errors_per_company():
+    """A broken company is reported without stopping the batch"""
+    companies = make_companies(2)
+    del companies[0]['name']
+    with in_script_dir():
+        results = SwarmOrchestrator().generate_batch(companies)
+
+    assert results[0]['error'] and results[0]['error'].startswith('KeyError')
+    assert results[1]['error'] is None
+
+
+def main():
+    """Run all tests"""
+    print("🚀 SWARM Orchestrator Test Suite")
+    print("=" * 50)
+    test_batch_in_memory()
+    test_batch_worker_pool_writes_files()
+    test_batch_reports_errors_per_company()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass text rewriter
+=============================================
+Covers match precedence of TextRewriter and the SEO / WebP rewriters built
+on it.
+"""
+
+import importlib.util
+import json
+import re
+from pathlib import Path
+
+from text_rewriter import TextRewriter
+from update_seo_images import create_replacement_mappings, create_seo_rewriter, update_xml_content
+
+HERE = Path(__file__).parent
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_precedence():
+    """Leftmost wins, then longest literal, then rules in order; output is never rescanned"""
+    print("🧪 Testing match precedence...")
+    rewriter = TextRewriter(
+        {'a': 'b', 'b': 'a', 'foo': 'F', 'foo.jpg': 'FJ', 'oo.jpg.x': 'never'},
+        rules=[(r'\d+(?=px)', lambda m: str(int(m.group(0)) * 2)), (r'\d+', 'N'), (r'(f)x', r'\1X')],
+    )
+    assert rewriter.subn('ab ba') == ('ba ab', 4)
+    assert rewriter.rewrite('foo.jpg.x foo.png') == 'FJ.x F.png'
+    assert rewriter.rewrite('10px 10em fx') == '20px Nem fX'
+    assert len(rewriter) == 8
+    assert TextRewriter().subn('unchanged') == ('unchanged', 0)
+    print("✅ Precedence is well-defined")
+
+
+def test_word_boundaries():
+    """Keys with word characters at their edges only match on word boundaries"""
+    print("🧪 Testing word boundaries...")
+    rewriter = TextRewriter({'5': 'five', 'logo': 'L', 'logo.png': 'LP', '/x/': '/y/'}, word_boundaries=True)
+    assert rewriter.rewrite('5 150 5px "5"') == 'five 150 5px "five"'
+    assert rewriter.rewrite('logo.png logo.pngs mylogo logo-white') == 'LP L.pngs mylogo L-white'
+    assert rewriter.rewrite('a/x/b') == 'a/y/b'
+    print("✅ Word boundaries respected")
+
+
+def test_seo_rewriter_rewrites_whole_urls():
+    """Full uploads URLs map to the new base + SEO filename in one step"""
+    print("🧪 Testing SEO image rewriter...")
+    with open(HERE / 'seo-image-mapping.json', encoding='utf-8') as f:
+        image_mapping = json.load(f)
+    image = image_mapping['images'][0]
+    original, seo_name = image['original'], image['seo_name']
+    replacements = create_replacement_mappings(image_mapping)
+
+    old_base = 'https://www.riman.de/wp-content/uploads/sites/9/'
+    xml = (f'<guid>{old_base}2019/06/{original}.jpg</guid>'
+           f'<img src="{old_base}2019/07/{original}-300x200.jpg" width="150">'
+           f'<wp:post_name><![CDATA[{original}]]></wp:post_name>'
+           f'<link>https://www.riman.de/Projekt/{original}/</link>'
+           f'<a href="{old_base}2019/06/other.pdf">')
+    result = update_xml_content(xml, replacements, image_mapping)
+
+    new_base = 'http://localhost:8081/wp-content/uploads/2025/08/'
+    assert result == (f'<guid>{new_base}{seo_name}.jpg</guid>'
+                      f'<img src="{new_base}{seo_name}-300x200.jpg" width="150">'
+                      f'<wp:post_name><![CDATA[{seo_name}]]></wp:post_name>'
+                      f'<link>http://localhost:8081/projekt/{seo_name}/</link>'
+                      f'<a href="{new_base}other.pdf">')
+
+    rewriter = create_seo_rewriter(replacements, image_mapping)
+    assert rewriter.rewrite('s:5:"width";i:1500;') == 's:5:"width";i:1500;'
+    print("✅ SEO rewriter produces single-step URLs")
+
+
+def test_webp_rewriter_matches_sequential_passes():
+    """The combined WebP rewrite equals the previous chain of re.sub passes"""
+    print("🧪 Testing WebP rewriter...")
+    webp = load_script('convert-to-webp-xml.py')
+
+    def sequential(xml):
+        xml = re.sub(r'\.jpg(?=["<\s])', '.webp', xml)
+        xml = xml.replace('image/jpeg', 'image/webp')
+        xml = re.sub(r'-\d+x\d+\.webp', '.webp', xml)
+        return xml
+
+    sample = ('<wp:attachment_url>http://x/a-1024x683.jpg</wp:attachment_url>'
+              '<mime>image/jpeg</mime> "b.jpg" c.jpg.bak d-1x1.webp e-300x200.jpgx '
+              'a:5:{s:5:"width";i:10;s:6:"height";i:10;s:4:"file";s:9:"f/g/h.jpg";}')
+    assert webp.create_webp_rewriter().rewrite(sample) == sequential(sample)
+    print("✅ WebP rewriter matches sequential passes")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Text Rewriter Test Suite")
+    print("=" * 50)
+    test_precedence()
+    test_word_boundaries()
+    test_seo_rewriter_rewrites_whole_urls()
+    test_webp_rewriter_matches_sequential_passes()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming WXR reader
+========================================
+Checks item records against a full ElementTree parse, flat memory on large
+exports, and the streaming rewrite used by XMLCorrector.
+"""
+
+import io
+import json
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from cholot_xml_analyzer import CholotXMLAnalyzer
+from wxr_reader import WXRReader
+
+HERE = Path(__file__).parent
+WP_NS = 'http://wordpress.org/export/1.2/'
+
+SAMPLE = f'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:wp="{WP_NS}" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+    <title>Cholot</title>
+    <wp:category><wp:term_id>1</wp:term_id><wp:cat_name><![CDATA[News]]></wp:cat_name></wp:category>
+    <wp:term><wp:term_id>2</wp:term_id><wp:term_taxonomy>nav_menu</wp:term_taxonomy></wp:term>
+    <item>
+        <title>Home</title>
+        <content:encoded><![CDATA[<p>Hallo & willkommen</p>]]></content:encoded>
+        <wp:post_id>7</wp:post_id>
+        <wp:post_type><![CDATA[page]]></wp:post_type>
+        <category domain="category" nicename="news"><![CDATA[News]]></category>
+        <wp:postmeta><wp:meta_key><![CDATA[_elementor_data]]></wp:meta_key><wp:meta_value><![CDATA[[{{"id":"a1","elType":"section","settings":{{"title":"Müller"}}}}]]]></wp:meta_value></wp:postmeta>
+        <wp:postmeta><wp:meta_key>_elementor_edit_mode</wp:meta_key><wp:meta_value>builder</wp:meta_value></wp:postmeta>
+        <wp:comment><wp:comment_id>3</wp:comment_id></wp:comment>
+    </item>
+    <item>
+        <title>Logo</title>
+        <wp:post_id>8</wp:post_id>
+        <wp:post_type>attachment</wp:post_type>
+    </item>
+</channel>
+</rss>'''
+
+
+def make_export(pages, data_size=20000):
+    """Synthetic export with one large Elementor payload per page"""
+    widget = json.dumps({'id': 'w', 'elType': 'widget', 'widgetType': 'text-editor',
+                         'settings': {'editor': 'x' * data_size}})
+    parts = [f'<rss version="2.0" xmlns:wp="{WP_NS}"><channel><title>Big</title>']
+    for n in range(pages):
+        parts.append(f'<item><title>Page {n}</title><wp:post_id>{n}</wp:post_id>'
+                     f'<wp:post_type>page</wp:post_type><wp:postmeta><wp:meta_key>_elementor_data</wp:meta_key>'
+                     f'<wp:meta_value><![CDATA[[{widget}]]]></wp:meta_value></wp:postmeta></item>')
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+
+def test_item_records():
+    """Records carry ids, types, meta and channel taxonomies"""
+    print("🧪 Testing item records...")
+    reader = WXRReader.from_string(SAMPLE)
+    home, logo = list(reader)
+
+    assert (home.post_id, home.post_type, home.title) == ('7', 'page', 'Home')
+    assert json.loads(home.elementor_data)[0]['settings']['title'] == 'Müller'
+    assert home.meta['_elementor_edit_mode'] == 'builder'
+    assert home.fields['content:encoded'] == '<p>Hallo & willkommen</p>'
+    assert home.categories == [{'domain': 'category', 'nicename': 'news', 'name': 'News'}]
+    assert 'wp:comment' not in home.fields
+    assert logo.elementor_data is None and logo.post_type == 'attachment'
+
+    assert reader.root_tag == 'rss' and reader.root_attrib['version'] == '2.0'
+    assert reader.channel['title'] == 'Cholot'
+    assert reader.channel_elements['item'] == 2
+    assert reader.taxonomies['categories'] == [{'wp:term_id': '1', 'wp:cat_name': 'News'}]
+    assert reader.taxonomies['terms'][0]['wp:term_taxonomy'] == 'nav_menu'
+    print("✅ Item records complete")
+
+
+def test_matches_full_parse():
+    """The analyzer sees the same items as a full ElementTree parse of the demo export"""
+    print("🧪 Testing analyzer against full parse...")
+    demo = HERE / 'demo-data-fixed.xml'
+    root = ET.parse(demo).getroot()
+    expected = [(item.findtext(f'{{{WP_NS}}}post_id'), item.findtext(f'{{{WP_NS}}}post_type'))
+                for item in root.iter('item')]
+    assert [(item.post_id, item.post_type) for item in WXRReader(str(demo))] == expected
+
+    analyzer = CholotXMLAnalyzer(str(demo))
+    assert analyzer.load_xml()
+    analyzer.count_items()
+    analyzer.extract_elementor_data()
+    assert analyzer.analysis['total_counts']['total_items'] == len(expected)
+    assert analyzer.analysis['total_counts']['pages'] == sum(1 for _, pt in expected if pt == 'page')
+    assert analyzer.analysis['pages_with_elementor']
+    print("✅ Analyzer matches full parse")
+
+
+def test_memory_stays_flat():
+    """Peak memory does not grow with the number of items"""
+    print("🧪 Testing memory profile...")
+    peaks = []
+    for pages in (50, 500):
+        source = io.BytesIO(make_export(pages))
+        tracemalloc.start()
+        count = sum(1 for item in WXRReader(source) if item.elementor_data)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert count == pages
+    print(f"   peak 50 pages: {peaks[0] / 1024:.0f} KB, 500 pages: {peaks[1] / 1024:.0f} KB")
+    assert peaks[1] < peaks[0] * 2
+    print("✅ Memory stays flat")
+
+
+def test_rewrite_edits_items():
+    """rewrite() streams a copy with per-item edits, keeping markup in CDATA"""
+    print("🧪 Testing streaming rewrite...")
+
+    def add_edit_mode(item, record):
+        # The same kind of edit XMLCorrector makes for pages without Elementor meta
+        if record.post_type == 'page' and '_elementor_edit_mode' not in record.meta:
+            postmeta = ET.SubElement(item, f'{{{WP_NS}}}postmeta')
+            ET.SubElement(postmeta, f'{{{WP_NS}}}meta_key').text = '_elementor_edit_mode'
+            ET.SubElement(postmeta, f'{{{WP_NS}}}meta_value').text = 'builder'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corrected = str(Path(tmp) / 'export-corrected.xml')
+        written = WXRReader.from_string(SAMPLE.replace('_elementor_edit_mode', '_other')).rewrite(
+            corrected, add_edit_mode)
+        assert written == 2
+
+        reader = WXRReader(corrected)
+        home, logo = list(reader)
+        assert home.meta['_elementor_edit_mode'] == 'builder'
+        assert json.loads(home.elementor_data)[0]['id'] == 'a1'
+        assert home.fields['content:encoded'] == '<p>Hallo & willkommen</p>'
+        assert '_elementor_edit_mode' not in logo.meta
+        assert reader.taxonomies['terms'][0]['wp:term_taxonomy'] == 'nav_menu'
+        assert '<![CDATA[<p>Hallo & willkommen</p>]]>' in Path(corrected).read_text(encoding='utf-8')
+    print("✅ Edits written while streaming")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 WXR Reader Test Suite")
+    print("=" * 50)
+    test_item_records()
+    test_matches_full_parse()
+    test_memory_stays_flat()
+    test_rewrite_edits_items()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass WXR serializer
+==============================================
+Checks that the fast serializer produces the same document as the old
+minidom path and that CDATA wrapping survives a round trip.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+from wxr_serializer import WXR_NAMESPACES, legacy_pretty_xml, write_wxr, wxr_to_string
+
+
+WP = '{%s}' % WXR_NAMESPACES['wp']
+
+
+def build_sample_tree():
+    """Create a small WXR tree with the tricky bits: entities, quotes, blank lines."""
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = 'Müller & Söhne <GmbH>'
+    ET.SubElement(channel, 'description').text = ''
+
+    item = ET.SubElement(channel, 'item')
+    ET.SubElement(item, 'title').text = 'Home "Start"'
+    ET.SubElement(item, 'guid', isPermaLink='false').text = 'http://localhost/?page_id=1'
+    ET.SubElement(item, f'{WP}post_id').text = '1'
+    meta = ET.SubElement(item, f'{WP}postmeta')
+    ET.SubElement(meta, f'{WP}meta_key').text = '_elementor_data'
+    ET.SubElement(meta, f'{WP}meta_value').text = '[{"html":"<p>a]]>b</p>\\n\\n<p>c</p>"}]'
+    return rss
+
+
+def canonical(xml_text):
+    root = ET.fromstring(xml_text.encode('utf-8'))
+    return [(e.tag, sorted(e.attrib.items()), (e.text or '').strip()) for e in root.iter()]
+
+
+def test_matches_minidom_output():
+    """Fast path parses to the same tree as the legacy minidom path"""
+    print("🧪 Testing fast serializer against minidom...")
+    rss = build_sample_tree()
+
+    fast = wxr_to_string(rss)
+    legacy = legacy_pretty_xml(rss)
+
+    assert canonical(fast) == canonical(legacy)
+    assert fast.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"')
+    assert '    <channel>\n        <title>Müller &amp; Söhne &lt;GmbH&gt;</title>' in fast
+    assert '<description/>' in fast
+    print("✅ Fast serializer matches minidom")
+
+
+def test_cdata_round_trip():
+    """CDATA sections keep text byte-identical, including ]]> and blank lines"""
+    print("🧪 Testing CDATA wrapping...")
+    rss = build_sample_tree()
+
+    buffer = io.StringIO()
+    write_wxr(rss, buffer, cdata={'wp:meta_value', 'title'})
+    output = buffer.getvalue()
+
+    assert '<wp:meta_value><![CDATA[[{"html":"<p>a]]]]><![CDATA[>b</p>' in output
+    assert '<title><![CDATA[Home "Start"]]></title>' in output
+
+    parsed = ET.fromstring(output.encode('utf-8'))
+    value = parsed.find(f'.//{WP}meta_value').text
+    assert value == '[{"html":"<p>a]]>b</p>\\n\\n<p>c</p>"}]'
+    print("✅ CDATA round trip preserved text")
+
+
+def test_cdata_predicate():
+    """Callable CDATA rules can look at attributes"""
+    rss = ET.Element('rss')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'category', domain='nav_menu').text = 'Main'
+    ET.SubElement(channel, 'category', domain='category').text = 'News'
+
+    output = wxr_to_string(rss, cdata=lambda tag, elem: elem.get('domain') == 'nav_menu')
+    assert '<category domain="nav_menu"><![CDATA[Main]]></category>' in output
+    assert '<category domain="category">News</category>' in output
+
+
+def main():
+    """Run all tests"""
+    print("🚀 WXR Serializer Test Suite")
+    print("=" * 50)
+    test_matches_minidom_output()
+    test_cdata_round_trip()
+    test_cdata_predicate()
+    print("\n✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
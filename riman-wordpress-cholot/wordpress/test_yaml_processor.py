@@ -317,6 +317,80 @@ def test_structure_validation():
         raise
 
 
+def test_seeded_ids():
+    """Test that seeded ID mode gives reproducible, unique IDs"""
+    print("Testing seeded ID allocation...")
+    
+    test_data = create_test_yaml()
+    
+    try:
+        first = YAMLToJSONProcessor(id_mode='seeded', id_seed=7).process_yaml_data(test_data)
+        second = YAMLToJSONProcessor(id_mode='seeded', id_seed=7).process_yaml_data(test_data)
+        other = YAMLToJSONProcessor(id_mode='seeded', id_seed=8).process_yaml_data(test_data)
+        
+        assert json.dumps(first, sort_keys=True) == json.dumps(second, sort_keys=True)
+        assert first['pages'][0]['elementor_data'] != other['pages'][0]['elementor_data']
+        
+        ids = first['pages'][0]['metadata']['generated_ids']
+        assert len(ids) == len(set(ids))
+        assert all(len(element_id) == 8 for element_id in ids)
+        
+        print("✓ Seeded ID test passed")
+        
+    except Exception as e:
+        print(f"✗ Seeded ID test failed: {str(e)}")
+        raise
+
+
+def test_content_ids():
+    """Test that content ID mode is reproducible without a seed"""
+    print("Testing content-addressed IDs...")
+    
+    test_data = create_test_yaml()
+    
+    try:
+        first = YAMLToJSONProcessor(id_mode='content').process_yaml_data(test_data)
+        second = YAMLToJSONProcessor(id_mode='content').process_yaml_data(test_data)
+        
+        assert json.dumps(first, sort_keys=True) == json.dumps(second, sort_keys=True)
+        
+        page = first['pages'][0]
+        ids = page['metadata']['generated_ids']
+        assert ids and len(ids) == len(set(ids))
+        assert page['elementor_data'][0]['id'] == ids[0]
+        
+        print("✓ Content ID test passed")
+        
+    except Exception as e:
+        print(f"✗ Content ID test failed: {str(e)}")
+        raise
+
+
+def test_parallel_workers():
+    """Test that a process pool gives the same output as serial processing"""
+    print("Testing parallel page rendering...")
+    
+    test_data = create_test_yaml()
+    base_page = test_data['pages'][0]
+    test_data = dict(test_data, pages=[
+        dict(base_page, title=f"Page {i}", slug=f"page-{i}") for i in range(6)
+    ])
+    
+    try:
+        for id_mode in ('seeded', 'content'):
+            serial = YAMLToJSONProcessor(id_mode=id_mode, id_seed=3).process_yaml_data(test_data)
+            parallel = YAMLToJSONProcessor(id_mode=id_mode, id_seed=3, workers=3).process_yaml_data(test_data)
+            
+            assert json.dumps(serial, sort_keys=True) == json.dumps(parallel, sort_keys=True)
+            assert [page['title'] for page in parallel['pages']] == [f"Page {i}" for i in range(6)]
+        
+        print("✓ Parallel rendering test passed")
+        
+    except Exception as e:
+        print(f"✗ Parallel rendering test failed: {str(e)}")
+        raise
+
+
 def test_file_operations():
     """Test file save/load operations"""
     print("Testing file operations...")
@@ -363,6 +437,9 @@ def main():
         result = test_basic_processing()
         test_widget_types()
         test_structure_validation()
+        test_seeded_ids()
+        test_content_ids()
+        test_parallel_workers()
         test_file_operations()
         
         print("\n" + "=" * 50)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Text Rewriter
+=============
+
+Applies many string replacements to a large document in a single scan,
+instead of one ``str.replace``/``re.sub`` pass per mapping entry.
+
+Literal keys are compiled into one trie-shaped regular expression (shared
+prefixes are factored out, so each position only follows the branch for
+its next character), optionally combined with regex rules.
+
+Precedence:
+- Matches never overlap; the scan goes left to right and the leftmost
+  match wins
+- At the same position the longest literal key wins, then the regex rules
+  in the order given
+- Replacement text is never rescanned, so one mapping cannot rewrite the
+  output of another
+
+Features:
+- word_boundaries=True: keys that start/end with a word character only
+  match on a word boundary (``5`` does not match inside ``150``)
+- Rules take a replacement template (``r'\\1'``) or a callable(match);
+  their patterns must not use numbered backreferences or reuse group names
+- subn() returns the number of replacements, like ``re.subn``
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Pattern, Tuple, Union
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+_WORD_CHAR = re.compile(r'\w')
+_TERMINAL = ''
+
+
+def _trie_pattern(keys: Iterable[str], word_boundaries: bool) -> str:
+    """Build a regex that matches the longest of ``keys`` at a position"""
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = True
+
+    def build(node: dict, last_char: str) -> str:
+        branches = [re.escape(char) + build(child, char)
+                    for char, child in sorted(node.items()) if char != _TERMINAL]
+        if _TERMINAL in node:
+            # Listed last: longer keys are tried first, backtracking falls back here
+            branches.append(r'(?!\w)' if word_boundaries and _WORD_CHAR.match(last_char) else '')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    roots = []
+    for char, child in sorted(trie.items()):
+        # Checked after the first character, so every branch still starts with
+        # a literal and the regex engine can skip ahead to candidate positions
+        boundary = r'(?<!\w.)' if word_boundaries and _WORD_CHAR.match(char) else ''
+        roots.append(re.escape(char) + boundary + build(child, char))
+    return '|'.join(roots)
+
+
+def _scoped(pattern: Pattern) -> str:
+    """Pattern source with its own flags scoped to it, for use inside a larger regex"""
+    letters = ''.join(letter for flag, letter in ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                                                  (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+                      if pattern.flags & flag)
+    return f'(?{letters}:{pattern.pattern})' if letters else f'(?:{pattern.pattern})'
+
+
+class TextRewriter:
+    """Single-pass multi-pattern replacement"""
+
+    def __init__(self, literals: Optional[Mapping[str, str]] = None,
+                 rules: Iterable[Tuple[Union[str, Pattern], Replacement]] = (),
+                 word_boundaries: bool = False, flags: int = 0):
+        self.literals: Dict[str, str] = {key: value for key, value in (literals or {}).items() if key}
+        self.rules: List[Tuple[Pattern, Replacement]] = [
+            (re.compile(pattern, flags) if isinstance(pattern, str) else pattern, replacement)
+            for pattern, replacement in rules
+        ]
+
+        alternatives = []
+        if self.literals:
+            alternatives.append(f'(?P<_lit>{_trie_pattern(self.literals, word_boundaries)})')
+        for index, (pattern, _) in enumerate(self.rules):
+            alternatives.append(f'(?P<_rule{index}>{_scoped(pattern)})')
+        # flags only apply to string rules; literal keys always match exactly
+        self.pattern: Optional[Pattern] = re.compile('|'.join(alternatives)) if alternatives else None
+
+    def __len__(self) -> int:
+        return len(self.literals) + len(self.rules)
+
+    def _replace(self, match: re.Match) -> str:
+        # The alternative's own group always closes last
+        name = match.lastgroup
+        if name == '_lit':
+            return self.literals[match.group(0)]
+
+        pattern, replacement = self.rules[int(name[len('_rule'):])]
+        # Re-match the rule alone so its own groups and lookarounds apply
+        own = pattern.match(match.string, match.start())
+        return replacement(own) if callable(replacement) else own.expand(replacement)
+
+    def subn(self, text: str) -> Tuple[str, int]:
+        """Rewrite ``text`` and return it with the number of replacements"""
+        if self.pattern is None:
+            return text, 0
+        return self.pattern.subn(self._replace, text)
+
+    def rewrite(self, text: str) -> str:
+        """Rewrite ``text`` in one scan"""
+        return self.subn(text)[0]
@@ -11,6 +11,8 @@ import json
 import os
 from pathlib import Path
 
+from text_rewriter import TextRewriter
+
 def load_json_file(filepath):
     """Load and parse JSON file."""
     try:
@@ -32,15 +34,11 @@ def replace_image_urls(content, seo_mapping):
         format_ext = img['format']
         filename_to_seo[original] = f"{seo_name}.{format_ext}"
     
-    # Replace URLs in content
-    modified_content = content
-    
-    # First, fix any malformed URLs that might exist
-    modified_content = re.sub(
-        r'https://[^/]+/cholot/http://localhost:8082/',
-        'http://localhost:8082/',
-        modified_content
-    )
+    # Host prefixes that map to the local installation
+    host_rewriter = TextRewriter({
+        'https://theme.winnertheme.com/cholot': 'http://localhost:8082',
+        'https://demo.ridianur.com/cholot': 'http://localhost:8082',
+    })
     
     # Replace specific image URLs with SEO versions
     def replace_image_url(match):
@@ -56,30 +54,21 @@ def replace_image_urls(content, seo_mapping):
                 return f"http://localhost:8082/{filename_to_seo[filename]}"
     
         # If no specific mapping, use generic localhost replacement
-        return full_url.replace('https://theme.winnertheme.com/cholot', 'http://localhost:8082')
-    
-    # Replace all image URLs
-    modified_content = re.sub(
-        r'https://[^/]+/[^/]*/wp-content/uploads/[^"\'>\s]*\.(?:jpg|jpeg|png|webp)',
-        replace_image_url,
-        modified_content
-    )
-    
-    # Replace any remaining winnertheme.com URLs
-    modified_content = re.sub(
-        r'https://theme\.winnertheme\.com/cholot([^"\'>\s]*)',
-        r'http://localhost:8082\1',
-        modified_content
-    )
-    
-    # Replace demo.ridianur.com URLs
-    modified_content = re.sub(
-        r'https://demo\.ridianur\.com/cholot',
-        'http://localhost:8082',
-        modified_content
-    )
-    
-    return modified_content
+        return host_rewriter.rewrite(full_url)
+    
+    # All URL rewrites in a single scan over the document
+    rewriter = TextRewriter(rules=[
+        # First, fix any malformed URLs that might exist
+        (r'https://[^/]+/cholot/http://localhost:8082/', 'http://localhost:8082/'),
+        # Replace all image URLs
+        (r'https://[^/]+/[^/]*/wp-content/uploads/[^"\'>\s]*\.(?:jpg|jpeg|png|webp)', replace_image_url),
+        # Replace any remaining winnertheme.com URLs
+        (r'https://theme\.winnertheme\.com/cholot', 'http://localhost:8082'),
+        # Replace demo.ridianur.com URLs
+        (r'https://demo\.ridianur\.com/cholot', 'http://localhost:8082'),
+    ])
+    
+    return rewriter.rewrite(content)
 
 def apply_content_mappings(content, content_mapping, riman_structure):
     """Apply content mappings from both mapping files."""
@@ -7,6 +7,8 @@ import re
 import os
 from pathlib import Path
 
+from text_rewriter import TextRewriter
+
 def load_image_mapping(mapping_file):
     """Load the SEO image mapping from JSON file."""
     with open(mapping_file, 'r', encoding='utf-8') as f:
@@ -77,51 +79,48 @@ def create_replacement_mappings(image_mapping):
     
     return replacements
 
-def update_xml_content(xml_content, replacements, image_mapping):
-    """Update XML content with new SEO filenames and structure."""
+def create_seo_rewriter(replacements, image_mapping):
+    """Compile all filename, URL and post field mappings into one single-pass rewriter.
     
-    # First, handle URL replacements
-    for old_pattern, new_pattern in replacements.items():
-        xml_content = xml_content.replace(old_pattern, new_pattern)
-    
-    # Add alt text attributes where missing
-    # This is a complex task that would require careful HTML parsing
-    # For now, we'll focus on the main replacements
+    The longest matching key wins, so a full image URL is rewritten as a whole
+    before its filename or the bare base URL could match.
+    """
+    # Bare numeric names ("5") would hit serialized lengths and sizes; their
+    # "5.jpg" and URL forms are still mapped
+    literals = {old: new for old, new in replacements.items() if not old.isdigit()}
     
-    # Update base site URLs
-    xml_content = xml_content.replace(
-        'https://www.riman.de/wp-content/uploads/sites/9/',
-        'http://localhost:8081/wp-content/uploads/2025/08/'
-    )
+    # Update base site URLs (the new base already contains the 2025/08/ date path)
+    literals['https://www.riman.de/wp-content/uploads/sites/9/'] = 'http://localhost:8081/wp-content/uploads/2025/08/'
+    literals['https://www.riman.de/wp-content/uploads/sites/9/2019/06/'] = 'http://localhost:8081/wp-content/uploads/2025/08/'
+    literals['https://www.riman.de/wp-content/uploads/sites/9/2019/07/'] = 'http://localhost:8081/wp-content/uploads/2025/08/'
     
     # Update any remaining date-based paths
-    xml_content = xml_content.replace('2019/06/', '2025/08/')
-    xml_content = xml_content.replace('2019/07/', '2025/08/')
+    literals['2019/06/'] = '2025/08/'
+    literals['2019/07/'] = '2025/08/'
     
     # Update post names and slugs to use SEO names
     for image in image_mapping['images']:
         original = image['original']
         seo_name = image['seo_name']
         
-        # Update post names in CDATA sections
-        xml_content = xml_content.replace(
-            f'<wp:post_name><![CDATA[{original}]]></wp:post_name>',
-            f'<wp:post_name><![CDATA[{seo_name}]]></wp:post_name>'
-        )
-        
-        # Update titles
-        xml_content = xml_content.replace(
-            f'<title>{original}</title>',
-            f'<title>{seo_name}</title>'
-        )
-        
-        # Update links
-        xml_content = xml_content.replace(
-            f'https://www.riman.de/Projekt/{original}/',
-            f'http://localhost:8081/projekt/{seo_name}/'
-        )
+        # Post names in CDATA sections, titles and links
+        literals[f'<wp:post_name><![CDATA[{original}]]></wp:post_name>'] = f'<wp:post_name><![CDATA[{seo_name}]]></wp:post_name>'
+        literals[f'<title>{original}</title>'] = f'<title>{seo_name}</title>'
+        literals[f'https://www.riman.de/Projekt/{original}/'] = f'http://localhost:8081/projekt/{seo_name}/'
+    
+    # Names like "logo" must not match inside "mylogo"
+    return TextRewriter(literals, word_boundaries=True)
+
+def update_xml_content(xml_content, replacements, image_mapping, rewriter=None):
+    """Update XML content with new SEO filenames and structure."""
+    if rewriter is None:
+        rewriter = create_seo_rewriter(replacements, image_mapping)
+    
+    # Add alt text attributes where missing
+    # This is a complex task that would require careful HTML parsing
+    # For now, we'll focus on the main replacements
     
-    return xml_content
+    return rewriter.rewrite(xml_content)
 
 def main():
     """Main function to process the XML file."""
@@ -8,20 +8,81 @@ This script validates Elementor data in WordPress XML files to ensure:
 2. JSON structure is valid
 3. Required Elementor meta keys are present
 4. Widget data is complete and valid
+
+Identical blocks are validated once: results are cached by content hash
+(in memory, optionally on disk with --cache) and the remaining blocks can
+be validated in a process pool with --workers. Pass a directory to check
+every export in it with one shared cache.
+
+Usage:
+    python validate-elementor.py cholot-generated.xml
+    python validate-elementor.py generated/ --workers 4 --cache .elementor-validation-cache.json
 """
 
 import sys
 import os
 import json
-import re
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Tuple, Optional
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Set, Tuple, Optional
 from datetime import datetime
 import html
 
+import json_backend
+from build_cache import BuildCache, source_fingerprint, text_digest
+from wxr_reader import WXRReader
+
+class BlockResultCache:
+    """
+    Validation results keyed by the SHA-256 of the raw Elementor data.
+    
+    Identical blocks (templates reused across pages, kits, successive
+    iterations of the same export) are validated once. Results live in
+    memory and, with a path, in a BuildCache file that is invalidated when
+    this script changes.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.results: Dict[str, Dict] = {}
+        self.disk = BuildCache(path, namespace='elementor-validation') if path else None
+        self.version = source_fingerprint(__file__, json_backend.__file__)
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self.results)
+    
+    def get(self, digest: str) -> Optional[Dict]:
+        result = self.results.get(digest)
+        if result is None and self.disk is not None:
+            result = self.disk.get(digest, self.version)
+            if result is not None:
+                self.results[digest] = result
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+    
+    def put(self, digest: str, result: Dict):
+        self.results[digest] = result
+        if self.disk is not None:
+            self.disk.put(digest, self.version, result)
+    
+    def save(self):
+        if self.disk is not None:
+            self.disk.save()
+
+
 class ElementorValidator:
-    def __init__(self, xml_file: str):
+    def __init__(self, xml_file: str, block_cache: Optional[BlockResultCache] = None,
+                 workers: int = 1, executor: Optional[ProcessPoolExecutor] = None, verbose: bool = True):
         self.xml_file = xml_file
+        self.block_cache = block_cache if block_cache is not None else BlockResultCache()
+        self.workers = max(1, workers)
+        self.executor = executor
+        self.verbose = verbose
         self.validation_results = {
             "total_pages": 0,
             "pages_with_elementor": 0,
@@ -35,32 +96,50 @@ class ElementorValidator:
     
     def log(self, message: str, level: str = "INFO"):
         """Log message with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        if self.verbose:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
         
         if level == "ERROR":
             self.validation_results["errors"].append(message)
         elif level == "WARNING":
             self.validation_results["warnings"].append(message)
     
+    def iter_elementor_blocks(self) -> Iterator[Dict]:
+        """
+        Yield every Elementor data block with the post that owns it.
+        
+        One forward pass over the XML: the current <item> supplies post_id,
+        title and post type, so identical data on two pages is still
+        attributed correctly. Meta keys seen on the way are collected in
+        self.present_meta_keys for validate_required_meta_keys.
+        """
+        self.present_meta_keys = set()
+        self.validation_results["total_pages"] = 0
+        index = 0
+        
+        for item in WXRReader(self.xml_file):
+            if item.post_type == 'page':
+                self.validation_results["total_pages"] += 1
+            self.present_meta_keys.update(item.meta)
+            
+            raw_data = item.meta.get('_elementor_data')
+            if raw_data is None:
+                continue
+            
+            yield {
+                'index': index,
+                'raw_data': raw_data,
+                'post_id': int(item.post_id) if item.post_id and item.post_id.isdigit() else None,
+                'post_title': item.title,
+                'post_type': item.post_type
+            }
+            index += 1
+    
     def extract_elementor_data_from_xml(self) -> List[Dict]:
         """Extract all Elementor data from XML file"""
         try:
-            with open(self.xml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find all _elementor_data meta values
-            elementor_pattern = r'<wp:meta_key>_elementor_data</wp:meta_key>\s*<wp:meta_value><!\[CDATA\[(.*?)\]\]></wp:meta_value>'
-            matches = re.findall(elementor_pattern, content, re.DOTALL)
-            
-            elementor_data_blocks = []
-            for i, match in enumerate(matches):
-                elementor_data_blocks.append({
-                    'index': i,
-                    'raw_data': match,
-                    'post_id': self._get_post_id_for_elementor_data(content, match)
-                })
-            
+            elementor_data_blocks = list(self.iter_elementor_blocks())
             self.log(f"Found {len(elementor_data_blocks)} Elementor data blocks")
             return elementor_data_blocks
         
@@ -68,26 +147,6 @@ class ElementorValidator:
             self.log(f"Error extracting Elementor data: {str(e)}", "ERROR")
             return []
     
-    def _get_post_id_for_elementor_data(self, content: str, elementor_data: str) -> Optional[int]:
-        """Try to find the post ID associated with Elementor data"""
-        try:
-            # Find the position of this Elementor data in the content
-            data_pos = content.find(elementor_data)
-            if data_pos == -1:
-                return None
-            
-            # Look backwards for the nearest <wp:post_id>
-            before_content = content[:data_pos]
-            post_id_matches = re.findall(r'<wp:post_id>(\d+)</wp:post_id>', before_content)
-            
-            if post_id_matches:
-                return int(post_id_matches[-1])  # Get the last (closest) post ID
-            
-            return None
-        
-        except Exception:
-            return None
-    
     def validate_json_structure(self, raw_data: str) -> Tuple[bool, Optional[List], str]:
         """Validate that Elementor data is valid JSON"""
         try:
@@ -98,7 +157,7 @@ class ElementorValidator:
             cleaned_data = cleaned_data.replace('\\"', '"').replace('\\\\', '\\')
             
             # Try to parse as JSON
-            parsed_data = json.loads(cleaned_data)
+            parsed_data = json_backend.loads(cleaned_data)
             
             if not isinstance(parsed_data, list):
                 return False, None, "Elementor data should be a JSON array"
@@ -194,6 +253,12 @@ class ElementorValidator:
     
     def validate_cholot_widgets(self, data: List[Dict]) -> Tuple[bool, List[str]]:
         """Validate Cholot-specific widgets"""
+        widget_count, issues = self._check_cholot_widgets(data)
+        self.log(f"Found {widget_count} Cholot-specific widgets")
+        return len(issues) == 0, issues
+    
+    def _check_cholot_widgets(self, data: List[Dict]) -> Tuple[int, List[str]]:
+        """Count Cholot-specific widgets and collect their issues"""
         issues = []
         cholot_widgets = []
         
@@ -213,8 +278,6 @@ class ElementorValidator:
             if widget_type.startswith('cholot-'):
                 cholot_widgets.append(widget)
         
-        self.log(f"Found {len(cholot_widgets)} Cholot-specific widgets")
-        
         # Validate Cholot widgets
         for i, widget in enumerate(cholot_widgets):
             widget_type = widget.get('widgetType')
@@ -240,13 +303,15 @@ class ElementorValidator:
                     if not settings.get(field):
                         issues.append(f"Cholot Contact widget {i}: Missing {field}")
         
-        return len(issues) == 0, issues
+        return len(cholot_widgets), issues
     
-    def validate_required_meta_keys(self) -> bool:
+    def validate_required_meta_keys(self, present_keys: Optional[Set[str]] = None) -> bool:
         """Check for required Elementor meta keys"""
         try:
-            with open(self.xml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if present_keys is None:
+                for _ in self.iter_elementor_blocks():
+                    pass
+                present_keys = self.present_meta_keys
             
             required_meta_keys = [
                 '_elementor_data',
@@ -257,7 +322,7 @@ class ElementorValidator:
             
             missing_keys = []
             for key in required_meta_keys:
-                if f'<wp:meta_key>{key}</wp:meta_key>' not in content:
+                if key not in present_keys:
                     missing_keys.append(key)
             
             if missing_keys:
@@ -280,71 +345,138 @@ class ElementorValidator:
             self.log(f"XML file not found: {self.xml_file}", "ERROR")
             return self.validation_results
         
-        # Extract Elementor data
-        elementor_blocks = self.extract_elementor_data_from_xml()
-        self.validation_results["pages_with_elementor"] = len(elementor_blocks)
+        # Validate each Elementor data block as the single pass reaches it.
+        # Known blocks come from the cache; with workers > 1 the unknown ones
+        # are deferred and validated in a process pool after the pass.
+        block_count = 0
+        deferred = []
+        pending = {}
+        try:
+            for block in self.iter_elementor_blocks():
+                block_count += 1
+                digest = text_digest(block['raw_data'])
+                result = self.block_cache.get(digest)
+                
+                if result is None and self.workers == 1 and self.executor is None:
+                    result = self.check_block(block['raw_data'])
+                    self.block_cache.put(digest, result)
+                
+                if result is not None and not deferred:
+                    self.validate_block(block, result)
+                else:
+                    if result is None and digest not in pending:
+                        pending[digest] = block['raw_data']
+                    deferred.append(({k: v for k, v in block.items() if k != 'raw_data'}, digest))
+        except Exception as e:
+            extraction_error = e
+        else:
+            extraction_error = None
+        
+        if pending:
+            for digest, result in zip(pending, self._check_in_pool(list(pending.values()))):
+                self.block_cache.put(digest, result)
+        for block, digest in deferred:
+            self.validate_block(block, self.block_cache.results[digest])
+        self.block_cache.save()
         
-        if not elementor_blocks:
+        if extraction_error is not None:
+            self.log(f"Error extracting Elementor data: {str(extraction_error)}", "ERROR")
+        
+        self.validation_results["pages_with_elementor"] = block_count
+        self.log(f"Found {block_count} Elementor data blocks")
+        
+        if not block_count:
             self.log("No Elementor data found in XML", "ERROR")
             return self.validation_results
         
-        # Validate each Elementor data block
-        for block in elementor_blocks:
-            index = block['index']
-            post_id = block.get('post_id', 'unknown')
-            raw_data = block['raw_data']
+        # Check for required meta keys collected during the same pass
+        self.validate_required_meta_keys(self.present_meta_keys)
+        
+        return self.validation_results
+    
+    def check_block(self, raw_data: str) -> Dict:
+        """
+        Validate one raw Elementor data block without logging.
+        
+        The result only holds plain values, so it can be cached on disk and
+        returned from worker processes.
+        """
+        is_valid_json, parsed_data, json_message = self.validate_json_structure(raw_data)
+        result = {
+            'json_valid': is_valid_json,
+            'json_message': json_message
+        }
+        
+        if is_valid_json:
+            # Validate Elementor structure and Cholot widgets
+            result['structure_valid'], result['structure_issues'] = self.validate_elementor_structure(parsed_data)
+            result['cholot_widget_count'], result['cholot_issues'] = self._check_cholot_widgets(parsed_data)
+        
+        return result
+    
+    def _check_in_pool(self, raw_blocks: List[str]) -> List[Dict]:
+        """Validate blocks in worker processes; results come back in submission order"""
+        if self.executor is not None:
+            return list(self.executor.map(_check_block_in_worker, raw_blocks))
+        
+        workers = min(self.workers, len(raw_blocks))
+        chunksize = max(1, len(raw_blocks) // (workers * 4))
+        self.log(f"Validating {len(raw_blocks)} unique blocks with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_check_block_in_worker, raw_blocks, chunksize=chunksize))
+    
+    def validate_block(self, block: Dict, result: Optional[Dict] = None):
+        """Validate one Elementor data block and record its details"""
+        index = block['index']
+        post_id = block.get('post_id', 'unknown')
+        if result is None:
+            result = self.check_block(block['raw_data'])
+        
+        self.log(f"Validating Elementor block {index} (Post ID: {post_id})")
+        
+        detail = {
+            'block_index': index,
+            'post_id': post_id,
+            'post_title': block.get('post_title'),
+            'json_valid': result['json_valid'],
+            'json_message': result['json_message'],
+            'structure_valid': False,
+            'cholot_widgets_valid': False
+        }
+        
+        if result['json_valid']:
+            self.validation_results["valid_elementor_data"] += 1
             
-            self.log(f"Validating Elementor block {index} (Post ID: {post_id})")
+            # Validate Elementor structure
+            structure_issues = result['structure_issues']
+            detail['structure_valid'] = result['structure_valid']
+            detail['structure_issues'] = structure_issues
             
-            # Validate JSON structure
-            is_valid_json, parsed_data, json_message = self.validate_json_structure(raw_data)
+            if not result['structure_valid']:
+                self.log(f"Block {index}: Structure validation failed", "ERROR")
+                for issue in structure_issues:
+                    self.log(f"  - {issue}", "ERROR")
+            else:
+                self.log(f"Block {index}: Structure validation passed")
             
-            detail = {
-                'block_index': index,
-                'post_id': post_id,
-                'json_valid': is_valid_json,
-                'json_message': json_message,
-                'structure_valid': False,
-                'cholot_widgets_valid': False
-            }
-            
-            if is_valid_json:
-                self.validation_results["valid_elementor_data"] += 1
-                
-                # Validate Elementor structure
-                is_valid_structure, structure_issues = self.validate_elementor_structure(parsed_data)
-                detail['structure_valid'] = is_valid_structure
-                detail['structure_issues'] = structure_issues
-                
-                if not is_valid_structure:
-                    self.log(f"Block {index}: Structure validation failed", "ERROR")
-                    for issue in structure_issues:
-                        self.log(f"  - {issue}", "ERROR")
-                else:
-                    self.log(f"Block {index}: Structure validation passed")
-                
-                # Validate Cholot widgets
-                is_valid_cholot, cholot_issues = self.validate_cholot_widgets(parsed_data)
-                detail['cholot_widgets_valid'] = is_valid_cholot
-                detail['cholot_issues'] = cholot_issues
-                
-                if not is_valid_cholot:
-                    self.log(f"Block {index}: Cholot widget validation issues found", "WARNING")
-                    for issue in cholot_issues:
-                        self.log(f"  - {issue}", "WARNING")
-                else:
-                    self.log(f"Block {index}: Cholot widget validation passed")
+            # Validate Cholot widgets
+            cholot_issues = result['cholot_issues']
+            self.log(f"Found {result['cholot_widget_count']} Cholot-specific widgets")
+            detail['cholot_widgets_valid'] = not cholot_issues
+            detail['cholot_issues'] = cholot_issues
             
+            if cholot_issues:
+                self.log(f"Block {index}: Cholot widget validation issues found", "WARNING")
+                for issue in cholot_issues:
+                    self.log(f"  - {issue}", "WARNING")
             else:
-                self.validation_results["invalid_elementor_data"] += 1
-                self.log(f"Block {index}: {json_message}", "ERROR")
-            
-            self.validation_results["details"].append(detail)
+                self.log(f"Block {index}: Cholot widget validation passed")
         
-        # Check for required meta keys
-        self.validate_required_meta_keys()
+        else:
+            self.validation_results["invalid_elementor_data"] += 1
+            self.log(f"Block {index}: {result['json_message']}", "ERROR")
         
-        return self.validation_results
+        self.validation_results["details"].append(detail)
     
     def generate_report(self) -> bool:
         """Generate validation report"""
@@ -366,7 +498,7 @@ class ElementorValidator:
             }
             
             with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+                json_backend.dump(report, f, indent=2, ensure_ascii=False)
             
             self.log(f"Validation report saved to: {report_file}")
             return True
@@ -414,21 +546,77 @@ class ElementorValidator:
             return False
 
 
+_worker_validator = None
+
+
+def _check_block_in_worker(raw_data: str) -> Dict:
+    """Validate one block with a per-process validator"""
+    global _worker_validator
+    if _worker_validator is None:
+        _worker_validator = ElementorValidator('', verbose=False)
+    return _worker_validator.check_block(raw_data)
+
+
+def validate_directory(directory: str, workers: int = 1, cache_path: Optional[str] = None) -> List[Tuple[str, Dict]]:
+    """
+    Validate every XML export in a directory with one shared block cache and,
+    for workers > 1, one shared process pool.
+    """
+    block_cache = BlockResultCache(cache_path)
+    xml_files = sorted(str(path) for path in Path(directory).glob('*.xml'))
+    results = []
+    
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for xml_file in xml_files:
+            validator = ElementorValidator(xml_file, block_cache=block_cache, workers=workers,
+                                           executor=executor, verbose=False)
+            results.append((xml_file, validator.run_validation()))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    return results
+
+
+def print_directory_summary(results: List[Tuple[str, Dict]]) -> bool:
+    """Print one line per export; True if every export passed"""
+    print(f"{'File':<50} {'Blocks':>7} {'Valid':>7} {'Invalid':>8} {'Errors':>7}")
+    print("-" * 83)
+    all_passed = True
+    for xml_file, result in results:
+        total = result["pages_with_elementor"]
+        valid = result["valid_elementor_data"]
+        passed = total > 0 and valid / total >= 0.8 and not result["errors"]
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} {os.path.basename(xml_file):<48} {total:>7} {valid:>7} "
+              f"{result['invalid_elementor_data']:>8} {len(result['errors']):>7}")
+    return all_passed
+
+
 def main():
     """Main execution function"""
-    if len(sys.argv) != 2:
-        print("Usage: python validate-elementor.py <xml_file>")
-        print("Example: python validate-elementor.py cholot-generated.xml")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Validate Elementor data in WordPress XML',
+        epilog='Example: python validate-elementor.py cholot-generated.xml')
+    parser.add_argument('xml_file', help='WXR export, or a directory of exports')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Validate unique blocks in N worker processes')
+    parser.add_argument('--cache', help='On-disk block result cache (JSON file)')
+    args = parser.parse_args()
     
-    xml_file = sys.argv[1]
+    xml_file = args.xml_file
     
     print("🔍 CHOLOT ELEMENTOR VALIDATOR")
     print("=" * 60)
     print("Validating Elementor data in WordPress XML")
     print()
     
-    validator = ElementorValidator(xml_file)
+    if os.path.isdir(xml_file):
+        results = validate_directory(xml_file, workers=args.workers, cache_path=args.cache)
+        sys.exit(0 if print_directory_summary(results) else 1)
+    
+    validator = ElementorValidator(xml_file, block_cache=BlockResultCache(args.cache), workers=args.workers)
     validation_results = validator.run_validation()
     
     # Generate detailed report
@@ -23,8 +23,11 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
+    import json_backend
     from generate_wordpress_xml import WordPressXMLGenerator, CholotComponentFactory
+    from page_stats import PageStats, collect_page_stats
     from test_scenarios import TestScenarioManager
+    from wxr_reader import WXRReader
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     sys.exit(1)
@@ -38,6 +41,9 @@ class ValidationReportGenerator:
         self.factory = CholotComponentFactory()
         self.scenario_manager = TestScenarioManager()
         self.demo_file_path = Path(__file__).parent / 'demo-data-fixed.xml'
+        # Reader, decoded _elementor_data and its statistics for the last XML output checked
+        self._page_stats_cache: Tuple[Optional[str], Optional[WXRReader], List[Tuple[Any, PageStats]]] = (
+            None, None, [])
         
     def generate_comprehensive_report(self) -> Dict[str, Any]:
         """Generate comprehensive validation report."""
@@ -143,7 +149,7 @@ class ValidationReportGenerator:
                 'namespaces': self._validate_namespaces(root),
                 'channel_structure': self._validate_channel_structure(root),
                 'item_structure': self._validate_item_structure(root),
-                'elementor_data': self._validate_elementor_data(root),
+                'elementor_data': self._validate_elementor_data(xml_output),
                 'cdata_handling': self._validate_cdata_handling(xml_output),
                 'encoding': 'UTF-8' in xml_output[:100]
             }
@@ -201,21 +207,42 @@ class ValidationReportGenerator:
         required_elements = ['title', 'guid']
         return all(item.find(element) is not None for element in required_elements)
     
-    def _validate_elementor_data(self, root: ET.Element) -> bool:
+    def _validate_elementor_data(self, xml_output: str) -> bool:
         """Validate Elementor data presence and format."""
-        for item in root.findall('.//item'):
-            for postmeta in item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'}):
-                meta_key = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                if meta_key is not None and meta_key.text == '_elementor_data':
-                    meta_value = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_value')
-                    if meta_value is not None:
-                        try:
-                            elementor_data = json.loads(meta_value.text)
-                            return isinstance(elementor_data, list)
-                        except json.JSONDecodeError:
-                            return False
+        for value in self._iter_elementor_data(WXRReader.from_string(xml_output)):
+            try:
+                elementor_data = json_backend.loads(value)
+                return isinstance(elementor_data, list)
+            except json.JSONDecodeError:
+                return False
         return False
     
+    def _iter_elementor_data(self, reader: WXRReader):
+        """Stream the raw ``_elementor_data`` values of every item."""
+        for item in reader:
+            if item.meta.get('_elementor_data') is not None:
+                yield item.elementor_data
+    
+    def _page_stats(self, xml_output: str) -> List[Tuple[Any, PageStats]]:
+        """Decoded ``_elementor_data`` and its statistics for every item, one traversal each."""
+        return self._read_pages(xml_output)[1]
+    
+    def _read_pages(self, xml_output: str) -> Tuple[WXRReader, List[Tuple[Any, PageStats]]]:
+        """The exhausted reader (root and channel facts) and the page statistics of ``xml_output``.
+        
+        The result for the last ``xml_output`` is kept, so the compliance checks
+        share a single decode and walk. Raises ``json.JSONDecodeError``.
+        """
+        cached_output, reader, pages = self._page_stats_cache
+        if cached_output is not xml_output:
+            reader, pages = WXRReader.from_string(xml_output), []
+            for value in self._iter_elementor_data(reader):
+                elementor_data = json_backend.loads(value)
+                stats = collect_page_stats(elementor_data if isinstance(elementor_data, list) else [])
+                pages.append((elementor_data, stats))
+            self._page_stats_cache = (xml_output, reader, pages)
+        return reader, pages
+    
     def _validate_cdata_handling(self, xml_output: str) -> bool:
         """Validate CDATA section handling."""
         return '<![CDATA[' in xml_output and ']]>' in xml_output
@@ -330,41 +357,27 @@ class ValidationReportGenerator:
                     scenario_data.get('site_config', {})
                 )
                 
-                # Parse and validate
-                root = ET.fromstring(xml_output)
+                # Parse and validate in one streaming pass
+                reader, pages = self._read_pages(xml_output)
+                found_widgets = set()
+                for _, stats in pages:
+                    # Check for expected widget types in Elementor data
+                    found_widgets.update(stats.widget_types)
                 
                 # Basic validation
                 basic_valid = (
-                    root.tag == 'rss' and
-                    root.get('version') == '2.0' and
-                    root.find('channel') is not None
+                    reader.root_tag == 'rss' and
+                    reader.root_attrib.get('version') == '2.0' and
+                    reader.has_channel
                 )
                 
                 # Check expected results if specified
                 expectations_met = True
                 if 'expected_pages' in scenario_data:
-                    items = root.findall('.//item')
-                    if len(items) != scenario_data['expected_pages']:
+                    if reader.channel_elements['item'] != scenario_data['expected_pages']:
                         expectations_met = False
                 
                 if 'expected_widgets' in scenario_data:
-                    # Check for expected widget types in Elementor data
-                    found_widgets = set()
-                    for item in root.findall('.//item'):
-                        for postmeta in item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'}):
-                            meta_key = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                            if meta_key is not None and meta_key.text == '_elementor_data':
-                                meta_value = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_value')
-                                if meta_value is not None:
-                                    elementor_data = json.loads(meta_value.text)
-                                    for section in elementor_data:
-                                        if section.get('elType') == 'section':
-                                            for column in section.get('elements', []):
-                                                if column.get('elType') == 'column':
-                                                    for widget in column.get('elements', []):
-                                                        if widget.get('elType') == 'widget':
-                                                            found_widgets.add(widget.get('widgetType', ''))
-                    
                     expected_widgets = set(scenario_data['expected_widgets'])
                     if not expected_widgets.issubset(found_widgets):
                         expectations_met = False
@@ -396,11 +409,8 @@ class ValidationReportGenerator:
             }
         
         try:
-            # Read demo file
-            with open(self.demo_file_path, 'r', encoding='utf-8') as f:
-                demo_xml = f.read()
-            
-            demo_root = ET.fromstring(demo_xml)
+            # Stream the demo file instead of loading it whole
+            demo_summary = self._summarize_export(WXRReader(str(self.demo_file_path)))
             
             # Generate test output
             test_data = {
@@ -421,14 +431,14 @@ class ValidationReportGenerator:
             }
             
             test_xml = self.generator.generate_xml(test_data)
-            test_root = ET.fromstring(test_xml)
+            test_summary = self._summarize_export(WXRReader.from_string(test_xml))
             
             comparison = {
                 'demo_file_available': True,
-                'structural_similarity': self._calculate_structural_similarity(demo_root, test_root),
-                'namespace_compatibility': self._compare_namespaces(demo_root, test_root),
-                'element_structure_match': self._compare_element_structure(demo_root, test_root),
-                'elementor_data_format': self._compare_elementor_format(demo_root, test_root),
+                'structural_similarity': self._calculate_structural_similarity(demo_summary, test_summary),
+                'namespace_compatibility': self._compare_namespaces(demo_summary, test_summary),
+                'element_structure_match': self._compare_element_structure(demo_summary, test_summary),
+                'elementor_data_format': self._compare_elementor_format(demo_summary, test_summary),
                 'score': 0,
                 'status': 'UNKNOWN'
             }
@@ -453,10 +463,29 @@ class ValidationReportGenerator:
                 'status': 'ERROR'
             }
     
-    def _calculate_structural_similarity(self, demo_root: ET.Element, test_root: ET.Element) -> float:
+    def _summarize_export(self, reader: WXRReader) -> Dict[str, Any]:
+        """Collect everything the demo comparison needs in one streaming pass."""
+        has_title = has_description = has_elementor = False
+        for item in reader:
+            has_title = has_title or 'title' in item.fields
+            has_description = has_description or 'description' in item.fields
+            has_elementor = has_elementor or '_elementor_data' in item.meta
+        
+        return {
+            'root_tag': reader.root_tag,
+            'version': reader.root_attrib.get('version'),
+            'has_channel': reader.has_channel,
+            'channel_elements': set(reader.channel_elements),
+            'namespaces': set(reader.namespaces),
+            'has_title': has_title or 'title' in reader.channel,
+            'has_description': has_description or 'description' in reader.channel,
+            'has_elementor_data': has_elementor
+        }
+    
+    def _calculate_structural_similarity(self, demo_summary: Dict[str, Any], test_summary: Dict[str, Any]) -> float:
         """Calculate structural similarity percentage."""
-        demo_structure = self._extract_structure_info(demo_root)
-        test_structure = self._extract_structure_info(test_root)
+        demo_structure = self._extract_structure_info(demo_summary)
+        test_structure = self._extract_structure_info(test_summary)
         
         matches = 0
         total = len(demo_structure)
@@ -470,60 +499,48 @@ class ValidationReportGenerator:
         
         return (matches / total * 100) if total > 0 else 0
     
-    def _extract_structure_info(self, root: ET.Element) -> Dict[str, Any]:
-        """Extract structural information from XML."""
+    def _extract_structure_info(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract structural information from an export summary."""
         return {
-            'root_tag': root.tag,
-            'has_channel': root.find('channel') is not None,
-            'has_items': len(root.findall('.//item')) > 0,
-            'has_title': root.find('.//title') is not None,
-            'has_description': root.find('.//description') is not None,
-            'version': root.get('version'),
-            'namespace_count': len([attr for attr in root.attrib.keys() if attr.startswith('xmlns')])
+            'root_tag': summary['root_tag'],
+            'has_channel': summary['has_channel'],
+            'has_items': 'item' in summary['channel_elements'],
+            'has_title': summary['has_title'],
+            'has_description': summary['has_description'],
+            'version': summary['version'],
+            'namespace_count': len(summary['namespaces'])
         }
     
-    def _compare_namespaces(self, demo_root: ET.Element, test_root: ET.Element) -> float:
+    def _compare_namespaces(self, demo_summary: Dict[str, Any], test_summary: Dict[str, Any]) -> float:
         """Compare XML namespaces."""
-        demo_namespaces = set(attr for attr in demo_root.attrib.keys() if attr.startswith('xmlns'))
-        test_namespaces = set(attr for attr in test_root.attrib.keys() if attr.startswith('xmlns'))
+        demo_namespaces = demo_summary['namespaces']
+        test_namespaces = test_summary['namespaces']
         
         if not demo_namespaces:
             return 1.0
         
         return len(demo_namespaces.intersection(test_namespaces)) / len(demo_namespaces)
     
-    def _compare_element_structure(self, demo_root: ET.Element, test_root: ET.Element) -> float:
+    def _compare_element_structure(self, demo_summary: Dict[str, Any], test_summary: Dict[str, Any]) -> float:
         """Compare element structure."""
-        demo_channel = demo_root.find('channel')
-        test_channel = test_root.find('channel')
-        
-        if demo_channel is None or test_channel is None:
+        if not demo_summary['has_channel'] or not test_summary['has_channel']:
             return 0.0
         
-        demo_elements = set(child.tag for child in demo_channel)
-        test_elements = set(child.tag for child in test_channel)
+        demo_elements = demo_summary['channel_elements']
+        test_elements = test_summary['channel_elements']
         
         if not demo_elements:
             return 1.0
         
         return len(demo_elements.intersection(test_elements)) / len(demo_elements)
     
-    def _compare_elementor_format(self, demo_root: ET.Element, test_root: ET.Element) -> float:
+    def _compare_elementor_format(self, demo_summary: Dict[str, Any], test_summary: Dict[str, Any]) -> float:
         """Compare Elementor data format."""
-        demo_has_elementor = self._has_elementor_data(demo_root)
-        test_has_elementor = self._has_elementor_data(test_root)
+        demo_has_elementor = demo_summary['has_elementor_data']
+        test_has_elementor = test_summary['has_elementor_data']
         
         return 1.0 if demo_has_elementor == test_has_elementor else 0.0
     
-    def _has_elementor_data(self, root: ET.Element) -> bool:
-        """Check if XML has Elementor data."""
-        for item in root.findall('.//item'):
-            for postmeta in item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'}):
-                meta_key = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                if meta_key is not None and meta_key.text == '_elementor_data':
-                    return True
-        return False
-    
     def _analyze_performance(self) -> Dict[str, Any]:
         """Analyze generator performance."""
         print("⚡ Analyzing performance...")
@@ -833,8 +850,8 @@ class ValidationReportGenerator:
             
             compliance_checks = {
                 'wordpress_structure': self._check_wordpress_structure(root),
-                'elementor_data_structure': self._check_elementor_structure(root),
-                'id_uniqueness': self._check_id_uniqueness(root),
+                'elementor_data_structure': self._check_elementor_structure(xml_output),
+                'id_uniqueness': self._check_id_uniqueness(xml_output),
                 'responsive_settings': self._check_responsive_settings(root),
                 'theme_compatibility': self._check_theme_compatibility(root),
                 'score': 0,
@@ -866,56 +883,26 @@ class ValidationReportGenerator:
         ]
         return all(required_structure)
     
-    def _check_elementor_structure(self, root: ET.Element) -> bool:
+    def _check_elementor_structure(self, xml_output: str) -> bool:
         """Check Elementor data structure compliance."""
-        for item in root.findall('.//item'):
-            for postmeta in item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'}):
-                meta_key = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                if meta_key is not None and meta_key.text == '_elementor_data':
-                    meta_value = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_value')
-                    if meta_value is not None:
-                        try:
-                            elementor_data = json.loads(meta_value.text)
-                            if isinstance(elementor_data, list) and elementor_data:
-                                # Check first section structure
-                                section = elementor_data[0]
-                                required_keys = ['id', 'elType', 'elements']
-                                return all(key in section for key in required_keys)
-                        except json.JSONDecodeError:
-                            return False
+        try:
+            pages = self._page_stats(xml_output)
+        except json.JSONDecodeError:
+            return False
+        for elementor_data, _ in pages:
+            if isinstance(elementor_data, list) and elementor_data:
+                # Check first section structure
+                section = elementor_data[0]
+                required_keys = ['id', 'elType', 'elements']
+                return all(key in section for key in required_keys)
         return False
     
-    def _check_id_uniqueness(self, root: ET.Element) -> bool:
-        """Check that all generated IDs are unique."""
-        ids = set()
-        for item in root.findall('.//item'):
-            for postmeta in item.findall('.//wp:postmeta', {'wp': 'http://wordpress.org/export/1.2/'}):
-                meta_key = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_key')
-                if meta_key is not None and meta_key.text == '_elementor_data':
-                    meta_value = postmeta.find('.//{http://wordpress.org/export/1.2/}meta_value')
-                    if meta_value is not None:
-                        try:
-                            elementor_data = json.loads(meta_value.text)
-                            extracted_ids = self._extract_all_ids(elementor_data)
-                            if len(extracted_ids) != len(set(extracted_ids)):
-                                return False
-                            ids.update(extracted_ids)
-                        except json.JSONDecodeError:
-                            return False
-        return True
-    
-    def _extract_all_ids(self, data: Any) -> List[str]:
-        """Recursively extract all IDs from Elementor data."""
-        ids = []
-        if isinstance(data, dict):
-            if 'id' in data:
-                ids.append(data['id'])
-            for value in data.values():
-                ids.extend(self._extract_all_ids(value))
-        elif isinstance(data, list):
-            for item in data:
-                ids.extend(self._extract_all_ids(item))
-        return ids
+    def _check_id_uniqueness(self, xml_output: str) -> bool:
+        """Check that all generated element IDs are unique within each page."""
+        try:
+            return all(stats.ids_unique for _, stats in self._page_stats(xml_output))
+        except json.JSONDecodeError:
+            return False
     
     def _check_responsive_settings(self, root: ET.Element) -> bool:
         """Check for responsive settings in widgets."""
@@ -990,7 +977,7 @@ class ValidationReportGenerator:
             output_file = Path(__file__).parent / f"validation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+            json_backend.dump(report, f, indent=2, ensure_ascii=False)
         
         return output_file
     
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+WXR Reader
+==========
+
+Streaming reader for WordPress WXR exports built on ``ET.iterparse``.
+
+The analyzers and validators used to load the whole export with
+``ET.parse`` (or read it into one string and scan it with regexes) and then
+walk ``.//item``. Theme demo exports run to hundreds of megabytes, so this
+module parses incrementally, turns each ``<item>`` into a small record and
+clears the element straight away. Memory stays flat in the size of the
+export and bounded by the largest single item.
+
+Features:
+- ``WXRItem`` records: post_id, post_type, title, leaf fields, meta dict
+- ``_elementor_data`` available as UTF-8 bytes for ``json.loads``
+- Channel fields, categories, tags and terms collected on the way
+- ``rewrite`` streams a corrected copy, editing one item element at a time
+- Accepts a path, a binary file object or (via ``from_string``) a document
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from wxr_serializer import WXR_NAMESPACES, XML_DECLARATION, WXRSerializer, escape_attribute
+
+
+WP = '{%s}' % WXR_NAMESPACES['wp']
+
+POSTMETA_TAG = f'{WP}postmeta'
+META_KEY_TAG = f'{WP}meta_key'
+META_VALUE_TAG = f'{WP}meta_value'
+
+# Channel-level taxonomy elements and the key they are collected under
+TAXONOMY_TAGS = {
+    f'{WP}category': 'categories',
+    f'{WP}tag': 'tags',
+    f'{WP}term': 'terms',
+}
+
+# Elements WordPress itself exports as CDATA when they hold markup
+CDATA_TAGS = frozenset(['content:encoded', 'excerpt:encoded', 'wp:meta_value'])
+
+Source = Union[str, IO[bytes]]
+
+
+@dataclass
+class WXRItem:
+    """Lightweight record of one ``<item>``; holds strings only, no elements."""
+    post_id: Optional[str]
+    post_type: Optional[str]
+    title: Optional[str]
+    meta: Dict[str, Optional[str]] = field(default_factory=dict)
+    fields: Dict[str, Optional[str]] = field(default_factory=dict)
+    categories: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+    @property
+    def elementor_data(self) -> Optional[bytes]:
+        """Raw ``_elementor_data`` meta value as UTF-8 bytes, or None."""
+        value = self.meta.get('_elementor_data')
+        return value.encode('utf-8') if value is not None else None
+
+
+class WXRReader:
+    """Iterates a WXR export item by item without building the full tree."""
+
+    def __init__(self, source: Source):
+        self.source = source
+        self._reset()
+
+    @classmethod
+    def from_string(cls, xml_text: Union[str, bytes]) -> 'WXRReader':
+        """Reader over an in-memory document, e.g. freshly generated output."""
+        if isinstance(xml_text, str):
+            xml_text = xml_text.encode('utf-8')
+        return cls(io.BytesIO(xml_text))
+
+    def _reset(self):
+        self.root_tag: Optional[str] = None
+        self.root_attrib: Dict[str, str] = {}
+        self.has_channel = False
+        self.namespaces: Dict[str, str] = {}
+        self.channel: Dict[str, Optional[str]] = {}
+        self.channel_elements: Counter = Counter()
+        self.taxonomies: Dict[str, List[Dict[str, Optional[str]]]] = {
+            'categories': [], 'tags': [], 'terms': []
+        }
+        self._names: Dict[str, str] = {}
+
+    def __iter__(self) -> Iterator[WXRItem]:
+        return self.items()
+
+    def items(self) -> Iterator[WXRItem]:
+        """Yield one ``WXRItem`` per ``<item>``, in document order."""
+        for kind, elem in self._stream():
+            if kind == 'item':
+                yield self._item_record(elem)
+
+    def rewrite(self, destination: Union[str, IO[str]],
+                transform: Callable[[ET.Element, WXRItem], Any] = None) -> int:
+        """
+        Stream the export into ``destination``, calling ``transform(element, record)``
+        on each ``<item>`` before it is written. The element may be edited in
+        place. Returns the number of items written.
+        """
+        if isinstance(destination, str):
+            with open(destination, 'w', encoding='utf-8') as fp:
+                return self.rewrite(fp, transform)
+
+        serializer = None
+        written = 0
+        for kind, elem in self._stream():
+            if kind == 'root':
+                namespaces = {**WXR_NAMESPACES, **{p: u for p, u in self.namespaces.items() if p}}
+                serializer = WXRSerializer(cdata=self._use_cdata, namespaces=namespaces)
+                attrs = ''.join(f' {key}="{escape_attribute(value)}"' for key, value in elem.attrib.items())
+                attrs += ''.join(f' xmlns:{p}="{escape_attribute(u)}"' for p, u in namespaces.items())
+                destination.write(XML_DECLARATION + '\n')
+                destination.write(f'<{elem.tag}{attrs}>\n')
+            elif kind == 'channel':
+                destination.write(serializer.indent + '<channel>\n')
+            else:
+                if kind == 'item':
+                    if transform is not None:
+                        transform(elem, self._item_record(elem))
+                    written += 1
+                destination.write(serializer.element_to_string(elem, level=2))
+
+        if serializer is not None:
+            if self.has_channel:
+                destination.write(serializer.indent + '</channel>\n')
+            destination.write(f'</{self.root_tag}>\n')
+        return written
+
+    def _stream(self) -> Iterator[Tuple[str, ET.Element]]:
+        """
+        Drive ``iterparse`` and yield ``('root'|'channel', element)`` when those
+        open, and ``('item'|'field', element)`` once a direct child of
+        ``<channel>`` is complete. Completed children are cleared and detached
+        from the channel after the consumer resumes.
+        """
+        self._reset()
+        depth = 0
+        channel = parent = None
+
+        for event, elem in ET.iterparse(self.source, events=('start-ns', 'start', 'end')):
+            if event == 'start-ns':
+                prefix, uri = elem
+                self.namespaces.setdefault(prefix, uri)
+                continue
+
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    self.root_tag = elem.tag
+                    self.root_attrib = dict(elem.attrib)
+                    yield 'root', elem
+                elif depth == 2:
+                    parent = elem
+                    if elem.tag == 'channel' and channel is None:
+                        channel = elem
+                        self.has_channel = True
+                        yield 'channel', elem
+                continue
+
+            if depth == 3 and channel is not None and parent is channel:
+                name = self._name(elem.tag)
+                self.channel_elements[name] += 1
+                if elem.tag == 'item':
+                    yield 'item', elem
+                else:
+                    taxonomy = TAXONOMY_TAGS.get(elem.tag)
+                    if taxonomy is not None:
+                        self.taxonomies[taxonomy].append(
+                            {self._name(child.tag): child.text for child in elem})
+                    elif len(elem) == 0:
+                        self.channel.setdefault(name, elem.text)
+                    yield 'field', elem
+                elem.clear()
+                channel.remove(elem)
+            depth -= 1
+
+    def _item_record(self, elem: ET.Element) -> WXRItem:
+        """Collect leaf fields, postmeta and categories of an ``<item>``."""
+        fields: Dict[str, Optional[str]] = {}
+        meta: Dict[str, Optional[str]] = {}
+        categories = []
+
+        for child in elem:
+            tag = child.tag
+            if tag == POSTMETA_TAG:
+                key = child.find(META_KEY_TAG)
+                if key is not None and key.text is not None:
+                    value = child.find(META_VALUE_TAG)
+                    meta[key.text] = value.text if value is not None else None
+            elif tag == 'category':
+                categories.append({
+                    'domain': child.get('domain'),
+                    'nicename': child.get('nicename'),
+                    'name': child.text,
+                })
+            elif len(child) == 0:
+                # Nested groups such as wp:comment are not part of the record
+                fields.setdefault(self._name(tag), child.text)
+
+        return WXRItem(
+            post_id=fields.get('wp:post_id'),
+            post_type=fields.get('wp:post_type'),
+            title=fields.get('title'),
+            meta=meta,
+            fields=fields,
+            categories=categories,
+        )
+
+    def _name(self, tag: str) -> str:
+        """``{uri}local`` -> ``prefix:local`` using the document's own prefixes."""
+        name = self._names.get(tag)
+        if name is None:
+            name = tag
+            if tag[:1] == '{':
+                uri, local = tag[1:].split('}', 1)
+                prefix = next((p for p, u in self.namespaces.items() if u == uri), None)
+                if prefix is None:
+                    prefix = next((p for p, u in WXR_NAMESPACES.items() if u == uri), None)
+                if prefix:
+                    name = f'{prefix}:{local}'
+            self._names[tag] = name
+        return name
+
+    @staticmethod
+    def _use_cdata(tag: str, elem: ET.Element) -> bool:
+        text = elem.text
+        return tag in CDATA_TAGS or (text is not None and ('<' in text or '&' in text))
+
+
+def iter_items(source: Source) -> Iterator[WXRItem]:
+    """Shortcut for ``iter(WXRReader(source))``."""
+    return WXRReader(source).items()
@@ -13,10 +13,11 @@ Features:
 - Shape divider configurations
 - Responsive settings preservation
 - Comprehensive error handling
+- Optional incremental rebuilds via an on-disk build cache
+- Optional parallel page rendering with a process pool (workers=N)
 """
 
 import yaml
-import json
 import logging
 import uuid
 import random
@@ -25,6 +26,13 @@ from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import elementor_ids
+import json_backend
+from build_cache import BuildCache, fingerprint, source_fingerprint
+from elementor_ids import ElementorIDAllocator, ContentIDAssigner, BASE36_ALPHABET
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +41,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# libyaml's safe loader is several times faster; fall back to the pure-Python one
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 @dataclass
 class ProcessingContext:
@@ -42,15 +53,20 @@ class ProcessingContext:
     generated_ids: List[str] = field(default_factory=list)
     base_url: str = "http://localhost:8080"
     language: str = "en-US"
+    # Elementor uses 8-character hex IDs; repeater items use 7-character base36 IDs
+    id_allocator: ElementorIDAllocator = field(default_factory=lambda: ElementorIDAllocator(length=8))
+    repeater_id_allocator: ElementorIDAllocator = field(
+        default_factory=lambda: ElementorIDAllocator(length=7, alphabet=BASE36_ALPHABET))
     
     def generate_element_id(self) -> str:
         """Generate unique Elementor element ID"""
-        # Elementor uses 8-character hex IDs
-        element_id = ''.join(random.choices('0123456789abcdef', k=8))
-        while element_id in self.generated_ids:
-            element_id = ''.join(random.choices('0123456789abcdef', k=8))
+        element_id = self.id_allocator.allocate()
         self.generated_ids.append(element_id)
         return element_id
+    
+    def generate_repeater_id(self) -> str:
+        """Generate unique ID for repeater items (social links, testimonials)"""
+        return self.repeater_id_allocator.allocate()
 
 
 class CholotWidgetFactory:
@@ -243,7 +259,7 @@ class CholotWidgetFactory:
             }
             
             # Apply content-specific settings
-            cls._apply_content_settings(widget, content, template_key)
+            cls._apply_content_settings(widget, content, template_key, context)
             
             # Apply custom settings if provided
             if 'custom_settings' in content:
@@ -257,7 +273,8 @@ class CholotWidgetFactory:
             return cls._create_fallback_widget(widget_type, content, context)
     
     @classmethod
-    def _apply_content_settings(cls, widget: Dict[str, Any], content: Dict[str, Any], template_key: str):
+    def _apply_content_settings(cls, widget: Dict[str, Any], content: Dict[str, Any], template_key: str,
+                                context: Optional[ProcessingContext] = None):
         """Apply content-specific settings to widget"""
         
         if template_key == 'texticon':
@@ -265,9 +282,9 @@ class CholotWidgetFactory:
         elif template_key == 'title':
             cls._apply_title_settings(widget, content)
         elif template_key == 'team':
-            cls._apply_team_settings(widget, content)
+            cls._apply_team_settings(widget, content, context)
         elif template_key == 'testimonial-two':
-            cls._apply_testimonial_settings(widget, content)
+            cls._apply_testimonial_settings(widget, content, context)
         elif template_key == 'text-line':
             cls._apply_text_line_settings(widget, content)
         elif template_key == 'contact':
@@ -312,7 +329,8 @@ class CholotWidgetFactory:
             settings['align'] = content['align']
     
     @classmethod
-    def _apply_team_settings(cls, widget: Dict[str, Any], content: Dict[str, Any]):
+    def _apply_team_settings(cls, widget: Dict[str, Any], content: Dict[str, Any],
+                             context: Optional[ProcessingContext] = None):
         """Apply team-specific settings"""
         settings = widget['settings']
         
@@ -334,10 +352,11 @@ class CholotWidgetFactory:
         if 'align' in content:
             settings['content_align'] = content['align']
         if 'social_links' in content:
-            settings['social_icon_list'] = cls._create_social_links(content['social_links'])
+            settings['social_icon_list'] = cls._create_social_links(content['social_links'], context)
     
     @classmethod
-    def _apply_testimonial_settings(cls, widget: Dict[str, Any], content: Dict[str, Any]):
+    def _apply_testimonial_settings(cls, widget: Dict[str, Any], content: Dict[str, Any],
+                                    context: Optional[ProcessingContext] = None):
         """Apply testimonial-specific settings"""
         settings = widget['settings']
         
@@ -348,7 +367,7 @@ class CholotWidgetFactory:
                     'title': testimonial.get('name', ''),
                     'position': testimonial.get('position', ''),
                     'text': testimonial.get('text', ''),
-                    '_id': ''.join(random.choices(string.ascii_lowercase + string.digits, k=7)),
+                    '_id': cls._repeater_id(context),
                     'image2_size': 'thumbnail'
                 }
                 if 'image_url' in testimonial and 'image_id' in testimonial:
@@ -443,7 +462,8 @@ class CholotWidgetFactory:
             settings['page_show'] = 'yes' if content['show_pagination'] else ''
     
     @classmethod
-    def _create_social_links(cls, links: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    def _create_social_links(cls, links: List[Dict[str, str]],
+                             context: Optional[ProcessingContext] = None) -> List[Dict[str, Any]]:
         """Create social links array for team widget"""
         social_links = []
         for link in links:
@@ -452,7 +472,7 @@ class CholotWidgetFactory:
                     'value': link['icon'],
                     'library': 'fa-brands' if 'fab' in link['icon'] else 'fa-solid'
                 },
-                '_id': ''.join(random.choices(string.ascii_lowercase + string.digits, k=7)),
+                '_id': cls._repeater_id(context),
                 'link': {
                     'url': link['url'],
                     'is_external': 'true',
@@ -465,6 +485,13 @@ class CholotWidgetFactory:
             social_links.append(social_link)
         return social_links
     
+    @classmethod
+    def _repeater_id(cls, context: Optional[ProcessingContext]) -> str:
+        """Repeater item ID from the page context, or a random one without context"""
+        if context is not None:
+            return context.generate_repeater_id()
+        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=7))
+    
     @classmethod
     def _create_fallback_widget(cls, widget_type: str, content: Dict[str, Any], context: ProcessingContext) -> Dict[str, Any]:
         """Create fallback widget for unknown types"""
@@ -821,9 +848,20 @@ class ElementorStructureBuilder:
 class YAMLToJSONProcessor:
     """Main processor class for converting YAML to Elementor JSON"""
     
-    def __init__(self, base_url: str = "http://localhost:8080", debug: bool = False):
+    def __init__(self, base_url: str = "http://localhost:8080", debug: bool = False,
+                 id_mode: str = 'random', id_seed: Optional[int] = None,
+                 build_cache: Optional[BuildCache] = None, workers: int = 1):
         self.base_url = base_url
         self.debug = debug
+        self.id_mode = id_mode
+        self.id_seed = id_seed
+        if id_mode == 'seeded' and id_seed is None:
+            raise ValueError("id_mode='seeded' requires id_seed")
+        # Pages whose config (and this processor's code) did not change are reused from the cache
+        self.build_cache = build_cache
+        self._source_digest = source_fingerprint(__file__, elementor_ids.__file__, json_backend.__file__) if build_cache else None
+        # Pages share no state, so they can be rendered in separate processes
+        self.workers = max(1, workers)
         if debug:
             logger.setLevel(logging.DEBUG)
         
@@ -833,7 +871,7 @@ class YAMLToJSONProcessor:
         """Process YAML file and return Elementor JSON structure"""
         try:
             with open(yaml_file, 'r', encoding='utf-8') as f:
-                yaml_data = yaml.safe_load(f)
+                yaml_data = yaml.load(f, Loader=YAML_LOADER)
             
             return self.process_yaml_data(yaml_data)
             
@@ -868,14 +906,21 @@ class YAMLToJSONProcessor:
                 }
             }
             
+            jobs = []
             for i, page_data in enumerate(pages):
                 # Type checking before processing
                 if not isinstance(page_data, (dict, str)):
                     logger.warning(f"Unexpected page_data type at index {i}: {type(page_data)}. Converting to dict.")
                     page_data = {'title': f'Page {i+1}', 'sections': []}
-                
-                processed_page = self._process_page(page_data, i + 1000, site_info)
-                result['pages'].append(processed_page)
+                jobs.append((page_data, i + 1000))
+            
+            result['pages'] = self._process_pages(jobs, site_info)
+            
+            if self.build_cache is not None:
+                self.build_cache.retain(f'page:{i + 1000}' for i in range(len(pages)))
+                self.build_cache.save()
+                logger.info(f"Build cache: {self.build_cache.hits} pages reused, "
+                            f"{self.build_cache.misses} rebuilt")
             
             logger.info(f"Successfully processed {len(pages)} pages")
             return result
@@ -885,6 +930,65 @@ class YAMLToJSONProcessor:
             logger.debug(traceback.format_exc())
             raise
     
+    def _process_pages(self, jobs: List[Tuple[Any, int]], site_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Process pages in order, reusing cached pages and rendering the rest serially or in a pool"""
+        pages: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending = []
+        
+        for index, (page_data, page_id) in enumerate(jobs):
+            digest = None
+            if self.build_cache is not None:
+                digest = self._page_digest(page_data, page_id, site_info)
+                cached = self.build_cache.get(f'page:{page_id}', digest)
+                if cached is not None:
+                    logger.debug(f"Reusing cached page {page_id}")
+                    pages[index] = cached
+                    continue
+            pending.append((index, page_data, page_id, digest))
+        
+        if self.workers > 1 and len(pending) > 1:
+            rendered = self._render_in_pool(pending, site_info)
+        else:
+            rendered = (self._process_page(page_data, page_id, site_info)
+                        for _, page_data, page_id, _ in pending)
+        
+        for (index, _, page_id, digest), page in zip(pending, rendered):
+            pages[index] = page
+            if self.build_cache is not None and 'error' not in page:
+                self.build_cache.put(f'page:{page_id}', digest, page)
+        
+        return pages
+    
+    def _render_in_pool(self, pending: List[Tuple], site_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Render pages in worker processes; results come back in submission order"""
+        workers = min(self.workers, len(pending))
+        chunksize = max(1, len(pending) // (workers * 4))
+        options = {
+            'base_url': self.base_url,
+            'debug': self.debug,
+            'id_mode': self.id_mode,
+            'id_seed': self.id_seed,
+        }
+        logger.info(f"Rendering {len(pending)} pages with {workers} worker processes")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                                 initargs=(options,)) as executor:
+            return list(executor.map(
+                _render_page_in_worker,
+                [page_data for _, page_data, _, _ in pending],
+                [page_id for _, _, page_id, _ in pending],
+                repeat(site_info),
+                chunksize=chunksize
+            ))
+    
+    def _page_digest(self, page_data: Any, page_id: int, site_info: Dict[str, Any]) -> str:
+        """Build cache fingerprint of everything a page's output depends on"""
+        return fingerprint(
+            page_data, page_id,
+            site_info.get('base_url', self.base_url), site_info.get('language', 'en-US'),
+            self.id_mode, self.id_seed, self._source_digest
+        )
+    
     def _process_page(self, page_data: Union[Dict[str, Any], str, Any], page_id: int, site_info: Dict[str, Any]) -> Dict[str, Any]:
         """Process individual page"""
         try:
@@ -906,7 +1010,8 @@ class YAMLToJSONProcessor:
             context = ProcessingContext(
                 page_id=page_id,
                 base_url=site_info.get('base_url', self.base_url),
-                language=site_info.get('language', 'en-US')
+                language=site_info.get('language', 'en-US'),
+                **self._create_id_allocators(page_id)
             )
             
             # Create page structure with safe access to page_data
@@ -928,6 +1033,9 @@ class YAMLToJSONProcessor:
                 section = ElementorStructureBuilder.create_section(section_data, context)
                 page['elementor_data'].append(section)
             
+            if self.id_mode == 'content':
+                self._assign_content_ids(page, context)
+            
             # Store generated IDs for reference
             page['metadata']['generated_ids'] = context.generated_ids
             
@@ -960,11 +1068,37 @@ class YAMLToJSONProcessor:
                 'page_data_type': str(type(page_data))
             }
     
+    def _create_id_allocators(self, page_id: int) -> Dict[str, ElementorIDAllocator]:
+        """Per-page ID allocators; seeded mode derives each page's seed from its ID"""
+        def seed(stream: str) -> Optional[str]:
+            return None if self.id_seed is None else f"{self.id_seed}:{page_id}:{stream}"
+        
+        # Content IDs are assigned after the page is built; counter IDs are cheap placeholders
+        mode = 'counter' if self.id_mode == 'content' else self.id_mode
+        return {
+            'id_allocator': ElementorIDAllocator(length=8, mode=mode, seed=seed('element')),
+            'repeater_id_allocator': ElementorIDAllocator(
+                length=7, mode=mode, seed=seed('repeater'), alphabet=BASE36_ALPHABET
+            )
+        }
+    
+    def _assign_content_ids(self, page: Dict[str, Any], context: ProcessingContext):
+        """Replace placeholder IDs with IDs derived from each element's path and content"""
+        assigner = ContentIDAssigner(length=8, repeater_length=7, repeater_alphabet=BASE36_ALPHABET)
+        assigner.assign(page['elementor_data'], namespace=page['slug'])
+        
+        def collect(elements):
+            for element in elements:
+                yield element['id']
+                yield from collect(element.get('elements', []))
+        
+        context.generated_ids = list(collect(page['elementor_data']))
+    
     def save_json(self, json_data: Dict[str, Any], output_file: str):
         """Save processed data to JSON file"""
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+                json_backend.dump(json_data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"JSON data saved to: {output_file}")
             
@@ -1005,6 +1139,19 @@ class YAMLToJSONProcessor:
             return False
 
 
+_worker_processor: Optional[YAMLToJSONProcessor] = None
+
+
+def _init_page_worker(options: Dict[str, Any]):
+    """Create one processor per worker process"""
+    global _worker_processor
+    _worker_processor = YAMLToJSONProcessor(**options)
+
+
+def _render_page_in_worker(page_data: Any, page_id: int, site_info: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_processor._process_page(page_data, page_id, site_info)
+
+
 def main():
     """Main function for command line usage"""
     import argparse
@@ -1015,11 +1162,21 @@ def main():
     parser.add_argument('--base-url', help='Base URL for the site', default='http://localhost:8080')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--validate', action='store_true', help='Validate output structure')
+    parser.add_argument('--id-mode', choices=['random', 'seeded', 'counter', 'content'], default='random',
+                        help='Elementor ID allocation mode')
+    parser.add_argument('--id-seed', type=int, help='Seed for --id-mode seeded')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Render pages in N worker processes (use a deterministic --id-mode for stable output)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only rebuild pages that changed since the last run (cache stored next to output)')
     
     args = parser.parse_args()
     
     try:
-        processor = YAMLToJSONProcessor(base_url=args.base_url, debug=args.debug)
+        build_cache = BuildCache.for_output(args.output, namespace='yaml_to_json') if args.incremental else None
+        processor = YAMLToJSONProcessor(base_url=args.base_url, debug=args.debug,
+                                        id_mode=args.id_mode, id_seed=args.id_seed,
+                                        build_cache=build_cache, workers=args.workers)
         result = processor.process_yaml_file(args.input_file)
         
         if args.validate: